@@ -0,0 +1,253 @@
+"""
+Base classes used to run benchmarks of the commerce hot paths.
+
+Benchmarks run against the configured database, inside a transaction that is rolled back
+once they complete, while every outbound HTTP request (to the Discovery, LMS, Enterprise and
+payment services) is answered by local stubs.
+"""
+from __future__ import unicode_literals
+
+import json
+import math
+import re
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.test import Client
+from oscar.core.loading import get_class, get_model
+from oscar.test.factories import UserFactory
+
+from ecommerce.core.instrumentation import collect_metrics
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.courses.models import Course
+
+Basket = get_model('basket', 'Basket')
+Default = get_class('partner.strategy', 'Default')
+Partner = get_model('partner', 'Partner')
+
+STUB_RESPONSES = (
+    (re.compile(r'/oauth2/access_token/?$'), {'access_token': 'benchmark-token', 'expires_in': 3600}),
+    (re.compile(r'/api/user/v1/accounts/[^/]+/?$'), {'is_active': True}),
+    (re.compile(r'/api/enrollment/v1/enrollment/?$'), {}),
+    (re.compile(r'/course_runs/(?P<key>[^/]+)/?$'), {
+        'title': 'Benchmark Course',
+        'start': '2013-02-05T05:00:00',
+        'end': None,
+        'image': {'src': ''},
+        'short_description': '',
+    }),
+)
+DEFAULT_STUB_RESPONSE = {'count': 0, 'next': None, 'previous': None, 'results': []}
+
+
+class BenchmarkError(Exception):
+    """ Raised when an iteration of a benchmark does not complete successfully. """
+    pass
+
+
+def _stub_response(request, uri, headers):
+    path = uri.split('?', 1)[0]
+    for pattern, body in STUB_RESPONSES:
+        if pattern.search(path):
+            return 200, headers, json.dumps(body)
+    return 200, headers, json.dumps(DEFAULT_STUB_RESPONSE)
+
+
+@contextmanager
+def stub_services():
+    """ Answers every outbound HTTP request with a canned response from the stubbed services. """
+    # httpretty is a test requirement, so it is only imported when the services are stubbed.
+    import httpretty
+
+    httpretty.reset()
+    httpretty.enable()
+    try:
+        for method in (httpretty.GET, httpretty.POST, httpretty.PUT, httpretty.PATCH, httpretty.DELETE):
+            httpretty.register_uri(
+                method, re.compile(r'https?://.*'), body=_stub_response, content_type='application/json'
+            )
+        yield
+    finally:
+        httpretty.disable()
+        httpretty.reset()
+
+
+def percentile(samples, fraction):
+    """
+    Returns the given percentile of the samples, using the nearest-rank method.
+
+    Arguments:
+        samples (list): Samples to compute the percentile of.
+        fraction (float): Percentile to compute, between 0 and 1.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = int(math.ceil(fraction * len(ordered)))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class BenchmarkResult(object):
+    """ Timings and resource usage recorded while running a benchmark. """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.durations = []
+        self.sql_queries = 0
+        self.http_requests = 0
+        self.error = None
+
+    def as_dict(self):
+        iterations = len(self.durations)
+        total = sum(self.durations)
+        return {
+            'size': self.size,
+            'iterations': iterations,
+            'error': self.error,
+            'throughput': round(iterations / total, 2) if total else None,
+            'mean_ms': round(total / iterations * 1000, 3) if iterations else None,
+            'p50_ms': round(percentile(self.durations, 0.5) * 1000, 3) if iterations else None,
+            'p99_ms': round(percentile(self.durations, 0.99) * 1000, 3) if iterations else None,
+            'sql_queries_per_iteration': round(float(self.sql_queries) / iterations, 2) if iterations else None,
+            'http_requests_per_iteration': round(float(self.http_requests) / iterations, 2) if iterations else None,
+        }
+
+
+class Benchmark(object):
+    """
+    Base class of the benchmarks.
+
+    Subclasses implement run, which is timed, and may implement setUp, which runs once before the
+    iterations, and prepare, which runs before each iteration and whose return value is passed to run.
+    """
+    name = None
+    partner_code = 'edx'
+
+    def __init__(self, size):
+        self.size = size
+
+    def setUp(self):
+        self.site, __ = Site.objects.get_or_create(
+            id=settings.SITE_ID, defaults={'domain': 'benchmark.fake', 'name': 'benchmark.fake'}
+        )
+        try:
+            self.site_configuration = self.site.siteconfiguration
+        except SiteConfiguration.DoesNotExist:
+            partner, __ = Partner.objects.get_or_create(
+                short_code=self.partner_code, defaults={'name': self.partner_code}
+            )
+            self.site_configuration = SiteConfiguration(site=self.site, partner=partner)
+
+        # These changes are rolled back along with every other row written by the benchmark.
+        self.site_configuration.lms_url_root = 'http://lms.benchmark.fake'
+        self.site_configuration.discovery_api_url = 'http://discovery.benchmark.fake/api/v1/'
+        self.site_configuration.oauth_settings = {
+            'SOCIAL_AUTH_EDX_OIDC_KEY': 'key',
+            'SOCIAL_AUTH_EDX_OIDC_SECRET': 'secret',
+        }
+        self.site_configuration.segment_key = None
+        self.site_configuration.enable_sdn_check = False
+        self.site_configuration.enable_embargo_check = False
+        self.site_configuration.save()
+        self.partner = self.site_configuration.partner
+
+        self.user = UserFactory()
+        self.client = Client(SERVER_NAME=self.site.domain)
+        self.client.force_login(self.user)
+
+    def create_seat(self, price=100, certificate_type='verified'):
+        """ Creates a course, and a seat of that course. """
+        course = Course.objects.create(
+            id='course-v1:benchmark+{}+run'.format(Course.objects.count()),
+            name='Benchmark Course',
+            partner=self.partner,
+        )
+        return course.create_or_update_seat(certificate_type, True, price)
+
+    def create_basket(self, product):
+        """ Creates a basket of the user, containing the given product. """
+        basket = Basket.objects.create(owner=self.user, site=self.site)
+        basket.strategy = Default()
+        basket.add_product(product)
+        return basket
+
+    def prepare(self):
+        return None
+
+    def run(self, prepared):
+        raise NotImplementedError
+
+    def assert_response(self, response):
+        """ Raises BenchmarkError if the response is an error. """
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                '{} responded with status code {}.'.format(response.request['PATH_INFO'], response.status_code)
+            )
+
+
+def run_benchmark(benchmark_class, iterations, warmup=0, size=10):
+    """
+    Runs a benchmark, rolling back all the changes made to the database once done.
+
+    Arguments:
+        benchmark_class (type): Benchmark subclass to run.
+        iterations (int): Number of timed iterations.
+        warmup (int): Number of untimed iterations run first, to fill caches.
+        size (int): Size of the benchmarked workload, e.g. the number of offers or codes.
+
+    Returns:
+        BenchmarkResult
+    """
+    result = BenchmarkResult(benchmark_class.name, size)
+    benchmark = benchmark_class(size)
+
+    with stub_services(), transaction.atomic():
+        try:
+            benchmark.setUp()
+            for __ in range(warmup):
+                benchmark.run(benchmark.prepare())
+
+            for __ in range(iterations):
+                prepared = benchmark.prepare()
+                with collect_metrics() as metrics:
+                    start = time.time()
+                    benchmark.run(prepared)
+                    result.durations.append(time.time() - start)
+                result.sql_queries += metrics.sql_queries
+                result.http_requests += metrics.http_requests
+        except Exception as exc:  # pylint: disable=broad-except
+            result.error = '{}: {}'.format(exc.__class__.__name__, exc)
+        finally:
+            transaction.set_rollback(True)
+
+    return result
+
+
+def find_regressions(baseline, current, threshold, metrics=('p50_ms', 'p99_ms')):
+    """
+    Compares results of the same benchmarks, e.g. results recorded on two commits.
+
+    Arguments:
+        baseline (dict): Results, keyed by benchmark name, to compare against.
+        current (dict): Results, keyed by benchmark name.
+        threshold (float): Relative slowdown tolerated before a metric is reported, e.g. 0.1 for 10%.
+        metrics (tuple): Names of the compared metrics.
+
+    Returns:
+        list: (benchmark name, metric, baseline value, current value) tuples of the regressed metrics.
+    """
+    regressions = []
+    for name, result in current.items():
+        baseline_result = baseline.get(name)
+        if not baseline_result or baseline_result.get('size') != result.get('size'):
+            continue
+
+        for metric in metrics:
+            old, new = baseline_result.get(metric), result.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append((name, metric, old, new))
+    return regressions
@@ -0,0 +1,462 @@
+"""
+Generation of large synthetic datasets, used for capacity testing.
+
+Rows are inserted with bulk_create, in batches each committed in its own transaction. Their
+primary keys are allocated by the generator, so rows referencing each other can be inserted
+without reading them back; the generator must therefore not run while other processes write to
+the same tables. Random choices are drawn from a seeded generator, so a given seed and scale
+always produce the same dataset.
+"""
+from __future__ import unicode_literals
+
+import base64
+import datetime
+import hashlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.core.lookups import payment_event_types, source_types
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.courses.importers import BulkCourseImporter
+from ecommerce.extensions.catalogue.utils import create_coupon_product_and_stockrecord
+from ecommerce.extensions.fulfillment.status import LINE, ORDER
+from ecommerce.extensions.offer.constants import OFFER_PRIORITY_VOUCHER
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
+from ecommerce.extensions.voucher.code_filter import add_codes
+
+logger = logging.getLogger(__name__)
+Basket = get_model('basket', 'Basket')
+BasketLine = get_model('basket', 'Line')
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Category = get_model('catalogue', 'Category')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+OrderDiscount = get_model('order', 'OrderDiscount')
+OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
+Partner = get_model('partner', 'Partner')
+PaymentEvent = get_model('order', 'PaymentEvent')
+PaymentEventQuantity = get_model('order', 'PaymentEventQuantity')
+PaymentEventTypeName = get_class('order.constants', 'PaymentEventTypeName')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+Range = get_model('offer', 'Range')
+Refund = get_model('refund', 'Refund')
+RefundLine = get_model('refund', 'RefundLine')
+Source = get_model('payment', 'Source')
+StockRecord = get_model('partner', 'StockRecord')
+User = get_user_model()
+Voucher = get_model('voucher', 'Voucher')
+VoucherApplication = get_model('voucher', 'VoucherApplication')
+
+CODE_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'
+CODE_LENGTH = 16
+PAYMENT_PROCESSORS = ('cybersource', 'paypal')
+SEAT_PRICES = (49, 99, 149, 199, 299)
+
+
+class PrimaryKeyAllocator(object):
+    """ Hands out primary keys following the largest key of each table. """
+
+    def __init__(self):
+        self._next = {}
+
+    def allocate(self, model, count):
+        """ Returns the first of count consecutive new primary keys of the model's table. """
+        if model not in self._next:
+            self._next[model] = (model.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+        first = self._next[model]
+        self._next[model] += count
+        return first
+
+    def assign(self, objects):
+        """ Sets new primary keys on unsaved objects of the same model. """
+        if objects:
+            first = self.allocate(objects[0].__class__, len(objects))
+            for offset, obj in enumerate(objects):
+                obj.pk = first + offset
+        return objects
+
+    def reset_sequences(self):
+        """ Moves the sequences of the backend (if any) past the allocated keys. """
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self._next.keys()))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+class DatasetGenerator(object):
+    """ Generates sites, courses, users, coupons, orders and refunds at a configurable scale.
+
+    Arguments:
+        seed (int): Seed of the random choices, also used to name the generated rows.
+        sites (int): Number of sites, each with its own partner.
+        courses (int): Number of courses per site, each with audit and verified seats and an enrollment code.
+        users (int): Number of users.
+        orders (int): Number of orders, each with a single paid seat.
+        coupons (int): Number of coupons per site.
+        vouchers_per_coupon (int): Number of single-use vouchers of each coupon.
+        application_rate (float): Fraction of the orders redeeming a voucher.
+        refund_rate (float): Fraction of the orders that are refunded.
+        days (int): Orders are placed over this many days, ending now.
+        batch_size (int): Number of rows inserted per query.
+    """
+
+    def __init__(self, seed=0, sites=1, courses=100, users=1000, orders=10000, coupons=10, vouchers_per_coupon=100,
+                 application_rate=0.1, refund_rate=0.05, days=365, batch_size=5000):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.site_count = sites
+        self.course_count = courses
+        self.user_count = users
+        self.order_count = orders
+        self.coupon_count = coupons
+        self.vouchers_per_coupon = vouchers_per_coupon
+        self.application_rate = application_rate
+        self.refund_rate = refund_rate
+        self.days = days
+        self.batch_size = batch_size
+        self.keys = PrimaryKeyAllocator()
+        self.end = timezone.now()
+
+        self.sites = []
+        self.seats = {}
+        self.user_ids = []
+        # Unused vouchers of each site, as (voucher ID, code, offer ID, offer name, benefit value) tuples.
+        self.vouchers = {}
+
+    def username(self, index):
+        return 'synthetic-{}-{}'.format(self.seed, index)
+
+    def site_code(self, index):
+        # Partner short codes are at most 8 characters long, so the seed and index are hashed rather than truncated.
+        digest = hashlib.sha1('{}:{}'.format(self.seed, index).encode('utf-8')).digest()
+        return base64.b32encode(digest)[:8].decode('ascii').lower()
+
+    def generate(self):
+        """ Generates the dataset. Returns the number of rows created, keyed by table. """
+        start_time = time.time()
+        counts = {}
+
+        self.create_sites()
+        counts['courses'] = self.create_courses()
+        counts['users'] = self.create_users()
+        counts['vouchers'] = self.create_coupons()
+        counts.update(self.create_orders())
+        self.keys.reset_sequences()
+
+        logger.info('Generated the dataset in [%.1f] seconds: %s', time.time() - start_time, counts)
+        return counts
+
+    def create_sites(self):
+        for index in range(self.site_count):
+            code = self.site_code(index)
+            name = 'Synthetic {}'.format(code)
+            partner, __ = Partner.objects.get_or_create(short_code=code, defaults={'name': name})
+            site, __ = Site.objects.get_or_create(
+                domain='{}.synthetic.fake'.format(code), defaults={'name': name}
+            )
+            SiteConfiguration.objects.get_or_create(site=site, defaults={
+                'partner': partner,
+                'lms_url_root': 'http://lms.synthetic.fake',
+                'payment_processors': ','.join(PAYMENT_PROCESSORS),
+                'from_email': 'synthetic@example.com',
+            })
+            self.sites.append((site, partner))
+
+        if len(set(site.id for site, __ in self.sites)) != self.site_count:
+            raise ValueError('The codes of the [{}] sites requested are not unique.'.format(self.site_count))
+
+    def create_courses(self):
+        """ Creates the courses of each site, with their seats, enrollment codes and stock records. """
+        total = 0
+        for index, (site, partner) in enumerate(self.sites):
+            specs = []
+            for number in range(self.course_count):
+                price = self.random.choice(SEAT_PRICES)
+                specs.append({
+                    'id': 'course-v1:Syn{}+C{}+S{}'.format(index, number, self.seed),
+                    'name': 'Synthetic Course {}'.format(number),
+                    'seats': [
+                        {'certificate_type': 'audit', 'id_verification_required': False, 'price': 0},
+                        {'certificate_type': 'verified', 'id_verification_required': True, 'price': price},
+                    ],
+                    'create_enrollment_code': True,
+                })
+            BulkCourseImporter(partner).import_courses(specs)
+
+            self.seats[site.id] = list(
+                StockRecord.objects.filter(
+                    partner=partner,
+                    product__course_id__in=[spec['id'] for spec in specs],
+                    product__certificate_type='verified',
+                ).select_related('product')
+            )
+            total += len(specs)
+        return total
+
+    def exists(self):
+        """ Returns whether a dataset was already generated with the same seed. """
+        return User.objects.filter(username=self.username(0)).exists()
+
+    def create_users(self):
+        for index in range(0, self.user_count, self.batch_size):
+            users = [
+                User(
+                    username=self.username(number),
+                    email='{}@example.com'.format(self.username(number)),
+                    password='!',
+                    full_name='Synthetic User {}'.format(number),
+                )
+                for number in range(index, min(index + self.batch_size, self.user_count))
+            ]
+            with transaction.atomic():
+                User.objects.bulk_create(self.keys.assign(users))
+            self.user_ids.extend(user.pk for user in users)
+        return self.user_count
+
+    def create_coupons(self):
+        """ Creates percentage discount coupons, each with single-use vouchers, for the seats of each site. """
+        category = Category.objects.get(name='Coupons')
+        start = self.end - datetime.timedelta(days=self.days)
+        end = self.end + datetime.timedelta(days=self.days)
+        codes = set()
+        total = 0
+
+        for site, partner in self.sites:
+            self.vouchers[site.id] = []
+            for number in range(self.coupon_count):
+                with transaction.atomic():
+                    benefit_value = self.random.choice((10, 25, 50, 100))
+                    title = 'Synthetic Coupon {}-{}'.format(partner.short_code, number)
+                    coupon = create_coupon_product_and_stockrecord(title, category, partner, 100)
+
+                    catalog = Catalog.objects.create(name=title, partner=partner)
+                    seats = self.seats[site.id]
+                    catalog.stock_records.add(*self.random.sample(seats, min(3, len(seats))))
+                    product_range = Range.objects.create(name=title, catalog=catalog)
+                    offer = ConditionalOffer.objects.create(
+                        name=title,
+                        offer_type=ConditionalOffer.VOUCHER,
+                        condition=Condition.objects.create(range=product_range, type=Condition.COUNT, value=1),
+                        benefit=Benefit.objects.create(
+                            range=product_range, type=Benefit.PERCENTAGE, value=benefit_value, max_affected_items=1
+                        ),
+                        site=site,
+                        partner=partner,
+                        priority=OFFER_PRIORITY_VOUCHER,
+                    )
+
+                    vouchers = []
+                    while len(vouchers) < self.vouchers_per_coupon:
+                        code = ''.join(self.random.choice(CODE_ALPHABET) for __ in range(CODE_LENGTH))
+                        if code not in codes:
+                            codes.add(code)
+                            vouchers.append(Voucher(
+                                name=title, code=code, usage=Voucher.SINGLE_USE, start_datetime=start, end_datetime=end
+                            ))
+                    Voucher.objects.bulk_create(self.keys.assign(vouchers), batch_size=self.batch_size)
+                    add_codes(voucher.code for voucher in vouchers)
+
+                    coupon_vouchers = CouponVouchers.objects.create(coupon=coupon)
+                    CouponVouchers.vouchers.through.objects.bulk_create([
+                        CouponVouchers.vouchers.through(couponvouchers_id=coupon_vouchers.id, voucher_id=voucher.pk)
+                        for voucher in vouchers
+                    ], batch_size=self.batch_size)
+                    Voucher.offers.through.objects.bulk_create([
+                        Voucher.offers.through(voucher_id=voucher.pk, conditionaloffer_id=offer.id)
+                        for voucher in vouchers
+                    ], batch_size=self.batch_size)
+                    coupon.attr.coupon_vouchers = coupon_vouchers
+                    coupon.save()
+
+                self.vouchers[site.id].extend(
+                    (voucher.pk, voucher.code, offer.id, offer.name, benefit_value) for voucher in vouchers
+                )
+                total += len(vouchers)
+
+            self.random.shuffle(self.vouchers[site.id])
+        return total
+
+    def create_orders(self):
+        """ Creates submitted baskets, orders, payments, voucher applications and refunds, in batches. """
+        counts = {'orders': 0, 'voucher_applications': 0, 'refunds': 0}
+        paid = payment_event_types.get_or_create(PaymentEventTypeName.PAID)[0]
+        refunded = payment_event_types.get_or_create(PaymentEventTypeName.REFUNDED)[0]
+        processors = {name: source_types.get_or_create(name)[0] for name in PAYMENT_PROCESSORS}
+        start_time = time.time()
+
+        for index in range(0, self.order_count, self.batch_size):
+            size = min(self.batch_size, self.order_count - index)
+            with transaction.atomic():
+                batch_counts = self.create_order_batch(size, paid, refunded, processors)
+            for key, value in batch_counts.items():
+                counts[key] += value
+
+            elapsed = max(time.time() - start_time, 0.001)
+            logger.info(
+                'Created [%d/%d] orders ([%.1f] orders per second).',
+                counts['orders'], self.order_count, counts['orders'] / elapsed
+            )
+        return counts
+
+    def create_order_batch(self, size, paid, refunded, processors):
+        rows = OrderedDict((model, []) for model in (
+            Basket, BasketLine, Order, Line, OrderDiscount, VoucherApplication, PaymentEvent, PaymentEventQuantity,
+            Source, PaymentProcessorResponse, Refund, RefundLine
+        ))
+        refund_events = []
+        applied = {}
+        number_generator = OrderNumberGenerator()
+        first_basket_id = self.keys.allocate(Basket, size)
+        first_order_id = self.keys.allocate(Order, size)
+        first_line_id = self.keys.allocate(Line, size)
+
+        for offset in range(size):
+            site, partner = self.sites[self.random.randrange(len(self.sites))]
+            stock_record = self.random.choice(self.seats[site.id])
+            user_id = self.random.choice(self.user_ids)
+            processor = self.random.choice(PAYMENT_PROCESSORS)
+            date_placed = self.end - datetime.timedelta(seconds=self.random.randrange(self.days * 86400))
+            price = stock_record.price_excl_tax
+            basket_id, order_id, line_id = first_basket_id + offset, first_order_id + offset, first_line_id + offset
+
+            voucher = None
+            if self.vouchers[site.id] and self.random.random() < self.application_rate:
+                voucher = self.vouchers[site.id].pop()
+            discount = (price * voucher[4] / 100).quantize(Decimal('0.01')) if voucher else Decimal(0)
+            total = price - discount
+
+            rows[Basket].append(Basket(
+                id=basket_id, owner_id=user_id, site=site, status=Basket.SUBMITTED, date_submitted=date_placed
+            ))
+            rows[BasketLine].append(BasketLine(
+                basket_id=basket_id,
+                line_reference='{}_{}'.format(stock_record.product_id, stock_record.id),
+                product_id=stock_record.product_id,
+                stockrecord=stock_record,
+                price_currency=stock_record.price_currency,
+                price_excl_tax=price,
+                price_incl_tax=price,
+            ))
+            rows[Order].append(Order(
+                id=order_id,
+                number=number_generator.order_number_from_basket_id(partner, basket_id),
+                site=site,
+                partner=partner,
+                basket_id=basket_id,
+                user_id=user_id,
+                currency=stock_record.price_currency,
+                total_incl_tax=total,
+                total_excl_tax=total,
+                shipping_incl_tax=0,
+                shipping_excl_tax=0,
+                shipping_method='No shipping required',
+                shipping_code='no-shipping-required',
+                status=ORDER.COMPLETE,
+                date_placed=date_placed,
+            ))
+            rows[Line].append(Line(
+                id=line_id,
+                order_id=order_id,
+                partner=partner,
+                partner_name=partner.name,
+                partner_sku=stock_record.partner_sku,
+                stockrecord=stock_record,
+                product=stock_record.product,
+                title=stock_record.product.title,
+                quantity=1,
+                line_price_incl_tax=total,
+                line_price_excl_tax=total,
+                line_price_before_discounts_incl_tax=price,
+                line_price_before_discounts_excl_tax=price,
+                unit_price_incl_tax=price,
+                unit_price_excl_tax=price,
+                status=LINE.COMPLETE,
+            ))
+
+            if voucher:
+                voucher_id, code, offer_id, offer_name, __ = voucher
+                rows[OrderDiscount].append(OrderDiscount(
+                    order_id=order_id, category=OrderDiscount.VOUCHER, offer_id=offer_id, offer_name=offer_name,
+                    voucher_id=voucher_id, voucher_code=code, frequency=1, amount=discount
+                ))
+                rows[VoucherApplication].append(VoucherApplication(
+                    voucher_id=voucher_id, user_id=user_id, order_id=order_id
+                ))
+                offer_totals = applied.setdefault(offer_id, [[], Decimal(0)])
+                offer_totals[0].append(voucher_id)
+                offer_totals[1] += discount
+
+            if total > 0:
+                transaction_id = 'synthetic-{}'.format(order_id)
+                rows[PaymentEvent].append(PaymentEvent(
+                    order_id=order_id, amount=total, reference=transaction_id, event_type=paid,
+                    processor_name=processor
+                ))
+                rows[PaymentEventQuantity].append(PaymentEventQuantity(line_id=line_id, quantity=1))
+                rows[PaymentProcessorResponse].append(PaymentProcessorResponse(
+                    processor_name=processor, transaction_id=transaction_id, basket_id=basket_id,
+                    response={'decision': 'ACCEPT', 'transaction_id': transaction_id}
+                ))
+
+                is_refunded = self.random.random() < self.refund_rate
+                rows[Source].append(Source(
+                    order_id=order_id, source_type=processors[processor], currency=stock_record.price_currency,
+                    amount_allocated=total, amount_debited=total, amount_refunded=total if is_refunded else 0,
+                    reference=transaction_id, card_type='visa' if processor == 'cybersource' else None
+                ))
+                if is_refunded:
+                    rows[Refund].append(Refund(
+                        order_id=order_id, user_id=user_id, total_credit_excl_tax=total,
+                        currency=stock_record.price_currency, status=REFUND.COMPLETE
+                    ))
+                    rows[RefundLine].append(RefundLine(
+                        order_line_id=line_id, line_credit_excl_tax=total, quantity=1, status=REFUND_LINE.COMPLETE
+                    ))
+                    refund_events.append(PaymentEvent(
+                        order_id=order_id, amount=total, reference=transaction_id, event_type=refunded,
+                        processor_name=processor
+                    ))
+
+        # Rows referenced by other rows of the batch are given their primary keys before being inserted. Payment
+        # events are listed before the refund events, so they line up with their quantities.
+        rows[PaymentEvent].extend(refund_events)
+        self.keys.assign(rows[PaymentEvent])
+        for event, quantity in zip(rows[PaymentEvent], rows[PaymentEventQuantity]):
+            quantity.event_id = event.pk
+        self.keys.assign(rows[Refund])
+        for refund, refund_line in zip(rows[Refund], rows[RefundLine]):
+            refund_line.refund_id = refund.pk
+
+        # The rows are inserted in the order their models were listed, so referenced rows are inserted first.
+        for model, objects in rows.items():
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+        for offer_id, (voucher_ids, discount) in applied.items():
+            Voucher.objects.filter(pk__in=voucher_ids).update(num_orders=F('num_orders') + 1)
+            ConditionalOffer.objects.filter(pk=offer_id).update(
+                num_applications=F('num_applications') + len(voucher_ids),
+                num_orders=F('num_orders') + len(voucher_ids),
+                total_discount=F('total_discount') + discount,
+            )
+
+        return {
+            'orders': size,
+            'voucher_applications': len(rows[VoucherApplication]),
+            'refunds': len(rows[Refund]),
+        }
@@ -0,0 +1,222 @@
+"""
+Benchmarks of the commerce hot paths.
+"""
+from __future__ import unicode_literals
+
+import datetime
+from collections import OrderedDict
+
+from django.urls import reverse
+from oscar.core.loading import get_class, get_model
+from oscar.test import factories
+
+from ecommerce.benchmarks.base import Benchmark
+from ecommerce.extensions.catalogue.utils import create_coupon_product
+from ecommerce.extensions.fulfillment.api import fulfill_order
+from ecommerce.extensions.payment.helpers import sign
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.extensions.voucher.utils import generate_coupon_report
+
+Applicator = get_class('offer.applicator', 'Applicator')
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Category = get_model('catalogue', 'Category')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class BasketAddBenchmark(Benchmark):
+    """ Adds a seat to the basket of the user. """
+    name = 'basket_add'
+
+    def setUp(self):
+        super(BasketAddBenchmark, self).setUp()
+        sku = self.create_seat().stockrecords.first().partner_sku
+        self.url = '{}?sku={}'.format(reverse('basket:basket-add'), sku)
+
+    def run(self, prepared):
+        self.assert_response(self.client.get(self.url))
+
+
+class BasketCalculateBenchmark(Benchmark):
+    """ Calculates the price of a basket of seats. The size is the number of seats. """
+    name = 'basket_calculate'
+
+    def setUp(self):
+        super(BasketCalculateBenchmark, self).setUp()
+        skus = [self.create_seat().stockrecords.first().partner_sku for __ in range(self.size)]
+        self.url = '{}?{}'.format(reverse('api:v2:baskets:calculate'), '&'.join('sku=' + sku for sku in skus))
+
+    def run(self, prepared):
+        self.assert_response(self.client.get(self.url))
+
+
+class ApplicatorBenchmark(Benchmark):
+    """ Applies offers to a basket containing a seat. The size is the number of site offers. """
+    name = 'applicator'
+
+    def setUp(self):
+        super(ApplicatorBenchmark, self).setUp()
+        self.seat = self.create_seat()
+        _range = factories.RangeFactory(products=[self.seat])
+        for __ in range(self.size):
+            factories.ConditionalOfferFactory(
+                offer_type=ConditionalOffer.SITE,
+                exclusive=False,
+                condition=factories.ConditionFactory(range=_range, type=Condition.COUNT, value=1),
+                benefit=factories.BenefitFactory(range=_range, value=1),
+            )
+
+    def prepare(self):
+        return self.create_basket(self.seat)
+
+    def run(self, prepared):
+        Applicator().apply(prepared, self.user)
+
+
+class CouponBenchmark(Benchmark):
+    """ Base class of the benchmarks creating coupons. """
+
+    def setUp(self):
+        super(CouponBenchmark, self).setUp()
+        # Created by the catalogue migrations.
+        self.category = Category.objects.get(name='Coupons')
+        self.catalog = Catalog.objects.create(partner=self.partner)
+        self.stock_record = self.create_seat().stockrecords.first()
+        self.catalog.stock_records.add(self.stock_record)
+
+    def create_coupon(self, quantity, voucher_type=Voucher.SINGLE_USE, benefit_value=100):
+        """ Creates a percentage discount coupon with the given number of codes, for the seat of the catalog. """
+        return create_coupon_product(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=benefit_value,
+            catalog=self.catalog,
+            catalog_query=None,
+            category=self.category,
+            code='',
+            course_seat_types=None,
+            email_domains=None,
+            end_datetime=datetime.datetime.now() + datetime.timedelta(days=365),
+            enterprise_customer=None,
+            enterprise_customer_catalog=None,
+            max_uses=None,
+            note=None,
+            partner=self.partner,
+            price=100,
+            quantity=quantity,
+            start_datetime=datetime.datetime.now() - datetime.timedelta(days=1),
+            title='Benchmark coupon',
+            voucher_type=voucher_type,
+            course_catalog=None,
+            program_uuid=None,
+            site=self.site
+        )
+
+
+class VoucherRedemptionBenchmark(CouponBenchmark):
+    """ Redeems a multi-use discount code for a seat. """
+    name = 'voucher_redemption'
+
+    def setUp(self):
+        super(VoucherRedemptionBenchmark, self).setUp()
+        coupon = self.create_coupon(quantity=1, voucher_type=Voucher.MULTI_USE, benefit_value=10)
+        code = coupon.attr.coupon_vouchers.vouchers.first().code
+        self.url = '{}?code={}&sku={}'.format(reverse('coupons:redeem'), code, self.stock_record.partner_sku)
+
+    def run(self, prepared):
+        self.assert_response(self.client.get(self.url))
+
+
+class CybersourceNotificationBenchmark(Benchmark):
+    """ Handles accepted CyberSource payment notifications, placing and fulfilling orders. """
+    name = 'cybersource_notification'
+
+    def setUp(self):
+        super(CybersourceNotificationBenchmark, self).setUp()
+        self.seat = self.create_seat()
+        self.processor = Cybersource(self.site)
+        self.country = factories.CountryFactory()
+        self.url = reverse('cybersource:redirect')
+
+    def prepare(self):
+        basket = self.create_basket(self.seat)
+        basket.freeze()
+
+        total = unicode(basket.total_incl_tax)
+        notification = {
+            'decision': 'ACCEPT',
+            'reason_code': '100',
+            'req_reference_number': basket.order_number,
+            'transaction_id': '123456',
+            'auth_amount': total,
+            'req_amount': total,
+            'req_tax_amount': '0.00',
+            'req_currency': basket.currency,
+            'req_card_number': 'xxxxxxxxxxxx1111',
+            'req_card_type': '001',
+            'req_profile_id': self.processor.profile_id,
+            'req_bill_to_forename': 'Benchmark',
+            'req_bill_to_surname': 'User',
+            'req_bill_to_address_line1': 'Line 1',
+            'req_bill_to_address_city': 'City',
+            'req_bill_to_address_postal_code': '00000',
+            'req_bill_to_address_country': self.country.iso_3166_1_a2,
+        }
+        signed_field_names = list(notification.keys())
+        notification['signed_field_names'] = ','.join(signed_field_names)
+        message = ','.join('{}={}'.format(key, notification[key]) for key in signed_field_names)
+        notification['signature'] = sign(message, self.processor.secret_key)
+        return notification
+
+    def run(self, prepared):
+        self.assert_response(self.client.post(self.url, prepared))
+
+
+class FulfillmentBenchmark(Benchmark):
+    """ Fulfills orders of a seat, enrolling the user through the LMS. """
+    name = 'fulfillment'
+
+    def setUp(self):
+        super(FulfillmentBenchmark, self).setUp()
+        self.seat = self.create_seat()
+
+    def prepare(self):
+        basket = self.create_basket(self.seat)
+        return create_order(basket=basket, user=self.user, site=self.site)
+
+    def run(self, prepared):
+        fulfill_order(prepared, prepared.lines.all())
+
+
+class CouponCreationBenchmark(CouponBenchmark):
+    """ Creates coupons. The size is the number of codes of each coupon. """
+    name = 'coupon_creation'
+
+    def run(self, prepared):
+        self.create_coupon(quantity=self.size)
+
+
+class CouponReportBenchmark(CouponBenchmark):
+    """ Generates the report of a coupon. The size is the number of codes of the coupon. """
+    name = 'coupon_report'
+
+    def setUp(self):
+        super(CouponReportBenchmark, self).setUp()
+        self.coupon = self.create_coupon(quantity=self.size)
+
+    def run(self, prepared):
+        generate_coupon_report([self.coupon.attr.coupon_vouchers])
+
+
+BENCHMARKS = OrderedDict((benchmark.name, benchmark) for benchmark in (
+    BasketAddBenchmark,
+    BasketCalculateBenchmark,
+    ApplicatorBenchmark,
+    VoucherRedemptionBenchmark,
+    CybersourceNotificationBenchmark,
+    FulfillmentBenchmark,
+    CouponCreationBenchmark,
+    CouponReportBenchmark,
+))
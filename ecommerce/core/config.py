@@ -12,3 +12,14 @@ class CoreAppConfig(AppConfig):
         # Allows Celery tasks to bind themselves to an initialized instance of the Celery library.
         # noinspection PyUnresolvedReferences
         from ecommerce import celery_app  # pylint: disable=unused-variable
+
+        # Connect the signal receivers invalidating the lookup registries.
+        # noinspection PyUnresolvedReferences
+        import ecommerce.core.lookups  # pylint: disable=unused-variable
+
+        # Connect the signal receivers invalidating the cached sites.
+        # noinspection PyUnresolvedReferences
+        import ecommerce.core.sites  # pylint: disable=unused-variable
+
+        from ecommerce.core.instrumentation import install_hooks
+        install_hooks()
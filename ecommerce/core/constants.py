@@ -25,6 +25,10 @@ ENROLLMENT_CODE_PRODUCT_CLASS_NAME = 'Enrollment Code'
 ENROLLMENT_CODE_SWITCH = 'create_enrollment_codes'
 ENROLLMENT_CODE_SEAT_TYPES = ['verified', 'professional', 'no-id-professional']
 
+# Course publication constants
+# When active, course publication to the LMS is queued and performed by the process_course_publications command.
+ASYNC_COURSE_PUBLICATION_SWITCH = 'async_course_publication'
+
 # Course Entitlement constant
 COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME = 'Course Entitlement'
 
@@ -0,0 +1,194 @@
+"""
+Per-request performance instrumentation.
+
+Hooks installed on the database cursor, TieredCache and requests sessions record, for
+every active collector, the number and duration of SQL queries, the TieredCache hits
+and misses, and the number and duration of outbound HTTP requests (which include the
+calls made by EdxRestApiClient). RequestInstrumentationMiddleware collects these
+metrics for each request, and hands them to the exporters listed in the
+PERFORMANCE_INSTRUMENTATION_EXPORTERS setting.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+import newrelic.agent
+import requests
+from django.conf import settings
+from django.db.backends.utils import CursorWrapper
+from edx_django_utils.cache import TieredCache
+from six.moves.urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_installed = False
+
+
+class RequestMetrics(object):
+    """Counters and timings recorded while collecting metrics. Times are in seconds."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self.sql_queries = 0
+        self.sql_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.http_requests = 0
+        self.http_time = 0.0
+        # Number of outbound HTTP requests, keyed by host.
+        self.http_requests_by_host = {}
+
+    @property
+    def duration(self):
+        return (self.finished or time.time()) - self.started
+
+    def as_dict(self):
+        return {
+            'duration_ms': int(self.duration * 1000),
+            'sql_queries': self.sql_queries,
+            'sql_time_ms': int(self.sql_time * 1000),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'http_requests': self.http_requests,
+            'http_time_ms': int(self.http_time * 1000),
+        }
+
+
+def _get_collectors():
+    if not hasattr(_local, 'collectors'):
+        _local.collectors = []
+    return _local.collectors
+
+
+@contextmanager
+def collect_metrics():
+    """
+    Records the metrics of the code run by the current thread within the block.
+
+    Collectors can be nested, in which case each of them records the metrics of its whole block.
+
+    Yields:
+        RequestMetrics
+    """
+    metrics = RequestMetrics()
+    collectors = _get_collectors()
+    collectors.append(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.finished = time.time()
+        collectors.remove(metrics)
+
+
+def start_collecting():
+    """Starts recording metrics for the current thread, returning the RequestMetrics being recorded."""
+    metrics = RequestMetrics()
+    _get_collectors().append(metrics)
+    return metrics
+
+
+def stop_collecting(metrics):
+    """Stops recording the given metrics."""
+    metrics.finished = time.time()
+    collectors = _get_collectors()
+    if metrics in collectors:
+        collectors.remove(metrics)
+
+
+def _record_sql(duration):
+    for metrics in _get_collectors():
+        metrics.sql_queries += 1
+        metrics.sql_time += duration
+
+
+def _record_cache(is_found):
+    for metrics in _get_collectors():
+        if is_found:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+def _record_http(url, duration):
+    host = urlparse(url).netloc
+    for metrics in _get_collectors():
+        metrics.http_requests += 1
+        metrics.http_time += duration
+        metrics.http_requests_by_host[host] = metrics.http_requests_by_host.get(host, 0) + 1
+
+
+def _timed(func, record):
+    """Wraps func, passing the duration of each call to record when metrics are being collected."""
+    def wrapper(*args, **kwargs):
+        if not _get_collectors():
+            return func(*args, **kwargs)
+
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(args, time.time() - start)
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def install_hooks():
+    """Instruments the database cursor, TieredCache and requests sessions. Calling this more than once is a no-op."""
+    global _installed  # pylint: disable=global-statement
+    if _installed:
+        return
+
+    CursorWrapper.execute = _timed(CursorWrapper.execute, lambda args, duration: _record_sql(duration))
+    CursorWrapper.executemany = _timed(CursorWrapper.executemany, lambda args, duration: _record_sql(duration))
+    requests.Session.send = _timed(requests.Session.send, lambda args, duration: _record_http(args[1].url, duration))
+
+    get_cached_response = TieredCache.get_cached_response
+
+    def get_cached_response_wrapper(key):
+        cached_response = get_cached_response(key)
+        if _get_collectors():
+            _record_cache(cached_response.is_found)
+        return cached_response
+
+    TieredCache.get_cached_response = staticmethod(get_cached_response_wrapper)
+    _installed = True
+
+
+class LoggingExporter(object):
+    """Writes the metrics of each request as a structured log line."""
+
+    def export(self, request, response, metrics):
+        values = metrics.as_dict()
+        values.update({
+            'method': request.method,
+            'path': request.path,
+            'status_code': response.status_code,
+        })
+        logger.info(
+            'request_metrics: %s',
+            ', '.join('{}="{}"'.format(key, value) for key, value in sorted(values.items()))
+        )
+
+
+class NewRelicExporter(object):
+    """Attaches the metrics of each request to its New Relic transaction as custom parameters."""
+
+    def export(self, request, response, metrics):  # pylint: disable=unused-argument
+        for key, value in metrics.as_dict().items():
+            newrelic.agent.add_custom_parameter('ecommerce_{}'.format(key), value)
+
+
+def get_exporters():
+    """Returns instances of the exporters configured by the PERFORMANCE_INSTRUMENTATION_EXPORTERS setting."""
+    exporters = []
+    for path in getattr(settings, 'PERFORMANCE_INSTRUMENTATION_EXPORTERS', ()):
+        module_path, class_name = path.rsplit('.', 1)
+        exporters.append(getattr(import_module(module_path), class_name)())
+    return exporters
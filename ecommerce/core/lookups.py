@@ -0,0 +1,107 @@
+"""
+In-process registries of lookup rows.
+
+Checkout, basket and fulfillment code repeatedly fetches rows from tiny tables that
+almost never change (product classes, product options, basket attribute types,
+payment event types and payment source types). The registries defined here load
+each row once per process, and drop their rows whenever a row of the table is
+saved or deleted.
+"""
+from __future__ import unicode_literals
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from oscar.core.loading import get_model
+
+
+class LookupRegistry(object):
+    """Caches the rows of a lookup table, keyed by the value of one of their unique fields."""
+
+    def __init__(self, app_label, model_name, field='name'):
+        self.app_label = app_label
+        self.model_name = model_name
+        self.field = field
+        self._rows = {}
+        # Values of rows created by this process, whose creating transaction has not been committed yet.
+        self._pending = set()
+
+        sender = '{}.{}'.format(app_label, model_name)
+        post_save.connect(self.clear, sender=sender, weak=False)
+        post_delete.connect(self.clear, sender=sender, weak=False)
+
+    @property
+    def model(self):
+        return get_model(self.app_label, self.model_name)
+
+    def get(self, value):
+        """
+        Returns the row whose field has the given value.
+
+        Raises:
+            DoesNotExist: if there is no such row.
+        """
+        row = self._rows.get(value)
+        if row is None:
+            row = self.model.objects.get(**{self.field: value})
+            self._cache(value, row)
+        return row
+
+    def get_or_none(self, value):
+        """Returns the row whose field has the given value, or None if there is no such row."""
+        try:
+            return self.get(value)
+        except self.model.DoesNotExist:
+            return None
+
+    def get_or_create(self, value):
+        """
+        Returns the row whose field has the given value, creating it if needed.
+
+        Returns:
+            tuple: The row, and whether it was created.
+        """
+        row = self._rows.get(value)
+        if row is not None:
+            return row, False
+
+        row, created = self.model.objects.get_or_create(**{self.field: value})
+        if created:
+            # A row created inside a transaction that is later rolled back must never be handed out,
+            # so it is only cached once the transaction has been committed.
+            self._pending.add(value)
+            transaction.on_commit(lambda: self._commit(value, row))
+        else:
+            self._cache(value, row)
+        return row, created
+
+    def clear(self, **kwargs):  # pylint: disable=unused-argument
+        """Drops all cached rows. Connected to the post_save and post_delete signals of the model."""
+        self._rows = {}
+
+    def reset(self):
+        """Drops all cached rows, and forgets about rows created by uncommitted transactions."""
+        self._rows = {}
+        self._pending = set()
+
+    def _cache(self, value, row):
+        if value not in self._pending:
+            self._rows[value] = row
+
+    def _commit(self, value, row):
+        self._pending.discard(value)
+        self._cache(value, row)
+
+
+product_classes = LookupRegistry('catalogue', 'ProductClass')
+options = LookupRegistry('catalogue', 'Option', field='code')
+basket_attribute_types = LookupRegistry('basket', 'BasketAttributeType')
+payment_event_types = LookupRegistry('order', 'PaymentEventType')
+source_types = LookupRegistry('payment', 'SourceType')
+
+REGISTRIES = (product_classes, options, basket_attribute_types, payment_event_types, source_types)
+
+
+def reset_lookup_registries():
+    """Resets all registries. Tests call this, since rolling back their transactions does not send signals."""
+    for registry in REGISTRIES:
+        registry.reset()
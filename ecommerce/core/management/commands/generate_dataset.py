@@ -0,0 +1,105 @@
+""" Generates a large synthetic dataset, used for capacity testing. """
+
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.benchmarks.dataset import DatasetGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Generate a seeded synthetic dataset of courses, users, coupons, orders and refunds using bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed',
+                            action='store',
+                            dest='seed',
+                            type=int,
+                            default=0,
+                            help='Seed of the random choices. Each seed may only be used once per database.')
+        parser.add_argument('--sites',
+                            action='store',
+                            dest='sites',
+                            type=int,
+                            default=1,
+                            help='Number of sites, each with its own partner.')
+        parser.add_argument('--courses',
+                            action='store',
+                            dest='courses',
+                            type=int,
+                            default=100,
+                            help='Number of courses per site.')
+        parser.add_argument('--users',
+                            action='store',
+                            dest='users',
+                            type=int,
+                            default=1000,
+                            help='Number of users.')
+        parser.add_argument('--orders',
+                            action='store',
+                            dest='orders',
+                            type=int,
+                            default=10000,
+                            help='Number of orders.')
+        parser.add_argument('--coupons',
+                            action='store',
+                            dest='coupons',
+                            type=int,
+                            default=10,
+                            help='Number of coupons per site.')
+        parser.add_argument('--vouchers-per-coupon',
+                            action='store',
+                            dest='vouchers_per_coupon',
+                            type=int,
+                            default=100,
+                            help='Number of single-use vouchers of each coupon.')
+        parser.add_argument('--application-rate',
+                            action='store',
+                            dest='application_rate',
+                            type=float,
+                            default=0.1,
+                            help='Fraction of the orders redeeming a voucher.')
+        parser.add_argument('--refund-rate',
+                            action='store',
+                            dest='refund_rate',
+                            type=float,
+                            default=0.05,
+                            help='Fraction of the orders that are refunded.')
+        parser.add_argument('--days',
+                            action='store',
+                            dest='days',
+                            type=int,
+                            default=365,
+                            help='Orders are placed over this many days, ending now.')
+        parser.add_argument('--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            type=int,
+                            default=5000,
+                            help='Number of rows inserted per query.')
+
+    def handle(self, *args, **options):
+        generator = DatasetGenerator(
+            seed=options['seed'],
+            sites=options['sites'],
+            courses=options['courses'],
+            users=options['users'],
+            orders=options['orders'],
+            coupons=options['coupons'],
+            vouchers_per_coupon=options['vouchers_per_coupon'],
+            application_rate=options['application_rate'],
+            refund_rate=options['refund_rate'],
+            days=options['days'],
+            batch_size=options['batch_size'],
+        )
+
+        if generator.exists():
+            raise CommandError('A dataset was already generated with seed [{}].'.format(options['seed']))
+
+        counts = generator.generate()
+        for name, count in sorted(counts.items()):
+            self.stdout.write('{}: {}'.format(name, count))
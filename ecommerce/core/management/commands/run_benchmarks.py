@@ -0,0 +1,106 @@
+""" Runs the benchmarks of the commerce hot paths, and records their results as JSON. """
+
+from __future__ import unicode_literals
+
+import json
+import logging
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from ecommerce.benchmarks.base import find_regressions, run_benchmark
+from ecommerce.benchmarks.suites import BENCHMARKS
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the benchmarks of the commerce hot paths against the local database and stubbed services.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--benchmark',
+                            action='append',
+                            dest='benchmarks',
+                            choices=list(BENCHMARKS.keys()),
+                            help='Name of a benchmark to run. May be repeated. Defaults to all benchmarks.')
+        parser.add_argument('--iterations',
+                            action='store',
+                            dest='iterations',
+                            type=int,
+                            default=50,
+                            help='Number of timed iterations of each benchmark.')
+        parser.add_argument('--warmup',
+                            action='store',
+                            dest='warmup',
+                            type=int,
+                            default=5,
+                            help='Number of untimed iterations run before the timed ones.')
+        parser.add_argument('--size',
+                            action='store',
+                            dest='size',
+                            type=int,
+                            default=10,
+                            help='Size of the benchmarked workloads, e.g. the number of offers or coupon codes.')
+        parser.add_argument('--label',
+                            action='store',
+                            dest='label',
+                            type=str,
+                            default='',
+                            help='Label recorded with the results, e.g. a commit hash.')
+        parser.add_argument('--output',
+                            action='store',
+                            dest='output',
+                            type=str,
+                            help='Path of the file the JSON results are written to. Defaults to stdout.')
+        parser.add_argument('--baseline',
+                            action='store',
+                            dest='baseline',
+                            type=str,
+                            help='Path of JSON results, written by a previous run, to compare the results with.')
+        parser.add_argument('--threshold',
+                            action='store',
+                            dest='threshold',
+                            type=float,
+                            default=0.1,
+                            help='Relative slowdown, compared to the baseline, reported as a regression.')
+
+    def handle(self, *args, **options):
+        try:
+            # The remote services are stubbed with httpretty, which is only installed with the test requirements.
+            import httpretty  # pylint: disable=unused-import
+        except ImportError:
+            raise CommandError('The benchmarks require the test requirements, see requirements/test.txt.')
+
+        names = options['benchmarks'] or list(BENCHMARKS.keys())
+
+        results = {}
+        for name in names:
+            logger.info('Running benchmark [%s]...', name)
+            result = run_benchmark(
+                BENCHMARKS[name], options['iterations'], warmup=options['warmup'], size=options['size']
+            )
+            if result.error:
+                logger.error('Benchmark [%s] failed: %s', name, result.error)
+            results[name] = result.as_dict()
+
+        report = json.dumps({
+            'label': options['label'],
+            'created': timezone.now().isoformat(),
+            'results': results,
+        }, indent=2, sort_keys=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['results']
+
+            regressions = find_regressions(baseline, results, options['threshold'])
+            for name, metric, old, new in regressions:
+                logger.warning('Benchmark [%s] regressed: %s went from %s to %s.', name, metric, old, new)
+            if regressions:
+                raise CommandError('{} benchmark metrics regressed.'.format(len(regressions)))
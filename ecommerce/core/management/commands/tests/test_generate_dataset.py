@@ -0,0 +1,72 @@
+"""
+Tests for Django management command to generate synthetic datasets.
+"""
+from __future__ import unicode_literals
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.benchmarks.dataset import DatasetGenerator
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Category = get_model('catalogue', 'Category')
+Order = get_model('order', 'Order')
+PaymentEvent = get_model('order', 'PaymentEvent')
+Refund = get_model('refund', 'Refund')
+Voucher = get_model('voucher', 'Voucher')
+VoucherApplication = get_model('voucher', 'VoucherApplication')
+
+
+class GenerateDatasetTests(CouponMixin, DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(GenerateDatasetTests, self).setUp()
+        # The generator relies on the categories created by the migrations, which may be disabled.
+        if not Category.objects.filter(name='Coupons').exists():
+            factories.CategoryFactory(name='Coupons')
+
+    def generate(self, seed=1):
+        call_command(
+            'generate_dataset', seed=seed, sites=2, courses=3, users=5, orders=40, coupons=1, vouchers_per_coupon=10,
+            application_rate=0.5, refund_rate=0.5, batch_size=7
+        )
+
+    def test_generate(self):
+        """ Verify orders, with their payments, voucher applications and refunds, are generated. """
+        self.generate()
+
+        site_codes = [DatasetGenerator(seed=1).site_code(index) for index in range(2)]
+        orders = Order.objects.filter(partner__short_code__in=site_codes)
+        self.assertEqual(orders.count(), 40)
+        self.assertEqual(len(set(orders.values_list('number', flat=True))), 40)
+        self.assertEqual(Voucher.objects.filter(name__startswith='Synthetic Coupon').count(), 20)
+
+        applications = VoucherApplication.objects.filter(order__in=orders)
+        self.assertTrue(applications.exists())
+        for application in applications.select_related('voucher'):
+            self.assertEqual(application.voucher.num_orders, 1)
+
+        refunds = Refund.objects.filter(order__in=orders)
+        self.assertTrue(refunds.exists())
+        for refund in refunds:
+            self.assertEqual(refund.lines.count(), 1)
+            self.assertEqual(PaymentEvent.objects.filter(order=refund.order, event_type__name='Refunded').count(), 1)
+
+        for order in orders.filter(total_incl_tax__gt=0):
+            self.assertEqual(order.lines.count(), 1)
+            self.assertEqual(order.sources.get().amount_debited, order.total_incl_tax)
+
+    def test_site_codes(self):
+        """ Verify the codes of the sites fit partner short codes, and are unique across seeds and indices. """
+        codes = [DatasetGenerator(seed=seed).site_code(index) for seed in range(10, 1000, 10) for index in range(100)]
+        self.assertTrue(all(len(code) <= 8 for code in codes))
+        self.assertEqual(len(set(codes)), len(codes))
+
+    def test_seed_reuse(self):
+        """ Verify a seed can only be used once. """
+        self.generate()
+        with self.assertRaises(CommandError):
+            self.generate()
@@ -0,0 +1,102 @@
+"""
+Tests for Django management command to run the benchmarks of the commerce hot paths.
+"""
+from __future__ import unicode_literals
+
+import json
+import sys
+import tempfile
+
+import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.benchmarks.base import find_regressions, percentile
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Category = get_model('catalogue', 'Category')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class RunBenchmarksTests(CouponMixin, DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(RunBenchmarksTests, self).setUp()
+        # The benchmarks rely on the categories created by the migrations, which may be disabled.
+        if not Category.objects.filter(name='Coupons').exists():
+            factories.CategoryFactory(name='Coupons')
+
+    def run_command(self, benchmarks=('coupon_report',), **kwargs):
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command(
+                'run_benchmarks', benchmarks=list(benchmarks), iterations=2, warmup=0, size=2, output=output.name,
+                **kwargs
+            )
+            return json.load(open(output.name))
+
+    def test_results(self):
+        """ Verify the results of the benchmarks are recorded, and the changes they made are rolled back. """
+        voucher_count = Voucher.objects.count()
+
+        report = self.run_command(label='abc123')
+
+        self.assertEqual(report['label'], 'abc123')
+        result = report['results']['coupon_report']
+        self.assertIsNone(result['error'])
+        self.assertEqual(result['iterations'], 2)
+        self.assertEqual(result['size'], 2)
+        self.assertIsNotNone(result['p50_ms'])
+        self.assertIsNotNone(result['p99_ms'])
+        self.assertEqual(Voucher.objects.count(), voucher_count)
+
+    def test_stubbed_services(self):
+        """ Verify the requests benchmarks make to the remote services are answered by the stubs. """
+        report = self.run_command(benchmarks=['fulfillment'])
+
+        result = report['results']['fulfillment']
+        self.assertIsNone(result['error'])
+        self.assertEqual(result['iterations'], 2)
+        self.assertGreater(result['http_requests_per_iteration'], 0)
+
+    def test_missing_test_requirements(self):
+        """ Verify the command fails, before running any benchmark, when httpretty is not installed. """
+        with mock.patch.dict(sys.modules, {'httpretty': None}):
+            with mock.patch('ecommerce.core.management.commands.run_benchmarks.run_benchmark') as mock_run:
+                with self.assertRaisesRegexp(CommandError, 'test requirements'):
+                    self.run_command()
+
+        self.assertFalse(mock_run.called)
+
+    def test_baseline_regression(self):
+        """ Verify the command fails when the results regressed compared to the baseline. """
+        baseline = {'results': {'coupon_report': {'size': 2, 'p50_ms': 0.0001, 'p99_ms': 0.0001}}}
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as baseline_file:
+            json.dump(baseline, baseline_file)
+            baseline_file.flush()
+
+            with self.assertRaises(CommandError):
+                self.run_command(baseline=baseline_file.name)
+
+    def test_find_regressions(self):
+        """ Verify only metrics slower than the threshold, for benchmarks of the same size, are reported. """
+        baseline = {
+            'a': {'size': 10, 'p50_ms': 10, 'p99_ms': 20},
+            'b': {'size': 10, 'p50_ms': 10, 'p99_ms': 20},
+        }
+        current = {
+            'a': {'size': 10, 'p50_ms': 10.5, 'p99_ms': 30},
+            'b': {'size': 100, 'p50_ms': 100, 'p99_ms': 200},
+            'c': {'size': 10, 'p50_ms': 100, 'p99_ms': 200},
+        }
+        self.assertEqual(find_regressions(baseline, current, 0.1), [('a', 'p99_ms', 20, 30)])
+
+    def test_percentile(self):
+        """ Verify percentiles are computed with the nearest-rank method. """
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.5), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([3], 0.99), 3)
+        self.assertIsNone(percentile([], 0.5))
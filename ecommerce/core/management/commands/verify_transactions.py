@@ -36,12 +36,12 @@ from django.db.models import Sum
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.lookups import payment_event_types
 from ecommerce.core.utils import use_read_replica_if_available
 
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 PaymentEventTypeName = get_class('order.constants', 'PaymentEventTypeName')
 
 DEFAULT_START_DELTA_TIME = 240
@@ -82,8 +82,8 @@ class Command(BaseCommand):
         self.MULTI_PAYMENT_ON_ORDER = []
         self.ORDER_PAYMENT_TOTALS_MISMATCH = []
         self.REFUND_AMOUNT_EXCEEDED = []
-        self.PAID_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.PAID)
-        self.REFUNDED_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.REFUNDED)
+        self.PAID_EVENT_TYPE = payment_event_types.get(PaymentEventTypeName.PAID)
+        self.REFUNDED_EVENT_TYPE = payment_event_types.get(PaymentEventTypeName.REFUNDED)
 
         start_delta = options['start_delta']
         end_delta = options['end_delta']
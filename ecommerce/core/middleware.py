@@ -0,0 +1,62 @@
+"""
+Middleware for the core app.
+"""
+from django.conf import settings
+
+from ecommerce.core.instrumentation import get_exporters, start_collecting, stop_collecting
+from ecommerce.core.sites import get_current_site
+
+METRIC_HEADERS = (
+    ('X-Ecommerce-Sql-Queries', 'sql_queries'),
+    ('X-Ecommerce-Sql-Time-Ms', 'sql_time_ms'),
+    ('X-Ecommerce-Cache-Hits', 'cache_hits'),
+    ('X-Ecommerce-Cache-Misses', 'cache_misses'),
+    ('X-Ecommerce-Http-Requests', 'http_requests'),
+    ('X-Ecommerce-Http-Time-Ms', 'http_time_ms'),
+)
+
+
+class RequestInstrumentationMiddleware(object):
+    """
+    Middleware that records the SQL queries, cache lookups and outbound HTTP requests made while handling a request.
+
+    The metrics are handed to the configured exporters, and added to the response headers
+    when PERFORMANCE_INSTRUMENTATION_HEADERS is enabled. This middleware should appear first,
+    so the work done by the other middleware is recorded too.
+    """
+
+    def __init__(self):
+        self.exporters = get_exporters()
+
+    def process_request(self, request):
+        request._instrumentation_metrics = start_collecting()  # pylint: disable=protected-access
+
+    def process_response(self, request, response):
+        metrics = getattr(request, '_instrumentation_metrics', None)
+        # process_request is skipped when a middleware listed before this one returns a response.
+        if metrics is None:
+            return response
+
+        stop_collecting(metrics)
+        values = metrics.as_dict()
+
+        if settings.PERFORMANCE_INSTRUMENTATION_HEADERS:
+            for header, key in METRIC_HEADERS:
+                response[header] = str(values[key])
+
+        for exporter in self.exporters:
+            exporter.export(request, response, metrics)
+
+        return response
+
+
+class CurrentSiteMiddleware(object):
+    """
+    Middleware that sets `site` attribute to request object.
+
+    Unlike django.contrib.sites.middleware.CurrentSiteMiddleware, the site is resolved, along with its
+    SiteConfiguration and Partner, from the process-level cache of ecommerce.core.sites.
+    """
+
+    def process_request(self, request):
+        request.site = get_current_site(request)
@@ -6,7 +6,6 @@ from urlparse import urljoin, urlsplit, urlunsplit
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.functional import cached_property
@@ -297,11 +296,6 @@ class SiteConfiguration(models.Model):
     def segment_client(self):
         return SegmentClient(self.segment_key, debug=settings.DEBUG, send=settings.SEND_SEGMENT_EVENTS)
 
-    def save(self, *args, **kwargs):
-        # Clear Site cache upon SiteConfiguration changed
-        Site.objects.clear_cache()
-        super(SiteConfiguration, self).save(*args, **kwargs)
-
     def build_ecommerce_url(self, path=''):
         """
         Returns path joined with the appropriate ecommerce URL root for the current site.
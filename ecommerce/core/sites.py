@@ -0,0 +1,130 @@
+"""
+Process-level cache of the sites served by this process, along with their configuration and partner.
+
+Every request resolves its Site, and usually the SiteConfiguration and Partner of that site. Each process
+keeps these rows, stamped with a version of the site held in the shared cache. Changing a site, its
+configuration or its partner replaces that version, so every process reloads that site, and only that site,
+the next time it is requested.
+"""
+from __future__ import unicode_literals
+
+import uuid
+
+from django.conf import settings
+from django.contrib.sites import models as sites_models
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http.request import split_domain_port
+from oscar.core.loading import get_model
+
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.core.utils import get_cache_key
+
+Partner = get_model('partner', 'Partner')
+Site = sites_models.Site
+
+# Cached sites, keyed by ID or domain. Each entry is a (version, site) tuple.
+_sites = {}
+
+
+def _get_version_key(site_id):
+    return get_cache_key(site_version_site_id=site_id)
+
+
+def get_site_version(site_id):
+    """Returns the current version of the site with the given ID, as recorded in the shared cache."""
+    key = _get_version_key(site_id)
+    version = cache.get(key)
+    if version is None:
+        # The version expired or was evicted. Any version recorded from now on is newer than the cached sites.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def _get_site(key, site_id=None, **lookup):
+    entry = _sites.get(key)
+    if entry:
+        version, site = entry
+        if version == get_site_version(site.id):
+            return site
+
+    if site_id is None:
+        site_id = Site.objects.filter(**lookup).values_list('id', flat=True).first()
+        if site_id is None:
+            raise Site.DoesNotExist
+
+    # The version is read before the site is loaded. If the site changes while it is loaded, the version
+    # changes too, so the stale entry is not used.
+    version = get_site_version(site_id)
+    site = Site.objects.select_related('siteconfiguration__partner').get(pk=site_id)
+    _sites[key] = (version, site)
+    return site
+
+
+def get_current_site(request):
+    """
+    Returns the Site of the request, with its SiteConfiguration and Partner.
+
+    The site is resolved like Site.objects.get_current, i.e. using the SITE_ID setting if it is set,
+    and the host of the request otherwise.
+
+    Raises:
+        Site.DoesNotExist: if there is no matching site.
+    """
+    site_id = getattr(settings, 'SITE_ID', '')
+    if site_id:
+        return _get_site(site_id, site_id=site_id)
+
+    host = request.get_host()
+    try:
+        # First attempt to look up the site by host with or without port.
+        return _get_site(host, domain__iexact=host)
+    except Site.DoesNotExist:
+        # Fallback to looking up site after stripping port from the host.
+        domain, __ = split_domain_port(host)
+        return _get_site(domain, domain__iexact=domain)
+
+
+def invalidate_site(site_id):
+    """
+    Drops the cached rows of the site with the given ID from every process.
+
+    The cached rows of this process are dropped immediately. Other processes reload the site once the
+    current transaction is committed, so they never cache rows that are about to change.
+    """
+    for key, (__, site) in list(_sites.items()):
+        if site.id == site_id:
+            _sites.pop(key, None)
+
+    # Django keeps its own cache of sites, used by Site.objects.get_current. Only this site is dropped from it.
+    for key, site in list(sites_models.SITE_CACHE.items()):
+        if site.id == site_id:
+            sites_models.SITE_CACHE.pop(key, None)
+
+    transaction.on_commit(lambda: cache.set(_get_version_key(site_id), uuid.uuid4().hex, None))
+
+
+def clear_sites():
+    """Drops all the cached sites of this process. Tests call this, since rolling back does not send signals."""
+    _sites.clear()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_on_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    invalidate_site(instance.id)
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def invalidate_site_on_configuration_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    invalidate_site(instance.site_id)
+
+
+@receiver(post_save, sender=Partner)
+def invalidate_sites_on_partner_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    for site_id in SiteConfiguration.objects.filter(partner=instance).values_list('site_id', flat=True):
+        invalidate_site(site_id)
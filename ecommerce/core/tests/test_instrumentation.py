@@ -0,0 +1,108 @@
+from __future__ import unicode_literals
+
+import httpretty
+import mock
+import requests
+from django.contrib.sites.models import Site
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from edx_django_utils.cache import TieredCache
+from testfixtures import LogCapture
+
+from ecommerce.core.instrumentation import LoggingExporter, collect_metrics
+from ecommerce.core.middleware import RequestInstrumentationMiddleware
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.core.instrumentation'
+
+
+class CollectMetricsTests(TestCase):
+    def test_sql_queries(self):
+        """ Verify SQL queries are counted. """
+        with collect_metrics() as metrics:
+            list(Site.objects.all())
+            list(Site.objects.all())
+
+        self.assertEqual(metrics.sql_queries, 2)
+
+    def test_cache_lookups(self):
+        """ Verify TieredCache hits and misses are counted. """
+        TieredCache.set_all_tiers('instrumentation-key', 'value', 60)
+
+        with collect_metrics() as metrics:
+            TieredCache.get_cached_response('instrumentation-key')
+            TieredCache.get_cached_response('missing-key')
+
+        self.assertEqual(metrics.cache_hits, 1)
+        self.assertEqual(metrics.cache_misses, 1)
+
+    @httpretty.activate
+    def test_http_requests(self):
+        """ Verify outbound HTTP requests are counted per host. """
+        httpretty.register_uri(httpretty.GET, 'http://example.com/api/', body='{}')
+
+        with collect_metrics() as metrics:
+            requests.get('http://example.com/api/')
+
+        self.assertEqual(metrics.http_requests, 1)
+        self.assertEqual(metrics.http_requests_by_host, {'example.com': 1})
+
+    def test_nested_collectors(self):
+        """ Verify each collector records the whole of its block, and nothing is recorded outside of them. """
+        with collect_metrics() as outer:
+            list(Site.objects.all())
+            with collect_metrics() as inner:
+                list(Site.objects.all())
+
+        list(Site.objects.all())
+        self.assertEqual(outer.sql_queries, 2)
+        self.assertEqual(inner.sql_queries, 1)
+
+
+class RequestInstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        super(RequestInstrumentationMiddlewareTests, self).setUp()
+        self.request = RequestFactory().get('/test/')
+
+    def process(self, middleware):
+        middleware.process_request(self.request)
+        list(Site.objects.all())
+        return middleware.process_response(self.request, HttpResponse())
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_HEADERS=True, PERFORMANCE_INSTRUMENTATION_EXPORTERS=())
+    def test_headers(self):
+        """ Verify the metrics are added to the response headers when enabled. """
+        response = self.process(RequestInstrumentationMiddleware())
+        self.assertEqual(response['X-Ecommerce-Sql-Queries'], '1')
+        self.assertEqual(response['X-Ecommerce-Http-Requests'], '0')
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_HEADERS=False, PERFORMANCE_INSTRUMENTATION_EXPORTERS=())
+    def test_headers_disabled(self):
+        """ Verify the metrics are not added to the response headers when disabled. """
+        response = self.process(RequestInstrumentationMiddleware())
+        self.assertNotIn('X-Ecommerce-Sql-Queries', response)
+
+    @override_settings(
+        PERFORMANCE_INSTRUMENTATION_EXPORTERS=('ecommerce.core.instrumentation.LoggingExporter',)
+    )
+    def test_exporters(self):
+        """ Verify the metrics are handed to the configured exporters. """
+        middleware = RequestInstrumentationMiddleware()
+        self.assertIsInstance(middleware.exporters[0], LoggingExporter)
+
+        with LogCapture(LOGGER_NAME) as logger:
+            self.process(middleware)
+            message = logger.records[0].getMessage()
+
+        self.assertIn('path="/test/"', message)
+        self.assertIn('sql_queries="1"', message)
+        self.assertIn('status_code="200"', message)
+
+    def test_process_request_skipped(self):
+        """ Verify responses are returned untouched when process_request was not run. """
+        middleware = RequestInstrumentationMiddleware()
+        middleware.exporters = [mock.Mock()]
+        response = HttpResponse()
+
+        self.assertEqual(middleware.process_response(self.request, response), response)
+        self.assertFalse(middleware.exporters[0].export.called)
@@ -0,0 +1,53 @@
+from oscar.core.loading import get_model
+
+from ecommerce.core.lookups import basket_attribute_types
+from ecommerce.tests.testcases import TestCase
+
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+
+
+class LookupRegistryTests(TestCase):
+    def setUp(self):
+        super(LookupRegistryTests, self).setUp()
+        self.attribute_type = BasketAttributeType.objects.create(name='test-attribute')
+
+    def test_get(self):
+        """ Verify rows are only queried once. """
+        self.assertEqual(basket_attribute_types.get('test-attribute'), self.attribute_type)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(basket_attribute_types.get('test-attribute'), self.attribute_type)
+
+    def test_get_missing(self):
+        """ Verify missing rows raise DoesNotExist, or return None when using get_or_none. """
+        with self.assertRaises(BasketAttributeType.DoesNotExist):
+            basket_attribute_types.get('missing-attribute')
+
+        self.assertIsNone(basket_attribute_types.get_or_none('missing-attribute'))
+
+    def test_invalidation(self):
+        """ Verify saving or deleting a row drops the cached rows. """
+        basket_attribute_types.get('test-attribute')
+        self.attribute_type.save()
+
+        with self.assertNumQueries(1):
+            basket_attribute_types.get('test-attribute')
+
+        self.attribute_type.delete()
+        with self.assertRaises(BasketAttributeType.DoesNotExist):
+            basket_attribute_types.get('test-attribute')
+
+    def test_get_or_create(self):
+        """ Verify existing rows are cached, and created rows are not cached until their transaction commits. """
+        attribute_type, created = basket_attribute_types.get_or_create('test-attribute')
+        self.assertEqual(attribute_type, self.attribute_type)
+        self.assertFalse(created)
+
+        __, created = basket_attribute_types.get_or_create('new-attribute')
+        self.assertTrue(created)
+
+        # The test transaction is never committed.
+        with self.assertNumQueries(1):
+            basket_attribute_types.get('new-attribute')
+        with self.assertNumQueries(0):
+            basket_attribute_types.get('test-attribute')
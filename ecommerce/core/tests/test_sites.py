@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.client import RequestFactory
+
+from ecommerce.core.middleware import CurrentSiteMiddleware
+from ecommerce.core.sites import _get_version_key, get_current_site
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(SITE_ID=None)
+class CurrentSiteTests(TestCase):
+    def setUp(self):
+        super(CurrentSiteTests, self).setUp()
+        self.other_site_configuration = SiteConfigurationFactory(site__domain='other.fake')
+
+    def get_request(self, domain):
+        return RequestFactory(SERVER_NAME=domain).get('')
+
+    def assert_site_cached(self, domain):
+        with self.assertNumQueries(0):
+            site = get_current_site(self.get_request(domain))
+            self.assertEqual(site.domain, domain)
+            self.assertIsNotNone(site.siteconfiguration.partner)
+        return site
+
+    def test_get_current_site(self):
+        """ Verify the site, its configuration and partner are only queried when the site is first requested. """
+        with self.assertNumQueries(2):
+            site = get_current_site(self.get_request(self.site.domain))
+
+        self.assertEqual(site, self.site)
+        self.assertEqual(site.siteconfiguration, self.site_configuration)
+        self.assertEqual(site.siteconfiguration.partner, self.partner)
+        self.assert_site_cached(self.site.domain)
+
+    def test_get_current_site_with_port(self):
+        """ Verify the site is found when the host includes a port absent from the domain. """
+        site = get_current_site(self.get_request('{}:8002'.format(self.site.domain)))
+        self.assertEqual(site, self.site)
+
+    @override_settings(SITE_ID=1)
+    def test_get_current_site_by_id(self):
+        """ Verify the site is looked up by ID when SITE_ID is set. """
+        self.assertEqual(get_current_site(self.get_request('unknown.fake')).id, 1)
+
+    def test_configuration_change(self):
+        """ Verify changing the configuration of a site only drops that site. """
+        get_current_site(self.get_request(self.site.domain))
+        get_current_site(self.get_request('other.fake'))
+
+        self.site_configuration.from_email = 'changed@example.com'
+        self.site_configuration.save()
+
+        site = get_current_site(self.get_request(self.site.domain))
+        self.assertEqual(site.siteconfiguration.from_email, 'changed@example.com')
+        self.assert_site_cached('other.fake')
+
+    def test_partner_change(self):
+        """ Verify changing a partner drops the sites it is configured for. """
+        get_current_site(self.get_request(self.site.domain))
+
+        self.partner.name = 'Changed'
+        self.partner.save()
+
+        site = get_current_site(self.get_request(self.site.domain))
+        self.assertEqual(site.siteconfiguration.partner.name, 'Changed')
+
+    def test_version_change(self):
+        """ Verify a site is reloaded once another process changes its version. """
+        get_current_site(self.get_request(self.site.domain))
+        cache.set(_get_version_key(self.site.id), 'changed-by-another-process', None)
+
+        with self.assertNumQueries(2):
+            get_current_site(self.get_request(self.site.domain))
+
+    def test_middleware(self):
+        """ Verify the middleware sets the site of the request. """
+        request = self.get_request(self.site.domain)
+        CurrentSiteMiddleware().process_request(request)
+        self.assertEqual(request.site, self.site)
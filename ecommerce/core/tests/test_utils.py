@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+
+import ddt
+import mock
+from slumber.exceptions import HttpClientError
+
+from ecommerce.core.utils import iterate_pages, traverse_pagination
+from ecommerce.tests.testcases import TestCase
+
+PAGE_SIZE = 3
+
+
+class FakeEndpoint(object):
+    """ Serves the items as pages, numbered or bounded by offset and limit, like DRF-powered APIs. """
+
+    def __init__(self, items, offset_pagination=False):
+        self.items = items
+        self.offset_pagination = offset_pagination
+        self.requests = []
+
+    def get(self, **querystring):
+        self.requests.append(querystring)
+        if self.offset_pagination:
+            offset = int(querystring.get('offset', ['0'])[0])
+            next_page = 'http://api/items/?limit={}&offset={}'.format(PAGE_SIZE, offset + PAGE_SIZE)
+        else:
+            offset = (int(querystring.get('page', ['1'])[0]) - 1) * PAGE_SIZE
+            next_page = 'http://api/items/?page={}'.format(offset // PAGE_SIZE + 2)
+
+        return {
+            'count': len(self.items),
+            'results': self.items[offset:offset + PAGE_SIZE],
+            'next': next_page if offset + PAGE_SIZE < len(self.items) else None,
+        }
+
+
+@ddt.ddt
+class PaginationTests(TestCase):
+    items = list(range(10))
+
+    @ddt.data(
+        (1, False),
+        (1, True),
+        (2, False),
+        (2, True),
+        (8, False),
+    )
+    @ddt.unpack
+    def test_iterate_pages(self, concurrency, offset_pagination):
+        """ Verify the results of every page are yielded in order, whether or not the pages are requested at once. """
+        endpoint = FakeEndpoint(self.items, offset_pagination)
+        pages = list(iterate_pages(endpoint.get(), endpoint, concurrency=concurrency))
+
+        self.assertEqual(pages, [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]])
+        self.assertEqual(len(endpoint.requests), 4)
+
+    def test_iterate_pages_lazily(self):
+        """ Verify pages are only requested as they are iterated over. """
+        endpoint = FakeEndpoint(self.items)
+        pages = iterate_pages(endpoint.get(), endpoint, concurrency=1)
+
+        self.assertEqual(next(pages), [0, 1, 2])
+        self.assertEqual(next(pages), [3, 4, 5])
+        self.assertEqual(len(endpoint.requests), 2)
+
+    def test_traverse_pagination(self):
+        """ Verify the results of every page are returned. """
+        endpoint = FakeEndpoint(self.items)
+        self.assertEqual(traverse_pagination(endpoint.get(), endpoint), self.items)
+
+    def test_rate_limited(self):
+        """ Verify pages are requested again after the API responds that too many requests were made. """
+        endpoint = mock.Mock()
+        endpoint.get.side_effect = [
+            HttpClientError(response=mock.Mock(status_code=429, headers={'Retry-After': '2'})),
+            {'count': 4, 'results': [3], 'next': None},
+        ]
+        response = {'count': 4, 'results': [0, 1, 2], 'next': 'http://api/items/?page=2'}
+
+        with mock.patch('time.sleep') as mock_sleep:
+            pages = list(iterate_pages(response, endpoint, concurrency=1))
+
+        self.assertEqual(pages, [[0, 1, 2], [3]])
+        self.assertEqual(endpoint.get.call_count, 2)
+        mock_sleep.assert_any_call(2.0)
+
+    def test_client_error(self):
+        """ Verify client errors other than rate limiting are raised. """
+        endpoint = mock.Mock()
+        endpoint.get.side_effect = HttpClientError(response=mock.Mock(status_code=404, headers={}))
+        with self.assertRaises(HttpClientError):
+            traverse_pagination({'results': [0], 'next': 'http://api/items/?page=2'}, endpoint)
+        self.assertEqual(endpoint.get.call_count, 1)
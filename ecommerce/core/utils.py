@@ -2,15 +2,25 @@ from __future__ import unicode_literals
 
 import hashlib
 import logging
+import math
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 from urlparse import parse_qs, urlparse
 
 import six
 import waffle
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from slumber.exceptions import HttpClientError
 
 logger = logging.getLogger(__name__)
 
+# Number of times a page is requested again after the API responds that too many requests were made.
+MAX_PAGE_RETRIES = 3
+# Seconds waited before requesting a page again, if the API does not say how long to wait.
+DEFAULT_RETRY_AFTER = 1
+
 
 def log_message_and_raise_validation_error(message):
     """
@@ -87,6 +97,138 @@ def deprecated_traverse_pagination(response, endpoint):
     return results
 
 
+class RateLimiter(object):
+    """ Spaces out calls, made from any number of threads, to at most the given number per second. """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_call = 0
+
+    def wait(self):
+        with self.lock:
+            now = time.time()
+            call = max(now, self.next_call)
+            self.next_call = call + self.interval
+
+        if call > now:
+            time.sleep(call - now)
+
+
+def _get_page(endpoint, querystring, rate_limiter):
+    """ Requests a page, waiting and requesting it again whenever the API responds that it is rate limited. """
+    for attempt in range(MAX_PAGE_RETRIES + 1):
+        rate_limiter.wait()
+        try:
+            return endpoint.get(**querystring)
+        except HttpClientError as exc:
+            response = getattr(exc, 'response', None)
+            if response is None or response.status_code != 429 or attempt == MAX_PAGE_RETRIES:
+                raise
+
+            try:
+                retry_after = float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                retry_after = DEFAULT_RETRY_AFTER
+            logger.warning('Rate limited while traversing pages, retrying in %s seconds.', retry_after)
+            time.sleep(retry_after)
+
+
+def _get_page_querystrings(response, querystring):
+    """
+    Returns the query strings of every remaining page, given the first page and the query string of the second one,
+    or None if the pages cannot be told from them.
+    """
+    count = response.get('count')
+    page_size = len(response.get('results', []))
+    if not count or not page_size:
+        return None
+
+    querystrings = []
+    if 'page' in querystring:
+        try:
+            first = int(querystring['page'][0])
+        except ValueError:
+            return None
+        num_pages = response.get('num_pages') or int(math.ceil(count / float(page_size)))
+        for page in range(first, num_pages + 1):
+            querystrings.append(dict(querystring, page=[six.text_type(page)]))
+    elif 'offset' in querystring and 'limit' in querystring:
+        try:
+            first, limit = int(querystring['offset'][0]), int(querystring['limit'][0])
+        except ValueError:
+            return None
+        for offset in range(first, count, limit):
+            querystrings.append(dict(querystring, offset=[six.text_type(offset)]))
+    else:
+        return None
+
+    return querystrings
+
+
+def iterate_pages(response, endpoint, concurrency=None, rate_limit=None):
+    """
+    Traverse a paginated API response, yielding the "results" (list of dict) of each page in turn.
+
+    Pages are followed through their "next" links one at a time, or, given a concurrency, requested that many at
+    once if the total count of results tells which pages remain. Only that many pages are held at once.
+
+    Arguments:
+        response (Dict): Current response dict from service API
+        endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        concurrency (int): Maximum number of pages requested at once. Defaults to settings.PAGINATION_CONCURRENCY.
+        rate_limit (int): Maximum number of pages requested per second. Defaults to settings.PAGINATION_RATE_LIMIT.
+
+    Yields:
+        list of dict.
+    """
+    concurrency = concurrency or settings.PAGINATION_CONCURRENCY
+    rate_limiter = RateLimiter(rate_limit or settings.PAGINATION_RATE_LIMIT)
+
+    yield response.get('results', [])
+
+    next_page = response.get('next')
+    if not next_page:
+        return
+
+    querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
+    querystrings = _get_page_querystrings(response, querystring) if concurrency > 1 else None
+    if querystrings:
+        pool = ThreadPool(min(concurrency, len(querystrings)))
+        try:
+            for start in range(0, len(querystrings), concurrency):
+                for page in pool.map(
+                        lambda qs: _get_page(endpoint, qs, rate_limiter), querystrings[start:start + concurrency]
+                ):
+                    yield page.get('results', [])
+        finally:
+            pool.close()
+            pool.join()
+        return
+
+    while next_page:
+        response = _get_page(endpoint, querystring, rate_limiter)
+        yield response.get('results', [])
+        next_page = response.get('next')
+        if next_page:
+            querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
+
+
+def traverse_pagination(response, endpoint, concurrency=None, rate_limit=None):
+    """
+    Traverse a paginated API response, returning the "results" (list of dict) of every page.
+
+    See iterate_pages for the arguments. Prefer iterating over the pages if the results need not be held at once.
+
+    Returns:
+        list of dict.
+    """
+    results = []
+    for page in iterate_pages(response, endpoint, concurrency, rate_limit):
+        results.extend(page)
+    return results
+
+
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
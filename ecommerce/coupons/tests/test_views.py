@@ -26,7 +26,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.test.factories import prepare_voucher
-from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin
+from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin, PerformanceBudgetMixin
 from ecommerce.tests.testcases import TestCase
 
 Applicator = get_class('offer.applicator', 'Applicator')
@@ -299,7 +299,7 @@ class CouponOfferViewTests(ApiMockMixin, CouponMixin, DiscoveryTestMixin, Enterp
 
 @ddt.ddt
 class CouponRedeemViewTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, EnterpriseServiceMockMixin,
-                            TestCase, DiscoveryMockMixin):
+                            PerformanceBudgetMixin, TestCase, DiscoveryMockMixin):
     redeem_url = reverse('coupons:redeem')
 
     def setUp(self):
@@ -397,6 +397,14 @@ class CouponRedeemViewTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, En
         msg = 'No voucher found with code {code}'.format(code=code)
         self.assertEqual(response.context['error'], msg)
 
+    def test_invalid_voucher_code_budget(self):
+        """ Verify invalid codes are rejected without outbound HTTP requests. """
+        url = format_url(base=self.redeem_url, params={'code': 'INVALID', 'sku': self.stock_record.partner_sku})
+
+        with self.assert_budget(max_queries=20, max_http_requests=0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
     def test_no_product(self):
         """ Verify an error is returned when a stock record for the provided SKU doesn't exist. """
         self.create_coupon_and_get_code(catalog=self.catalog)
@@ -35,7 +35,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.offer.utils import render_email_confirmation_if_required
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
-from ecommerce.extensions.voucher.utils import get_voucher_and_products_from_code
+from ecommerce.extensions.voucher.utils import get_cached_voucher, get_voucher_and_products_from_code
 
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
@@ -162,7 +162,7 @@ class CouponRedeemView(EdxOrderPlacementMixin, View):
             return render(request, template_name, {'error': _('SKU not provided.')})
 
         try:
-            voucher = Voucher.objects.get(code=code)
+            voucher = get_cached_voucher(code)
         except Voucher.DoesNotExist:
             msg = 'No voucher found with code {code}'.format(code=code)
             return render(request, template_name, {'error': _(msg)})
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, CoursePublication
 
 
 class CourseAdmin(admin.ModelAdmin):
@@ -9,4 +9,12 @@ class CourseAdmin(admin.ModelAdmin):
     list_filter = ('partner', )
 
 
+class CoursePublicationAdmin(admin.ModelAdmin):
+    list_display = ('course', 'status', 'attempts', 'next_attempt', 'created', 'modified',)
+    search_fields = ('course__id', )
+    list_filter = ('status', )
+    raw_id_fields = ('course', )
+
+
 admin.site.register(Course, CourseAdmin)
+admin.site.register(CoursePublication, CoursePublicationAdmin)
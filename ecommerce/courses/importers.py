@@ -0,0 +1,448 @@
+"""Bulk creation of course seats, enrollment codes and their stock records."""
+from __future__ import unicode_literals
+
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from oscar.core.loading import get_model
+from oscar.core.utils import slugify
+
+from ecommerce.core.constants import (
+    ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
+    ENROLLMENT_CODE_SEAT_TYPES,
+    SEAT_PRODUCT_CLASS_NAME
+)
+from ecommerce.core.lookups import product_classes
+from ecommerce.courses.models import Course
+from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.extensions.catalogue.models import ATTRIBUTE_SNAPSHOT_FIELDS
+from ecommerce.extensions.catalogue.utils import generate_sku
+
+logger = logging.getLogger(__name__)
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductAttribute = get_model('catalogue', 'ProductAttribute')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+class BulkCourseImporter(object):
+    """ Creates or updates the seats and enrollment codes of many courses using set-based queries.
+
+    Existing courses, products and stock records are resolved with a constant number of queries per batch,
+    and missing ones are inserted with bulk_create, along with their attribute values. Only rows whose data
+    has changed are updated individually. Unlike Course.create_or_update_seat, stale professional seats are
+    not removed.
+
+    Courses are described by dicts with the following keys:
+        id (str): Course ID.
+        name (str): Course name.
+        verification_deadline (datetime): Optional verification deadline.
+        seats (list): Dicts with the certificate_type, id_verification_required and price of each seat, and
+            optionally its expires, credit_provider and credit_hours.
+        create_enrollment_code (bool): Whether an enrollment code is created for the course's eligible seat.
+    """
+
+    def __init__(self, partner=None, batch_size=100):
+        # Partner of the courses created by the importer. Existing courses keep their partner.
+        self.partner = partner
+        self.batch_size = batch_size
+        self.seat_class = product_classes.get(SEAT_PRODUCT_CLASS_NAME)
+        self.enrollment_code_class = product_classes.get(ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        self.seat_attributes = {
+            attribute.code: attribute for attribute in ProductAttribute.objects.filter(product_class=self.seat_class)
+        }
+        self.enrollment_code_attributes = {
+            attribute.code: attribute
+            for attribute in ProductAttribute.objects.filter(product_class=self.enrollment_code_class)
+        }
+
+    def import_courses(self, specs, publish=False, concurrency=1):
+        """ Import courses in batches, each batch in its own transaction, logging progress and throughput.
+
+        Arguments:
+            specs (list): Course dicts, as described in the class docstring.
+            publish (bool): Whether each batch is published to the LMS once saved.
+            concurrency (int): Maximum number of courses published simultaneously.
+
+        Returns:
+            dict: Publication error messages, keyed by course ID.
+        """
+        publisher = LMSPublisher()
+        errors = {}
+        total = len(specs)
+        start_time = time.time()
+
+        for index in range(0, total, self.batch_size):
+            with transaction.atomic():
+                courses = self.import_batch(specs[index:index + self.batch_size])
+
+            if publish:
+                for course, error in publisher.publish_many(courses, concurrency=concurrency):
+                    if error:
+                        errors[course.id] = error
+
+            imported = min(index + self.batch_size, total)
+            elapsed = max(time.time() - start_time, 0.001)
+            logger.info(
+                'Imported [%d/%d] courses ([%.1f] courses per second).', imported, total, imported / elapsed
+            )
+
+        return errors
+
+    def import_batch(self, specs):
+        """ Create or update a batch of courses, with their seats and enrollment codes.
+
+        Returns:
+            list: The imported courses.
+        """
+        courses = self._get_or_create_courses(specs)
+        parents = self._get_or_create_parent_seats(courses.values())
+        seats = self._create_or_update_seats(specs, courses, parents)
+
+        enrollment_codes = []
+        for spec in specs:
+            if not spec.get('create_enrollment_code'):
+                continue
+
+            eligible_seats = [
+                seat_spec for seat_spec in spec['seats']
+                if seat_spec['certificate_type'].lower() in ENROLLMENT_CODE_SEAT_TYPES
+            ]
+            if eligible_seats:
+                # Only one enrollment code exists per course, so the last eligible seat wins, as it does when
+                # seats are created one at a time.
+                seat_spec = eligible_seats[-1]
+                enrollment_codes.append({
+                    'course': courses[spec['id']],
+                    'seat_type': seat_spec['certificate_type'].lower(),
+                    'id_verification_required': seat_spec['id_verification_required'],
+                    'price': seat_spec['price'],
+                    'expires': seat_spec.get('expires'),
+                })
+
+        self.create_or_update_enrollment_codes(enrollment_codes)
+        logger.debug('Imported [%d] courses with [%d] seats.', len(courses), len(seats))
+        return [courses[spec['id']] for spec in specs]
+
+    def get_seats_by_course(self, course_ids):
+        """ Returns the seats of the given courses, with their attributes and stock records prefetched.
+
+        Returns:
+            dict: Lists of (seat, attribute values dict) tuples, keyed by course ID.
+        """
+        seats = Product.objects.filter(
+            course_id__in=course_ids,
+            structure=Product.CHILD,
+            parent__product_class=self.seat_class
+        ).select_related('parent__product_class').prefetch_related(
+            Prefetch('attribute_values', queryset=ProductAttributeValue.objects.select_related('attribute')),
+            'stockrecords'
+        )
+
+        seats_by_course = {}
+        for seat in seats:
+            seats_by_course.setdefault(seat.course_id, []).append((seat, self._populate_attributes(seat)))
+        return seats_by_course
+
+    def create_or_update_enrollment_codes(self, entries):
+        """ Create or update the enrollment codes, and their stock records, of several courses.
+
+        Arguments:
+            entries (list): Dicts with the course, seat_type, id_verification_required, price and
+                expires of each enrollment code.
+
+        Returns:
+            list: The enrollment codes which were created.
+        """
+        if not entries:
+            return []
+
+        existing = {
+            enrollment_code.course_id: enrollment_code
+            for enrollment_code in Product.objects.filter(
+                product_class=self.enrollment_code_class,
+                course_id__in=[entry['course'].id for entry in entries]
+            ).select_related('product_class').prefetch_related(
+                Prefetch('attribute_values', queryset=ProductAttributeValue.objects.select_related('attribute')),
+                'stockrecords'
+            )
+        }
+
+        created = []
+        prices = []
+        for entry in entries:
+            course = entry['course']
+            attributes = {
+                'course_key': course.id,
+                'seat_type': entry['seat_type'],
+                'id_verification_required': entry['id_verification_required'],
+            }
+            enrollment_code = existing.get(course.id)
+            if enrollment_code is None:
+                title = 'Enrollment code for {seat_type} seat in {course_name}'.format(
+                    seat_type=entry['seat_type'],
+                    course_name=course.name
+                )
+                enrollment_code = Product(
+                    title=title,
+                    slug=slugify(title),
+                    product_class=self.enrollment_code_class,
+                    course=course,
+                    expires=entry['expires']
+                )
+                created.append((enrollment_code, attributes))
+                prices.append((enrollment_code, course.partner, entry['price'], True))
+            else:
+                self._update_attributes(
+                    enrollment_code, self._populate_attributes(enrollment_code), attributes,
+                    self.enrollment_code_attributes
+                )
+                prices.append((enrollment_code, course.partner, entry['price'], False))
+
+        self._bulk_create_products(created)
+        self._bulk_create_attribute_values(created, self.enrollment_code_attributes)
+        self._create_or_update_stock_records(prices)
+        return [enrollment_code for enrollment_code, __ in created]
+
+    def _get_or_create_courses(self, specs):
+        """ Returns the courses described by the specs, keyed by ID, creating missing ones. """
+        courses = Course.objects.select_related('partner').in_bulk([spec['id'] for spec in specs])
+        new_courses = []
+
+        for spec in specs:
+            course = courses.get(spec['id'])
+            verification_deadline = spec.get('verification_deadline')
+            if course is None:
+                course = Course(
+                    id=spec['id'],
+                    name=spec['name'],
+                    verification_deadline=verification_deadline,
+                    partner=self.partner
+                )
+                courses[course.id] = course
+                new_courses.append(course)
+            elif course.name != spec['name'] or course.verification_deadline != verification_deadline:
+                course.name = spec['name']
+                course.verification_deadline = verification_deadline
+                # Saving through the model keeps the parent seat's title in sync with the course name.
+                course.save()
+
+        # Course IDs are primary keys, so the inserted rows need not be retrieved again.
+        Course.objects.bulk_create(new_courses)
+        return courses
+
+    def _get_or_create_parent_seats(self, courses):
+        """ Returns the parent seat product of each course, keyed by course ID, creating missing ones. """
+        parents = {
+            parent.course_id: parent
+            for parent in Product.objects.filter(
+                course_id__in=[course.id for course in courses],
+                structure=Product.PARENT,
+                product_class=self.seat_class
+            ).select_related('product_class')
+        }
+
+        new_parents = []
+        for course in courses:
+            if course.id not in parents:
+                title = 'Seat in {}'.format(course.name)
+                parent = Product(
+                    course=course,
+                    structure=Product.PARENT,
+                    product_class=self.seat_class,
+                    title=title,
+                    slug=slugify(title),
+                    is_discountable=True
+                )
+                parents[course.id] = parent
+                new_parents.append((parent, {'course_key': course.id}))
+
+        if new_parents:
+            category = Category.objects.get(name='Seats')
+            self._bulk_create_products(new_parents)
+            ProductCategory.objects.bulk_create(
+                [ProductCategory(product=parent, category=category) for parent, __ in new_parents]
+            )
+            self._bulk_create_attribute_values(new_parents, self.seat_attributes)
+
+        return parents
+
+    def _create_or_update_seats(self, specs, courses, parents):
+        """ Create or update the seats described by the specs.
+
+        Returns:
+            list: The seats, created or existing.
+        """
+        existing = {}
+        for course_id, seats in self.get_seats_by_course(courses.keys()).items():
+            for seat, values in seats:
+                key = (
+                    course_id,
+                    values.get('certificate_type', ''),
+                    bool(values.get('id_verification_required')),
+                    values.get('credit_provider')
+                )
+                existing[key] = (seat, values)
+
+        new_seats = []
+        new_keys = set()
+        prices = []
+        for spec in specs:
+            course = courses[spec['id']]
+            for seat_spec in spec['seats']:
+                certificate_type = seat_spec['certificate_type'].lower()
+                id_verification_required = seat_spec['id_verification_required']
+                credit_provider = seat_spec.get('credit_provider')
+                expires = seat_spec.get('expires')
+                title = course.get_course_seat_name(certificate_type, id_verification_required)
+
+                # If a ProductAttribute is saved with a value of None or the empty string, the ProductAttribute is
+                # deleted. As a consequence, "audit" seats do not have a certificate_type attribute.
+                attributes = {'course_key': course.id, 'id_verification_required': id_verification_required}
+                if certificate_type:
+                    attributes['certificate_type'] = certificate_type
+                if credit_provider:
+                    attributes['credit_provider'] = credit_provider
+                if seat_spec.get('credit_hours'):
+                    attributes['credit_hours'] = seat_spec['credit_hours']
+
+                key = (course.id, certificate_type, bool(id_verification_required), credit_provider)
+                if key in existing:
+                    seat, values = existing.pop(key)
+                    if seat.title != title or seat.expires != expires:
+                        seat.title = title
+                        seat.expires = expires
+                        # Saving through the model propagates expiration changes to the enrollment code.
+                        seat.save()
+                    self._update_attributes(seat, values, attributes, self.seat_attributes)
+                    prices.append((seat, course.partner, seat_spec['price'], False))
+                elif key not in new_keys:
+                    seat = Product(
+                        course=course,
+                        structure=Product.CHILD,
+                        parent=parents[course.id],
+                        is_discountable=True,
+                        title=title,
+                        slug=slugify(title),
+                        expires=expires
+                    )
+                    new_seats.append((seat, attributes))
+                    new_keys.add(key)
+                    prices.append((seat, course.partner, seat_spec['price'], True))
+
+        self._bulk_create_products(new_seats)
+        self._bulk_create_attribute_values(new_seats, self.seat_attributes)
+        self._create_or_update_stock_records(prices)
+        return [seat for seat, __, __, __ in prices]
+
+    def _create_or_update_stock_records(self, prices):
+        """ Create or update the stock records of the given products.
+
+        Arguments:
+            prices (list): (product, partner, price, created) tuples. Products which were not created by this
+                importer must have their stock records prefetched.
+        """
+        new_stock_records = []
+        for product, partner, price, created in prices:
+            stock_records = [] if created else [
+                stock_record for stock_record in product.stockrecords.all() if stock_record.partner_id == partner.id
+            ]
+
+            if stock_records:
+                stock_record = stock_records[0]
+                if stock_record.price_excl_tax != price or \
+                        stock_record.price_currency != settings.OSCAR_DEFAULT_CURRENCY:
+                    stock_record.price_excl_tax = price
+                    stock_record.price_currency = settings.OSCAR_DEFAULT_CURRENCY
+                    stock_record.save()
+            else:
+                new_stock_records.append(StockRecord(
+                    product=product,
+                    partner=partner,
+                    partner_sku=generate_sku(product, partner),
+                    price_excl_tax=price,
+                    price_currency=settings.OSCAR_DEFAULT_CURRENCY
+                ))
+
+        StockRecord.objects.bulk_create(new_stock_records)
+
+    def _bulk_create_products(self, entries):
+        """ Insert products with a single query, and set their primary keys.
+
+        Arguments:
+            entries (list): (product, attribute values dict) tuples.
+        """
+        if not entries:
+            return
+
+        products = []
+        for product, attributes in entries:
+            # Signals are not sent for bulk inserts, so the attribute snapshot is filled in here.
+            for code, value in attributes.items():
+                if code in ATTRIBUTE_SNAPSHOT_FIELDS:
+                    setattr(product, ATTRIBUTE_SNAPSHOT_FIELDS[code], value)
+            products.append(product)
+
+        if connection.features.can_return_ids_from_bulk_insert:
+            Product.objects.bulk_create(products)
+            return
+
+        # Other backends do not report the primary keys of inserted rows. Each row is tagged with a
+        # temporary value of the unique UPC column, which is used to retrieve its key and cleared afterwards.
+        tagged = {}
+        for product in products:
+            product.upc = 'bulk-import-{}'.format(uuid.uuid4().hex)
+            tagged[product.upc] = product
+
+        Product.objects.bulk_create(products)
+        for pk, upc in Product.objects.filter(upc__in=tagged.keys()).values_list('pk', 'upc'):
+            tagged[upc].pk = pk
+            tagged[upc].upc = None
+        Product.objects.filter(upc__in=tagged.keys()).update(upc=None)
+
+    def _bulk_create_attribute_values(self, entries, attribute_definitions):
+        """ Insert the attribute values of newly created products with a single query.
+
+        Arguments:
+            entries (list): (product, attribute values dict) tuples.
+            attribute_definitions (dict): ProductAttributes of the products' class, keyed by code.
+        """
+        attribute_values = []
+        for product, attributes in entries:
+            for code, value in attributes.items():
+                attribute_value = ProductAttributeValue(attribute=attribute_definitions[code], product=product)
+                attribute_value.value = value
+                attribute_values.append(attribute_value)
+                setattr(product.attr, code, value)
+            # The product has no other attribute values, so there is no need to load them from the database.
+            product.attr.initialised = True
+
+        ProductAttributeValue.objects.bulk_create(attribute_values)
+
+    def _populate_attributes(self, product):
+        """ Load a product's prefetched attribute values into its attribute container.
+
+        Returns:
+            dict: Attribute values, keyed by code.
+        """
+        values = {
+            attribute_value.attribute.code: attribute_value.value
+            for attribute_value in product.attribute_values.all()
+        }
+        for code, value in values.items():
+            setattr(product.attr, code, value)
+        product.attr.initialised = True
+        return values
+
+    def _update_attributes(self, product, values, attributes, attribute_definitions):
+        """ Save the attribute values of an existing product which differ from the stored ones. """
+        for code, value in attributes.items():
+            if values.get(code) != value:
+                attribute_definitions[code].save_value(product, value)
+                setattr(product.attr, code, value)
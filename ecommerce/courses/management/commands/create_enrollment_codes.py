@@ -5,13 +5,18 @@ from __future__ import unicode_literals
 
 import logging
 import os
+import time
 
 from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from oscar.core.loading import get_model
 
-from ecommerce.core.constants import ENROLLMENT_CODE_SEAT_TYPES
+from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, ENROLLMENT_CODE_SEAT_TYPES
+from ecommerce.courses.importers import BulkCourseImporter
 from ecommerce.courses.models import Course
 
 logger = logging.getLogger(__name__)
+Product = get_model('catalogue', 'Product')
 
 
 class CourseInfoError(Exception):
@@ -45,15 +50,30 @@ class Command(BaseCommand):
             help='Number of courses in each batch of enrollment code creation.',
             type=int,
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            dest='bulk',
+            default=False,
+            help='Resolve the seats and create the enrollment codes of each batch of courses with set-based queries.',
+        )
 
     def handle(self, *args, **options):
         course_ids_file = options['course_ids_file']
         batch_limit = options['batch_limit']
 
-        if course_ids_file:
-            if not os.path.exists(course_ids_file):
-                raise CommandError('Pass the correct absolute path to course ids file as --course_ids_file argument.')
+        if course_ids_file and not os.path.exists(course_ids_file):
+            raise CommandError('Pass the correct absolute path to course ids file as --course_ids_file argument.')
 
+        if options['bulk']:
+            if course_ids_file:
+                with open(course_ids_file, 'r') as file_handler:
+                    course_ids = [course_id.strip() for course_id in file_handler.readlines()]
+            else:
+                course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+
+            total_courses, failed_courses = self._generate_enrollment_codes_in_bulk(course_ids, batch_limit)
+        elif course_ids_file:
             total_courses, failed_courses = self._generate_enrollment_codes_from_file(course_ids_file)
         else:
             total_courses, failed_courses = self._generate_enrollment_codes_from_db(batch_limit)
@@ -136,6 +156,101 @@ class Command(BaseCommand):
                     failed_courses.append(course.id)
         return total_courses, failed_courses
 
+    def _generate_enrollment_codes_in_bulk(self, course_ids, batch_limit):
+        """
+        Generate enrollment codes for the given courses, resolving seats and existing enrollment codes and
+        creating the missing ones with a constant number of queries per batch.
+
+        Arguments:
+            course_ids (list): ids of the courses to process.
+            batch_limit (int): How many courses to process in each batch.
+
+        Returns:
+            (total_course, failed_course): a tuple containing count of course processed and a list containing ids of
+                courses whose enrollment codes could not be generated.
+        """
+        failed_courses = []
+        total_courses = len(course_ids)
+        importer = BulkCourseImporter()
+        start_time = time.time()
+
+        for index in range(0, total_courses, batch_limit):
+            batch = course_ids[index:index + batch_limit]
+            logger.info('Creating enrollment code for %d courses.', len(batch))
+            courses = Course.objects.select_related('partner').in_bulk(batch)
+            seats_by_course = importer.get_seats_by_course(courses.keys())
+            courses_with_enrollment_codes = set(
+                Product.objects.filter(
+                    product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
+                    course_id__in=courses.keys()
+                ).values_list('course_id', flat=True)
+            )
+
+            entries = []
+            for course_id in batch:
+                course = courses.get(course_id)
+                if course is None:
+                    failed_courses.append(course_id)
+                    logger.error('Failed to generate enrollment codes for "%s": Course does not exist.', course_id)
+                    continue
+
+                seats = seats_by_course.get(course_id, [])
+                seat_types = [values.get('certificate_type', '').lower() for __, values in seats]
+                eligible_seats = [
+                    (seat, values) for seat, values in seats
+                    if values.get('certificate_type', '').lower() in ENROLLMENT_CODE_SEAT_TYPES
+                ]
+
+                if not eligible_seats:
+                    logger.info(
+                        'Skipping enrollment code generation for "%s" course. '
+                        'Because enrollment codes are not allowed for "%s" seat type.',
+                        course_id,
+                        ', '.join(seat_types),
+                    )
+                elif course_id in courses_with_enrollment_codes:
+                    logger.info(
+                        'Skipping enrollment code generation for "%s" course due to existing enrollment codes.',
+                        course_id,
+                    )
+                elif len(eligible_seats) > 1:
+                    logger.error(
+                        'Enrollment code generation failed for "%s" course. Because %s',
+                        course_id,
+                        'Course "%s" has multiple seats eligible for enrollment codes.' % course_id,
+                    )
+                    failed_courses.append(course_id)
+                elif not eligible_seats[0][0].stockrecords.all():
+                    logger.error(
+                        'Enrollment code generation failed for "%s" course. Because %s',
+                        course_id,
+                        'The seat of course "%s" eligible for enrollment codes has no stock record.' % course_id,
+                    )
+                    failed_courses.append(course_id)
+                else:
+                    seat, values = eligible_seats[0]
+                    entries.append({
+                        'course': course,
+                        'seat_type': values['certificate_type'].lower(),
+                        'id_verification_required': values.get('id_verification_required', False),
+                        'price': seat.stockrecords.all()[0].price_excl_tax,
+                        'expires': None,
+                    })
+
+            with transaction.atomic():
+                importer.create_or_update_enrollment_codes(entries)
+
+            for entry in entries:
+                logger.info('Enrollment code generated for "%s" course.', entry['course'].id)
+
+            processed = min(index + batch_limit, total_courses)
+            elapsed = max(time.time() - start_time, 0.001)
+            logger.info(
+                'Processed %d of %d courses (%.1f courses per second).', processed, total_courses, processed / elapsed
+            )
+
+        return total_courses, failed_courses
+
     def _generate_enrollment_code(self, course):
         """
         Generate enrollment code for the given course.
@@ -0,0 +1,72 @@
+""" This command publishes the courses queued for publication to the LMS."""
+from __future__ import unicode_literals
+
+import logging
+import time
+
+from django.core.management import BaseCommand
+
+from ecommerce.courses.models import CoursePublication
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Publish queued courses to the LMS, retrying failures with exponential backoff."""
+
+    help = 'Publish the courses queued for publication to the LMS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch_size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Maximum number of queued publications processed per batch.')
+        parser.add_argument('--concurrency',
+                            action='store',
+                            dest='concurrency',
+                            default=4,
+                            type=int,
+                            help='Number of courses to publish in parallel.')
+        parser.add_argument('--max_attempts',
+                            action='store',
+                            dest='max_attempts',
+                            default=CoursePublication.MAX_ATTEMPTS,
+                            type=int,
+                            help='Number of attempts after which a publication is marked as failed.')
+        parser.add_argument('--poll_interval',
+                            action='store',
+                            dest='poll_interval',
+                            default=None,
+                            type=int,
+                            help='Keep running, waiting this many seconds whenever the queue is empty. '
+                                 'By default, the command exits once no publications are due.')
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        total_published = total_failed = 0
+
+        while True:
+            published, failed = CoursePublication.publish_pending(
+                batch_size=options['batch_size'],
+                concurrency=options['concurrency'],
+                max_attempts=options['max_attempts'],
+            )
+            total_published += published
+            total_failed += failed
+
+            if published or failed:
+                # Failed publications are rescheduled, so they are not picked up again by the next batch.
+                logger.info('Published [%d] courses to LMS, [%d] failed.', published, failed)
+                continue
+
+            if poll_interval is None:
+                break
+            time.sleep(poll_interval)
+
+        logger.info(
+            'Finished processing queued publications. [%d] courses published, [%d] failed.',
+            total_published,
+            total_failed
+        )
@@ -7,6 +7,7 @@ import os
 from django.core.management import BaseCommand, CommandError
 
 from ecommerce.courses.models import Course
+from ecommerce.courses.publishers import LMSPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,18 @@ class Command(BaseCommand):
                             dest='course_ids_file',
                             default=None,
                             help='Path to file to read courses from.')
+        parser.add_argument('--concurrency',
+                            action='store',
+                            dest='concurrency',
+                            default=1,
+                            type=int,
+                            help='Number of courses to publish in parallel.')
+        parser.add_argument('--batch_size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Number of courses loaded from the database at a time when publishing in parallel.')
 
     def handle(self, *args, **options):
         failed = 0
@@ -34,21 +47,19 @@ class Command(BaseCommand):
             raise CommandError("Pass the correct absolute path to course ids file as --course_ids_file argument.")
 
         with open(course_ids_file, 'r') as file_handler:
-            course_ids = file_handler.readlines()
-            total_courses = len(course_ids)
-            logger.info("Publishing %d courses.", total_courses)
+            course_ids = [course_id.strip() for course_id in file_handler.readlines()]
+
+        total_courses = len(course_ids)
+        logger.info("Publishing %d courses.", total_courses)
+        if options['concurrency'] > 1:
+            failed = self._publish_concurrently(course_ids, options['concurrency'], options['batch_size'])
+        else:
             for index, course_id in enumerate(course_ids, start=1):
                 try:
-                    course_id = course_id.strip()
                     course = Course.objects.get(id=course_id)
                     publishing_error = course.publish_to_lms()
-                    if publishing_error:
+                    if not self._log_result(index, total_courses, course_id, publishing_error):
                         failed += 1
-                        logger.error(
-                            u"(%d/%d) Failed to publish %s: %s", index, total_courses, course_id, publishing_error
-                        )
-                    else:
-                        logger.info(u"(%d/%d) Successfully published %s.", index, total_courses, course_id)
                 except Course.DoesNotExist:
                     failed += 1
                     logger.error(
@@ -58,3 +69,39 @@ class Command(BaseCommand):
             logger.error("Completed publishing courses. %d of %d failed.", failed, total_courses)
         else:
             logger.info("All %d courses successfully published.", total_courses)
+
+    def _log_result(self, index, total_courses, course_id, publishing_error):
+        """Log the outcome of a single publication, and return True if it succeeded."""
+        if publishing_error:
+            logger.error(u"(%d/%d) Failed to publish %s: %s", index, total_courses, course_id, publishing_error)
+            return False
+
+        logger.info(u"(%d/%d) Successfully published %s.", index, total_courses, course_id)
+        return True
+
+    def _publish_concurrently(self, course_ids, concurrency, batch_size):
+        """Publish the courses in batches, with up to `concurrency` LMS calls in flight. Returns the failure count."""
+        failed = 0
+        total_courses = len(course_ids)
+        publisher = LMSPublisher()
+        for start in range(0, total_courses, batch_size):
+            batch = course_ids[start:start + batch_size]
+            courses = Course.objects.filter(id__in=batch).select_related('partner__default_site__siteconfiguration')
+            courses = {course.id: course for course in courses}
+            results = dict(
+                (course.id, error)
+                for course, error in publisher.publish_many(
+                    [courses[course_id] for course_id in batch if course_id in courses], concurrency=concurrency
+                )
+            )
+
+            for index, course_id in enumerate(batch, start=start + 1):
+                if course_id not in courses:
+                    failed += 1
+                    logger.error(
+                        u"(%d/%d) Failed to publish %s: Course does not exist.", index, total_courses, course_id
+                    )
+                elif not self._log_result(index, total_courses, course_id, results[course_id]):
+                    failed += 1
+
+        return failed
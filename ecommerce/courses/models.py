@@ -14,6 +14,7 @@ from ecommerce.core.constants import (
     ENROLLMENT_CODE_SEAT_TYPES,
     SEAT_PRODUCT_CLASS_NAME
 )
+from ecommerce.core.lookups import product_classes
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.extensions.catalogue.utils import generate_sku
 
@@ -22,7 +23,6 @@ Category = get_model('catalogue', 'Category')
 Partner = get_model('partner', 'Partner')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
-ProductClass = get_model('catalogue', 'ProductClass')
 Selector = get_class('partner.strategy', 'Selector')
 StockRecord = get_model('partner', 'StockRecord')
 
@@ -49,7 +49,7 @@ class Course(models.Model):
         parent, created = self.products.get_or_create(
             course=self,
             structure=Product.PARENT,
-            product_class=ProductClass.objects.get(name=SEAT_PRODUCT_CLASS_NAME),
+            product_class=product_classes.get(SEAT_PRODUCT_CLASS_NAME),
         )
         ProductCategory.objects.get_or_create(category=Category.objects.get(name='Seats'), product=parent)
         parent.title = 'Seat in {}'.format(self.name)
@@ -71,6 +71,17 @@ class Course(models.Model):
         """ Publish Course and Products to LMS. """
         return LMSPublisher().publish(self)
 
+    def queue_publication_to_lms(self):
+        """ Queue publication of Course and Products to LMS.
+
+        The queue entry is written using the current database connection, so it is committed (or rolled back)
+        together with the changes that prompted the publication.
+
+        Returns:
+            CoursePublication
+        """
+        return CoursePublication.objects.create(course=self)
+
     @classmethod
     def is_mode_verified(cls, mode):
         """ Returns True if the mode is verified, otherwise False. """
@@ -91,7 +102,7 @@ class Course(models.Model):
     @property
     def type(self):
         """ Returns the type of the course (based on the available seat types). """
-        seat_types = [getattr(seat.attr, 'certificate_type', '').lower() for seat in self.seat_products]
+        seat_types = [seat.get_snapshot_attribute('certificate_type', '').lower() for seat in self._get_seat_products()]
         if 'credit' in seat_types:
             return 'credit'
         elif 'professional' in seat_types or 'no-id-professional' in seat_types:
@@ -114,13 +125,50 @@ class Course(models.Model):
     @property
     def enrollment_code_product(self):
         """Returns this course's enrollment code if it exists and is active."""
-        enrollment_code = self.get_enrollment_code()
+        enrollment_code = self._get_enrollment_code()
         if enrollment_code:
             info = Selector().strategy().fetch_for_product(enrollment_code)
             if info.availability.is_available_to_buy:
                 return enrollment_code
         return None
 
+    def _get_prefetched_products(self):
+        """ Returns the products of this course if they have been prefetched, otherwise None.
+
+        Views listing courses prefetch their products, along with the products' attribute values
+        and stock records. Properties derived from the products use them rather than querying
+        the products of each course again.
+        """
+        if 'products' in getattr(self, '_prefetched_objects_cache', {}):
+            return list(self.products.all())
+        return None
+
+    def _get_seat_products(self):
+        """ Returns the course seat Products, from the prefetched products if available. """
+        products = self._get_prefetched_products()
+        if products is None:
+            return self.seat_products
+
+        seat_class = product_classes.get_or_none(SEAT_PRODUCT_CLASS_NAME)
+        parent_ids = [
+            product.id for product in products
+            if product.structure == Product.PARENT and seat_class and product.product_class_id == seat_class.id
+        ]
+        return [product for product in products if product.parent_id and product.parent_id in parent_ids]
+
+    def _get_enrollment_code(self):
+        """ Returns the enrollment code Product, from the prefetched products if available. """
+        products = self._get_prefetched_products()
+        if products is None:
+            return self.get_enrollment_code()
+
+        enrollment_code_class = product_classes.get_or_none(ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        enrollment_codes = [
+            product for product in products
+            if enrollment_code_class and product.product_class_id == enrollment_code_class.id
+        ]
+        return enrollment_codes[0] if enrollment_codes else None
+
     def get_course_seat_name(self, certificate_type, id_verification_required):
         """ Returns the name for a course seat. """
         name = u'Seat in {}'.format(self.name)
@@ -300,7 +348,7 @@ class Course(models.Model):
         Returns:
             Enrollment code product.
         """
-        enrollment_code_product_class = ProductClass.objects.get(name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        enrollment_code_product_class = product_classes.get(ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
         enrollment_code = self.get_enrollment_code()
 
         if not enrollment_code:
@@ -357,3 +405,98 @@ class Course(models.Model):
             else:
                 enrollment_code.expires = now() - timedelta(days=365)
             enrollment_code.save()
+
+
+class CoursePublication(models.Model):
+    """ Outbox entry requesting that a course's commerce data be published to the LMS.
+
+    Entries are drained in batches by the process_course_publications management command. Since
+    publication always sends the current state of the course, all pending entries for a course are
+    satisfied by a single successful publication.
+    """
+    PENDING = 'pending'
+    PUBLISHED = 'published'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PUBLISHED, _('Published')),
+        (FAILED, _('Failed')),
+    )
+
+    # Failed publications are retried after RETRY_DELAY * 2^(attempts - 1) seconds, capped at MAX_RETRY_DELAY.
+    RETRY_DELAY = 60
+    MAX_RETRY_DELAY = 60 * 60
+    MAX_ATTEMPTS = 10
+
+    course = models.ForeignKey(Course, related_name='publications', on_delete=models.CASCADE)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=now)
+    last_error = models.TextField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta(object):
+        index_together = ('status', 'next_attempt')
+
+    def __unicode__(self):
+        return u'{course_id}: {status}'.format(course_id=self.course_id, status=self.status)
+
+    @classmethod
+    def get_retry_delay(cls, attempts):
+        """ Returns the number of seconds to wait before the next attempt, given the number of failed attempts. """
+        return min(cls.RETRY_DELAY * 2 ** max(attempts - 1, 0), cls.MAX_RETRY_DELAY)
+
+    @classmethod
+    def publish_pending(cls, batch_size=100, concurrency=1, max_attempts=MAX_ATTEMPTS):
+        """ Publish a batch of due publications to the LMS.
+
+        Publishing is idempotent, so concurrent workers picking up the same entries is harmless.
+
+        Arguments:
+            batch_size (int): Maximum number of queue entries processed.
+            concurrency (int): Maximum number of courses published simultaneously.
+            max_attempts (int): Number of attempts after which an entry is marked as failed.
+
+        Returns:
+            tuple: Number of courses published and number of courses which failed to publish.
+        """
+        pending = list(
+            cls.objects.filter(status=cls.PENDING, next_attempt__lte=now()).order_by('id')[:batch_size]
+        )
+        publications_by_course = {}
+        for publication in pending:
+            publications_by_course.setdefault(publication.course_id, []).append(publication)
+
+        if not publications_by_course:
+            return 0, 0
+
+        courses = Course.objects.filter(id__in=publications_by_course.keys()).select_related(
+            'partner__default_site__siteconfiguration'
+        )
+        published = failed = 0
+        for course, error in LMSPublisher().publish_many(list(courses), concurrency=concurrency):
+            publications = publications_by_course[course.id]
+            ids = [publication.id for publication in publications]
+            if error is None:
+                published += 1
+                cls.objects.filter(id__in=ids).update(status=cls.PUBLISHED, last_error=None, modified=now())
+                continue
+
+            failed += 1
+            # Entries for the same course are retried together, on the schedule of the most-attempted one.
+            attempts = max(publication.attempts for publication in publications) + 1
+            if attempts >= max_attempts:
+                logger.error('Giving up publishing [%s] to LMS after [%d] attempts: %s', course.id, attempts, error)
+                cls.objects.filter(id__in=ids).update(
+                    status=cls.FAILED, attempts=attempts, last_error=error, modified=now()
+                )
+            else:
+                cls.objects.filter(id__in=ids).update(
+                    attempts=attempts,
+                    last_error=error,
+                    next_attempt=now() + timedelta(seconds=cls.get_retry_delay(attempts)),
+                    modified=now()
+                )
+
+        return published, failed
@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 
 from django.utils.translation import ugettext_lazy as _
 from edx_rest_api_client.exceptions import SlumberHttpBaseException
@@ -44,6 +45,25 @@ class LMSPublisher(object):
             'expires': self.get_seat_expiration(seat),
         }
 
+    def get_publication_data(self, course):
+        """ Serializes a course to the payload expected by the Commerce API.
+
+        All database access needed to publish a course happens here, which allows the LMS calls
+        made by publish_data to run outside of the request (or worker) thread.
+
+        Arguments:
+            course (Course): Course to be serialized.
+
+        Returns:
+            dict
+        """
+        return {
+            'id': course.id,
+            'name': course.name,
+            'verification_deadline': self.get_course_verification_deadline(course),
+            'modes': [self.serialize_seat_for_commerce_api(seat) for seat in course.seat_products],
+        }
+
     def publish(self, course):
         """ Publish course commerce data to LMS.
 
@@ -57,22 +77,78 @@ class LMSPublisher(object):
             None, if publish operation succeeded; otherwise, error message.
         """
         site = course.partner.default_site
-        course_id = course.id
-        error_message = _('Failed to publish commerce data for {course_id} to LMS.').format(course_id=course_id)
+        return self.publish_data(site.siteconfiguration, self.get_publication_data(course))
+
+    def publish_many(self, courses, concurrency=1):
+        """ Publish several courses to LMS, running up to `concurrency` LMS calls in parallel.
+
+        Courses are serialized serially on the calling thread; only the HTTP calls are
+        spread over the thread pool, so worker threads never touch the database.
+
+        Arguments:
+            courses (list): Courses to be published.
+            concurrency (int): Maximum number of courses published simultaneously.
 
-        name = course.name
-        verification_deadline = self.get_course_verification_deadline(course)
-        modes = [self.serialize_seat_for_commerce_api(seat) for seat in course.seat_products]
+        Returns:
+            list: (course, error message) tuples, in the order the courses were given. The error
+                message is None if the course was published successfully.
+        """
+        results = []
+        jobs = []
+        for course in courses:
+            try:
+                site_configuration = course.partner.default_site.siteconfiguration
+                data = self.get_publication_data(course)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to serialize [%s] for publication to LMS.', course.id)
+                results.append([course, _('Failed to publish commerce data for {course_id} to LMS.').format(
+                    course_id=course.id
+                )])
+                continue
+
+            result = [course, None]
+            results.append(result)
+            jobs.append((result, site_configuration, data))
+
+        def _publish(job):
+            result, site_configuration, data = job
+            result[1] = self.publish_data(site_configuration, data)
+
+        if concurrency > 1 and len(jobs) > 1:
+            pool = ThreadPool(min(concurrency, len(jobs)))
+            try:
+                pool.map(_publish, jobs)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for job in jobs:
+                _publish(job)
+
+        return [tuple(result) for result in results]
+
+    def publish_data(self, site_configuration, data):
+        """ Publish serialized course commerce data to LMS.
+
+        Arguments:
+            site_configuration (SiteConfiguration): Configuration of the site whose LMS receives the data.
+            data (dict): Course data, as returned by get_publication_data.
+
+        Returns:
+            None, if publish operation succeeded; otherwise, error message.
+        """
+        course_id = data['id']
+        error_message = _('Failed to publish commerce data for {course_id} to LMS.').format(course_id=course_id)
 
-        has_credit = 'credit' in [mode['name'] for mode in modes]
+        has_credit = 'credit' in [mode['name'] for mode in data['modes']]
         if has_credit:
             try:
-                data = {
+                credit_data = {
                     'course_key': course_id,
                     'enabled': True
                 }
-                credit_api_client = site.siteconfiguration.credit_api_client
-                credit_api_client.courses(course_id).put(data)
+                credit_api_client = site_configuration.credit_api_client
+                credit_api_client.courses(course_id).put(credit_data)
                 logger.info('Successfully published CreditCourse for [%s] to LMS.', course_id)
             except SlumberHttpBaseException as e:
                 # Note that %r is used to log the repr() of the response content, which may sometimes
@@ -90,14 +166,7 @@ class LMSPublisher(object):
                 return error_message
 
         try:
-            data = {
-                'id': course_id,
-                'name': name,
-                'verification_deadline': verification_deadline,
-                'modes': modes,
-            }
-
-            commerce_api_client = site.siteconfiguration.commerce_api_client
+            commerce_api_client = site_configuration.commerce_api_client
             commerce_api_client.courses(course_id).put(data=data)
             logger.info('Successfully published commerce data for [%s].', course_id)
         except SlumberHttpBaseException as e:  # pylint: disable=bare-except
@@ -334,3 +334,51 @@ class CreateEnrollmentCodesTests(DiscoveryTestMixin, TransactionTestCase):
 
         # Verify that enrollment code is not generated for a course that has multiple seats.
         self.assertIsNone(self.professional_course_1.get_enrollment_code())
+
+    def test_create_enrollment_codes_in_bulk(self):
+        """
+        Verify enrollment codes are created for each batch of courses with set-based queries.
+        """
+        # emulate multiple seat scenario for a course.
+        self.professional_course_2.create_or_update_seat('verified', False, Decimal(10.0))
+        self.create_course_ids_file(
+            self.tmp_file_path,
+            [
+                self.professional_course_1.id,
+                self.professional_course_2.id,
+                self.audit_course.id,
+                self.verified_course.id,
+                'fake/course/id',
+            ],
+        )
+
+        with LogCapture(LOGGER_NAME) as log_capture:
+            call_command('create_enrollment_codes', course_ids_file=self.tmp_file_path, bulk=True, batch_limit=3)
+
+        messages = [record.getMessage() for record in log_capture.records]
+        self.assertIn('Enrollment code generated for "%s" course.' % self.professional_course_1.id, messages)
+        self.assertIn('Enrollment code generated for "%s" course.' % self.verified_course.id, messages)
+        self.assertIn('Completed enrollment codes generation. 2 of 5 failed.', messages)
+        self.assertIn('\n'.join(['Failed courses:', self.professional_course_2.id, 'fake/course/id']), messages)
+
+        self.assertEqual(self.professional_course_1.get_enrollment_code().attr.seat_type, 'professional')
+        self.assertEqual(self.verified_course.get_enrollment_code().attr.seat_type, 'verified')
+        self.assertIsNone(self.professional_course_2.get_enrollment_code())
+        self.assertIsNone(self.audit_course.get_enrollment_code())
+
+    def test_create_enrollment_codes_in_bulk_without_stock_record(self):
+        """
+        Verify courses whose eligible seat has no stock record are reported as failed in bulk mode.
+        """
+        for seat in self.verified_course.seat_products:
+            seat.stockrecords.all().delete()
+        self.create_course_ids_file(self.tmp_file_path, [self.professional_course_1.id, self.verified_course.id])
+
+        with LogCapture(LOGGER_NAME) as log_capture:
+            call_command('create_enrollment_codes', course_ids_file=self.tmp_file_path, bulk=True)
+
+        messages = [record.getMessage() for record in log_capture.records]
+        self.assertIn('Completed enrollment codes generation. 1 of 2 failed.', messages)
+        self.assertIn('\n'.join(['Failed courses:', self.verified_course.id]), messages)
+        self.assertIsNotNone(self.professional_course_1.get_enrollment_code())
+        self.assertIsNone(self.verified_course.get_enrollment_code())
@@ -0,0 +1,109 @@
+from __future__ import unicode_literals
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from oscar.core.loading import get_model
+
+from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+from ecommerce.courses.importers import BulkCourseImporter
+from ecommerce.courses.models import Course
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.catalogue.utils import generate_sku
+from ecommerce.tests.testcases import TestCase
+
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+class BulkCourseImporterTests(DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(BulkCourseImporterTests, self).setUp()
+        self.importer = BulkCourseImporter(self.partner)
+
+    def get_spec(self, course_id, verified_price=100):
+        return {
+            'id': course_id,
+            'name': 'Test Course',
+            'seats': [
+                {'certificate_type': 'audit', 'id_verification_required': False, 'price': 0},
+                {'certificate_type': 'verified', 'id_verification_required': True, 'price': verified_price},
+            ],
+            'create_enrollment_code': True,
+        }
+
+    def assert_seat_valid(self, seat, course, certificate_type, id_verification_required, price):
+        """ Verify the seat matches the one Course.create_or_update_seat would have created. """
+        seat = Product.objects.get(id=seat.id)
+        self.assertEqual(seat.parent, course.parent_seat_product)
+        self.assertEqual(seat.title, course.get_course_seat_name(certificate_type, id_verification_required))
+        self.assertEqual(getattr(seat.attr, 'certificate_type', ''), certificate_type)
+        self.assertEqual(seat.attr.course_key, course.id)
+        self.assertEqual(seat.attr.id_verification_required, id_verification_required)
+
+        stock_record = StockRecord.objects.get(product=seat, partner=self.partner)
+        self.assertEqual(stock_record.price_excl_tax, price)
+        self.assertEqual(stock_record.partner_sku, generate_sku(seat, self.partner))
+
+    def test_import_batch(self):
+        """ Verify courses, seats, enrollment codes and stock records are created. """
+        courses = self.importer.import_batch([self.get_spec('a/b/c'), self.get_spec('d/e/f')])
+
+        self.assertEqual([course.id for course in courses], ['a/b/c', 'd/e/f'])
+        for course in Course.objects.filter(id__in=['a/b/c', 'd/e/f']):
+            self.assertEqual(course.partner, self.partner)
+            self.assertEqual(list(course.parent_seat_product.categories.all()), [self.category])
+
+            seats = course.seat_products
+            self.assertEqual(len(seats), 2)
+            self.assert_seat_valid(seats.get(attributes__name='certificate_type'), course, 'verified', True, 100)
+            self.assert_seat_valid(seats.exclude(attributes__name='certificate_type').get(), course, '', False, 0)
+
+            enrollment_code = course.get_enrollment_code()
+            self.assertEqual(enrollment_code.attr.course_key, course.id)
+            self.assertEqual(enrollment_code.attr.seat_type, 'verified')
+            self.assertEqual(enrollment_code.attr.id_verification_required, True)
+            self.assertEqual(
+                StockRecord.objects.get(product=enrollment_code).partner_sku,
+                generate_sku(enrollment_code, self.partner)
+            )
+
+        self.assertFalse(Product.objects.filter(upc__isnull=False).exists())
+
+    def test_import_batch_existing_seats(self):
+        """ Verify seats created one at a time are resolved, and only changed data is updated. """
+        course = CourseFactory(id='a/b/c', name='Test Course', partner=self.partner)
+        verified_seat = course.create_or_update_seat('verified', True, 100, create_enrollment_code=True)
+        product_count = Product.objects.count()
+
+        self.importer.import_batch([self.get_spec(course.id, verified_price=150)])
+
+        # Only the audit seat is new.
+        self.assertEqual(Product.objects.count(), product_count + 1)
+        self.assert_seat_valid(verified_seat, course, 'verified', True, 150)
+        self.assertEqual(
+            StockRecord.objects.get(product__product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME).price_excl_tax,
+            Decimal(150)
+        )
+
+    def test_import_batch_query_count(self):
+        """ Verify the number of queries needed to create courses does not depend on the number of courses. """
+        with CaptureQueriesContext(connection) as single_course:
+            self.importer.import_batch([self.get_spec('a/b/c')])
+
+        with CaptureQueriesContext(connection) as many_courses:
+            self.importer.import_batch([self.get_spec('course-v1:org+course+{}'.format(index)) for index in range(10)])
+
+        self.assertEqual(len(single_course), len(many_courses))
+
+    def test_import_courses(self):
+        """ Verify courses are imported in batches, and published when requested. """
+        specs = [self.get_spec('course-v1:org+course+{}'.format(index)) for index in range(3)]
+        importer = BulkCourseImporter(self.partner, batch_size=2)
+
+        errors = importer.import_courses(specs)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(Course.objects.filter(id__in=[spec['id'] for spec in specs]).count(), 3)
@@ -1,13 +1,14 @@
 import ddt
 import mock
 from django.conf import settings
+from django.db.models import Prefetch
 from django.utils.timezone import now, timedelta
 from freezegun import freeze_time
 from oscar.core.loading import get_model
 from oscar.test.factories import BasketFactory
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, CoursePublication
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
@@ -15,6 +16,7 @@ from ecommerce.extensions.test.factories import create_order
 from ecommerce.tests.testcases import TestCase
 
 Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 ProductClass = get_model('catalogue', 'ProductClass')
 StockRecord = get_model('partner', 'StockRecord')
 
@@ -318,6 +320,23 @@ class CourseTests(DiscoveryTestMixin, TestCase):
         course.create_or_update_seat('credit', True, 1000, credit_provider='SMU')
         self.assertEqual(course.type, 'credit')
 
+    def test_derived_fields_with_prefetched_products(self):
+        """ Verify the type and enrollment code are computed from prefetched products without further queries. """
+        course = CourseFactory(id='a/b/c', name='Test Course', partner=self.partner)
+        course.create_or_update_seat('audit', False, 0)
+        course.create_or_update_seat('verified', True, 10, create_enrollment_code=True)
+        enrollment_code = course.enrollment_code_product
+
+        course = Course.objects.prefetch_related(
+            Prefetch('products', queryset=Product.objects.select_related('product_class')),
+            Prefetch('products__attribute_values', queryset=ProductAttributeValue.objects.select_related('attribute')),
+            'products__stockrecords'
+        ).get(id=course.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(course.type, 'verified')
+            self.assertEqual(course.enrollment_code_product, enrollment_code)
+
     def test_enrollment_code_seat_type_filter(self):
         """ Verify that the ENROLLMENT_CODE_SEAT_TYPES constant is properly applied during seat creation """
         course = CourseFactory(id='test/course/123', name='Test Course 123', partner=self.partner)
@@ -363,3 +382,75 @@ class CourseTests(DiscoveryTestMixin, TestCase):
         ec_expires = now() - timedelta(days=365)
         self.assertEqual(course.get_enrollment_code().expires, ec_expires)
         self.assertIsNone(course.enrollment_code_product)
+
+
+class CoursePublicationTests(DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(CoursePublicationTests, self).setUp()
+        self.partner.default_site = self.site
+        self.partner.save()
+        self.course = CourseFactory(partner=self.partner)
+
+    def test_queue_publication_to_lms(self):
+        """ Verify queueing a publication creates a pending outbox entry, without calling the LMS. """
+        with mock.patch.object(LMSPublisher, 'publish_data') as mock_publish:
+            publication = self.course.queue_publication_to_lms()
+
+        self.assertFalse(mock_publish.called)
+        self.assertEqual(publication.course, self.course)
+        self.assertEqual(publication.status, CoursePublication.PENDING)
+        self.assertEqual(publication.attempts, 0)
+
+    def test_publish_pending(self):
+        """ Verify all pending entries for a course are satisfied by a single publication. """
+        self.course.queue_publication_to_lms()
+        self.course.queue_publication_to_lms()
+
+        with mock.patch.object(LMSPublisher, 'publish_data', return_value=None) as mock_publish:
+            self.assertEqual(CoursePublication.publish_pending(), (1, 0))
+
+        self.assertEqual(mock_publish.call_count, 1)
+        self.assertFalse(CoursePublication.objects.filter(status=CoursePublication.PENDING).exists())
+        self.assertEqual(CoursePublication.objects.filter(status=CoursePublication.PUBLISHED).count(), 2)
+
+        with mock.patch.object(LMSPublisher, 'publish_data') as mock_publish:
+            self.assertEqual(CoursePublication.publish_pending(), (0, 0))
+        self.assertFalse(mock_publish.called)
+
+    @freeze_time('2017-01-01')
+    def test_publish_pending_failure(self):
+        """ Verify failed publications are retried with exponential backoff, and eventually marked as failed. """
+        publication = self.course.queue_publication_to_lms()
+        error = 'Publication failed.'
+
+        with mock.patch.object(LMSPublisher, 'publish_data', return_value=error):
+            self.assertEqual(CoursePublication.publish_pending(max_attempts=3), (0, 1))
+            publication.refresh_from_db()
+            self.assertEqual(publication.status, CoursePublication.PENDING)
+            self.assertEqual(publication.attempts, 1)
+            self.assertEqual(publication.last_error, error)
+            self.assertEqual(publication.next_attempt, now() + timedelta(seconds=CoursePublication.RETRY_DELAY))
+
+            # The entry is not due yet.
+            self.assertEqual(CoursePublication.publish_pending(max_attempts=3), (0, 0))
+
+            with freeze_time(publication.next_attempt):
+                self.assertEqual(CoursePublication.publish_pending(max_attempts=3), (0, 1))
+            publication.refresh_from_db()
+            self.assertEqual(publication.attempts, 2)
+            self.assertEqual(
+                publication.next_attempt - publication.modified,
+                timedelta(seconds=CoursePublication.RETRY_DELAY * 2)
+            )
+
+            with freeze_time(publication.next_attempt):
+                self.assertEqual(CoursePublication.publish_pending(max_attempts=3), (0, 1))
+            publication.refresh_from_db()
+            self.assertEqual(publication.status, CoursePublication.FAILED)
+            self.assertEqual(publication.attempts, 3)
+
+    def test_get_retry_delay(self):
+        """ Verify the retry delay doubles with each attempt, up to the maximum. """
+        self.assertEqual(CoursePublication.get_retry_delay(1), CoursePublication.RETRY_DELAY)
+        self.assertEqual(CoursePublication.get_retry_delay(3), CoursePublication.RETRY_DELAY * 4)
+        self.assertEqual(CoursePublication.get_retry_delay(100), CoursePublication.MAX_RETRY_DELAY)
@@ -13,6 +13,7 @@ from django.core.management import CommandError, call_command
 from testfixtures import LogCapture
 
 from ecommerce.courses.models import Course
+from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.tests.testcases import TransactionTestCase
@@ -113,6 +114,29 @@ class PublishCoursesToLMSTests(DiscoveryTestMixin, TransactionTestCase):
             mock_publish.call_args_list, [mock.call(self.course), mock.call(second_course)]
         )
 
+    def test_course_publish_concurrently(self):
+        """ Verify courses are published through the concurrent publisher, and results logged in file order."""
+        second_course = CourseFactory(partner=self.partner)
+        fake_course_id = "fake_course_id"
+        error_msg = "The failure message."
+        self.create_course_ids_file(self.tmp_file_path, [self.course.id, fake_course_id, second_course.id])
+        expected = (
+            (LOGGER_NAME, "INFO", "Publishing 3 courses."),
+            (LOGGER_NAME, "INFO", u"(1/3) Successfully published {}.".format(self.course.id)),
+            (LOGGER_NAME, "ERROR", u"(2/3) Failed to publish {}: Course does not exist.".format(fake_course_id)),
+            (LOGGER_NAME, "ERROR", u"(3/3) Failed to publish {}: {}".format(second_course.id, error_msg)),
+            (LOGGER_NAME, "ERROR", "Completed publishing courses. 2 of 3 failed."),
+        )
+
+        def publish_data(_site_configuration, data):
+            return error_msg if data['id'] == second_course.id else None
+
+        with mock.patch.object(LMSPublisher, 'publish_data', side_effect=publish_data) as mock_publish:
+            with LogCapture(LOGGER_NAME) as lc:
+                call_command('publish_to_lms', course_ids_file=self.tmp_file_path, concurrency=4, batch_size=2)
+                lc.check(*expected)
+        self.assertEqual(mock_publish.call_count, 2)
+
     def test_course_publish_failed(self):
         """ Verify failed courses are logged."""
 
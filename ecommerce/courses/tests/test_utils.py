@@ -13,6 +13,7 @@ from ecommerce.courses.utils import (
     get_certificate_type_display_value,
     get_course_catalogs,
     get_course_info_from_catalog,
+    get_course_info_from_catalog_for_products,
     mode_for_product
 )
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
@@ -100,6 +101,41 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
             _ = get_course_info_from_catalog(self.request.site, product)
             self.assertEqual(mocked_set_all_tiers.call_count, 2)
 
+    @ddt.data(1, 4)
+    def test_get_course_info_from_catalog_for_products(self, concurrency):
+        """ Verify the information of several products is fetched at once, and cached for each of them. """
+        self.mock_access_token_response()
+        course = CourseFactory(partner=self.partner)
+        seat = course.create_or_update_seat('verified', None, 100)
+        audit_seat = course.create_or_update_seat('audit', False, 0)
+        entitlement = create_or_update_course_entitlement(
+            'verified', 100, self.partner, 'foo-bar', 'Foo Bar Entitlement')
+        unavailable_course = CourseFactory(partner=self.partner)
+        unavailable_seat = unavailable_course.create_or_update_seat('verified', None, 100)
+        discovery_api_url = self.site_configuration.discovery_api_url
+        self.mock_course_run_detail_endpoint(course, discovery_api_url=discovery_api_url)
+        self.mock_course_detail_endpoint(entitlement, discovery_api_url=discovery_api_url)
+        httpretty.register_uri(
+            httpretty.GET,
+            '{}course_runs/{}/?partner={}'.format(discovery_api_url, unavailable_course.id, self.partner.short_code),
+            status=500
+        )
+
+        with self.settings(DISCOVERY_API_CONCURRENCY=concurrency):
+            courses = get_course_info_from_catalog_for_products(
+                self.request.site, [seat, audit_seat, entitlement, unavailable_seat]
+            )
+
+        self.assertEqual(set(courses), {seat.id, audit_seat.id, entitlement.id})
+        self.assertEqual(courses[seat.id]['title'], course.name)
+        self.assertEqual(courses[audit_seat.id], courses[seat.id])
+        self.assertEqual(courses[entitlement.id]['title'], entitlement.title)
+
+        # The information is cached for get_course_info_from_catalog.
+        httpretty.reset()
+        self.assertEqual(get_course_info_from_catalog(self.request.site, seat), courses[seat.id])
+        self.assertEqual(get_course_info_from_catalog(self.request.site, entitlement), courses[entitlement.id])
+
     @ddt.data(
         ('honor', 'Honor'),
         ('verified', 'Verified'),
@@ -1,11 +1,17 @@
 import hashlib
+import logging
+from multiprocessing.pool import ThreadPool
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
 
-from ecommerce.core.utils import deprecated_traverse_pagination
+from ecommerce.core.utils import traverse_pagination
+
+logger = logging.getLogger(__name__)
 
 
 def mode_for_product(product):
@@ -15,39 +21,111 @@ def mode_for_product(product):
     bulk purchase "enrollment code" product variant of the single-seat product, so we attempt
     to locate the 'seat_type' attribute in its place.
     """
-    mode = getattr(product.attr, 'certificate_type', getattr(product.attr, 'seat_type', None))
+    mode = product.get_snapshot_attribute('certificate_type', product.get_snapshot_attribute('seat_type'))
     if not mode:
         return 'audit'
-    if mode == 'professional' and not getattr(product.attr, 'id_verification_required', False):
+    if mode == 'professional' and not product.get_snapshot_attribute('id_verification_required', False):
         return 'no-id-professional'
     return mode
 
 
+def _get_catalog_key(product):
+    """ Returns the UUID of the course of an entitlement, or the key of the course run of any other product. """
+    if product.is_course_entitlement_product:
+        return product.get_snapshot_attribute('UUID')
+    return CourseKey.from_string(product.get_snapshot_attribute('course_key'))
+
+
+def _get_course_info_cache_key(key, partner_short_code):
+    cache_key = 'courses_api_detail_{}{}'.format(key, partner_short_code)
+    return hashlib.md5(cache_key).hexdigest()
+
+
+def _fetch_course_info(api, key, is_course_entitlement, partner_short_code):
+    if is_course_entitlement:
+        return api.courses(key).get()
+    return api.course_runs(key).get(partner=partner_short_code)
+
+
 def get_course_info_from_catalog(site, product):
     """ Get course or course_run information from Discovery Service and cache """
-    if product.is_course_entitlement_product:
-        key = product.attr.UUID
-    else:
-        key = CourseKey.from_string(product.attr.course_key)
+    key = _get_catalog_key(product)
 
     api = site.siteconfiguration.discovery_api_client
     partner_short_code = site.siteconfiguration.partner.short_code
 
-    cache_key = 'courses_api_detail_{}{}'.format(key, partner_short_code)
-    cache_key = hashlib.md5(cache_key).hexdigest()
+    cache_key = _get_course_info_cache_key(key, partner_short_code)
     course_cached_response = TieredCache.get_cached_response(cache_key)
     if course_cached_response.is_found:
         return course_cached_response.value
 
-    if product.is_course_entitlement_product:
-        course = api.courses(key).get()
-    else:
-        course = api.course_runs(key).get(partner=partner_short_code)
+    course = _fetch_course_info(api, key, product.is_course_entitlement_product, partner_short_code)
 
     TieredCache.set_all_tiers(cache_key, course, settings.COURSES_API_CACHE_TIMEOUT)
     return course
 
 
+def get_course_info_from_catalog_for_products(site, products):
+    """
+    Get course or course_run information from Discovery Service for several products at once.
+
+    The information not yet cached is fetched concurrently, and cached as by get_course_info_from_catalog.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        products (list): Products that have a course_key (seats and enrollment codes) or UUID (entitlements)
+
+    Returns:
+        dict: Course or course_run information keyed by product ID. Products whose information could not be
+            retrieved are left out.
+    """
+    partner_short_code = site.siteconfiguration.partner.short_code
+    keys = {}
+    uncached = {}
+    courses = {}
+    for product in products:
+        key = _get_catalog_key(product)
+        keys[product.id] = key
+        if key in courses or key in uncached:
+            continue
+
+        cache_key = _get_course_info_cache_key(key, partner_short_code)
+        course_cached_response = TieredCache.get_cached_response(cache_key)
+        if course_cached_response.is_found:
+            courses[key] = course_cached_response.value
+        else:
+            uncached[key] = (cache_key, product.is_course_entitlement_product)
+
+    if uncached:
+        api = site.siteconfiguration.discovery_api_client
+
+        def _fetch(key):
+            try:
+                return key, _fetch_course_info(api, key, uncached[key][1], partner_short_code)
+            except (ConnectionError, SlumberBaseException, Timeout):
+                logger.warning('Failed to retrieve data from Discovery Service for [%s].', key, exc_info=True)
+                return key, None
+
+        if settings.DISCOVERY_API_CONCURRENCY > 1 and len(uncached) > 1:
+            pool = ThreadPool(min(settings.DISCOVERY_API_CONCURRENCY, len(uncached)))
+            try:
+                results = pool.map(_fetch, list(uncached))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_fetch(key) for key in uncached]
+
+        for key, course in results:
+            if course is not None:
+                TieredCache.set_all_tiers(uncached[key][0], course, settings.COURSES_API_CACHE_TIMEOUT)
+                courses[key] = course
+
+    return dict(
+        (product_id, courses[key]) for product_id, key in keys.items() if courses.get(key) is not None
+    )
+
+
 def get_course_catalogs(site, resource_id=None):
     """
     Get details related to course catalogs from Discovery Service.
@@ -82,7 +160,7 @@ def get_course_catalogs(site, resource_id=None):
     if resource_id:
         results = response
     else:
-        results = deprecated_traverse_pagination(response, endpoint)
+        results = traverse_pagination(response, endpoint)
 
     TieredCache.set_all_tiers(cache_key, results, settings.COURSES_API_CACHE_TIMEOUT)
     return results
@@ -10,7 +10,6 @@ from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
 from edx_rest_api_client.client import EdxRestApiClient
-from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.url_utils import get_lms_url
@@ -18,9 +17,9 @@ from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.extensions.voucher.utils import get_cached_voucher
 
 logger = logging.getLogger(__name__)
-Voucher = get_model('voucher', 'Voucher')
 
 
 class Checkout(TemplateView):
@@ -132,7 +131,7 @@ class Checkout(TemplateView):
         """
         code = self.request.GET.get('code')
         if code:
-            voucher = Voucher.objects.get(code=code)
+            voucher = get_cached_voucher(code)
             discount_type = voucher.benefit.type
             discount_value = voucher.benefit.value
 
@@ -12,10 +12,9 @@ from ecommerce.enterprise.api import catalog_contains_course_runs, fetch_enterpr
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH, ENTERPRISE_OFFERS_SWITCH
 from ecommerce.extensions.basket.utils import ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
 from ecommerce.extensions.offer.decorators import check_condition_applicability
+from ecommerce.extensions.offer.evaluation import get_evaluation_context
 from ecommerce.extensions.offer.mixins import ConditionWithoutRangeMixin, SingleItemConsumptionConditionMixin
 
-BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 logger = logging.getLogger(__name__)
@@ -30,6 +29,22 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
     def name(self):
         return "Basket contains a seat from {}'s catalog".format(self.enterprise_customer_name)
 
+    @staticmethod
+    def _get_learner_data_job(basket):
+        """ Returns the (key, func) tuple fetching the enterprise learner data of the basket owner. """
+        site = basket.site
+        owner = basket.owner
+        return ('enterprise_learner_data', owner.id), lambda: fetch_enterprise_learner_data(site, owner)
+
+    def get_prefetch_jobs(self, offer, basket):  # pylint: disable=unused-argument
+        """ Returns the jobs prefetching the data used by is_satisfied. See OfferEvaluationContext. """
+        if not basket.owner or not waffle.switch_is_active(ENTERPRISE_OFFERS_SWITCH):
+            return []
+
+        # The partner is loaded now, so the job does not query the database from another thread.
+        basket.site.siteconfiguration.partner  # pylint: disable=pointless-statement
+        return [self._get_learner_data_job(basket)]
+
     @check_condition_applicability([ENTERPRISE_OFFERS_SWITCH])
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
         """
@@ -59,9 +74,10 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
             logger.info('Skipping Voucher type enterprise conditional offer until we are ready to support it.')
             return False
 
+        context = get_evaluation_context(basket)
         learner_data = {}
         try:
-            learner_data = fetch_enterprise_learner_data(basket.site, basket.owner)['results'][0]
+            learner_data = context.memoize(*self._get_learner_data_job(basket))['results'][0]
         except (ConnectionError, KeyError, SlumberHttpBaseException, Timeout):
             logger.exception(
                 'Failed to retrieve enterprise learner data for site [%s] and user [%s].',
@@ -111,8 +127,15 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
                                offer.id, catalog, offer.condition.enterprise_customer_catalog_uuid)
                 return False
 
-        if not catalog_contains_course_runs(basket.site, course_run_ids, self.enterprise_customer_uuid,
-                                            enterprise_customer_catalog_uuid=self.enterprise_customer_catalog_uuid):
+        contains_course_runs = context.memoize(
+            ('enterprise_catalog_contains_course_runs', tuple(course_run_ids), str(self.enterprise_customer_uuid),
+             str(self.enterprise_customer_catalog_uuid)),
+            lambda: catalog_contains_course_runs(
+                basket.site, course_run_ids, self.enterprise_customer_uuid,
+                enterprise_customer_catalog_uuid=self.enterprise_customer_catalog_uuid
+            )
+        )
+        if not contains_course_runs:
             # Basket contains course runs that do not exist in the EnterpriseCustomerCatalogs
             # associated with the EnterpriseCustomer.
             logger.warning('Unable to apply enterprise offer %s because '
@@ -138,15 +161,7 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
 
         if not catalog:
             # For actual baskets get `catalog` from basket attribute
-            enterprise_catalog_attribute, __ = BasketAttributeType.objects.get_or_create(
-                name=ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
-            )
-            enterprise_customer_catalog = BasketAttribute.objects.filter(
-                basket=basket,
-                attribute_type=enterprise_catalog_attribute,
-            ).first()
-            if enterprise_customer_catalog:
-                catalog = enterprise_customer_catalog.value_text
+            catalog = get_evaluation_context(basket).get_basket_attribute(ENTERPRISE_CATALOG_ATTRIBUTE_TYPE)
 
         # Return only valid UUID
         try:
@@ -0,0 +1,49 @@
+""" Syncs the directory of enterprise customers, listed by the coupon administration tool, with the Enterprise API. """
+from __future__ import unicode_literals
+
+import logging
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.enterprise.utils import sync_enterprise_customers
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Sync the directory of enterprise customers of each site with the Enterprise API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site-id',
+                            action='store',
+                            dest='site_id',
+                            type=int,
+                            default=None,
+                            help='ID of the site whose customers are synced. Defaults to every site.')
+
+    def handle(self, *args, **options):
+        sites = Site.objects.filter(siteconfiguration__isnull=False).select_related('siteconfiguration')
+        if options['site_id']:
+            sites = sites.filter(id=options['site_id'])
+            if not sites:
+                raise CommandError('Site [{}] does not exist, or is not configured.'.format(options['site_id']))
+
+        failed = []
+        for site in sites:
+            try:
+                counts = sync_enterprise_customers(site)
+            except (ConnectionError, SlumberBaseException, Timeout):
+                logger.exception('Failed to sync the enterprise customers of site [%s].', site.domain)
+                failed.append(site.domain)
+                continue
+
+            logger.info(
+                'Synced the enterprise customers of site [%s]: %d created, %d updated, %d deleted.',
+                site.domain, counts['created'], counts['updated'], counts['deleted']
+            )
+
+        if failed:
+            raise CommandError('Failed to sync the enterprise customers of sites {}.'.format(', '.join(failed)))
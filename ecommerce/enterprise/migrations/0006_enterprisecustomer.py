@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('enterprise', '0005_assignableenterprisecustomercondition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnterpriseCustomer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('uuid', models.UUIDField()),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('active', models.BooleanField(default=True)),
+                ('enable_data_sharing_consent', models.BooleanField(default=False)),
+                ('enforce_data_sharing_consent', models.CharField(blank=True, max_length=32)),
+                ('contact_email', models.CharField(blank=True, max_length=254)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enterprise_customers', to='sites.Site')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EnterpriseCustomerDirectory',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('synced', models.DateTimeField(help_text='Last time a sync of the directory completed.')),
+                ('site', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='enterprise_customer_directory', to='sites.Site')),
+            ],
+            options={
+                'ordering': ('-modified', '-created'),
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='enterprisecustomer',
+            unique_together=set([('site', 'uuid')]),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from __future__ import unicode_literals
+
+import datetime
+
+import six
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.db import models
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+
+
+class EnterpriseCustomerDirectory(TimeStampedModel):
+    """
+    Directory of the enterprise customers of a site, recording when it was last synced with the Enterprise service.
+
+    The directory is only written once a sync completes, so the customers of a site whose sync is in progress, or
+    failed, are not relied on until a sync completes again.
+    """
+    site = models.OneToOneField(Site, related_name='enterprise_customer_directory', on_delete=models.CASCADE)
+    synced = models.DateTimeField(help_text='Last time a sync of the directory completed.')
+
+    def __unicode__(self):
+        return 'Enterprise customer directory of [{site}]'.format(site=self.site_id)
+
+    @classmethod
+    def is_synced(cls, site):
+        """ Returns True if the last completed sync of the site's directory is recent enough to be relied on. """
+        synced_since = timezone.now() - datetime.timedelta(seconds=settings.ENTERPRISE_CUSTOMER_DIRECTORY_MAX_AGE)
+        return cls.objects.filter(site=site, synced__gte=synced_since).exists()
+
+
+class EnterpriseCustomer(TimeStampedModel):
+    """
+    Enterprise customer of a site, mirrored from the Enterprise service by the sync_enterprise_customers command.
+    """
+    site = models.ForeignKey(Site, related_name='enterprise_customers', on_delete=models.CASCADE)
+    uuid = models.UUIDField()
+    name = models.CharField(max_length=255, db_index=True)
+    active = models.BooleanField(default=True)
+    enable_data_sharing_consent = models.BooleanField(default=False)
+    enforce_data_sharing_consent = models.CharField(max_length=32, blank=True)
+    contact_email = models.CharField(max_length=254, blank=True)
+
+    # Fields updated from the responses of the Enterprise API, and the defaults of those missing from them.
+    API_FIELDS = (
+        ('name', ''),
+        ('active', True),
+        ('enable_data_sharing_consent', False),
+        ('enforce_data_sharing_consent', ''),
+        ('contact_email', ''),
+    )
+
+    class Meta(object):
+        unique_together = ('site', 'uuid')
+
+    def __unicode__(self):
+        return self.name
+
+    def as_dict(self):
+        """ Returns the customer in the format of get_enterprise_customer. """
+        return {
+            'name': self.name,
+            'id': six.text_type(self.uuid),
+            'enable_data_sharing_consent': self.enable_data_sharing_consent,
+            'enforce_data_sharing_consent': self.enforce_data_sharing_consent,
+            'contact_email': self.contact_email,
+        }
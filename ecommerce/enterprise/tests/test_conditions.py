@@ -3,6 +3,7 @@ from uuid import uuid4
 
 import ddt
 import httpretty
+import mock
 from oscar.core.loading import get_model
 from waffle.models import Switch
 
@@ -11,6 +12,7 @@ from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH,
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
 from ecommerce.extensions.basket.utils import basket_add_enterprise_catalog_attribute
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.offer.evaluation import OfferEvaluationContext
 from ecommerce.extensions.test import factories
 from ecommerce.tests.factories import ProductFactory, SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
@@ -229,6 +231,22 @@ class EnterpriseCustomerConditionTests(EnterpriseServiceMockMixin, DiscoveryTest
         )
         self.assertFalse(self.condition.is_satisfied(offer, basket))
 
+    def test_is_satisfied_shares_learner_data(self):
+        """ Ensure the learner data is fetched once for all the offers evaluated with the same context. """
+        basket = factories.BasketFactory(site=self.site, owner=self.user)
+        basket.add_product(self.course_run.seat_products[0])
+        basket.offer_evaluation_context = OfferEvaluationContext(basket)
+        learner_data = {'results': [{'enterprise_customer': {'uuid': str(uuid4())}}]}
+
+        with mock.patch('ecommerce.enterprise.conditions.fetch_enterprise_learner_data',
+                        return_value=learner_data) as mock_fetch:
+            for __ in range(2):
+                condition = factories.EnterpriseCustomerConditionFactory()
+                offer = factories.EnterpriseOfferFactory(partner=self.partner, condition=condition)
+                self.assertFalse(condition.is_satisfied(offer, basket))
+
+        self.assertEqual(mock_fetch.call_count, 1)
+
     @httpretty.activate
     def test_is_satisfied_no_course_product(self):
         """ Ensure the condition returns false if the basket contains a product not associated with a course run. """
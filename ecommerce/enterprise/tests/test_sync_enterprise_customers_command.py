@@ -0,0 +1,30 @@
+from __future__ import unicode_literals
+
+import mock
+from django.core.management import CommandError, call_command
+from requests.exceptions import Timeout
+
+from ecommerce.tests.testcases import TestCase
+
+COMMAND = 'sync_enterprise_customers'
+SYNC = 'ecommerce.enterprise.management.commands.sync_enterprise_customers.sync_enterprise_customers'
+
+
+class SyncEnterpriseCustomersCommandTests(TestCase):
+    def test_sync(self):
+        """ The enterprise customers of the site should be synced. """
+        with mock.patch(SYNC, return_value={'created': 1, 'updated': 0, 'deleted': 0}) as mock_sync:
+            call_command(COMMAND, site_id=self.site.id)
+        mock_sync.assert_called_once_with(self.site)
+
+    def test_unknown_site(self):
+        """ CommandError should be raised if the site does not exist. """
+        with self.assertRaises(CommandError):
+            call_command(COMMAND, site_id=0)
+
+    def test_sync_failure(self):
+        """ CommandError should be raised once every site is synced, if the customers of a site fail to be. """
+        with mock.patch(SYNC, side_effect=Timeout) as mock_sync:
+            with self.assertRaises(CommandError):
+                call_command(COMMAND)
+        self.assertTrue(mock_sync.called)
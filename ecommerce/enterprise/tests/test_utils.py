@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+import json
 import uuid
 
 import ddt
@@ -9,7 +10,9 @@ from django.http.response import HttpResponse
 from edx_django_utils.cache import TieredCache
 from mock import patch
 from oscar.test.factories import VoucherFactory
+from slumber.exceptions import HttpServerError
 
+from ecommerce.enterprise.models import EnterpriseCustomer, EnterpriseCustomerDirectory
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
 from ecommerce.enterprise.utils import (
     enterprise_customer_user_needs_consent,
@@ -18,7 +21,9 @@ from ecommerce.enterprise.utils import (
     get_enterprise_customer_uuid,
     get_enterprise_customers,
     get_or_create_enterprise_customer_user,
-    set_enterprise_customer_cookie
+    search_enterprise_customers,
+    set_enterprise_customer_cookie,
+    sync_enterprise_customers
 )
 from ecommerce.extensions.test.factories import prepare_voucher
 from ecommerce.tests.testcases import TestCase
@@ -190,3 +195,105 @@ class EnterpriseUtilsTests(EnterpriseServiceMockMixin, TestCase):
 
         cached_response = get_enterprise_catalog(self.site, enterprise_catalog_uuid, 50, 1)
         self.assertEqual(response, cached_response)
+
+
+@httpretty.activate
+class EnterpriseCustomerDirectoryTests(EnterpriseServiceMockMixin, TestCase):
+    def setUp(self):
+        super(EnterpriseCustomerDirectoryTests, self).setUp()
+        self.customers = [
+            {
+                'uuid': str(uuid.uuid4()),
+                'name': name,
+                'active': True,
+                'enable_data_sharing_consent': True,
+                'enforce_data_sharing_consent': 'at_enrollment',
+                'contact_email': '',
+            } for name in ('Starfleet Academy', 'Millennium Falcon', 'starbase')
+        ]
+
+    def mock_customers(self):
+        self.mock_access_token_response()
+        httpretty.register_uri(
+            method=httpretty.GET,
+            uri=self.ENTERPRISE_CUSTOMER_URL,
+            body=json.dumps({'count': len(self.customers), 'next': None, 'results': self.customers}),
+            content_type='application/json'
+        )
+
+    def test_sync(self):
+        """ Verify new and changed customers are written, and customers no longer listed are deleted. """
+        self.mock_customers()
+        self.assertEqual(sync_enterprise_customers(self.site), {'created': 3, 'updated': 0, 'deleted': 0})
+
+        self.customers[0]['name'] = 'Starfleet Command'
+        self.customers[0]['active'] = False
+        deleted = self.customers.pop()
+        self.mock_customers()
+        self.mock_enterprise_customer_api_not_found(deleted['uuid'])
+        self.assertEqual(sync_enterprise_customers(self.site), {'created': 0, 'updated': 1, 'deleted': 1})
+
+        customer = EnterpriseCustomer.objects.get(uuid=self.customers[0]['uuid'])
+        self.assertEqual(customer.name, 'Starfleet Command')
+        self.assertFalse(customer.active)
+        self.assertFalse(EnterpriseCustomer.objects.filter(uuid=deleted['uuid']).exists())
+
+    def test_sync_unlisted_customer_kept(self):
+        """ Verify customers missing from the pages are only deleted if the API confirms they do not exist. """
+        self.mock_customers()
+        sync_enterprise_customers(self.site)
+
+        # The customer shifted to a page that was already read.
+        shifted = self.customers.pop()
+        self.mock_customers()
+        self.mock_specific_enterprise_customer_api(shifted['uuid'], name=shifted['name'])
+        self.assertEqual(sync_enterprise_customers(self.site), {'created': 0, 'updated': 0, 'deleted': 0})
+        self.assertTrue(EnterpriseCustomer.objects.filter(uuid=shifted['uuid']).exists())
+
+    def test_failed_sync(self):
+        """ Verify the customers written by a sync that fails are not relied on. """
+        self.mock_access_token_response()
+        first_page = {'count': 4, 'next': '{}?page=2'.format(self.ENTERPRISE_CUSTOMER_URL), 'results': self.customers}
+        httpretty.register_uri(
+            method=httpretty.GET,
+            uri=self.ENTERPRISE_CUSTOMER_URL,
+            responses=[
+                httpretty.Response(body=json.dumps(first_page), content_type='application/json'),
+                httpretty.Response(body='', status=500),
+            ]
+        )
+        with self.assertRaises(HttpServerError):
+            sync_enterprise_customers(self.site)
+
+        self.assertEqual(EnterpriseCustomer.objects.filter(site=self.site).count(), 3)
+        self.assertIsNone(search_enterprise_customers(self.site))
+        self.assertFalse(EnterpriseCustomerDirectory.is_synced(self.site))
+
+    def test_search(self):
+        """ Verify customers are searched by name once the directory is synced, and ordered by name. """
+        self.assertIsNone(search_enterprise_customers(self.site))
+
+        self.mock_customers()
+        sync_enterprise_customers(self.site)
+        self.assertEqual(
+            [customer.name for customer in search_enterprise_customers(self.site, 'star')],
+            ['starbase', 'Starfleet Academy']
+        )
+
+        with self.settings(ENTERPRISE_CUSTOMER_DIRECTORY_MAX_AGE=0):
+            self.assertIsNone(search_enterprise_customers(self.site))
+
+    def test_get_enterprise_customer(self):
+        """ Verify customers are read from the directory, once it is synced, instead of the Enterprise API. """
+        self.mock_customers()
+        sync_enterprise_customers(self.site)
+        httpretty.reset()
+
+        customer = self.customers[0]
+        self.assertEqual(get_enterprise_customer(self.site, customer['uuid']), {
+            'name': customer['name'],
+            'id': customer['uuid'],
+            'enable_data_sharing_consent': True,
+            'enforce_data_sharing_consent': 'at_enrollment',
+            'contact_email': '',
+        })
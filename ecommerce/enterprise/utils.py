@@ -6,19 +6,24 @@ import hmac
 import logging
 from collections import OrderedDict
 from urllib import urlencode
+from uuid import UUID
 
 import waffle
 from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Lower
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext as _
 from edx_django_utils.cache import TieredCache
 from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout
-from slumber.exceptions import SlumberHttpBaseException
+from slumber.exceptions import HttpNotFoundError, SlumberHttpBaseException
 
-from ecommerce.core.utils import deprecated_traverse_pagination
+from ecommerce.core.utils import iterate_pages
 from ecommerce.enterprise.exceptions import EnterpriseDoesNotExist
+from ecommerce.enterprise.models import EnterpriseCustomer, EnterpriseCustomerDirectory
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_ENTERPRISE
 
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
@@ -71,6 +76,16 @@ def get_enterprise_customer(site, uuid):
     if cached_response.is_found:
         return cached_response.value
 
+    enterprise_customer = get_synced_enterprise_customer(site, uuid)
+    if enterprise_customer:
+        enterprise_customer_response = enterprise_customer.as_dict()
+        TieredCache.set_all_tiers(
+            cache_key,
+            enterprise_customer_response,
+            settings.ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT
+        )
+        return enterprise_customer_response
+
     client = get_enterprise_api_client(site)
     path = [resource, str(uuid)]
     client = reduce(getattr, path, client)
@@ -108,12 +123,106 @@ def get_enterprise_customers(site):
                 'name': each['name'],
                 'id': each['uuid'],
             }
-            for each in deprecated_traverse_pagination(response, endpoint)
+            for page in iterate_pages(response, endpoint)
+            for each in page
         ],
         key=lambda k: k['name'].lower()
     )
 
 
+def get_synced_enterprise_customer(site, uuid):
+    """
+    Return the enterprise customer of the site with the given UUID from the directory, if the directory is synced
+    """
+    if not EnterpriseCustomerDirectory.is_synced(site):
+        return None
+    try:
+        uuid = UUID(str(uuid))
+    except ValueError:
+        return None
+    return EnterpriseCustomer.objects.filter(site=site, uuid=uuid).first()
+
+
+def search_enterprise_customers(site, search=None):
+    """
+    Return the enterprise customers of the site whose names contain the search text, ordered by name, from the
+    directory. None is returned if the directory is not synced.
+    """
+    if not EnterpriseCustomerDirectory.is_synced(site):
+        return None
+    enterprise_customers = EnterpriseCustomer.objects.filter(site=site)
+    if search:
+        enterprise_customers = enterprise_customers.filter(name__icontains=search)
+    return enterprise_customers.order_by(Lower('name'), 'id')
+
+
+def _is_enterprise_customer_deleted(endpoint, uuid):
+    try:
+        getattr(endpoint, str(uuid)).get()
+    except HttpNotFoundError:
+        return True
+    return False
+
+
+def sync_enterprise_customers(site):
+    """
+    Sync the directory of the site's enterprise customers with the Enterprise API.
+
+    Customers are read page by page. Only the customers which are new, or whose details changed, are written.
+    Customers no longer listed by the API are deleted once the API confirms they do not exist, since customers
+    deleted while the pages are read shift the following customers to earlier pages, that were already read.
+    The directory is only marked as synced once every customer is written.
+
+    Returns:
+        dict: Numbers of customers created, updated and deleted.
+    """
+    resource = 'enterprise-customer'
+    client = get_enterprise_api_client(site)
+    endpoint = getattr(client, resource)
+    response = endpoint.get()
+
+    started = timezone.now()
+    existing = {
+        enterprise_customer.uuid: enterprise_customer
+        for enterprise_customer in EnterpriseCustomer.objects.filter(site=site)
+    }
+    seen = set()
+    counts = {'created': 0, 'updated': 0, 'deleted': 0}
+
+    for page in iterate_pages(response, endpoint):
+        created = []
+        for each in page:
+            uuid = UUID(str(each['uuid']))
+            if uuid in seen:
+                # Customers created while the pages are read may shift others to the next page.
+                continue
+            seen.add(uuid)
+            values = dict(
+                (field, default if each.get(field) is None else each[field])
+                for field, default in EnterpriseCustomer.API_FIELDS
+            )
+            enterprise_customer = existing.get(uuid)
+            if enterprise_customer is None:
+                created.append(EnterpriseCustomer(site=site, uuid=uuid, **values))
+            elif any(getattr(enterprise_customer, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(enterprise_customer, field, value)
+                enterprise_customer.save()
+                counts['updated'] += 1
+
+        EnterpriseCustomer.objects.bulk_create(created)
+        counts['created'] += len(created)
+
+    deleted = [uuid for uuid in existing if uuid not in seen and _is_enterprise_customer_deleted(endpoint, uuid)]
+    with transaction.atomic():
+        if deleted:
+            EnterpriseCustomer.objects.filter(site=site, uuid__in=deleted).delete()
+        EnterpriseCustomerDirectory.objects.update_or_create(site=site, defaults={'synced': started})
+    counts['deleted'] = len(deleted)
+
+    return counts
+
+
 def get_enterprise_customer_consent_failed_context_data(request, voucher):
     """
     Get the template context to display a message informing the user that they were not enrolled in the course
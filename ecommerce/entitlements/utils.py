@@ -7,13 +7,13 @@ from django.db.models import Q
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
+from ecommerce.core.lookups import product_classes
 from ecommerce.extensions.catalogue.utils import generate_sku
 
 logger = logging.getLogger(__name__)
 Category = get_model('catalogue', 'Category')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
-ProductClass = get_model('catalogue', 'ProductClass')
 StockRecord = get_model('partner', 'StockRecord')
 
 
@@ -21,7 +21,7 @@ def create_parent_course_entitlement(name, UUID):
     """ Create the parent course entitlement product if it does not already exist. """
     parent, created = Product.objects.get_or_create(
         structure=Product.PARENT,
-        product_class=ProductClass.objects.get(name=COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME),
+        product_class=product_classes.get(COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME),
         attributes__name='UUID',
         attribute_values__value_text=UUID,
         defaults={
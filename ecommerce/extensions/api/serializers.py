@@ -16,6 +16,7 @@ from rest_framework import serializers
 from rest_framework.reverse import reverse
 
 from ecommerce.core.constants import (
+    ASYNC_COURSE_PUBLICATION_SWITCH,
     COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,
     COURSE_ID_REGEX,
     ISO_8601_FORMAT,
@@ -330,7 +331,7 @@ class BasketSerializer(serializers.ModelSerializer):
         return "None"
 
     def get_products(self, obj):
-        lines = BasketLine.objects.filter(basket=obj)
+        lines = BasketLine.objects.filter(basket=obj).select_related('product')
         products = [line.product for line in lines]
         serialized_data = []
         for product in products:
@@ -570,6 +571,11 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
                 if course.get_enrollment_code():
                     course.toggle_enrollment_code_status(is_active=create_or_activate_enrollment_code)
 
+                if waffle.switch_is_active(ASYNC_COURSE_PUBLICATION_SWITCH):
+                    # The queue entry is committed with the course, and published by a worker.
+                    course.queue_publication_to_lms()
+                    return created, None, None
+
                 resp_message = course.publish_to_lms()
                 published = (resp_message is None)
 
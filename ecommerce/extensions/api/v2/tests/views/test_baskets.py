@@ -35,7 +35,7 @@ from ecommerce.extensions.test.factories import (
 )
 from ecommerce.programs.tests.mixins import ProgramTestMixin
 from ecommerce.tests.factories import ProductFactory
-from ecommerce.tests.mixins import BasketCreationMixin, ThrottlingMixin
+from ecommerce.tests.mixins import BasketCreationMixin, PerformanceBudgetMixin, ThrottlingMixin
 from ecommerce.tests.testcases import TestCase, TransactionTestCase
 
 Basket = get_model('basket', 'Basket')
@@ -390,7 +390,7 @@ class BasketDestroyViewTests(TestCase):
         self.assertFalse(Basket.objects.filter(id=self.basket.id).exists())
 
 
-class BasketCalculateViewTests(ProgramTestMixin, TestCase):
+class BasketCalculateViewTests(PerformanceBudgetMixin, ProgramTestMixin, TestCase):
     def setUp(self):
         super(BasketCalculateViewTests, self).setUp()
         self.products = ProductFactory.create_batch(3, stockrecords__partner=self.partner, categories=[])
@@ -429,6 +429,12 @@ class BasketCalculateViewTests(ProgramTestMixin, TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, expected)
 
+    def test_basket_calculate_budget(self):
+        """ Verify calculating a basket without offers makes no HTTP requests, and a bounded number of queries. """
+        with self.assert_budget(max_queries=40, max_http_requests=0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
     @httpretty.activate
     def test_basket_calculate_site_offer(self):
         """ Verify successful basket calculation with a site offer """
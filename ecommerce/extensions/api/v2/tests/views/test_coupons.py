@@ -27,6 +27,7 @@ from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.api.v2.views.coupons import DEPRECATED_COUPON_CATEGORIES, CouponViewSet
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.voucher.models import CouponVouchers
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.constants import BENEFIT_MAP
 from ecommerce.programs.custom import class_path
@@ -585,6 +586,21 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
             self.assertEqual(voucher.start_datetime.year, 2030)
             self.assertEqual(voucher.end_datetime.year, 2035)
 
+    def test_update_datetimes_invalidates_snapshots(self):
+        """Test that updating a coupons date invalidates the cached snapshots of its vouchers."""
+        vouchers = self.coupon.attr.coupon_vouchers.vouchers.all()
+        for voucher in vouchers:
+            get_voucher_snapshot(voucher.code)
+
+        self.get_response_json(
+            'PUT',
+            reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id}),
+            data={'id': self.coupon.id, 'end_datetime': '2035-01-01'}
+        )
+
+        for voucher in vouchers:
+            self.assertEqual(get_voucher_snapshot(voucher.code).voucher.end_datetime.year, 2035)
+
     def test_update_benefit_value(self):
         """Test that updating a benefit value updates all of it's voucher offers."""
         path = reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id})
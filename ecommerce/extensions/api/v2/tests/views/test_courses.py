@@ -6,12 +6,14 @@ import jwt
 import mock
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from oscar.core.loading import get_class, get_model
 
-from ecommerce.core.constants import ISO_8601_FORMAT, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.constants import ASYNC_COURSE_PUBLICATION_SWITCH, ISO_8601_FORMAT, SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.tests import toggle_switch
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, CoursePublication
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api.v2.tests.views import JSON_CONTENT_TYPE, ProductSerializerMixin
@@ -109,6 +111,26 @@ class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
         response = self.client.get(self.list_path)
         self.assertDictEqual(json.loads(response.content), {'count': 0, 'next': None, 'previous': None, 'results': []})
 
+    def test_list_query_count(self):
+        """ Verify the number of queries needed to list courses does not depend on the number of courses. """
+        self.course.create_or_update_seat('verified', True, 100, create_enrollment_code=True)
+        self.client.get(self.list_path)
+
+        with CaptureQueriesContext(connection) as single_course:
+            response = self.client.get(self.list_path)
+        self.assertEqual(json.loads(response.content)['results'], [self.serialize_course(self.course)])
+
+        for index in range(3):
+            course = CourseFactory(id='course-v1:org+course+{}'.format(index), partner=self.partner)
+            course.create_or_update_seat('audit', False, 0)
+            course.create_or_update_seat('verified', True, 100, create_enrollment_code=True)
+
+        with CaptureQueriesContext(connection) as many_courses:
+            response = self.client.get(self.list_path)
+        self.assertEqual(len(json.loads(response.content)['results']), 4)
+
+        self.assertEqual(len(single_course), len(many_courses))
+
     def test_create(self):
         """ Verify the view can create a new Course."""
         Course.objects.all().delete()
@@ -206,3 +228,16 @@ class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
             mock_publish.return_value = True
             response = self.client.post(path)
             self.assert_publish_response(response, 200, 'Course [{course_id}] was successfully published to LMS.')
+
+    def test_publish_async(self):
+        """ Verify the view queues the course for publication if asynchronous publication is enabled. """
+        path = reverse('api:v2:course-publish', kwargs={'pk': self.course.id})
+        toggle_switch('publish_course_modes_to_lms', True)
+        toggle_switch(ASYNC_COURSE_PUBLICATION_SWITCH, True)
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            response = self.client.post(path)
+            self.assert_publish_response(response, 202, 'Course [{course_id}] was queued for publication to LMS.')
+
+        self.assertFalse(mock_publish.called)
+        self.assertEqual(self.course.publications.filter(status=CoursePublication.PENDING).count(), 1)
@@ -20,6 +20,7 @@ from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.enterprise.benefits import BENEFIT_MAP as ENTERPRISE_BENEFIT_MAP
 from ecommerce.enterprise.conditions import AssignableEnterpriseCustomerCondition
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
+from ecommerce.enterprise.models import EnterpriseCustomer, EnterpriseCustomerDirectory
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.invoice.models import Invoice
@@ -92,6 +93,24 @@ class TestEnterpriseCustomerView(EnterpriseServiceMockMixin, TestCase):
             }
         )
 
+    def test_get_customers_from_directory(self):
+        """ Verify customers are searched and paginated from the directory once it is synced. """
+        for name in ('Starfleet Academy', 'Millennium Falcon', 'starbase'):
+            EnterpriseCustomer.objects.create(site=self.site, uuid=uuid4(), name=name)
+        EnterpriseCustomerDirectory.objects.create(site=self.site, synced=now())
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        url = reverse('api:v2:enterprise:enterprise_customers')
+
+        result = self.client.get(url, {'search': 'star'})
+        self.assertEqual(
+            [customer['name'] for customer in result.json()['results']], ['starbase', 'Starfleet Academy']
+        )
+
+        result = self.client.get(url, {'page': 2, 'page_size': 2})
+        self.assertEqual(result.json()['count'], 3)
+        self.assertEqual([customer['name'] for customer in result.json()['results']], ['Starfleet Academy'])
+
 
 @ddt.ddt
 class EnterpriseCouponViewSetTest(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixin, ThrottlingMixin, TestCase):
@@ -9,13 +9,14 @@ from django.urls import reverse
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import (
+    ASYNC_COURSE_PUBLICATION_SWITCH,
     COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
     ISO_8601_FORMAT,
     SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.core.tests import toggle_switch
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, CoursePublication
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
@@ -317,6 +318,19 @@ class AtomicPublicationTests(DiscoveryTestMixin, TestCase):
             self.assert_course_saved(self.course_id, expected=self.data, enrollment_code_count=1)
             self.assertTrue(Product.objects.filter(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME).exists())
 
+    def test_create_async(self):
+        """Verify that the course is queued for publication, in the same transaction, if publication is async."""
+        toggle_switch(ASYNC_COURSE_PUBLICATION_SWITCH, True)
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            response = self.client.post(self.create_path, json.dumps(self.data), JSON_CONTENT_TYPE)
+
+        self.assertFalse(mock_publish.called)
+        self.assertEqual(response.status_code, 201)
+        self.assert_course_saved(self.course_id, expected=self.data, enrollment_code_count=1)
+        publication = CoursePublication.objects.get(course_id=self.course_id)
+        self.assertEqual(publication.status, CoursePublication.PENDING)
+
     def test_update(self):
         """Verify that a Course and associated products can be updated and published."""
         self.create_course_and_seats()
@@ -255,6 +255,18 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         self.assertNotIn(expired_seat, products)
         self.assertNotIn(future_enrollment_seat, products)
 
+    def test_retrieve_course_objects_ordered_by_seat_type(self):
+        """Verify seats are ordered as the seat types listed, whatever the spacing of the list."""
+        course = CourseFactory(partner=self.partner)
+        professional_seat = course.create_or_update_seat('professional', False, 100)
+        verified_seat = course.create_or_update_seat('verified', True, 50)
+        course_discovery_results = [{'key': course.id, 'enrollment_start': None, 'enrollment_end': None}]
+
+        products, __, __ = VoucherViewSet().retrieve_course_objects(
+            course_discovery_results, 'verified, professional'
+        )
+        self.assertEqual(products, [verified_seat, professional_seat])
+
 
 @ddt.ddt
 @httpretty.activate
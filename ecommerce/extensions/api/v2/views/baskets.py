@@ -32,6 +32,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment import exceptions as payment_exceptions
 from ecommerce.extensions.payment.helpers import get_default_processor_class, get_processor_class_by_name
+from ecommerce.extensions.voucher.utils import get_cached_voucher
 
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
@@ -430,7 +431,7 @@ class BasketCalculateView(generics.GenericAPIView):
 
         code = request.GET.get('code', None)
         try:
-            voucher = Voucher.objects.get(code=code) if code else None
+            voucher = get_cached_voucher(code) if code else None
         except Voucher.DoesNotExist:
             voucher = None
 
@@ -75,11 +75,7 @@ class CatalogViewSet(NestedViewSetMixin, ReadOnlyModelViewSet):
             results = response['results']
             course_ids = [result['key'] for result in results]
             seats = serializers.ProductSerializer(
-                Product.objects.filter(
-                    course_id__in=course_ids,
-                    attributes__name='certificate_type',
-                    attribute_values__value_text__in=seat_types
-                ),
+                Product.objects.filter(course_id__in=course_ids, certificate_type__in=seat_types),
                 many=True,
                 context={'request': request}
             ).data
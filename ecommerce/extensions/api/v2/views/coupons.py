@@ -26,6 +26,7 @@ from ecommerce.extensions.catalogue.utils import create_coupon_product, get_or_c
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.processors.invoice import InvoicePayment
 from ecommerce.extensions.voucher.models import CouponVouchers
+from ecommerce.extensions.voucher.snapshots import bump_voucher_versions
 from ecommerce.extensions.voucher.utils import (
     get_or_create_enterprise_offer,
     update_voucher_offer,
@@ -254,19 +255,15 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         Validate stock_record_ids and return a coupon catalog if applicable.
 
         When a black-listed course mode is received raise an exception.
-        Audit modes do not have a certificate type and therefore will raise
-        an AttributeError exception.
+        Audit modes do not have a certificate type and are not supported either.
         """
         if not stock_record_ids:
             return None
 
         seats = Product.objects.filter(stockrecords__id__in=stock_record_ids)
         for seat in seats:
-            try:
-                if seat.attr.certificate_type in settings.BLACK_LIST_COUPON_COURSE_MODES:
-                    validation_message = 'Course mode not supported'
-                    raise ValidationError(validation_message)
-            except AttributeError:
+            certificate_type = seat.get_snapshot_attribute('certificate_type')
+            if certificate_type is None or certificate_type in settings.BLACK_LIST_COUPON_COURSE_MODES:
                 validation_message = 'Course mode not supported'
                 raise ValidationError(validation_message)
 
@@ -345,6 +342,8 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         data = self.create_update_data_dict(data=request_data, fields=CouponVouchers.UPDATEABLE_VOUCHER_FIELDS)
         if data:
             vouchers.all().update(**data)
+            # The update does not send post_save, so the snapshots of the vouchers are invalidated explicitly.
+            bump_voucher_versions(vouchers.all())
 
     def create_update_data_dict(self, data, fields):
         """
@@ -7,7 +7,7 @@ from rest_framework.decorators import detail_route
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from ecommerce.core.constants import COURSE_ID_REGEX
+from ecommerce.core.constants import ASYNC_COURSE_PUBLICATION_SWITCH, COURSE_ID_REGEX
 from ecommerce.courses.models import Course
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
@@ -23,7 +23,7 @@ class CourseViewSet(NonDestroyableModelViewSet):
     )
     products_prefetch = Prefetch(
         'products',
-        queryset=Product.objects.select_related('parent__product_class').all()
+        queryset=Product.objects.select_related('product_class', 'parent__product_class').all()
     )
     lookup_value_regex = COURSE_ID_REGEX
     serializer_class = serializers.CourseSerializer
@@ -87,6 +87,11 @@ class CourseViewSet(NonDestroyableModelViewSet):
               'because the switch [publish_course_modes_to_lms] is disabled.'
 
         if waffle.switch_is_active('publish_course_modes_to_lms'):
+            if waffle.switch_is_active(ASYNC_COURSE_PUBLICATION_SWITCH):
+                course.queue_publication_to_lms()
+                msg = 'Course [{course_id}] was queued for publication to LMS.'
+                return Response({'status': msg.format(course_id=course.id)}, status=status.HTTP_202_ACCEPTED)
+
             published = course.publish_to_lms()
             if published:
                 msg = 'Course [{course_id}] was successfully published to LMS.'
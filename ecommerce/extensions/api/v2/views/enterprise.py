@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import logging
 
+import six
 import waffle
 from django.core.exceptions import ValidationError
 from oscar.core.loading import get_model
@@ -13,7 +14,7 @@ from rest_framework.response import Response
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
-from ecommerce.enterprise.utils import get_enterprise_customers
+from ecommerce.enterprise.utils import get_enterprise_customers, search_enterprise_customers
 from ecommerce.extensions.api.serializers import (
     CouponSerializer,
     CouponVoucherSerializer,
@@ -41,13 +42,54 @@ Voucher = get_model('voucher', 'Voucher')
 DEPRECATED_COUPON_CATEGORIES = ['Bulk Enrollment']
 
 
+class EnterpriseCustomerResults(object):
+    """ Names and UUIDs of the customers of the directory, read as they are sliced, e.g. by pagination. """
+
+    def __init__(self, queryset):
+        self.queryset = queryset.only('name', 'uuid')
+
+    def __len__(self):
+        return self.queryset.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._as_result(customer) for customer in self.queryset[index]]
+        return self._as_result(self.queryset[index])
+
+    def __iter__(self):
+        return (self._as_result(customer) for customer in self.queryset.iterator())
+
+    @staticmethod
+    def _as_result(customer):
+        return {'name': customer.name, 'id': six.text_type(customer.uuid)}
+
+
 class EnterpriseCustomerViewSet(generics.GenericAPIView):
 
     permission_classes = (IsAuthenticated, IsAdminUser,)
 
     def get(self, request):
+        """
+        List the enterprise customers of the site, ordered by name.
+
+        Customers are filtered by the "search" parameter, and paginated if a "page" is requested.
+        """
         site = request.site
-        return Response(data={'results': get_enterprise_customers(site)})
+        search = request.query_params.get('search')
+        enterprise_customers = search_enterprise_customers(site, search)
+        if enterprise_customers is None:
+            # The directory is not synced, the customers are read from the Enterprise API.
+            enterprise_customers = [
+                enterprise_customer for enterprise_customer in get_enterprise_customers(site)
+                if not search or search.lower() in enterprise_customer['name'].lower()
+            ]
+        else:
+            enterprise_customers = EnterpriseCustomerResults(enterprise_customers)
+
+        if 'page' in request.query_params:
+            page = self.paginate_queryset(enterprise_customers)
+            return self.get_paginated_response(list(page))
+        return Response(data={'results': list(enterprise_customers)})
 
 
 class EnterpriseCouponViewSet(CouponViewSet):
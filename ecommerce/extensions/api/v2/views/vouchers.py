@@ -24,6 +24,7 @@ from ecommerce.enterprise.utils import get_enterprise_catalog
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.voucher.utils import get_cached_voucher
 
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
@@ -73,7 +74,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         code = request.GET.get('code', '')
 
         try:
-            voucher = Voucher.objects.get(code=code)
+            voucher = get_cached_voucher(code)
         except Voucher.DoesNotExist:
             logger.error('Voucher with code %s not found.', code)
             return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -141,13 +142,15 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             elif is_course_run_enrollable(result):
                 course_run_metadata[result['key']] = result
 
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
-                course_id__in=course_run_metadata.keys(),
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
+        seat_types = [seat_type.strip().lower() for seat_type in course_seat_types.split(',')]
+        # The database may match certificate types differing in case or trailing spaces, which are ordered last.
+        seat_type_order = dict((seat_type, index) for index, seat_type in enumerate(seat_types))
+        products = sorted(
+            Product.objects.filter(course_id__in=course_run_metadata.keys(), certificate_type__in=seat_types),
+            key=lambda product: seat_type_order.get(
+                (product.certificate_type or '').strip().lower(), len(seat_types)
+            )
+        )
         stock_records = StockRecord.objects.filter(product__in=products)
         return products, stock_records, course_run_metadata
 
@@ -181,7 +184,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                         continue
                 else:
                     continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
+                credit_seats = Product.objects.filter(parent=product.parent, credit_provider__isnull=False)
 
                 if credit_seats.count() > 1:
                     multiple_credit_providers = True
@@ -343,7 +346,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             'multiple_credit_providers': multiple_credit_providers,
             'organization': CourseKey.from_string(course.id).org,
             'credit_provider_price': credit_provider_price,
-            'seat_type': product.attr.certificate_type,
+            'seat_type': product.get_snapshot_attribute('certificate_type'),
             'stockrecords': serializers.StockRecordSerializer(stock_record).data,
             'title': course_info.get('title', course.name),
             'voucher_end_date': voucher.end_datetime
@@ -42,7 +42,7 @@ from ecommerce.extensions.payment.forms import PaymentForm
 from ecommerce.extensions.payment.tests.processors import DummyProcessor
 from ecommerce.extensions.test.factories import create_order, prepare_voucher
 from ecommerce.tests.factories import ProductFactory, SiteConfigurationFactory, StockRecordFactory
-from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin
+from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin, PerformanceBudgetMixin
 from ecommerce.tests.testcases import TestCase
 
 Applicator = get_class('offer.applicator', 'Applicator')
@@ -309,7 +309,7 @@ class BasketAddItemsViewTests(
 @httpretty.activate
 @ddt.ddt
 class BasketSummaryViewTests(EnterpriseServiceMockMixin, DiscoveryTestMixin, DiscoveryMockMixin, LmsApiMockMixin,
-                             ApiMockMixin, BasketMixin, TestCase):
+                             ApiMockMixin, BasketMixin, PerformanceBudgetMixin, TestCase):
     """ BasketSummaryView basket view tests. """
     path = reverse('basket:summary')
 
@@ -376,6 +376,14 @@ class BasketSummaryViewTests(EnterpriseServiceMockMixin, DiscoveryTestMixin, Dis
         self.assertEqual(line_data['product_title'], title)
         self.assertEqual(line_data['product_description'], description)
 
+    def test_non_seat_product_budget(self):
+        """ Verify the summary of a basket without seats makes no outbound HTTP requests. """
+        self.create_basket_and_add_product(factories.ProductFactory())
+
+        with self.assert_budget(max_queries=60, max_http_requests=0):
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
     def test_enrollment_code_seat_type(self):
         """Verify the correct seat type attribute is retrieved."""
         course, __, enrollment_code = self.prepare_course_seat_and_enrollment_code()
@@ -13,6 +13,7 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.signals import voucher_addition
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookups import basket_attribute_types
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.offer.constants import CUSTOM_APPLICATOR_USE_FLAG
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
@@ -24,7 +25,6 @@ Applicator = get_class('offer.applicator', 'Applicator')
 CustomApplicator = get_class('offer.applicator', 'CustomApplicator')
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BUNDLE = 'bundle_identifier'
 ORGANIZATION_ATTRIBUTE_TYPE = 'organization'
 ENTERPRISE_CATALOG_ATTRIBUTE_TYPE = 'enterprise_catalog_uuid'
@@ -170,7 +170,7 @@ def _find_seat_enrollment_toggle_sku(product, target_structure):
     stock_records = StockRecord.objects.filter(
         product__course_id=product.course_id,
         product__structure=target_structure
-    )
+    ).select_related('product')
 
     # Determine the proper partner SKU to embed in the single/multiple basket switch link
     # The logic here is a little confusing.  "Seat" products have "certificate_type" attributes, and
@@ -179,11 +179,11 @@ def _find_seat_enrollment_toggle_sku(product, target_structure):
     # SKU from the corresponding Enrollment Code product.  If the basket is in multi-purchase mode,
     # we are working with an Enrollment Code product and must present the 'buy single' switch link
     # and SKU from the corresponding Seat product.
-    product_cert_type = getattr(product.attr, 'certificate_type', None)
-    product_seat_type = getattr(product.attr, 'seat_type', None)
+    product_cert_type = product.get_snapshot_attribute('certificate_type')
+    product_seat_type = product.get_snapshot_attribute('seat_type')
     for stock_record in stock_records:
-        stock_record_cert_type = getattr(stock_record.product.attr, 'certificate_type', None)
-        stock_record_seat_type = getattr(stock_record.product.attr, 'seat_type', None)
+        stock_record_cert_type = stock_record.product.get_snapshot_attribute('certificate_type')
+        stock_record_seat_type = stock_record.product.get_snapshot_attribute('seat_type')
         if (product_seat_type and product_seat_type == stock_record_cert_type) or \
                 (product_cert_type and product_cert_type == stock_record_seat_type):
             return stock_record.partner_sku
@@ -279,7 +279,7 @@ def basket_add_organization_attribute(basket, request_data):
     business_client = request_data.get(ORGANIZATION_ATTRIBUTE_TYPE)
 
     if business_client:
-        organization_attribute, __ = BasketAttributeType.objects.get_or_create(name=ORGANIZATION_ATTRIBUTE_TYPE)
+        organization_attribute, __ = basket_attribute_types.get_or_create(ORGANIZATION_ATTRIBUTE_TYPE)
         BasketAttribute.objects.get_or_create(
             basket=basket,
             attribute_type=organization_attribute,
@@ -301,9 +301,7 @@ def basket_add_enterprise_catalog_attribute(basket, request_data):
     # Value of enterprise catalog UUID is being passed as `catalog` from
     # basket page
     enterprise_catalog_uuid = request_data.get('catalog') if request_data else None
-    enterprise_catalog_attribute, __ = BasketAttributeType.objects.get_or_create(
-        name=ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
-    )
+    enterprise_catalog_attribute, __ = basket_attribute_types.get_or_create(ENTERPRISE_CATALOG_ATTRIBUTE_TYPE)
     if enterprise_catalog_uuid:
         BasketAttribute.objects.update_or_create(
             basket=basket,
@@ -338,7 +336,7 @@ def _set_basket_bundle_status(bundle, basket):
     if bundle:
         BasketAttribute.objects.update_or_create(
             basket=basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE),
+            attribute_type=basket_attribute_types.get(BUNDLE),
             defaults={'value_text': bundle}
         )
         basket.clear_vouchers()
@@ -388,7 +386,7 @@ def validate_voucher(voucher, user, basket, request_site):
     # Do not allow single course run coupons used on bundles.
     bundle_attribute = BasketAttribute.objects.filter(
         basket=basket,
-        attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
+        attribute_type=basket_attribute_types.get(BUNDLE)
     )
     is_bundle_purchase = len(bundle_attribute) > 0
     voucher_program_uuid = voucher.best_offer.condition.program_uuid
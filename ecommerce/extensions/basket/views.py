@@ -16,12 +16,14 @@ from opaque_keys.edx.keys import CourseKey
 from oscar.apps.basket.views import VoucherAddView as BaseVoucherAddView
 from oscar.apps.basket.views import VoucherRemoveView as BaseVoucherRemoveView
 from oscar.apps.basket.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
-from requests.exceptions import ConnectionError, Timeout
-from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.exceptions import SiteConfigurationError
+from ecommerce.core.lookups import basket_attribute_types
 from ecommerce.core.url_utils import get_lms_course_about_url, get_lms_url
-from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog
+from ecommerce.courses.utils import (
+    get_certificate_type_display_value,
+    get_course_info_from_catalog_for_products
+)
 from ecommerce.enterprise.entitlements import get_enterprise_code_redemption_redirect
 from ecommerce.enterprise.utils import CONSENT_FAILED_PARAM, get_enterprise_customer_from_voucher, has_enterprise_offer
 from ecommerce.extensions.analytics.utils import (
@@ -44,7 +46,6 @@ from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAM
 from ecommerce.extensions.payment.forms import PaymentForm
 
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 Benefit = get_model('offer', 'Benefit')
 logger = logging.getLogger(__name__)
 Product = get_model('catalogue', 'Product')
@@ -105,7 +106,7 @@ class BasketAddItemsView(View):
         # order to opt them in later as part of fulfillment
         BasketAttribute.objects.update_or_create(
             basket=request.basket,
-            attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+            attribute_type=basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE),
             defaults={'value_text': request.GET.get('email_opt_in') == 'true'},
         )
 
@@ -129,9 +130,9 @@ class BasketSummaryView(BasketView):
         """
         seat_type = None
         if product.is_seat_product or product.is_course_entitlement_product:
-            seat_type = get_certificate_type_display_value(product.attr.certificate_type)
+            seat_type = get_certificate_type_display_value(product.get_snapshot_attribute('certificate_type'))
         elif product.is_enrollment_code_product:
-            seat_type = get_certificate_type_display_value(product.attr.seat_type)
+            seat_type = get_certificate_type_display_value(product.get_snapshot_attribute('seat_type'))
         return seat_type
 
     @newrelic.agent.function_trace()
@@ -144,17 +145,18 @@ class BasketSummaryView(BasketView):
         return date
 
     @newrelic.agent.function_trace()
-    def _get_course_data(self, product):
+    def _get_course_data(self, product, course):
         """
         Return course data.
 
         Args:
             product (Product): A product that has course_key as attribute (seat or bulk enrollment coupon)
+            course (dict): Course or course run information from the Discovery Service, or None if unavailable
         Returns:
             Dictionary containing course name, course key, course image URL and description.
         """
         if product.is_seat_product:
-            course_key = CourseKey.from_string(product.attr.course_key)
+            course_key = CourseKey.from_string(product.get_snapshot_attribute('course_key'))
         else:
             course_key = None
         course_name = None
@@ -162,10 +164,8 @@ class BasketSummaryView(BasketView):
         short_description = None
         course_start = None
         course_end = None
-        course = None
 
-        try:
-            course = get_course_info_from_catalog(self.request.site, product)
+        if course:
             try:
                 image_url = course['image']['src']
             except (KeyError, TypeError):
@@ -179,11 +179,11 @@ class BasketSummaryView(BasketView):
             # template overrides can make use of them.
             course_start = self._deserialize_date(course.get('start'))
             course_end = self._deserialize_date(course.get('end'))
-        except (ConnectionError, SlumberBaseException, Timeout):
-            logger.exception('Failed to retrieve data from Discovery Service for course [%s].', course_key)
+        else:
+            logger.error('Failed to retrieve data from Discovery Service for course [%s].', course_key)
 
         if self.request.basket.num_items == 1 and product.is_enrollment_code_product:
-            course_key = CourseKey.from_string(product.attr.course_key)
+            course_key = CourseKey.from_string(product.get_snapshot_attribute('course_key'))
             if course and course.get('marketing_url', None):
                 course_about_url = course['marketing_url']
             else:
@@ -236,12 +236,19 @@ class BasketSummaryView(BasketView):
         is_enrollment_code_purchase = False
         switch_link_text = partner_sku = order_details_msg = None
 
+        # The course information of every line is fetched at once, rather than line by line.
+        courses = get_course_info_from_catalog_for_products(self.request.site, [
+            line.product for line in lines if line.product.is_seat_product or
+            line.product.is_course_entitlement_product or line.product.is_enrollment_code_product
+        ])
+
         for line in lines:
             if line.product.is_seat_product or line.product.is_course_entitlement_product:
-                line_data = self._get_course_data(line.product)
-                certificate_type = line.product.attr.certificate_type
+                line_data = self._get_course_data(line.product, courses.get(line.product.id))
+                certificate_type = line.product.get_snapshot_attribute('certificate_type')
 
-                if getattr(line.product.attr, 'id_verification_required', False) and certificate_type != 'credit':
+                id_verification_required = line.product.get_snapshot_attribute('id_verification_required', False)
+                if id_verification_required and certificate_type != 'credit':
                     display_verification_message = True
 
                 if line.product.is_course_entitlement_product:
@@ -261,7 +268,7 @@ class BasketSummaryView(BasketView):
                             'After you complete your order you will be automatically enrolled in the course.'
                         )
             elif line.product.is_enrollment_code_product:
-                line_data = self._get_course_data(line.product)
+                line_data = self._get_course_data(line.product, courses.get(line.product.id))
                 is_enrollment_code_purchase = True
                 show_voucher_form = False
                 order_details_msg = _(
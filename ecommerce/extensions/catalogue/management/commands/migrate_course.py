@@ -11,16 +11,19 @@ from django.core.management import BaseCommand
 from django.db import transaction
 from edx_rest_api_client.client import EdxRestApiClient
 
+from ecommerce.courses.importers import BulkCourseImporter
 from ecommerce.courses.models import Course
 
 logger = logging.getLogger(__name__)
 
 
 class MigratedCourse(object):
-    def __init__(self, course_id, site_domain):
-        self.site = Site.objects.get(domain=site_domain)
-        self.site_configuration = self.site.siteconfiguration
-        self.course, _created = Course.objects.get_or_create(id=course_id, partner=self.site_configuration.partner)
+    def __init__(self, course_id, site_domain=None, site_configuration=None):
+        self.site_configuration = site_configuration or Site.objects.get(domain=site_domain).siteconfiguration
+        self.site = self.site_configuration.site
+        self.course_id = course_id
+        # Set by load_from_lms. The course is only created once its data is retrieved from the LMS.
+        self.course = None
 
     def load_from_lms(self):
         """
@@ -30,6 +33,9 @@ class MigratedCourse(object):
         """
         name, verification_deadline, modes = self._retrieve_data_from_lms()
 
+        self.course, _created = Course.objects.get_or_create(
+            id=self.course_id, partner=self.site_configuration.partner
+        )
         self.course.name = name
         self.course.verification_deadline = verification_deadline
         self.course.save()
@@ -46,12 +52,12 @@ class MigratedCourse(object):
         """Get course name and verification deadline from the Commerce API."""
         commerce_api_client = self.site_configuration.commerce_api_client
 
-        data = commerce_api_client.courses(self.course.id).get()
+        data = commerce_api_client.courses(self.course_id).get()
         logger.debug(data)
         course_name = data.get('name')
 
         if course_name is None:
-            message = 'Unable to retrieve course name for {}.'.format(self.course.id)
+            message = 'Unable to retrieve course name for {}.'.format(self.course_id)
             logger.error(message)
             raise Exception(message)
 
@@ -66,12 +72,12 @@ class MigratedCourse(object):
             self.site_configuration.build_lms_url('/api/course_structure/v0/'),
             jwt=self.site_configuration.access_token
         )
-        data = api_client.courses(self.course.id).get()
+        data = api_client.courses(self.course_id).get()
         logger.debug(data)
 
         course_name = data.get('name')
         if course_name is None:
-            message = 'Aborting migration. No name is available for {}.'.format(self.course.id)
+            message = 'Aborting migration. No name is available for {}.'.format(self.course_id)
             logger.error(message)
             raise Exception(message)
 
@@ -83,7 +89,7 @@ class MigratedCourse(object):
 
     def _query_enrollment_api(self, headers):
         """Get modes and pricing from Enrollment API."""
-        url = self._build_lms_url('api/enrollment/v1/course/{}?include_expired=1'.format(self.course.id))
+        url = self._build_lms_url('api/enrollment/v1/course/{}?include_expired=1'.format(self.course_id))
         response = requests.get(url, headers=headers)
 
         if response.status_code != 200:
@@ -119,16 +125,35 @@ class MigratedCourse(object):
 
         return course_name, course_verification_deadline, modes
 
+    def get_import_spec(self):
+        """
+        Retrieves the course from the LMS, and returns it in the format expected by BulkCourseImporter.
+        """
+        name, verification_deadline, modes = self._retrieve_data_from_lms()
+        return {
+            'id': self.course_id,
+            'name': name,
+            'verification_deadline': verification_deadline,
+            'seats': [self._get_seat_spec(mode) for mode in modes],
+        }
+
+    def _get_seat_spec(self, mode):
+        """ Returns the seat data for an LMS course mode. """
+        expires = mode.get('expiration_datetime')
+        return {
+            'certificate_type': Course.certificate_type_for_mode(mode['slug']),
+            'id_verification_required': Course.is_mode_verified(mode['slug']),
+            'price': mode['min_price'],
+            'expires': parse(expires) if expires else None,
+        }
+
     def _get_products(self, modes):
         """ Creates/updates course seat products. """
         for mode in modes:
-            certificate_type = Course.certificate_type_for_mode(mode['slug'])
-            id_verification_required = Course.is_mode_verified(mode['slug'])
-            price = mode['min_price']
-            expires = mode.get('expiration_datetime')
-            expires = parse(expires) if expires else None
+            seat = self._get_seat_spec(mode)
             self.course.create_or_update_seat(
-                certificate_type, id_verification_required, price, expires=expires, remove_stale_modes=False
+                seat['certificate_type'], seat['id_verification_required'], seat['price'], expires=seat['expires'],
+                remove_stale_modes=False
             )
 
 
@@ -149,6 +174,24 @@ class Command(BaseCommand):
                             dest='site_domain',
                             default=None,
                             help='Domain for the ecommerce site providing the course.')
+        parser.add_argument('--bulk',
+                            action='store_true',
+                            dest='bulk',
+                            default=False,
+                            help='Retrieve all courses from the LMS first, then save and publish them in batches '
+                                 'using set-based queries.')
+        parser.add_argument('--batch_size',
+                            action='store',
+                            dest='batch_size',
+                            default=100,
+                            type=int,
+                            help='Number of courses saved per batch when using --bulk.')
+        parser.add_argument('--concurrency',
+                            action='store',
+                            dest='concurrency',
+                            default=1,
+                            type=int,
+                            help='Number of courses published to the LMS in parallel when using --bulk.')
 
     def handle(self, *args, **options):
         course_ids = options.get('course_ids', [])
@@ -158,6 +201,10 @@ class Command(BaseCommand):
             logger.error('Courses cannot be migrated without providing a site domain.')
             return
 
+        if options.get('bulk', False):
+            self._migrate_in_bulk(course_ids, site_domain, options)
+            return
+
         for course_id in course_ids:
             course_id = unicode(course_id)
             try:
@@ -195,3 +242,37 @@ class Command(BaseCommand):
                         raise Exception('Forced rollback.')
             except Exception:  # pylint: disable=broad-except
                 logger.exception('Failed to migrate [%s]!', course_id)
+
+    def _migrate_in_bulk(self, course_ids, site_domain, options):
+        """
+        Retrieve the courses from the LMS, then save and publish them in batches.
+
+        The courses are retrieved before any transaction is started, and each batch is only published to the LMS
+        once it is committed, so courses which are not saved are never published.
+        """
+        commit = options.get('commit', False)
+        publish = commit and waffle.switch_is_active('publish_course_modes_to_lms')
+        if commit and not publish:
+            logger.info('Data will not be published to LMS because the switch '
+                        '[publish_course_modes_to_lms] is disabled.')
+
+        site_configuration = Site.objects.get(domain=site_domain).siteconfiguration
+        specs = []
+        for course_id in course_ids:
+            course_id = unicode(course_id)
+            try:
+                specs.append(MigratedCourse(course_id, site_configuration=site_configuration).get_import_spec())
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to migrate [%s]!', course_id)
+
+        importer = BulkCourseImporter(site_configuration.partner, batch_size=options.get('batch_size', 100))
+        if commit:
+            errors = importer.import_courses(specs, publish=publish, concurrency=options.get('concurrency', 1))
+            for course_id, error in errors.items():
+                logger.error('Failed to publish [%s] to LMS: %s', course_id, error)
+            logger.info('[%d] courses were saved to the database.', len(specs))
+        else:
+            with transaction.atomic():
+                importer.import_courses(specs)
+                logger.info('[%d] courses were NOT saved to the database.', len(specs))
+                transaction.set_rollback(True)
@@ -1,15 +1,19 @@
 from __future__ import unicode_literals
 
+import json
 import logging
+import os
 import time
+from multiprocessing.pool import ThreadPool
 
 from dateutil import parser
 from django.core.management import BaseCommand, CommandError
+from django.db.models import Case, DateTimeField, Value, When
 from edx_rest_api_client.client import EdxRestApiClient
 from slumber.exceptions import HttpClientError
 
 from ecommerce.core.url_utils import get_lms_url
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, Product
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +26,10 @@ class Command(BaseCommand):
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     logger.addHandler(ch)
-    enrollment_date_not_found = set()
     pause_time = 5
     max_tries = 5
+    page_size = 50
+    seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
 
     def add_arguments(self, par):
         par.add_argument('--commit',
@@ -33,86 +38,193 @@ class Command(BaseCommand):
                          default=False,
                          help='Save the data to the database. If this is not set, '
                               'expires date will not be updated')
+        par.add_argument('--concurrency',
+                         action='store',
+                         dest='concurrency',
+                         default=4,
+                         type=int,
+                         help='Number of course pages fetched from the LMS in parallel.')
+        par.add_argument('--chunk_size',
+                         action='store',
+                         dest='chunk_size',
+                         default=500,
+                         type=int,
+                         help='Number of courses whose seats are updated with a single query.')
+        par.add_argument('--checkpoint_file',
+                         action='store',
+                         dest='checkpoint_file',
+                         default=None,
+                         help='Path to a file recording the enrollment end dates already applied. Courses whose '
+                              'enrollment end date has not changed since they were recorded are skipped, which '
+                              'makes runs incremental and allows an interrupted run to be resumed.')
 
     def handle(self, *args, **options):
-        seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
+        start_time = time.time()
         save_to_db = options.get('commit', False)
-        courses_enrollment_info = self._get_courses_enrollment_info()
+        chunk_size = options.get('chunk_size', 500)
+        checkpoint_file = options.get('checkpoint_file')
+        checkpoint = self._load_checkpoint(checkpoint_file)
+        courses_enrollment_info = self._get_courses_enrollment_info(options.get('concurrency', 4))
 
         if not courses_enrollment_info:
             msg = 'No course enrollment information found.'
             logger.error(msg)
             raise CommandError(msg)
 
-        courses = Course.objects.all().order_by('id')
-        logger.info('[%d] courses found for update.', courses.count())
-
-        for course in courses:
-            enrollment_end_date = courses_enrollment_info.get(course.id)
-
-            # Only proceed if course enrollment information is present
-            if not enrollment_end_date:
-                logger.error('Enrollment missing for course [%s]', course.id)
-                continue
-
-            if save_to_db:
-                course_seats = course.seat_products.filter(
-                    attributes__name='certificate_type',
-                    attribute_values__value_text__in=seats_to_update
-                )
-                expires = parser.parse(enrollment_end_date)
-                course_seats.update(expires=expires)
-                logger.info(
-                    'Updated expiration date for [%s] seats: [%s]',
-                    course.id,
-                    ', '.join([str(seat.id) for seat in course_seats]),
-                )
-
-    def _get_courses_enrollment_info(self):
-        """
-        Retrieve the enrollment information for all the courses.
+        course_ids = list(Course.objects.all().order_by('id').values_list('id', flat=True))
+        logger.info('[%d] courses found for update.', len(course_ids))
 
-        Returns:
-            Dictionary representing the key-value pair (course_key, enrollment_end) of course.
+        for index in range(0, len(course_ids), chunk_size):
+            changed = {}
+            for course_id in course_ids[index:index + chunk_size]:
+                enrollment_end_date = courses_enrollment_info.get(course_id)
+
+                # Only proceed if course enrollment information is present
+                if not enrollment_end_date:
+                    logger.error('Enrollment missing for course [%s]', course_id)
+                    continue
+
+                if checkpoint.get(course_id) != enrollment_end_date:
+                    changed[course_id] = enrollment_end_date
+
+            if save_to_db and changed:
+                self._update_seats(changed)
+                checkpoint.update(changed)
+                self._save_checkpoint(checkpoint_file, checkpoint)
+
+        elapsed = max(time.time() - start_time, 0.001)
+        logger.info(
+            'Processed [%d] courses in [%.2f] seconds ([%.1f] courses per second).',
+            len(course_ids),
+            elapsed,
+            len(course_ids) / elapsed
+        )
+
+    def _update_seats(self, enrollment_end_dates):
         """
-        def _parse_response(api_response):
-            response_data = api_response.get('results', [])
+        Update the expiration date of the seats of several courses with a single query.
 
-            # Map course_id with enrollment end date.
-            courses_enrollment = dict(
-                (course_info['course_id'], course_info['enrollment_end'])
-                for course_info in response_data
+        Arguments:
+            enrollment_end_dates (dict): Mapping of course ID to the course's enrollment end date.
+        """
+        expiration_dates = dict(
+            (course_id, parser.parse(enrollment_end)) for course_id, enrollment_end in enrollment_end_dates.items()
+        )
+        seats = Product.objects.filter(
+            course_id__in=expiration_dates.keys(),
+            structure=Product.CHILD,
+            certificate_type__in=self.seats_to_update
+        ).values_list('id', 'course_id', 'expires')
+
+        seat_ids_by_course = {}
+        for seat_id, course_id, expires in seats:
+            if expires != expiration_dates[course_id]:
+                seat_ids_by_course.setdefault(course_id, []).append(seat_id)
+
+        if not seat_ids_by_course:
+            return
+
+        Product.objects.filter(
+            id__in=[seat_id for seat_ids in seat_ids_by_course.values() for seat_id in seat_ids]
+        ).update(expires=Case(
+            *[When(course_id=course_id, then=Value(expiration_dates[course_id])) for course_id in seat_ids_by_course],
+            output_field=DateTimeField()
+        ))
+
+        for course_id in sorted(seat_ids_by_course):
+            logger.info(
+                'Updated expiration date for [%s] seats: [%s]',
+                course_id,
+                ', '.join([str(seat_id) for seat_id in seat_ids_by_course[course_id]]),
             )
-            return courses_enrollment, api_response['pagination'].get('next', None)
 
-        querystring = {'page_size': 50}
-        api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
-        course_enrollments = {}
+    def _load_checkpoint(self, checkpoint_file):
+        """ Returns the enrollment end dates recorded by previous runs, keyed by course ID. """
+        if not checkpoint_file or not os.path.exists(checkpoint_file):
+            return {}
+
+        with open(checkpoint_file, 'r') as file_handler:
+            return json.load(file_handler)
 
-        page = 0
+    def _save_checkpoint(self, checkpoint_file, checkpoint):
+        """ Records the enrollment end dates applied so far, so that they are skipped by later runs. """
+        if not checkpoint_file:
+            return
+
+        # Write to a temporary file first, so that an interrupted run never leaves a truncated checkpoint behind.
+        tmp_file = '{}.tmp'.format(checkpoint_file)
+        with open(tmp_file, 'w') as file_handler:
+            json.dump(checkpoint, file_handler)
+        os.rename(tmp_file, checkpoint_file)
+
+    def _get_page(self, page):
+        """
+        Retrieve a single page of courses from the LMS, waiting and retrying when rate-limited.
+
+        Returns:
+            dict: The API response.
+        """
+        api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
         throttling_attempts = 0
-        next_page = True
-        while next_page:
-            page += 1
-            querystring['page'] = page
+        while True:
             try:
-                response = api.courses().get(**querystring)
-                throttling_attempts = 0
+                return api.courses().get(page=page, page_size=self.page_size)
             except HttpClientError as exc:
                 # this is a known limitation; If we get HTTP429, we need to pause execution for a few seconds
                 # before re-requesting the data. raise any other errors
                 if exc.response.status_code == 429 and throttling_attempts < self.max_tries:
+                    # Honor the server's Retry-After hint, otherwise back off exponentially.
+                    retry_after = exc.response.headers.get('Retry-After')
+                    pause_time = int(retry_after) if retry_after and retry_after.isdigit() else \
+                        self.pause_time * 2 ** throttling_attempts
                     logger.warning(
                         'API calls are being rate-limited. Waiting for [%d] seconds before retrying...',
-                        self.pause_time
+                        pause_time
                     )
-                    time.sleep(self.pause_time)
-                    page -= 1
+                    time.sleep(pause_time)
                     throttling_attempts += 1
                     logger.info('Retrying [%d]...', throttling_attempts)
-                    continue
                 else:
                     raise
-            enrollment_info, next_page = _parse_response(response)
-            course_enrollments.update(enrollment_info)
+
+    def _get_courses_enrollment_info(self, concurrency=1):
+        """
+        Retrieve the enrollment information for all the courses.
+
+        The first page reveals the total number of pages, which are then fetched concurrently. If the
+        response does not include the number of pages, the remaining pages are fetched one at a time.
+
+        Returns:
+            Dictionary representing the key-value pair (course_key, enrollment_end) of course.
+        """
+        def _parse_response(api_response):
+            response_data = api_response.get('results', [])
+
+            # Map course_id with enrollment end date.
+            return dict(
+                (course_info['course_id'], course_info['enrollment_end'])
+                for course_info in response_data
+            )
+
+        response = self._get_page(1)
+        course_enrollments = _parse_response(response)
+        pagination = response.get('pagination', {})
+        num_pages = pagination.get('num_pages')
+
+        if num_pages and concurrency > 1:
+            pool = ThreadPool(concurrency)
+            try:
+                for page_response in pool.imap_unordered(self._get_page, range(2, num_pages + 1)):
+                    course_enrollments.update(_parse_response(page_response))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            page = 1
+            while pagination.get('next'):
+                page += 1
+                response = self._get_page(page)
+                course_enrollments.update(_parse_response(response))
+                pagination = response.get('pagination', {})
+
         return course_enrollments
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from hashlib import md5
+
+from django.db import migrations, models
+
+
+def get_stock_records_fingerprint(stock_record_ids):
+    """Returns the fingerprint identifying a set of stock records, regardless of their order.
+
+    Copied from ecommerce.extensions.catalogue.models, so the migration does not depend on the current models.
+    """
+    stock_record_ids = sorted(set(int(stock_record_id) for stock_record_id in stock_record_ids))
+    if not stock_record_ids:
+        return ''
+    return md5(','.join(str(stock_record_id) for stock_record_id in stock_record_ids)).hexdigest()
+
+
+def populate_fingerprints(apps, schema_editor):
+    """Compute the stock records fingerprint of existing catalogs."""
+    Catalog = apps.get_model('catalogue', 'Catalog')
+
+    stock_record_ids_by_catalog = {}
+    for catalog_id, stock_record_id in Catalog.stock_records.through.objects.values_list(
+            'catalog_id', 'stockrecord_id'
+    ):
+        stock_record_ids_by_catalog.setdefault(catalog_id, []).append(stock_record_id)
+
+    for catalog_id, stock_record_ids in stock_record_ids_by_catalog.items():
+        Catalog.objects.filter(id=catalog_id).update(
+            stock_records_fingerprint=get_stock_records_fingerprint(stock_record_ids)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0033_add_coupon_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalog',
+            name='stock_records_fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Hash of the IDs of the stock records in this catalog, used to look up catalogs by content.', max_length=32),
+        ),
+        migrations.RunPython(populate_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+SNAPSHOT_FIELDS = {
+    'certificate_type': ('certificate_type', 'value_text'),
+    'course_key': ('course_key', 'value_text'),
+    'credit_provider': ('credit_provider', 'value_text'),
+    'id_verification_required': ('id_verification_required', 'value_boolean'),
+    'seat_type': ('seat_type', 'value_text'),
+    'UUID': ('uuid', 'value_text'),
+}
+BATCH_SIZE = 1000
+
+
+def populate_attribute_snapshots(apps, schema_editor):
+    """Copy the values of the snapshot attributes to the new product fields."""
+    Product = apps.get_model('catalogue', 'Product')
+    ProductAttributeValue = apps.get_model('catalogue', 'ProductAttributeValue')
+
+    for code, (field, value_field) in SNAPSHOT_FIELDS.items():
+        product_ids_by_value = {}
+        values = ProductAttributeValue.objects.filter(attribute__code=code).values_list('product_id', value_field)
+        for product_id, value in values.iterator():
+            product_ids_by_value.setdefault(value, []).append(product_id)
+
+        for value, product_ids in product_ids_by_value.items():
+            for index in range(0, len(product_ids), BATCH_SIZE):
+                Product.objects.filter(id__in=product_ids[index:index + BATCH_SIZE]).update(**{field: value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0034_catalog_stock_records_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='certificate_type',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='course_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='credit_provider',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='id_verification_required',
+            field=models.NullBooleanField(editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='seat_type',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='uuid',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(populate_attribute_snapshots, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
+from hashlib import md5
+
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
-from django.db.models.signals import post_init, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.catalogue.abstract_models import AbstractProduct
@@ -13,6 +16,16 @@ from ecommerce.core.constants import (
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.journals.constants import JOURNAL_PRODUCT_CLASS_NAME  # TODO: journals dependency
 
+# Attributes read on hot paths, mapped to the Product fields holding a copy of their values.
+ATTRIBUTE_SNAPSHOT_FIELDS = {
+    'certificate_type': 'certificate_type',
+    'course_key': 'course_key',
+    'credit_provider': 'credit_provider',
+    'id_verification_required': 'id_verification_required',
+    'seat_type': 'seat_type',
+    'UUID': 'uuid',
+}
+
 
 class Product(AbstractProduct):
     course = models.ForeignKey(
@@ -22,6 +35,15 @@ class Product(AbstractProduct):
                                    help_text=_('Last date/time on which this product can be purchased.'))
     original_expires = None
 
+    # Snapshot of the attributes in ATTRIBUTE_SNAPSHOT_FIELDS, kept in sync whenever the product or one of
+    # its attribute values is saved. Reading and filtering on these fields avoids joining attribute values.
+    certificate_type = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+    course_key = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+    credit_provider = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    id_verification_required = models.NullBooleanField(editable=False)
+    seat_type = models.CharField(max_length=255, null=True, blank=True, editable=False)
+    uuid = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+
     @property
     def is_seat_product(self):
         return self.get_product_class().name == SEAT_PRODUCT_CLASS_NAME
@@ -43,6 +65,18 @@ class Product(AbstractProduct):
     def is_coupon_product(self):
         return self.get_product_class().name == COUPON_PRODUCT_CLASS_NAME
 
+    def get_snapshot_attribute(self, code, default=None):
+        """Returns the value of an attribute listed in ATTRIBUTE_SNAPSHOT_FIELDS, or default if it is not set.
+
+        The value is read from the snapshot fields, unless attribute values have been loaded or
+        assigned through attr, so that unsaved values are returned and no query is needed.
+        """
+        if self.attr.initialised or code in self.attr.__dict__:
+            return getattr(self.attr, code, default)
+
+        value = getattr(self, ATTRIBUTE_SNAPSHOT_FIELDS[code])
+        return default if value is None else value
+
     def save(self, *args, **kwargs):
         try:
             if not isinstance(self.attr.note, basestring) and self.attr.note is not None:
@@ -51,6 +85,11 @@ class Product(AbstractProduct):
                 )
         except AttributeError:
             pass
+
+        # Reading the note above loaded the attribute values, including any unsaved ones.
+        for code, field in ATTRIBUTE_SNAPSHOT_FIELDS.items():
+            setattr(self, field, getattr(self.attr, code, None))
+
         super(Product, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
 
 
@@ -65,6 +104,21 @@ def update_original_expires(sender, **kwargs):  # pylint: disable=unused-argumen
     instance.original_expires = instance.expires
 
 
+@receiver(post_save, sender='catalogue.ProductAttributeValue')
+@receiver(post_delete, sender='catalogue.ProductAttributeValue')
+def update_attribute_snapshot(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Keeps the attribute snapshot of a product in sync with attribute values saved or deleted directly."""
+    try:
+        field = ATTRIBUTE_SNAPSHOT_FIELDS.get(instance.attribute.code)
+    except ObjectDoesNotExist:
+        # The attribute itself is being deleted.
+        return
+
+    if field:
+        value = None if kwargs.get('signal') == post_delete else instance.value
+        Product.objects.filter(id=instance.product_id).update(**{field: value})
+
+
 @receiver(post_save, sender=Product)
 def update_enrollment_code(sender, **kwargs):  # pylint: disable=unused-argument
     """Updates a seat's enrollment code when the seat is updated.
@@ -90,6 +144,10 @@ class Catalog(models.Model):
     name = models.CharField(max_length=255)
     partner = models.ForeignKey('partner.Partner', related_name='catalogs', on_delete=models.CASCADE)
     stock_records = models.ManyToManyField('partner.StockRecord', blank=True, related_name='catalogs')
+    stock_records_fingerprint = models.CharField(
+        max_length=32, blank=True, default='', db_index=True, editable=False,
+        help_text=_('Hash of the IDs of the stock records in this catalog, used to look up catalogs by content.')
+    )
 
     def __unicode__(self):
         return u'{id}: {partner_code}-{catalog_name}'.format(
@@ -98,4 +156,58 @@ class Catalog(models.Model):
             catalog_name=self.name
         )
 
+
+def get_stock_records_fingerprint(stock_record_ids):
+    """Returns the fingerprint identifying a set of stock records, regardless of their order."""
+    stock_record_ids = sorted(set(int(stock_record_id) for stock_record_id in stock_record_ids))
+    if not stock_record_ids:
+        return ''
+    return md5(','.join(str(stock_record_id) for stock_record_id in stock_record_ids)).hexdigest()
+
+
+def update_stock_records_fingerprints(catalog_ids):
+    """Recomputes the stock records fingerprint of the given catalogs."""
+    stock_record_ids_by_catalog = dict((catalog_id, []) for catalog_id in catalog_ids)
+    for catalog_id, stock_record_id in Catalog.stock_records.through.objects.filter(
+            catalog_id__in=catalog_ids
+    ).values_list('catalog_id', 'stockrecord_id'):
+        stock_record_ids_by_catalog[catalog_id].append(stock_record_id)
+
+    for catalog_id, stock_record_ids in stock_record_ids_by_catalog.items():
+        Catalog.objects.filter(id=catalog_id).update(
+            stock_records_fingerprint=get_stock_records_fingerprint(stock_record_ids)
+        )
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through)
+def update_catalog_fingerprint(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """Keeps the stock records fingerprint of catalogs in sync with their stock records.
+
+    The relation can be modified from both sides. When it is modified from a
+    stock record, every catalog the stock record is added to or removed from
+    needs its fingerprint recomputed.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            update_stock_records_fingerprints([instance.id])
+    elif action == 'pre_clear':
+        instance._cleared_catalog_ids = list(instance.catalogs.values_list('id', flat=True))
+    elif action == 'post_clear':
+        update_stock_records_fingerprints(getattr(instance, '_cleared_catalog_ids', []))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        update_stock_records_fingerprints(pk_set)
+
+
+@receiver(pre_delete, sender='partner.StockRecord')
+def collect_stock_record_catalogs(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Remembers the catalogs of a stock record, whose catalog memberships are deleted along with it."""
+    instance._deleted_from_catalog_ids = list(instance.catalogs.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender='partner.StockRecord')
+def update_deleted_stock_record_catalogs(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Recomputes the fingerprint of the catalogs a deleted stock record belonged to."""
+    update_stock_records_fingerprints(getattr(instance, '_deleted_from_catalog_ids', []))
+
+
 from oscar.apps.catalogue.models import *  # noqa isort:skip pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order,ungrouped-imports
@@ -291,6 +291,38 @@ class CommandTests(CourseMigrationTestMixin, TestCase):
 
         self.assert_course_migrated()
 
+    @httpretty.activate
+    def test_handle_with_commit_in_bulk(self):
+        """ Verify the management command saves the courses in batches, and publishes them to the LMS. """
+        self.mock_access_token_response()
+        self._mock_lms_apis()
+
+        with mock.patch.object(LMSPublisher, 'publish_data', return_value=None) as mock_publish:
+            call_command('migrate_course', self.course_id, commit=True, bulk=True, site_domain=self.site.domain)
+            self.assertEqual(mock_publish.call_count, 1)
+
+        self.assert_course_migrated()
+
+    @httpretty.activate
+    def test_handle_in_bulk_without_commit(self):
+        """ Verify the management command does not save data in bulk mode without the commit option. """
+        initial_product_count = Product.objects.count()
+        self._mock_lms_apis()
+
+        with mock.patch.object(LMSPublisher, 'publish_data') as mock_publish:
+            call_command('migrate_course', self.course_id, bulk=True, site_domain=self.site.domain)
+            self.assertFalse(mock_publish.called)
+
+        self.assertEqual(Product.objects.count(), initial_product_count)
+        self.assertFalse(Course.objects.filter(id=self.course_id).exists())
+
+    def test_handle_in_bulk_with_failure(self):
+        """ Verify no course is saved in bulk mode if its data cannot be retrieved from the LMS. """
+        with mock.patch.object(MigratedCourse, '_retrieve_data_from_lms', side_effect=Exception):
+            call_command('migrate_course', self.course_id, commit=True, bulk=True, site_domain=self.site.domain)
+
+        self.assertFalse(Course.objects.filter(id=self.course_id).exists())
+
     @httpretty.activate
     def test_handle_with_no_site(self):
         """ Verify the management command does not run if no site domain is provided. """
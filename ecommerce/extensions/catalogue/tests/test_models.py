@@ -88,3 +88,40 @@ class ProductTests(CouponMixin, DiscoveryTestMixin, TestCase):
         """Verify creating product with invalid note type raises ValidationError."""
         with self.assertRaises(ValidationError):
             self._create_coupon_product_with_note_attribute(note)
+
+    def test_attribute_snapshot(self):
+        """Verify the attribute snapshot is populated when the product is saved, and read without queries."""
+        course, seat, enrollment_code = self.create_course_seat_and_enrollment_code(id_verification=True)
+        seat = Product.objects.get(id=seat.id)
+        enrollment_code = Product.objects.get(id=enrollment_code.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(seat.get_snapshot_attribute('certificate_type'), 'verified')
+            self.assertEqual(seat.get_snapshot_attribute('course_key'), course.id)
+            self.assertTrue(seat.get_snapshot_attribute('id_verification_required'))
+            self.assertIsNone(seat.get_snapshot_attribute('credit_provider'))
+            self.assertEqual(seat.get_snapshot_attribute('credit_provider', ''), '')
+            self.assertEqual(enrollment_code.get_snapshot_attribute('seat_type'), 'verified')
+
+        self.assertEqual(list(Product.objects.filter(certificate_type__in=['verified', 'credit'])), [seat])
+
+    def test_attribute_snapshot_unsaved_values(self):
+        """Verify values assigned through attr take precedence over the snapshot."""
+        __, seat, __ = self.create_course_seat_and_enrollment_code()
+        seat.attr.certificate_type = 'professional'
+        self.assertEqual(seat.get_snapshot_attribute('certificate_type'), 'professional')
+
+        seat.save()
+        self.assertEqual(Product.objects.get(id=seat.id).certificate_type, 'professional')
+
+    def test_attribute_snapshot_attribute_value_changes(self):
+        """Verify the snapshot follows attribute values saved or deleted directly."""
+        __, seat, __ = self.create_course_seat_and_enrollment_code()
+        attribute_value = seat.attribute_values.get(attribute__code='certificate_type')
+
+        attribute_value.value = 'professional'
+        attribute_value.save()
+        self.assertEqual(Product.objects.get(id=seat.id).get_snapshot_attribute('certificate_type'), 'professional')
+
+        attribute_value.delete()
+        self.assertIsNone(Product.objects.get(id=seat.id).get_snapshot_attribute('certificate_type'))
@@ -4,6 +4,8 @@ from __future__ import unicode_literals
 import datetime
 import json
 import logging
+import os
+import tempfile
 
 import ddt
 import httpretty
@@ -66,6 +68,13 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
             content_type=JSON
         )
 
+    def assert_logs(self, log_capture, expected):
+        """ Verify the logged messages, followed by the throughput report. """
+        actual = list(log_capture.actual())
+        self.assertEqual(actual[:-1], expected)
+        self.assertEqual(actual[-1][:2], (LOGGER_NAME, 'INFO'))
+        self.assertTrue(actual[-1][2].startswith('Processed [1] courses in '))
+
     @httpretty.activate
     def test_update_course_with_commit(self):
         """ Verify all course seats are updated successfully, when commit option is provided. """
@@ -93,7 +102,7 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire', commit=True)
-            lc.check(*expected)
+            self.assert_logs(lc, expected)
 
         # Verify course seats have been updated
         for seat in seats_expected_to_update:
@@ -124,7 +133,7 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire', commit=False)
-            lc.check(*expected)
+            self.assert_logs(lc, expected)
 
         # Verify course seats have not been updated
         for seat in seats_expected_to_update:
@@ -178,7 +187,53 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
 
         with LogCapture(LOGGER_NAME) as lc:
             call_command('update_course_seat_expire')
-            lc.check(*expected)
+            self.assert_logs(lc, expected)
+
+    @httpretty.activate
+    def test_update_course_with_checkpoint(self):
+        """ Verify courses whose enrollment end date was already applied are skipped on subsequent runs. """
+        checkpoint_file = os.path.join(tempfile.gettempdir(), 'update-course-seat-expire-checkpoint.json')
+        self.addCleanup(lambda: os.path.exists(checkpoint_file) and os.remove(checkpoint_file))
+        self.mock_courses_api(status=200, body=self.course_info)
+
+        call_command('update_course_seat_expire', commit=True, checkpoint_file=checkpoint_file)
+        self.assertEqual(Product.objects.get(id=self.honor_seat.id).expires, self.expire_date)
+
+        # Seats modified after the checkpoint are left alone, since the LMS data has not changed.
+        Product.objects.filter(id=self.honor_seat.id).update(expires=None)
+        with LogCapture(LOGGER_NAME) as lc:
+            call_command('update_course_seat_expire', commit=True, checkpoint_file=checkpoint_file)
+            self.assert_logs(lc, [(LOGGER_NAME, 'INFO', '[1] courses found for update.')])
+        self.assertIsNone(Product.objects.get(id=self.honor_seat.id).expires)
+
+        # A new enrollment end date is applied.
+        self.course_info['results'][0]['enrollment_end'] = unicode(self.verified_expire_date)
+        self.mock_courses_api(status=200, body=self.course_info)
+        call_command('update_course_seat_expire', commit=True, checkpoint_file=checkpoint_file)
+        self.assertEqual(Product.objects.get(id=self.honor_seat.id).expires, self.verified_expire_date)
+
+    @httpretty.activate
+    def test_update_course_with_multiple_pages(self):
+        """ Verify the remaining pages are fetched concurrently once the number of pages is known. """
+        second_course = CourseFactory(partner=self.partner)
+        second_course_seat = second_course.create_or_update_seat('audit', False, 0)
+
+        def courses_callback(request, uri, headers):  # pylint: disable=unused-argument
+            page = int(request.querystring['page'][0])
+            course_id = self.course.id if page == 1 else second_course.id
+            body = {
+                'pagination': {'num_pages': 2},
+                'results': [{'enrollment_end': unicode(self.expire_date), 'course_id': course_id}],
+            }
+            return 200, headers, json.dumps(body)
+
+        httpretty.register_uri(
+            httpretty.GET, get_lms_url('/api/courses/v1/courses/'), body=courses_callback, content_type=JSON
+        )
+        call_command('update_course_seat_expire', commit=True, concurrency=2)
+
+        self.assertEqual(Product.objects.get(id=self.honor_seat.id).expires, self.expire_date)
+        self.assertEqual(Product.objects.get(id=second_course_seat.id).expires, self.expire_date)
 
     @httpretty.activate
     @mock.patch(
@@ -191,7 +246,7 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
         new_callable=mock.PropertyMock,
         return_value=1
     )
-    def test_update_course_with_exception(self, mock_max_tries, mock_pause_time):
+    def test_update_course_with_exception(self, mock_pause_time, mock_max_tries):
         """
         Verify that management command logs throttling errors when rate-limit to API
         exceeds.
@@ -215,4 +270,4 @@ class UpdateSeatExpireDateTests(DiscoveryTestMixin, TestCase):
                 lc.check(*expected)
 
         self.assertEqual(mock_max_tries.call_count, 2)
-        self.assertEqual(mock_pause_time.call_count, 2)
+        self.assertEqual(mock_pause_time.call_count, 1)
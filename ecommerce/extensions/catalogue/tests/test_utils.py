@@ -86,6 +86,37 @@ class UtilsTests(DiscoveryTestMixin, TestCase):
         self.assertNotEqual(self.catalog, new_catalog)
         self.assertEqual(Catalog.objects.count(), 2)
 
+    def test_get_or_create_catalog_ignores_order(self):
+        """Verify catalogs are matched regardless of the order of the stock record IDs."""
+        course = CourseFactory(id='sku/test2/course', name='Test Course 2', partner=self.partner)
+        seat_2 = course.create_or_update_seat('verified', False, 0)
+        stock_records = [self.seat.stockrecords.first(), seat_2.stockrecords.first()]
+        self.catalog.stock_records.add(*stock_records)
+
+        with self.assertNumQueries(2):
+            catalog, created = get_or_create_catalog(
+                name='Test',
+                partner=self.partner,
+                stock_record_ids=[stock_record.id for stock_record in reversed(stock_records)]
+            )
+        self.assertFalse(created)
+        self.assertEqual(catalog, self.catalog)
+
+    def test_get_or_create_catalog_tracks_stock_record_changes(self):
+        """Verify catalogs whose stock records changed are found by their new stock records."""
+        stock_record = self.seat.stockrecords.first()
+        self.catalog.stock_records.add(stock_record)
+        stock_record.catalogs.remove(self.catalog)
+
+        catalog, created = get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=[])
+        self.assertFalse(created)
+        self.assertEqual(catalog, self.catalog)
+
+    def test_get_or_create_catalog_missing_stock_record(self):
+        """Verify an exception is raised for stock records that do not exist."""
+        with self.assertRaises(StockRecord.DoesNotExist):
+            get_or_create_catalog(name='Test', partner=self.partner, stock_record_ids=[0])
+
 
 class CouponUtilsTests(CouponMixin, DiscoveryTestMixin, TestCase):
     def setUp(self):
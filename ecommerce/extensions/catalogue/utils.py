@@ -8,6 +8,8 @@ from django.db.utils import IntegrityError
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.core.lookups import product_classes
+from ecommerce.extensions.catalogue.models import get_stock_records_fingerprint
 from ecommerce.extensions.voucher.models import CouponVouchers
 from ecommerce.extensions.voucher.utils import create_vouchers
 
@@ -15,7 +17,6 @@ Catalog = get_model('catalogue', 'Catalog')
 logger = logging.getLogger(__name__)
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
-ProductClass = get_model('catalogue', 'ProductClass')
 StockRecord = get_model('partner', 'StockRecord')
 
 
@@ -114,7 +115,7 @@ def create_coupon_product(
 
 
 def create_coupon_product_and_stockrecord(title, category, partner, price):
-    product_class = ProductClass.objects.get(name=COUPON_PRODUCT_CLASS_NAME)
+    product_class = product_classes.get(COUPON_PRODUCT_CLASS_NAME)
     coupon_product = Product.objects.create(title=title, product_class=product_class)
     ProductCategory.objects.get_or_create(product=coupon_product, category=category)
     sku = generate_sku(product=coupon_product, partner=partner)
@@ -154,22 +155,22 @@ def generate_sku(product, partner):
         )).encode('utf-8')
     elif product.is_enrollment_code_product:
         _hash = ' '.join((
-            getattr(product.attr, 'course_key', ''),
-            getattr(product.attr, 'seat_type', ''),
+            product.get_snapshot_attribute('course_key', ''),
+            product.get_snapshot_attribute('seat_type', ''),
             unicode(partner.id)
         )).encode('utf-8')
     elif product.is_seat_product:
         _hash = ' '.join((
-            getattr(product.attr, 'certificate_type', ''),
-            unicode(product.attr.course_key),
-            unicode(product.attr.id_verification_required),
-            getattr(product.attr, 'credit_provider', ''),
+            product.get_snapshot_attribute('certificate_type', ''),
+            unicode(product.get_snapshot_attribute('course_key')),
+            unicode(product.get_snapshot_attribute('id_verification_required')),
+            product.get_snapshot_attribute('credit_provider', ''),
             unicode(partner.id)
         )).encode('utf-8')
     elif product.is_course_entitlement_product:
         _hash = ' '.join((
-            getattr(product.attr, 'certificate_type', ''),
-            unicode(product.attr.UUID),
+            product.get_snapshot_attribute('certificate_type', ''),
+            unicode(product.get_snapshot_attribute('UUID')),
             unicode(partner.id)
         )).encode('utf-8')
 
@@ -186,16 +187,24 @@ def get_or_create_catalog(name, partner, stock_record_ids):
     """
     Returns the catalog which has the same name, partner and stock records.
     If there isn't one with that data, creates and returns a new one.
+
+    Catalogs are looked up by the fingerprint of their stock records, so the
+    lookup is a single indexed query regardless of the number of catalogs.
     """
-    catalogs = Catalog.objects.all()
-    stock_records = [StockRecord.objects.get(id=id) for id in stock_record_ids]  # pylint: disable=redefined-builtin
+    stock_records = StockRecord.objects.in_bulk(stock_record_ids)
+    missing_ids = set(int(stock_record_id) for stock_record_id in stock_record_ids) - set(stock_records)
+    if missing_ids:
+        raise StockRecord.DoesNotExist(
+            'Stock records [{}] do not exist.'.format(', '.join(str(record_id) for record_id in sorted(missing_ids)))
+        )
 
-    for catalog in catalogs:
-        if catalog.name == name and catalog.partner == partner:
-            if set(catalog.stock_records.all()) == set(stock_records):
-                return catalog, False
+    fingerprint = get_stock_records_fingerprint(stock_records.keys())
+    catalog = Catalog.objects.filter(
+        name=name, partner=partner, stock_records_fingerprint=fingerprint
+    ).order_by('id').first()
+    if catalog:
+        return catalog, False
 
-    catalog = Catalog.objects.create(name=name, partner=partner)
-    for stock_record in stock_records:
-        catalog.stock_records.add(stock_record)
+    catalog = Catalog.objects.create(name=name, partner=partner, stock_records_fingerprint=fingerprint)
+    catalog.stock_records.add(*stock_records.values())
     return catalog, True
@@ -10,6 +10,7 @@ from ecommerce_worker.fulfillment.v1.tasks import fulfill_order
 from oscar.apps.checkout.mixins import OrderPlacementMixin
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookups import basket_attribute_types, payment_event_types, source_types
 from ecommerce.core.models import BusinessClient
 from ecommerce.extensions.analytics.utils import audit_log, track_segment_event
 from ecommerce.extensions.api import data as data_api
@@ -24,13 +25,10 @@ CommunicationEventType = get_model('customer', 'CommunicationEventType')
 logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 Order = get_model('order', 'Order')
 post_checkout = get_class('checkout.signals', 'post_checkout')
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 Source = get_model('payment', 'Source')
-SourceType = get_model('payment', 'SourceType')
 
 
 class EdxOrderPlacementMixin(OrderPlacementMixin):
@@ -81,7 +79,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
     def record_payment(self, basket, handled_processor_response):
         self.emit_checkout_step_events(basket, handled_processor_response, self.payment_processor)
         track_segment_event(basket.site, basket.owner, 'Payment Info Entered', {'checkout_id': basket.order_number})
-        source_type, __ = SourceType.objects.get_or_create(name=self.payment_processor.NAME)
+        source_type, __ = source_types.get_or_create(self.payment_processor.NAME)
         total = handled_processor_response.total
         reference = handled_processor_response.transaction_id
         source = Source(
@@ -93,7 +91,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
             label=handled_processor_response.card_number,
             card_type=handled_processor_response.card_type
         )
-        event_type, __ = PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.PAID)
+        event_type, __ = payment_event_types.get_or_create(PaymentEventTypeName.PAID)
         payment_event = PaymentEvent(event_type=event_type, amount=total, reference=reference,
                                      processor_name=self.payment_processor.NAME)
         self.add_payment_source(source)
@@ -160,7 +158,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
         try:
             email_opt_in = BasketAttribute.objects.get(
                 basket=order.basket,
-                attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+                attribute_type=basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE),
             ).value_text == 'True'
         except BasketAttribute.DoesNotExist:
             email_opt_in = False
@@ -259,7 +257,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
             line.product.is_enrollment_code_product for line in order.basket.all_lines()
         )
 
-        organization_attribute = BasketAttributeType.objects.filter(name=ORGANIZATION_ATTRIBUTE_TYPE).first()
+        organization_attribute = basket_attribute_types.get_or_none(ORGANIZATION_ATTRIBUTE_TYPE)
         if not organization_attribute:
             return None
 
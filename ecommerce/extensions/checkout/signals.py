@@ -101,7 +101,7 @@ def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable
         # We do not currently support email sending for orders with more than one item.
         if len(order.lines.all()) == ORDER_LINE_COUNT:
             product = order.lines.first().product
-            credit_provider_id = getattr(product.attr, 'credit_provider', None)
+            credit_provider_id = product.get_snapshot_attribute('credit_provider')
             if not credit_provider_id:
                 logger.error(
                     'Failed to send credit receipt notification. Credit seat product [%s] has no provider.', product.id
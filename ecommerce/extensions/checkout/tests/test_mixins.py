@@ -4,7 +4,9 @@ Tests for the ecommerce.extensions.checkout.mixins module.
 import ddt
 import mock
 from django.core import mail
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import BasketFactory, ProductFactory, UserFactory
 from testfixtures import LogCapture
@@ -24,6 +26,7 @@ from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.tests.mixins import PaymentEventsMixin
 from ecommerce.extensions.payment.tests.processors import DummyProcessor
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
@@ -98,6 +101,25 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, PaymentEventsMixin,
         paid_type = PaymentEventType.objects.get(code='paid')
         self.assert_valid_payment_event_fields(mixin._payment_events[-1], total, paid_type, processor_name, reference)
 
+    def test_handle_payment_query_count(self, __):
+        """
+        Verify payment source and event types are only queried by the first payment handled by the process.
+        """
+        SourceType.objects.get_or_create(name=DummyProcessor.NAME)
+        PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.PAID)
+        mixin = EdxOrderPlacementMixin()
+        mixin.payment_processor = DummyProcessor(self.site)
+        baskets = [create_basket(owner=self.user, site=self.site) for __ in range(2)]
+
+        with CaptureQueriesContext(connection) as first_payment:
+            mixin.handle_payment({}, baskets[0])
+        with CaptureQueriesContext(connection) as second_payment:
+            mixin.handle_payment({}, baskets[1])
+
+        self.assertLess(len(second_payment), len(first_payment))
+        for table in ('payment_sourcetype', 'order_paymenteventtype'):
+            self.assertFalse(any(table in query['sql'] for query in second_payment.captured_queries))
+
     def test_order_number_collision(self, _mock_track):
         """
         Verify that an attempt to create an order with the same number as an existing
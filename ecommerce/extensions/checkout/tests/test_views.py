@@ -21,6 +21,7 @@ from ecommerce.tests.testcases import TestCase
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
 Order = get_model('order', 'Order')
 
 
@@ -248,6 +249,37 @@ class ReceiptResponseViewTests(DiscoveryMockMixin, LmsApiMockMixin, RefundTestMi
         response = self._get_receipt_response(order_number)
         self.assertEqual(response.status_code, 404)
 
+    @ddt.data(CybersourceNotification.PENDING, CybersourceNotification.PROCESSING)
+    def test_get_receipt_for_pending_order(self, status):
+        """ The view should ask to be reloaded while the order of a recorded notification is being placed. """
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        CybersourceNotification.objects.create(
+            idempotency_key='pending', order_number=basket.order_number, site=self.site, notification={}, status=status
+        )
+        response = self._get_receipt_response(basket.order_number)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Refresh'], '5')
+        self.assertTemplateUsed(response, 'edx/checkout/receipt_pending.html')
+
+    @ddt.data(
+        (CybersourceNotification.PROCESSED, False),
+        (CybersourceNotification.FAILED, False),
+        (CybersourceNotification.PENDING, True),
+    )
+    @ddt.unpack
+    def test_get_receipt_for_pending_order_not_found(self, status, other_owner):
+        """ The view should return 404 status if the notification was handled, or the basket is someone else's. """
+        owner = self.create_user() if other_owner else self.user
+        basket = factories.BasketFactory(owner=owner, site=self.site)
+        CybersourceNotification.objects.create(
+            idempotency_key='pending', order_number=basket.order_number, site=self.site, notification={}, status=status
+        )
+        response = self._get_receipt_response(basket.order_number)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateUsed(response, 'edx/checkout/receipt_not_found.html')
+
     def test_get_payment_method_no_source(self):
         """ Payment method should be None when an Order has no Payment source. """
         order = self.create_order()
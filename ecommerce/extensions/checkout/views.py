@@ -12,6 +12,7 @@ from django.views.generic import RedirectView, TemplateView
 from oscar.apps.checkout.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookups import basket_attribute_types
 from ecommerce.core.url_utils import (
     get_lms_courseware_url,
     get_lms_dashboard_url,
@@ -26,8 +27,11 @@ from ecommerce.extensions.checkout.utils import get_receipt_page_url
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
 Order = get_model('order', 'Order')
+OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
+
+RECEIPT_PENDING_REFRESH_SECONDS = 5
 
 
 def get_program_uuid(order):
@@ -42,7 +46,7 @@ def get_program_uuid(order):
     """
     bundle_attributes = BasketAttribute.objects.filter(
         basket=order.basket,
-        attribute_type=BasketAttributeType.objects.get(name='bundle_identifier')
+        attribute_type=basket_attribute_types.get('bundle_identifier')
     )
     bundle_attribute = bundle_attributes.first()
     return bundle_attribute.value_text if bundle_attribute else None
@@ -173,6 +177,13 @@ class ReceiptResponseView(ThankYouView):
         try:
             return super(ReceiptResponseView, self).get(request, *args, **kwargs)
         except Http404:
+            if self.is_order_pending():
+                # Reload the page until the order is placed, and its receipt can be displayed.
+                self.template_name = 'edx/checkout/receipt_pending.html'
+                response = self.render_to_response(context={})
+                response['Refresh'] = RECEIPT_PENDING_REFRESH_SECONDS
+                return response
+
             self.template_name = 'edx/checkout/receipt_not_found.html'
             context = {
                 'order_history_url': request.site.siteconfiguration.build_lms_url('account/settings'),
@@ -213,6 +224,28 @@ class ReceiptResponseView(ThankYouView):
 
         return get_object_or_404(Order, **kwargs)
 
+    def is_order_pending(self):
+        """ Returns True if the order is yet to be placed from a CyberSource notification already recorded for it. """
+        order_number = self.request.GET['order_number']
+        notifications = CybersourceNotification.objects.filter(
+            order_number=order_number,
+            site=self.request.site,
+            status__in=(CybersourceNotification.PENDING, CybersourceNotification.PROCESSING),
+        )
+        if not notifications.exists():
+            return False
+
+        user = self.request.user
+        if user.is_staff:
+            return True
+
+        try:
+            basket_id = OrderNumberGenerator().basket_id(order_number)
+        except (IndexError, ValueError):
+            return False
+
+        return Basket.objects.filter(id=basket_id, owner=user).exists()
+
     def get_payment_method(self, order):
         source = order.sources.first()
         if source:
@@ -226,7 +259,7 @@ class ReceiptResponseView(ThankYouView):
 
     def order_contains_credit_seat(self, order):
         for line in order.lines.all():
-            if getattr(line.product.attr, 'credit_provider', None):
+            if line.product.get_snapshot_attribute('credit_provider'):
                 return True
         return False
 
@@ -250,8 +283,8 @@ class ReceiptResponseView(ThankYouView):
         for line in order.lines.all():
             product = line.product
 
-            if (getattr(product.attr, 'id_verification_required', False) and
-                    (getattr(product.attr, 'course_key', False) or getattr(product.attr, 'UUID', False))):
+            if (product.get_snapshot_attribute('id_verification_required', False) and
+                    (product.get_snapshot_attribute('course_key') or product.get_snapshot_attribute('UUID'))):
                 context.update({
                     'verification_url': site.siteconfiguration.build_lms_url('verify_student/reverify'),
                     'user_verified': request.user.is_verified(site),
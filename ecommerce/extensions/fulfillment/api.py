@@ -146,3 +146,55 @@ def revoke_fulfillment_for_refund(refund):
                     refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
 
     return succeeded
+
+
+def revoke_fulfillment_for_refunds(refunds, concurrency=1):
+    """
+    Revokes fulfillment for all lines in the given refunds.
+
+    The lines supported by each fulfillment module are revoked together, so modules calling remote services may
+    revoke them concurrently.
+
+    Arguments:
+        refunds (list of Refund): Refunds whose lines are revoked.
+        concurrency (int): Maximum number of lines each module revokes at once.
+
+    Returns
+        dict: True if revocation of all lines of the refund succeeded, otherwise False, keyed by refund ID.
+    """
+    results = dict((refund.id, True) for refund in refunds)
+    refund_lines = []
+
+    for refund in refunds:
+        # Lines revoked before, e.g. by an earlier attempt to revoke the lines of the refund, are not revoked again.
+        pending_lines = [
+            refund_line for refund_line in refund.lines.all() if refund_line.status != REFUND_LINE.COMPLETE
+        ]
+
+        # Refunds corresponding to a total credit of $0 require no revocation, as in revoke_fulfillment_for_refund.
+        if refund.total_credit_excl_tax == 0:
+            for refund_line in pending_lines:
+                refund_line.set_status(REFUND_LINE.COMPLETE)
+        else:
+            refund_lines.extend(pending_lines)
+
+    revocations = {}
+    for module_class in get_fulfillment_modules():
+        module = module_class()
+        supported_lines = [refund_line for refund_line in refund_lines if module.supports_line(refund_line.order_line)]
+        if supported_lines:
+            revoked = module.revoke_lines([refund_line.order_line for refund_line in supported_lines], concurrency)
+            for refund_line in supported_lines:
+                revocations.setdefault(refund_line.id, []).append(revoked.get(refund_line.order_line_id, False))
+
+    for refund_line in refund_lines:
+        if refund_line.id not in revocations:
+            continue
+
+        if all(revocations[refund_line.id]):
+            refund_line.set_status(REFUND_LINE.COMPLETE)
+        else:
+            results[refund_line.refund_id] = False
+            refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
+
+    return results
@@ -7,12 +7,14 @@ import abc
 import datetime
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 
 import requests
 from django.conf import settings
 from django.urls import reverse
 from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=ungrouped-imports
 from rest_framework import status
 
@@ -20,6 +22,7 @@ from ecommerce.core.constants import (
     DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 )
+from ecommerce.core.lookups import options
 from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
@@ -33,7 +36,6 @@ from ecommerce.extensions.voucher.utils import create_vouchers
 from ecommerce.notifications.notifications import send_notification
 
 Benefit = get_model('offer', 'Benefit')
-Option = get_model('catalogue', 'Option')
 Product = get_model('catalogue', 'Product')
 Range = get_model('offer', 'Range')
 Voucher = get_model('voucher', 'Voucher')
@@ -110,6 +112,20 @@ class BaseFulfillmentModule(object):  # pragma: no cover
         """
         raise NotImplementedError("Revoke method not implemented!")
 
+    def revoke_lines(self, lines, concurrency=1):  # pylint: disable=unused-argument
+        """ Revokes the specified lines.
+
+        Modules whose revocations call remote services may revoke the lines concurrently.
+
+        Args:
+            lines (List of Lines): Order Lines to be revoked.
+            concurrency (int): Maximum number of lines revoked at once.
+
+        Returns:
+            dict: True if the product of the line is revoked, otherwise False, keyed by line ID.
+        """
+        return dict((line.id, self.revoke_line(line)) for line in lines)
+
 
 class DonationsFromCheckoutTestFulfillmentModule(BaseFulfillmentModule):
     """
@@ -171,9 +187,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     Allows the enrollment of a student via purchase of a 'seat'.
     """
 
-    def _post_to_enrollment_api(self, data, user):
-        enrollment_api_url = get_lms_enrollment_api_url()
-        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+    def _get_enrollment_api_headers(self, user):
         headers = {
             'Content-Type': 'application/json',
             'X-Edx-Api-Key': settings.EDX_API_KEY
@@ -187,7 +201,13 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         if ip:
             headers['X-Forwarded-For'] = ip
 
-        return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
+        return headers
+
+    def _post_to_enrollment_api(self, data, user=None, session=None, enrollment_api_url=None, headers=None):
+        enrollment_api_url = enrollment_api_url or get_lms_enrollment_api_url()
+        headers = headers or self._get_enrollment_api_headers(user)
+        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+        return (session or requests).post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
 
     def _add_enterprise_data_to_enrollment_api_post(self, data, order):
         """ Augment enrollment api POST data with enterprise specific data.
@@ -273,18 +293,16 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
             return order, lines
 
         for line in lines:
-            try:
-                mode = mode_for_product(line.product)
-                course_key = line.product.attr.course_key
-            except AttributeError:
+            mode = mode_for_product(line.product)
+            course_key = line.product.get_snapshot_attribute('course_key')
+            if course_key is None:
                 logger.error("Supported Seat Product does not have required attributes, [certificate_type, course_key]")
                 line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
                 continue
-            try:
-                provider = line.product.attr.credit_provider
-            except AttributeError:
+
+            provider = line.product.get_snapshot_attribute('credit_provider')
+            if provider is None:
                 logger.debug("Seat [%d] has no credit_provider attribute. Defaulted to None.", line.product.id)
-                provider = None
 
             data = {
                 'user': order.user.username,
@@ -357,51 +375,117 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
 
+    def _get_revocation_data(self, line):
+        """ Returns the data posted to the Enrollment API to un-enroll the purchaser of the line. """
+        return {
+            'user': line.order.user.username,
+            'is_active': False,
+            'mode': mode_for_product(line.product),
+            'course_details': {
+                'course_id': line.product.get_snapshot_attribute('course_key'),
+            },
+        }
+
+    def _handle_revocation_response(self, line, data, response):
+        """ Returns True if the Enrollment API response reports the purchaser of the line is un-enrolled. """
+        if response.status_code == status.HTTP_200_OK:
+            audit_log(
+                'line_revoked',
+                order_line_id=line.id,
+                order_number=line.order.number,
+                product_class=line.product.get_product_class().name,
+                course_id=data['course_details']['course_id'],
+                certificate_type=line.product.get_snapshot_attribute('certificate_type', ''),
+                user_id=line.order.user.id
+            )
+
+            return True
+        else:
+            # check if the error / message are something we can recover from.
+            data = response.json()
+            detail = data.get('message', '(No details provided.)')
+            if response.status_code == 400 and "Enrollment mode mismatch" in detail:
+                # The user is currently enrolled in different mode than the one
+                # we are refunding an order for.  Don't revoke that enrollment.
+                logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
+                return True
+            else:
+                logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+
+        return False
+
     def revoke_line(self, line):
         try:
             logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
 
-            mode = mode_for_product(line.product)
-            course_key = line.product.attr.course_key
-            data = {
-                'user': line.order.user.username,
-                'is_active': False,
-                'mode': mode,
-                'course_details': {
-                    'course_id': course_key,
-                },
-            }
-
+            data = self._get_revocation_data(line)
             response = self._post_to_enrollment_api(data, user=line.order.user)
-
-            if response.status_code == status.HTTP_200_OK:
-                audit_log(
-                    'line_revoked',
-                    order_line_id=line.id,
-                    order_number=line.order.number,
-                    product_class=line.product.get_product_class().name,
-                    course_id=course_key,
-                    certificate_type=getattr(line.product.attr, 'certificate_type', ''),
-                    user_id=line.order.user.id
-                )
-
-                return True
-            else:
-                # check if the error / message are something we can recover from.
-                data = response.json()
-                detail = data.get('message', '(No details provided.)')
-                if response.status_code == 400 and "Enrollment mode mismatch" in detail:
-                    # The user is currently enrolled in different mode than the one
-                    # we are refunding an order for.  Don't revoke that enrollment.
-                    logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
-                    return True
-                else:
-                    logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+            return self._handle_revocation_response(line, data, response)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
 
         return False
 
+    def revoke_lines(self, lines, concurrency=1):
+        """ Revokes the specified lines, posting to the Enrollment API concurrently over a shared session.
+
+        The data, URL and headers posted for each line are read before, and the responses are handled after, the
+        requests are sent, so neither the database nor the current request is accessed from the worker threads.
+        """
+        results = {}
+        jobs = []
+        for line in lines:
+            try:
+                logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
+                jobs.append((
+                    line,
+                    self._get_revocation_data(line),
+                    line.order.site.siteconfiguration.build_lms_url('/api/enrollment/v1/enrollment'),
+                    self._get_enrollment_api_headers(line.order.user),
+                ))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+                results[line.id] = False
+
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_maxsize=concurrency))
+        session.mount('https://', HTTPAdapter(pool_maxsize=concurrency))
+
+        def _post(job):
+            line, data, enrollment_api_url, headers = job
+            try:
+                response = self._post_to_enrollment_api(
+                    data, session=session, enrollment_api_url=enrollment_api_url, headers=headers
+                )
+                return line, data, response
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+                return line, data, None
+
+        def _handle(line, data, response):
+            if response is None:
+                return False
+            try:
+                return self._handle_revocation_response(line, data, response)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+                return False
+
+        if concurrency > 1 and len(jobs) > 1:
+            pool = ThreadPool(min(concurrency, len(jobs)))
+            try:
+                for line, data, response in pool.imap_unordered(_post, jobs):
+                    results[line.id] = _handle(line, data, response)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for job in jobs:
+                results[job[0].id] = _handle(*_post(job))
+
+        session.close()
+        return results
+
 
 class CouponFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for coupons. """
@@ -507,13 +591,11 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         logger.info(msg)
 
         for line in lines:
-            name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
-            seat = Product.objects.filter(
-                attributes__name='course_key',
-                attribute_values__value_text=line.product.attr.course_key
-            ).get(
-                attributes__name='certificate_type',
-                attribute_values__value_text=line.product.attr.seat_type
+            course_key = line.product.get_snapshot_attribute('course_key')
+            name = 'Enrollment Code Range for {}'.format(course_key)
+            seat = Product.objects.get(
+                course_key=course_key,
+                certificate_type=line.product.get_snapshot_attribute('seat_type')
             )
             _range, created = Range.objects.get_or_create(name=name)
             if created:
@@ -564,7 +646,7 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         """ Sends an email with enrollment code order information. """
         # Note (multi-courses): Change from a course_name to a list of course names.
         product = order.lines.first().product
-        course = Course.objects.get(id=product.attr.course_key)
+        course = Course.objects.get(id=product.get_snapshot_attribute('course_key'))
         receipt_page_url = get_receipt_page_url(
             order_number=order.number,
             site_configuration=order.site.siteconfiguration
@@ -630,10 +712,9 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
         logger.info('Attempting to fulfill "Course Entitlement" product types for order [%s]', order.number)
 
         for line in lines:
-            try:
-                mode = mode_for_product(line.product)
-                UUID = line.product.attr.UUID
-            except AttributeError:
+            mode = mode_for_product(line.product)
+            UUID = line.product.get_snapshot_attribute('UUID')
+            if UUID is None:
                 logger.error('Entitlement Product does not have required attributes, [certificate_type, UUID]')
                 line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
                 continue
@@ -647,7 +728,7 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             }
 
             try:
-                entitlement_option = Option.objects.get(code='course_entitlement')
+                entitlement_option = options.get('course_entitlement')
 
                 entitlement_api_client = EdxRestApiClient(
                     get_lms_entitlement_api_url(),
@@ -688,8 +769,8 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
         try:
             logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
 
-            UUID = line.product.attr.UUID
-            entitlement_option = Option.objects.get(code='course_entitlement')
+            UUID = line.product.get_snapshot_attribute('UUID')
+            entitlement_option = options.get('course_entitlement')
             course_entitlement_uuid = line.attributes.get(option=entitlement_option).value
 
             entitlement_api_client = EdxRestApiClient(
@@ -706,7 +787,7 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
                 order_number=line.order.number,
                 product_class=line.product.get_product_class().name,
                 UUID=UUID,
-                certificate_type=getattr(line.product.attr, 'certificate_type', ''),
+                certificate_type=line.product.get_snapshot_attribute('certificate_type', ''),
                 user_id=line.order.user.id
             )
 
@@ -11,6 +11,7 @@ from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from requests.exceptions import ConnectionError, Timeout
 from testfixtures import LogCapture
+from threadlocals.threadlocals import set_thread_variable
 
 from ecommerce.core.constants import (
     COUPON_PRODUCT_CLASS_NAME,
@@ -315,6 +316,39 @@ class EnrollmentFulfillmentModuleTests(ProgramTestMixin, DiscoveryTestMixin, Ful
                 (logger_name, 'ERROR', 'Failed to revoke fulfillment of Line [%d]: %s' % (line.id, message))
             )
 
+    @httpretty.activate
+    @ddt.data(1, 2)
+    def test_revoke_lines(self, concurrency):
+        """ The method should un-enroll the purchasers of all lines, and report the lines revoked. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type=JSON)
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        basket.add_product(self.seat, 1)
+        lines = [self.order.lines.first(), create_order(number=2, basket=basket, user=self.user).lines.first()]
+
+        self.assertEqual(
+            EnrollmentFulfillmentModule().revoke_lines(lines, concurrency),
+            {lines[0].id: True, lines[1].id: True}
+        )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
+    @httpretty.activate
+    def test_revoke_lines_without_request(self):
+        """ The method should not depend on the current request, which is not available to the worker threads. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type=JSON)
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        basket.add_product(self.seat, 1)
+        lines = [self.order.lines.first(), create_order(number=2, basket=basket, user=self.user).lines.first()]
+        set_thread_variable('request', None)
+
+        self.assertEqual(
+            EnrollmentFulfillmentModule().revoke_lines(lines, concurrency=2),
+            {lines[0].id: True, lines[1].id: True}
+        )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+        for request in httpretty.httpretty.latest_requests:
+            self.assertEqual(request.headers['X-Edx-Ga-Client-Id'], self.user.tracking_context['ga_client_id'])
+            self.assertEqual(request.headers['X-Forwarded-For'], self.user.tracking_context['lms_ip'])
+
     @httpretty.activate
     def test_revoke_product_unknown_exception(self):
         """
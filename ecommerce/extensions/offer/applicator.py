@@ -2,17 +2,74 @@ import logging
 from itertools import chain
 
 import waffle
-from oscar.apps.offer.applicator import Applicator
+from oscar.apps.offer import results
+from oscar.apps.offer.applicator import Applicator as CoreApplicator
 from oscar.core.loading import get_model
 
+from ecommerce.core.lookups import basket_attribute_types
 from ecommerce.extensions.offer.constants import CUSTOM_APPLICATOR_LOG_FLAG
+from ecommerce.extensions.offer.evaluation import OfferEvaluationContext
+from ecommerce.extensions.offer.profiling import OfferProfiler, should_profile
 
 logger = logging.getLogger(__name__)
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BUNDLE = 'bundle_identifier'
 
 
+class Applicator(CoreApplicator):
+    """
+    Applicator sharing the data used by the conditions of the applied offers, and profiling a sample of its runs.
+    """
+    # Profiler recording the evaluations of every run. If unset, runs are sampled as set by
+    # the OFFER_PROFILING_SAMPLE_RATE setting, and the evaluations of sampled runs are sent to New Relic.
+    profiler = None
+
+    def apply_offers(self, basket, offers):
+        """
+        Applies the offers to the basket, with an OfferEvaluationContext attached to the basket.
+
+        The data needed by the conditions of the offers is prefetched concurrently, and fetched
+        once for all the offers, rather than once per offer.
+        """
+        context = OfferEvaluationContext(basket)
+        if not basket.is_empty:
+            context.prefetch(offers)
+
+        profiler = self.profiler
+        if profiler is None and should_profile():
+            profiler = OfferProfiler()
+
+        basket.offer_evaluation_context = context
+        try:
+            # This is Oscar's implementation, except for the benefits applied through the profiler.
+            applications = results.OfferApplications()
+            for offer in offers:
+                num_applications = 0
+                # Keep applying the offer until either
+                # (a) We reach the max number of applications for the offer.
+                # (b) The benefit can't be applied successfully.
+                while num_applications < offer.get_max_applications(basket.owner):
+                    if profiler:
+                        result = profiler.apply_benefit(offer, basket)
+                    else:
+                        result = offer.apply_benefit(basket)
+                    num_applications += 1
+                    if not result.is_successful:
+                        break
+                    applications.add(offer, result)
+                    if result.is_final:
+                        break
+
+            # Store this list of discounts with the basket so it can be
+            # rendered in templates
+            basket.offer_applications = applications
+        finally:
+            del basket.offer_evaluation_context
+
+        if profiler and profiler is not self.profiler:
+            profiler.export()
+
+
 class CustomApplicator(Applicator):
     """
     Custom applicator for applying offers to program baskets and voucher baskets.
@@ -38,7 +95,7 @@ class CustomApplicator(Applicator):
         """
         bundle_attributes = BasketAttribute.objects.filter(
             basket=basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
+            attribute_type=basket_attribute_types.get(BUNDLE)
         )
         if bundle_attributes.count() > 0:
             program_offers = self.get_program_offers(bundle_attributes.first())
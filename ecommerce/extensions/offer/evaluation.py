@@ -0,0 +1,132 @@
+"""
+Context shared by the conditions evaluated while offers are applied to a basket.
+
+Several conditions need the same remote data, e.g. the enterprise learner data or the LMS enrollments of the
+basket owner. The applicator attaches an OfferEvaluationContext to the basket while it applies offers, so this
+data is fetched once per basket, rather than once per offer, and fetched concurrently before the conditions
+are evaluated.
+"""
+from __future__ import unicode_literals
+
+import logging
+from multiprocessing.pool import ThreadPool
+
+from oscar.core.loading import get_model
+
+BasketAttribute = get_model('basket', 'BasketAttribute')
+logger = logging.getLogger(__name__)
+
+# Maximum number of threads used to prefetch the data of a basket.
+PREFETCH_POOL_SIZE = 4
+
+
+class OfferEvaluationContext(object):
+    """
+    Memoizes the data used by the conditions evaluated against a basket.
+
+    Values are memoized by key, along with the exception raised while computing them, if any. An exception is
+    raised again each time its key is requested, so conditions handle failures exactly as if they had fetched
+    the data themselves.
+
+    Conditions may define a get_prefetch_jobs(offer, basket) method returning (key, func) tuples. The jobs of
+    all the offers are run concurrently by prefetch, each distinct key once.
+    """
+
+    def __init__(self, basket):
+        self.basket = basket
+        self._values = {}
+        self._basket_attributes = None
+
+    def memoize(self, key, func):
+        """
+        Returns the value memoized for the key, computing it with func if it has not been computed yet.
+
+        Arguments:
+            key (tuple): Key of the value, unique across all the conditions.
+            func (callable): Function, taking no arguments, computing the value.
+        """
+        if key not in self._values:
+            try:
+                self._values[key] = (func(), None)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._values[key] = (None, exc)
+
+        value, exc = self._values[key]
+        if exc is not None:
+            raise exc
+        return value
+
+    def get_basket_attribute(self, name):
+        """
+        Returns the text value of the basket attribute with the given type name, or None if it is not set.
+
+        All the attributes of the basket are retrieved with a single query, the first time any is requested.
+        """
+        if self._basket_attributes is None:
+            self._basket_attributes = {}
+            if self.basket.id:
+                attributes = BasketAttribute.objects.filter(basket=self.basket).select_related('attribute_type')
+                for attribute in attributes:
+                    self._basket_attributes.setdefault(attribute.attribute_type.name, attribute.value_text)
+        return self._basket_attributes.get(name)
+
+    def prefetch(self, offers):
+        """
+        Computes the values needed by the conditions of the offers, running the jobs concurrently.
+
+        Arguments:
+            offers (list of ConditionalOffer): Offers about to be applied to the basket.
+        """
+        site = self.basket.site
+        if site is None:
+            return
+
+        # Conditions are never satisfied by offers of other partners, see check_condition_applicability.
+        partner_id = site.siteconfiguration.partner_id
+
+        jobs = {}
+        for offer in offers:
+            if offer.partner_id != partner_id:
+                continue
+
+            condition = offer.condition.proxy()
+            get_prefetch_jobs = getattr(condition, 'get_prefetch_jobs', None)
+            if get_prefetch_jobs:
+                for key, func in get_prefetch_jobs(offer, self.basket):
+                    if key not in self._values:
+                        jobs.setdefault(key, func)
+
+        if not jobs:
+            return
+
+        if len(jobs) == 1:
+            key, func = jobs.popitem()
+            self._prefetch(key, func)
+            return
+
+        pool = ThreadPool(min(len(jobs), PREFETCH_POOL_SIZE))
+        try:
+            pool.map(lambda job: self._prefetch(*job), list(jobs.items()))
+        finally:
+            pool.close()
+            pool.join()
+
+    def _prefetch(self, key, func):
+        try:
+            self.memoize(key, func)
+        except Exception:  # pylint: disable=broad-except
+            # The exception is memoized, and raised again when the condition requests the value.
+            logger.debug('Failed to prefetch [%s] for basket [%s].', key, self.basket.id)
+
+
+def get_evaluation_context(basket):
+    """
+    Returns the evaluation context attached to the basket by the applicator.
+
+    Offers may be evaluated outside of an applicator run, e.g. when a single condition is checked. A context
+    used only by the caller is returned in this case.
+    """
+    context = getattr(basket, 'offer_evaluation_context', None)
+    if context is None:
+        context = OfferEvaluationContext(basket)
+    return context
@@ -0,0 +1,119 @@
+"""
+This command replays recent baskets through the applicator, and ranks the evaluated offers by cost.
+"""
+from __future__ import unicode_literals
+
+import json
+import logging
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.extensions.offer.profiling import OfferProfiler, rank_offers
+
+Applicator = get_class('offer.applicator', 'Applicator')
+Basket = get_model('basket', 'Basket')
+Default = get_class('partner.strategy', 'Default')
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Replays recent baskets through the applicator, and ranks the evaluated offers by the time spent evaluating them.
+
+    Offers are applied to the baskets within a transaction which is rolled back. Remote services, e.g. the
+    Enterprise and LMS services, are called as they are when baskets are viewed.
+
+    Example:
+
+        ./manage.py profile_offers --baskets 200 --days 3 --site-domain ecommerce.example.com
+    """
+
+    help = 'Replay recent baskets through the applicator, and rank offers by cost.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baskets',
+                            action='store',
+                            dest='baskets',
+                            type=int,
+                            default=100,
+                            help='Number of baskets to replay.')
+        parser.add_argument('--days',
+                            action='store',
+                            dest='days',
+                            type=int,
+                            default=7,
+                            help='Only replay baskets created within this number of days.')
+        parser.add_argument('--site-domain',
+                            action='store',
+                            dest='site_domain',
+                            type=str,
+                            help='Only replay baskets of the site with this domain.')
+        parser.add_argument('--top',
+                            action='store',
+                            dest='top',
+                            type=int,
+                            default=20,
+                            help='Number of offers reported.')
+        parser.add_argument('--json',
+                            action='store_true',
+                            dest='json',
+                            default=False,
+                            help='Report the offers as JSON.')
+
+    def get_baskets(self, options):
+        baskets = Basket.objects.filter(
+            date_created__gte=timezone.now() - timedelta(days=options['days']),
+            lines__isnull=False,
+        )
+        if options['site_domain']:
+            baskets = baskets.filter(site__domain=options['site_domain'])
+
+        baskets = baskets.distinct().select_related('owner', 'site__siteconfiguration__partner')
+        return baskets.order_by('-date_created')[:options['baskets']]
+
+    def handle(self, *args, **options):
+        profiler = OfferProfiler()
+        applicator = Applicator()
+        applicator.profiler = profiler
+
+        baskets = self.get_baskets(options)
+        for basket in baskets:
+            basket.strategy = Default()
+            with transaction.atomic():
+                try:
+                    applicator.apply(basket, basket.owner)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('Failed to apply offers to basket [%d].', basket.id)
+                finally:
+                    transaction.set_rollback(True)
+
+        logger.info(
+            'Replayed %d baskets, evaluating %d offers %d times.',
+            len(baskets), len(set(evaluation.offer_id for evaluation in profiler.evaluations)),
+            len(profiler.evaluations)
+        )
+
+        profiles = [profile.as_dict() for profile in rank_offers(profiler.evaluations)[:options['top']]]
+        if options['json']:
+            self.stdout.write(json.dumps(profiles, indent=2, sort_keys=True))
+            return
+
+        self.stdout.write('{:>8} {:<40} {:>11} {:>10} {:>10} {:>12} {:>8} {:>8}  {}'.format(
+            'Offer', 'Name', 'Evaluations', 'Mean (ms)', 'Max (ms)', 'Total (ms)', 'SQL', 'HTTP', 'Outcomes'
+        ))
+        for profile in profiles:
+            self.stdout.write('{:>8} {:<40} {:>11} {:>10} {:>10} {:>12} {:>8} {:>8}  {}'.format(
+                profile['offer_id'],
+                profile['offer_name'][:40],
+                profile['evaluations'],
+                profile['mean_time_ms'],
+                profile['max_time_ms'],
+                profile['total_time_ms'],
+                profile['sql_queries_per_evaluation'],
+                profile['http_requests_per_evaluation'],
+                ', '.join('{}={}'.format(outcome, count) for outcome, count in sorted(profile['outcomes'].items())),
+            ))
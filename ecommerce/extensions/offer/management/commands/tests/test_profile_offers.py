@@ -0,0 +1,45 @@
+import datetime
+import json
+from StringIO import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.offer.profiling import OUTCOME_NOT_SATISFIED
+from ecommerce.tests.testcases import TestCase
+
+Basket = get_model('basket', 'Basket')
+
+
+class ProfileOffersTests(TestCase):
+    """Tests for profile_offers management command."""
+
+    def setUp(self):
+        super(ProfileOffersTests, self).setUp()
+        self.basket = factories.create_basket()
+        self.basket.site = self.site
+        self.basket.save()
+        self.offer = factories.ConditionalOfferFactory(name='Profiled offer')
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command('profile_offers', *args, stdout=out)
+        return out.getvalue()
+
+    def get_profile(self, profiles):
+        return next((profile for profile in profiles if profile['offer_id'] == self.offer.id), None)
+
+    def test_profile_offers(self):
+        """Test that command reports the offers evaluated against the replayed baskets."""
+        profile = self.get_profile(json.loads(self.call_command('--json')))
+        self.assertEqual(profile['evaluations'], 1)
+        self.assertEqual(profile['outcomes'], {OUTCOME_NOT_SATISFIED: 1})
+
+        self.assertIn('Profiled offer', self.call_command())
+
+    def test_old_baskets_skipped(self):
+        """Test that command only replays baskets created within the given number of days."""
+        Basket.objects.filter(id=self.basket.id).update(date_created=timezone.now() - datetime.timedelta(days=10))
+        self.assertIsNone(self.get_profile(json.loads(self.call_command('--json', '--days=7'))))
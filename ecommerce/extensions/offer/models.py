@@ -64,8 +64,8 @@ class Benefit(AbstractBenefit):
         return [
             line for line in lines
             if (line.product.is_seat_product or line.product.is_course_entitlement_product) and
-            hasattr(line.product.attr, 'certificate_type') and
-            line.product.attr.certificate_type.lower() in applicable_range.course_seat_types
+            line.product.get_snapshot_attribute('certificate_type') is not None and
+            line.product.get_snapshot_attribute('certificate_type').lower() in applicable_range.course_seat_types
         ]
 
     def _identify_uncached_product_identifiers(self, lines, domain, partner_code, query):
@@ -81,7 +81,7 @@ class Benefit(AbstractBenefit):
             if line.product.is_seat_product:
                 product_id = line.product.course.id
             else:  # All lines passed to this method should either have a seat or an entitlement product
-                product_id = line.product.attr.UUID
+                product_id = line.product.get_snapshot_attribute('UUID')
 
             cache_key = get_cache_key(
                 site_domain=domain,
@@ -398,7 +398,9 @@ class Range(AbstractRange):
         # course_catalog is associated with course_seat_types.
         if self.course_catalog and self.course_seat_types:
             # Product certificate type should belongs to range seat types.
-            if product.attr.certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
+            certificate_type = product.get_snapshot_attribute('certificate_type')
+            if certificate_type is not None and \
+                    certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
                 response = self.catalog_contains_product(product)
                 # Range can have a catalog query and 'regular' products in it,
                 # therefor an OR is used to check for both possibilities.
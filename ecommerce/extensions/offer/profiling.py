@@ -0,0 +1,159 @@
+"""
+Profiling of the evaluation of offers by the applicator.
+
+The applicator profiles a sample of its runs, as set by the OFFER_PROFILING_SAMPLE_RATE setting. Each offer
+evaluated by a profiled run is recorded as an OfferEvaluation, with the time spent checking its condition and
+applying its benefit, the SQL queries and HTTP requests made meanwhile, and its outcome. Evaluations are sent
+to New Relic as OfferEvaluation custom events. The profile_offers management command uses the same profiler
+to rank offers by cost, replaying recent baskets offline.
+"""
+from __future__ import unicode_literals
+
+import random
+import time
+
+import newrelic.agent
+from django.conf import settings
+from oscar.apps.offer import results
+
+from ecommerce.core.instrumentation import collect_metrics
+
+OUTCOME_APPLIED = 'applied'
+OUTCOME_ERROR = 'error'
+OUTCOME_NOT_APPLIED = 'not_applied'
+OUTCOME_NOT_SATISFIED = 'not_satisfied'
+
+
+class OfferEvaluation(object):
+    """ Cost and outcome of the evaluation of an offer against a basket. Times are in seconds. """
+
+    def __init__(self, offer, basket):
+        self.offer_id = offer.id
+        self.offer_name = offer.name
+        self.basket_id = basket.id
+        self.condition_time = 0.0
+        self.benefit_time = 0.0
+        self.sql_queries = 0
+        self.http_requests = 0
+        self.outcome = None
+
+    @property
+    def duration(self):
+        return self.condition_time + self.benefit_time
+
+    def as_dict(self):
+        return {
+            'offer_id': self.offer_id,
+            'offer_name': self.offer_name,
+            'basket_id': self.basket_id,
+            'condition_time_ms': int(self.condition_time * 1000),
+            'benefit_time_ms': int(self.benefit_time * 1000),
+            'sql_queries': self.sql_queries,
+            'http_requests': self.http_requests,
+            'outcome': self.outcome,
+        }
+
+
+class OfferProfiler(object):
+    """ Records the evaluations of offers by the applicator. """
+
+    def __init__(self):
+        self.evaluations = []
+
+    def apply_benefit(self, offer, basket):
+        """
+        Applies the benefit of the offer to the basket, recording the evaluation of the offer.
+
+        This mirrors ConditionalOffer.apply_benefit, timing the condition and the benefit separately.
+
+        Returns:
+            ApplicationResult
+        """
+        evaluation = OfferEvaluation(offer, basket)
+        self.evaluations.append(evaluation)
+
+        with collect_metrics() as metrics:
+            start = time.time()
+            try:
+                is_satisfied = offer.is_condition_satisfied(basket)
+                evaluation.condition_time = time.time() - start
+
+                if not is_satisfied:
+                    evaluation.outcome = OUTCOME_NOT_SATISFIED
+                    return results.ZERO_DISCOUNT
+
+                start = time.time()
+                result = offer.benefit.proxy().apply(basket, offer.condition.proxy(), offer)
+                evaluation.benefit_time = time.time() - start
+                evaluation.outcome = OUTCOME_APPLIED if result.is_successful else OUTCOME_NOT_APPLIED
+                return result
+            except Exception:
+                evaluation.outcome = OUTCOME_ERROR
+                raise
+            finally:
+                evaluation.sql_queries = metrics.sql_queries
+                evaluation.http_requests = metrics.http_requests
+
+    def export(self):
+        """ Sends the recorded evaluations to New Relic. """
+        for evaluation in self.evaluations:
+            newrelic.agent.record_custom_event('OfferEvaluation', evaluation.as_dict())
+
+
+def should_profile():
+    """ Returns True if the current run of the applicator is sampled for profiling. """
+    sample_rate = getattr(settings, 'OFFER_PROFILING_SAMPLE_RATE', 0)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+class OfferProfile(object):
+    """ Aggregated cost of the evaluations of an offer. Times are in seconds. """
+
+    def __init__(self, offer_id, offer_name):
+        self.offer_id = offer_id
+        self.offer_name = offer_name
+        self.evaluations = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.sql_queries = 0
+        self.http_requests = 0
+        # Number of evaluations, keyed by outcome.
+        self.outcomes = {}
+
+    def add(self, evaluation):
+        self.evaluations += 1
+        self.total_time += evaluation.duration
+        self.max_time = max(self.max_time, evaluation.duration)
+        self.sql_queries += evaluation.sql_queries
+        self.http_requests += evaluation.http_requests
+        self.outcomes[evaluation.outcome] = self.outcomes.get(evaluation.outcome, 0) + 1
+
+    def as_dict(self):
+        return {
+            'offer_id': self.offer_id,
+            'offer_name': self.offer_name,
+            'evaluations': self.evaluations,
+            'total_time_ms': round(self.total_time * 1000, 3),
+            'mean_time_ms': round(self.total_time / self.evaluations * 1000, 3),
+            'max_time_ms': round(self.max_time * 1000, 3),
+            'sql_queries_per_evaluation': round(float(self.sql_queries) / self.evaluations, 2),
+            'http_requests_per_evaluation': round(float(self.http_requests) / self.evaluations, 2),
+            'outcomes': self.outcomes,
+        }
+
+
+def rank_offers(evaluations):
+    """
+    Aggregates evaluations by offer.
+
+    Returns:
+        list of OfferProfile: Profiles of the evaluated offers, the most costly first.
+    """
+    profiles = {}
+    for evaluation in evaluations:
+        profile = profiles.get(evaluation.offer_id)
+        if profile is None:
+            profile = profiles[evaluation.offer_id] = OfferProfile(evaluation.offer_id, evaluation.offer_name)
+        profile.add(evaluation)
+
+    return sorted(profiles.values(), key=lambda profile: profile.total_time, reverse=True)
@@ -0,0 +1,93 @@
+import mock
+from oscar.apps.offer.results import ZERO_DISCOUNT
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.offer.applicator import Applicator
+from ecommerce.extensions.offer.evaluation import OfferEvaluationContext, get_evaluation_context
+from ecommerce.tests.testcases import TestCase
+
+BasketAttribute = get_model('basket', 'BasketAttribute')
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+
+
+class OfferEvaluationContextTests(TestCase):
+    def setUp(self):
+        super(OfferEvaluationContextTests, self).setUp()
+        self.basket = factories.create_basket(empty=True)
+        self.basket.site = self.site
+        self.context = OfferEvaluationContext(self.basket)
+
+    def create_offer(self, jobs, partner=None):
+        """ Returns a mock offer, whose condition returns the given prefetch jobs. """
+        offer = mock.Mock(partner_id=(partner or self.partner).id)
+        offer.condition.proxy.return_value.get_prefetch_jobs.return_value = jobs
+        return offer
+
+    def test_memoize(self):
+        """ Verify a value is computed once. """
+        func = mock.Mock(return_value='value')
+        self.assertEqual(self.context.memoize(('key',), func), 'value')
+        self.assertEqual(self.context.memoize(('key',), func), 'value')
+        self.assertEqual(func.call_count, 1)
+
+    def test_memoize_exception(self):
+        """ Verify the exception raised while computing a value is raised each time the value is requested. """
+        func = mock.Mock(side_effect=ValueError)
+        for __ in range(2):
+            with self.assertRaises(ValueError):
+                self.context.memoize(('key',), func)
+        self.assertEqual(func.call_count, 1)
+
+    def test_get_basket_attribute(self):
+        """ Verify all the attributes of the basket are retrieved with a single query. """
+        for name in ('bundle_identifier', 'enterprise_catalog_uuid'):
+            BasketAttribute.objects.create(
+                basket=self.basket,
+                attribute_type=BasketAttributeType.objects.get_or_create(name=name)[0],
+                value_text='{} value'.format(name),
+            )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.context.get_basket_attribute('bundle_identifier'), 'bundle_identifier value')
+            self.assertEqual(
+                self.context.get_basket_attribute('enterprise_catalog_uuid'), 'enterprise_catalog_uuid value'
+            )
+            self.assertIsNone(self.context.get_basket_attribute('unknown'))
+
+    def test_prefetch(self):
+        """ Verify each distinct job is run once, and the offers of other partners are skipped. """
+        shared = mock.Mock(return_value='shared')
+        failing = mock.Mock(side_effect=ValueError)
+        other_partner = mock.Mock()
+        offers = [
+            self.create_offer([(('shared',), shared), (('failing',), failing)]),
+            self.create_offer([(('shared',), shared)]),
+            self.create_offer([(('other',), other_partner)], partner=factories.PartnerFactory()),
+        ]
+
+        self.context.prefetch(offers)
+
+        self.assertEqual(shared.call_count, 1)
+        self.assertEqual(failing.call_count, 1)
+        self.assertFalse(other_partner.called)
+        self.assertEqual(self.context.memoize(('shared',), mock.Mock()), 'shared')
+        with self.assertRaises(ValueError):
+            self.context.memoize(('failing',), mock.Mock())
+
+    def test_applicator(self):
+        """ Verify the applicator attaches the context to the basket while offers are applied. """
+        contexts = []
+
+        def apply_benefit(basket):
+            contexts.append(get_evaluation_context(basket))
+            return ZERO_DISCOUNT
+
+        offer = mock.Mock()
+        offer.get_max_applications.return_value = 1
+        offer.apply_benefit.side_effect = apply_benefit
+        Applicator().apply_offers(self.basket, [offer])
+
+        self.assertIsInstance(contexts[0], OfferEvaluationContext)
+        self.assertFalse(hasattr(self.basket, 'offer_evaluation_context'))
+        self.assertIsNot(get_evaluation_context(self.basket), contexts[0])
@@ -0,0 +1,74 @@
+import mock
+from django.test import override_settings
+from oscar.apps.offer.results import ZERO_DISCOUNT, BasketDiscount
+from oscar.test import factories
+
+from ecommerce.extensions.offer.applicator import Applicator
+from ecommerce.extensions.offer.profiling import (
+    OUTCOME_APPLIED,
+    OUTCOME_ERROR,
+    OUTCOME_NOT_SATISFIED,
+    OfferProfiler,
+    rank_offers
+)
+from ecommerce.tests.testcases import TestCase
+
+
+class OfferProfilerTests(TestCase):
+    def setUp(self):
+        super(OfferProfilerTests, self).setUp()
+        self.basket = factories.create_basket(empty=True)
+        self.profiler = OfferProfiler()
+
+    def create_offer(self, offer_id, is_satisfied=True, result=ZERO_DISCOUNT):
+        """ Returns a mock offer, with the given condition and benefit outcomes. """
+        offer = mock.Mock(id=offer_id)
+        offer.name = 'Offer {}'.format(offer_id)
+        offer.get_max_applications.return_value = 1
+        offer.is_condition_satisfied.return_value = is_satisfied
+        offer.benefit.proxy.return_value.apply.return_value = result
+        return offer
+
+    def test_apply_benefit(self):
+        """ Verify the outcome of each evaluation is recorded. """
+        discount = BasketDiscount(10)
+        self.assertEqual(self.profiler.apply_benefit(self.create_offer(1, result=discount), self.basket), discount)
+        self.assertEqual(self.profiler.apply_benefit(self.create_offer(2, is_satisfied=False), self.basket),
+                         ZERO_DISCOUNT)
+        failing_offer = self.create_offer(3)
+        failing_offer.is_condition_satisfied.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.profiler.apply_benefit(failing_offer, self.basket)
+
+        self.assertEqual(
+            [(evaluation.offer_id, evaluation.outcome) for evaluation in self.profiler.evaluations],
+            [(1, OUTCOME_APPLIED), (2, OUTCOME_NOT_SATISFIED), (3, OUTCOME_ERROR)]
+        )
+
+    def test_rank_offers(self):
+        """ Verify offers are ranked by the total time spent evaluating them. """
+        for offer_id, duration in ((1, 0.1), (2, 0.3), (1, 0.1), (3, 0.15)):
+            self.profiler.apply_benefit(self.create_offer(offer_id), self.basket)
+            self.profiler.evaluations[-1].condition_time = duration
+
+        profiles = rank_offers(self.profiler.evaluations)
+        self.assertEqual([profile.offer_id for profile in profiles], [2, 1, 3])
+        self.assertEqual(profiles[1].evaluations, 2)
+        self.assertEqual(profiles[1].as_dict()['mean_time_ms'], 100)
+
+    @override_settings(OFFER_PROFILING_SAMPLE_RATE=1)
+    def test_applicator_sampled(self):
+        """ Verify the evaluations of sampled applicator runs are sent to New Relic. """
+        with mock.patch('newrelic.agent.record_custom_event') as mock_record:
+            Applicator().apply_offers(self.basket, [self.create_offer(1, is_satisfied=False)])
+        mock_record.assert_called_once_with('OfferEvaluation', mock.ANY)
+        self.assertEqual(mock_record.call_args[0][1]['outcome'], OUTCOME_NOT_SATISFIED)
+
+    def test_applicator_not_sampled(self):
+        """ Verify applicator runs are not profiled by default. """
+        offer = self.create_offer(1)
+        offer.apply_benefit.return_value = ZERO_DISCOUNT
+        with mock.patch('newrelic.agent.record_custom_event') as mock_record:
+            Applicator().apply_offers(self.basket, [offer])
+        self.assertTrue(offer.apply_benefit.called)
+        self.assertFalse(mock_record.called)
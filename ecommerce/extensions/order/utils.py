@@ -13,6 +13,7 @@ from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, ConnectTimeout  # pylint: disable=ungrouped-imports
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.lookups import options
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -20,7 +21,6 @@ from ecommerce.referrals.models import Referral
 
 logger = logging.getLogger(__name__)
 
-Option = get_model('catalogue', 'Option')
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
 RefundLine = get_model('refund', 'RefundLine')
@@ -185,7 +185,7 @@ class UserAlreadyPlacedOrder(object):
         if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
             return False
 
-        entitlement_option = Option.objects.get(code='course_entitlement')
+        entitlement_option = options.get('course_entitlement')
 
         orders_lines = OrderLine.objects.filter(product=product, order__user=user)
         if orders_lines:
@@ -5,7 +5,7 @@ from oscar.apps.payment.admin import *  # noqa pylint: disable=wildcard-import,u
 from oscar.core.loading import get_model
 from solo.admin import SingletonModelAdmin
 
-from ecommerce.extensions.payment.models import SDNCheckFailure
+from ecommerce.extensions.payment.models import CybersourceNotification, SDNCheckFailure, SDNList
 
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 PaypalProcessorConfiguration = get_model('payment', 'PaypalProcessorConfiguration')
@@ -50,4 +50,28 @@ class SDNCheckFailureAdmin(admin.ModelAdmin):
         # Use format_html() to escape user-provided inputs, avoiding an XSS vulnerability.
         return format_html('<br><br><pre>{}</pre>', pretty_response)
 
+
+@admin.register(CybersourceNotification)
+class CybersourceNotificationAdmin(admin.ModelAdmin):
+    list_filter = ('status',)
+    search_fields = ('idempotency_key', 'order_number')
+    list_display = ('idempotency_key', 'order_number', 'status', 'attempts', 'created')
+    fields = ('idempotency_key', 'order_number', 'site', 'status', 'attempts', 'formatted_notification')
+    readonly_fields = ('idempotency_key', 'order_number', 'site', 'attempts', 'formatted_notification')
+    show_full_result_count = False
+
+    def formatted_notification(self, obj):
+        pretty_notification = pformat(obj.notification)
+
+        # Use format_html() to escape user-provided inputs, avoiding an XSS vulnerability.
+        return format_html('<br><br><pre>{}</pre>', pretty_notification)
+
+
 admin.site.register(PaypalProcessorConfiguration, SingletonModelAdmin)
+
+
+@admin.register(SDNList)
+class SDNListAdmin(admin.ModelAdmin):
+    list_display = ('id', 'entries_count', 'source_url', 'created', 'modified')
+    fields = ('entries_count', 'source_url', 'checksum', 'created', 'modified')
+    readonly_fields = ('entries_count', 'source_url', 'checksum', 'created', 'modified')
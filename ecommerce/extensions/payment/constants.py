@@ -38,6 +38,12 @@ CYBERSOURCE_CARD_TYPE_MAP = {
 
 CLIENT_SIDE_CHECKOUT_FLAG_NAME = 'enable_client_side_checkout'
 
+# When active, accepted CyberSource notifications are recorded and their orders placed asynchronously.
+ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH = 'async_cybersource_notifications'
+
+# When active, SDN checks search the local mirror of the screening list, imported by the sync_sdn_list command.
+SDN_LOCAL_LIST_SWITCH = 'enable_sdn_local_list'
+
 # Paypal only supports 4 languages, which are prioritized by country.
 # https://developer.paypal.com/docs/classic/api/locale_codes/
 PAYPAL_LOCALES = {
@@ -0,0 +1,62 @@
+""" Places the orders of the CyberSource notifications recorded for asynchronous processing. """
+from __future__ import unicode_literals
+
+import datetime
+import logging
+
+from django.core.management import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.payment.notifications import process_notifications
+
+logger = logging.getLogger(__name__)
+
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
+
+
+class Command(BaseCommand):
+    help = 'Place the orders of the recorded CyberSource payment notifications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            type=int,
+                            default=100,
+                            help='Maximum number of notifications to process.')
+        parser.add_argument('--retry-failed',
+                            action='store_true',
+                            dest='retry_failed',
+                            default=False,
+                            help='Also process the notifications that previously failed.')
+        parser.add_argument('--max-attempts',
+                            action='store',
+                            dest='max_attempts',
+                            type=int,
+                            default=3,
+                            help='Number of attempts after which failed notifications are no longer retried.')
+        parser.add_argument('--stale-after',
+                            action='store',
+                            dest='stale_after',
+                            type=int,
+                            default=30,
+                            help='Minutes after which notifications left in processing, e.g. by a worker that '
+                                 'was stopped, are processed again.')
+
+    def handle(self, *args, **options):
+        stale = timezone.now() - datetime.timedelta(minutes=options['stale_after'])
+        query = Q(status=CybersourceNotification.PENDING) | Q(
+            status=CybersourceNotification.PROCESSING, modified__lt=stale
+        )
+        if options['retry_failed']:
+            query |= Q(status=CybersourceNotification.FAILED)
+
+        notifications = CybersourceNotification.objects.filter(
+            query, attempts__lt=options['max_attempts']
+        ).select_related('site').order_by('created')[:options['batch_size']]
+        notifications = list(notifications)
+
+        processed = process_notifications(notifications)
+        logger.info('Processed %d of %d CyberSource notifications.', processed, len(notifications))
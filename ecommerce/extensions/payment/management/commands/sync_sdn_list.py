@@ -0,0 +1,58 @@
+""" Imports the consolidated screening list, searched by SDN checks instead of the trade.gov API. """
+from __future__ import unicode_literals
+
+import logging
+
+import requests
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.payment.sdn import import_list
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Download the consolidated screening list, and import it for SDN checks made locally.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url',
+                            action='store',
+                            dest='url',
+                            default=None,
+                            help='URL of the list CSV file. Defaults to settings.SDN_LIST_URL.')
+        parser.add_argument('--file',
+                            action='store',
+                            dest='file',
+                            default=None,
+                            help='Path of a list CSV file downloaded beforehand, imported instead of downloading it.')
+        parser.add_argument('--force',
+                            action='store_true',
+                            dest='force',
+                            default=False,
+                            help='Import the list even if the file is the one the current list was imported from.')
+
+    def handle(self, *args, **options):
+        if options['file']:
+            source = options['file']
+            with open(source, 'rb') as f:
+                data = f.read()
+        else:
+            source = options['url'] or settings.SDN_LIST_URL
+            try:
+                response = requests.get(source, timeout=settings.SDN_LIST_DOWNLOAD_TIMEOUT)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as exc:
+                raise CommandError('Failed to download the SDN list from [{}]: {}'.format(source, exc))
+            data = response.content
+
+        try:
+            sdn_list = import_list(data, source_url=source, force=options['force'])
+        except ValueError as exc:
+            raise CommandError('Failed to import the SDN list from [{}]: {}'.format(source, exc))
+
+        if sdn_list is None:
+            logger.info('The SDN list downloaded from [%s] is unchanged.', source)
+        else:
+            logger.info('Imported SDN list [%d], listing %d individuals, from [%s].',
+                        sdn_list.id, sdn_list.entries_count, source)
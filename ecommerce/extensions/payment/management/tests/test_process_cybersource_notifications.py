@@ -0,0 +1,106 @@
+from __future__ import unicode_literals
+
+import mock
+from django.core.management import call_command
+from factory.django import mute_signals
+from oscar.core.loading import get_class, get_model
+from oscar.test import factories
+
+from ecommerce.extensions.payment.notifications import CybersourceNotificationProcessor
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.testcases import TestCase
+
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
+Order = get_model('order', 'Order')
+
+post_checkout = get_class('checkout.signals', 'post_checkout')
+
+
+@mute_signals(post_checkout)
+class ProcessCybersourceNotificationsTests(CybersourceMixin, TestCase):
+    command = 'process_cybersource_notifications'
+
+    def setUp(self):
+        super(ProcessCybersourceNotificationsTests, self).setUp()
+        self.processor = Cybersource(self.site)
+        self.basket = create_basket(owner=factories.UserFactory(), site=self.site)
+        self.basket.freeze()
+
+    def create_record(self, key='123456', basket=None, **kwargs):
+        notification = self.generate_notification(basket or self.basket, billing_address=self.make_billing_address())
+        return CybersourceNotification.objects.create(
+            idempotency_key=key,
+            order_number=notification['req_reference_number'],
+            site=self.site,
+            notification=notification,
+            **kwargs
+        )
+
+    def assert_status(self, record, status, attempts=1):
+        record.refresh_from_db()
+        self.assertEqual(record.status, status)
+        self.assertEqual(record.attempts, attempts)
+
+    def test_order_placed(self):
+        """ Verify the orders of pending notifications are placed once. """
+        record = self.create_record()
+
+        call_command(self.command)
+        call_command(self.command)
+
+        self.assertEqual(Order.objects.filter(basket=self.basket).count(), 1)
+        self.assert_status(record, CybersourceNotification.PROCESSED)
+
+    def test_orders_placed(self):
+        """ Verify the payment of each order is only recorded against that order. """
+        other_basket = create_basket(owner=factories.UserFactory(), site=self.site)
+        other_basket.freeze()
+        self.create_record(key='1')
+        self.create_record(key='2', basket=other_basket)
+
+        call_command(self.command)
+
+        for basket in (self.basket, other_basket):
+            order = Order.objects.get(basket=basket)
+            self.assertEqual(order.sources.count(), 1)
+            self.assertEqual(order.sources.first().amount_debited, order.total_incl_tax)
+            self.assertEqual(order.payment_events.count(), 1)
+
+    def test_duplicate_order(self):
+        """ Verify a notification of an order that was already placed is processed without placing another order. """
+        first = self.create_record(key='1')
+        second = self.create_record(key='2')
+
+        call_command(self.command)
+
+        self.assertEqual(Order.objects.filter(basket=self.basket).count(), 1)
+        self.assert_status(first, CybersourceNotification.PROCESSED)
+        self.assert_status(second, CybersourceNotification.PROCESSED)
+
+    def test_failure(self):
+        """ Verify failed notifications are only retried when requested, until they reach the maximum attempts. """
+        record = self.create_record()
+
+        with mock.patch.object(CybersourceNotificationProcessor, 'create_order', side_effect=Exception):
+            call_command(self.command)
+            self.assert_status(record, CybersourceNotification.FAILED)
+
+            call_command(self.command)
+            self.assert_status(record, CybersourceNotification.FAILED)
+
+            call_command(self.command, retry_failed=True, max_attempts=2)
+            call_command(self.command, retry_failed=True, max_attempts=2)
+            self.assert_status(record, CybersourceNotification.FAILED, attempts=2)
+
+        self.assertFalse(Order.objects.filter(basket=self.basket).exists())
+
+    def test_claimed_notification_skipped(self):
+        """ Verify a notification claimed by another worker is not processed again. """
+        record = self.create_record()
+        processor = CybersourceNotificationProcessor(self.site)
+        CybersourceNotification.objects.filter(id=record.id).update(status=CybersourceNotification.PROCESSING)
+
+        self.assertFalse(processor.process(record))
+        self.assertFalse(Order.objects.filter(basket=self.basket).exists())
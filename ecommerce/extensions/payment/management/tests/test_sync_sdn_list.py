@@ -0,0 +1,30 @@
+from __future__ import unicode_literals
+
+import httpretty
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.payment.tests.test_sdn import SDN_LIST_CSV
+from ecommerce.tests.testcases import TestCase
+
+SDNList = get_model('payment', 'SDNList')
+
+
+class SyncSDNListTests(TestCase):
+    command = 'sync_sdn_list'
+
+    @httpretty.activate
+    def test_sync(self):
+        """ The list should be downloaded, and imported. """
+        httpretty.register_uri(httpretty.GET, settings.SDN_LIST_URL, body=SDN_LIST_CSV)
+        call_command(self.command)
+        self.assertEqual(SDNList.objects.get().entries_count, 2)
+
+    @httpretty.activate
+    def test_download_error(self):
+        """ The command should fail, leaving the current list in place, if the list cannot be downloaded. """
+        httpretty.register_uri(httpretty.GET, settings.SDN_LIST_URL, status=500)
+        with self.assertRaises(CommandError):
+            call_command(self.command)
+        self.assertFalse(SDNList.objects.exists())
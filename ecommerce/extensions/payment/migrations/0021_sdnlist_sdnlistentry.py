@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0020_cybersourcenotification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SDNList',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('source_url', models.CharField(blank=True, max_length=255)),
+                ('checksum', models.CharField(max_length=64)),
+                ('entries_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'get_latest_by': 'created',
+                'verbose_name': 'SDN List',
+            },
+        ),
+        migrations.CreateModel(
+            name='SDNListEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=32)),
+                ('name', models.CharField(max_length=1024)),
+                ('names', models.TextField()),
+                ('addresses', models.TextField()),
+                ('countries', models.CharField(max_length=255)),
+                ('sdn_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='payment.SDNList')),
+            ],
+            options={
+                'verbose_name': 'SDN List Entry',
+                'verbose_name_plural': 'SDN List Entries',
+            },
+        ),
+    ]
@@ -67,5 +67,69 @@ class SDNCheckFailure(TimeStampedModel):
     class Meta(object):
         verbose_name = 'SDN Check Failure'
 
+
+class CybersourceNotification(TimeStampedModel):
+    """
+    Signed CyberSource payment notification, recorded so that its order can be placed asynchronously.
+
+    The idempotency key is unique, so a notification CyberSource delivers more than once is only recorded,
+    and processed, once.
+    """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    PROCESSED = 'processed'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (PROCESSING, _('Processing')),
+        (PROCESSED, _('Processed')),
+        (FAILED, _('Failed')),
+    )
+
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    order_number = models.CharField(max_length=128, db_index=True)
+    site = models.ForeignKey('sites.Site', verbose_name=_('Site'), null=True, blank=True, on_delete=models.SET_NULL)
+    notification = JSONField()
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def __unicode__(self):
+        return 'CyberSource notification [{key}]'.format(key=self.idempotency_key)
+
+    class Meta(object):
+        verbose_name = 'CyberSource Notification'
+
+
+class SDNList(TimeStampedModel):
+    """
+    Import of the individuals of the consolidated screening list, searched instead of the trade.gov API.
+
+    The list is modified whenever it is synced, even if the file downloaded is the one it was imported from.
+    """
+    source_url = models.CharField(max_length=255, blank=True)
+    checksum = models.CharField(max_length=64)
+    entries_count = models.PositiveIntegerField(default=0)
+
+    def __unicode__(self):
+        return 'SDN list [{id}]'.format(id=self.id)
+
+    class Meta(object):
+        get_latest_by = 'created'
+        verbose_name = 'SDN List'
+
+
+class SDNListEntry(models.Model):
+    """ Individual of the consolidated screening list, with the normalized words of their names and addresses. """
+    sdn_list = models.ForeignKey(SDNList, related_name='entries', on_delete=models.CASCADE)
+    source = models.CharField(max_length=32)
+    name = models.CharField(max_length=1024)
+    names = models.TextField()
+    addresses = models.TextField()
+    countries = models.CharField(max_length=255)
+
+    class Meta(object):
+        verbose_name = 'SDN List Entry'
+        verbose_name_plural = 'SDN List Entries'
+
 # noinspection PyUnresolvedReferences
 from oscar.apps.payment.models import *  # noqa isort:skip pylint: disable=ungrouped-imports, wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order
@@ -0,0 +1,103 @@
+"""
+Asynchronous placement of the orders paid for by recorded CyberSource notifications.
+
+When the async_cybersource_notifications switch is active, CybersourceInterstitialView records each accepted,
+validly signed, notification as a CybersourceNotification and acknowledges it immediately. The orders of
+these notifications are placed by the process_cybersource_notifications management command.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import IntegrityError
+from django.db.models import F
+from django.test import RequestFactory
+from django.urls import reverse
+from oscar.core.loading import get_model
+from threadlocals.threadlocals import get_current_request, set_thread_variable
+
+from ecommerce.extensions.payment.exceptions import DuplicateReferenceNumber
+from ecommerce.extensions.payment.views.cybersource import CybersourceNotificationMixin
+
+logger = logging.getLogger(__name__)
+
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
+
+
+class CybersourceNotificationProcessor(CybersourceNotificationMixin):
+    """
+    Places the order of a recorded notification.
+
+    The payment sources and events of the order are collected on the processor, so a new processor must be
+    used for each notification.
+    """
+
+    def __init__(self, site):
+        # Order placement, and the receivers of the signals it sends, expect a request of the site.
+        self.request = RequestFactory().post(reverse('cybersource:redirect'))
+        self.request.site = site
+        self.request.user = AnonymousUser()
+
+    def claim(self, record):
+        """
+        Marks the notification as being processed, returning False if another worker claimed it first.
+
+        The conditional update is atomic, so each notification is only processed by a single worker.
+        """
+        return CybersourceNotification.objects.filter(id=record.id, status=record.status).update(
+            status=CybersourceNotification.PROCESSING,
+            attempts=F('attempts') + 1,
+        ) == 1
+
+    def process(self, record):
+        """
+        Places the order paid for by the notification, unless another notification already placed it.
+
+        Returns:
+            bool: True if the notification was processed, False if it failed or was claimed by another worker.
+        """
+        if not self.claim(record):
+            return False
+
+        current_request = get_current_request()
+        set_thread_variable('request', self.request)
+        notification = record.notification
+        status = CybersourceNotification.PROCESSED
+        try:
+            basket = self.validate_notification(notification)
+            order = self.create_order(self.request, basket, self._get_billing_address(notification))
+            self.handle_post_order(order)
+        except (DuplicateReferenceNumber, IntegrityError):
+            # The order number is unique, so an order already placed for this payment cannot be placed again.
+            logger.info(
+                'The order [%s] of CyberSource notification [%s] already exists. No new order was created.',
+                record.order_number,
+                record.idempotency_key
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                'Failed to place the order [%s] of CyberSource notification [%s].',
+                record.order_number,
+                record.idempotency_key
+            )
+            status = CybersourceNotification.FAILED
+        finally:
+            set_thread_variable('request', current_request)
+
+        CybersourceNotification.objects.filter(id=record.id).update(status=status)
+        return status == CybersourceNotification.PROCESSED
+
+
+def process_notifications(notifications):
+    """
+    Places the orders of the given notifications.
+
+    Returns:
+        int: Number of notifications processed.
+    """
+    processed = 0
+    for record in notifications:
+        if CybersourceNotificationProcessor(record.site).process(record):
+            processed += 1
+    return processed
@@ -1,14 +1,13 @@
 """ Invoice payment processing. """
 from oscar.core.loading import get_model
 
+from ecommerce.core.lookups import payment_event_types, source_types
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.processors import BasePaymentProcessor
 from ecommerce.invoice.models import Invoice
 
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 Source = get_model('payment', 'Source')
-SourceType = get_model('payment', 'SourceType')
 
 
 class InvoicePayment(BasePaymentProcessor):
@@ -25,11 +24,10 @@ class InvoicePayment(BasePaymentProcessor):
         Create a new invoice record and return the source and event.
         """
 
-        source_type, __ = SourceType.objects.get_or_create(name=self.NAME)
+        source_type, __ = source_types.get_or_create(self.NAME)
         source = Source(source_type=source_type, label='Invoice')
 
-        event_type, __ = PaymentEventType.objects.get_or_create(
-            name=PaymentEventTypeName.PAID)
+        event_type, __ = payment_event_types.get_or_create(PaymentEventTypeName.PAID)
         event = PaymentEvent(event_type=event_type, processor_name=self.NAME)
 
         invoice = Invoice.objects.create(order=order, business_client=business_client)
@@ -0,0 +1,259 @@
+"""
+Local mirror of the consolidated screening list, searched in-process instead of the trade.gov API.
+
+The sync_sdn_list command imports the individuals of the list, downloaded as a CSV file, into the SDNList and
+SDNListEntry tables. Each process builds an index of the current list, mapping the words of the listed names to
+entries, and the trigrams of these words to the words, so names are matched despite small spelling differences.
+The index is rebuilt once a newer list is imported. Searches fall back to the trade.gov API while no list, or only
+an outdated one, is imported.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import hashlib
+import logging
+import re
+import threading
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import six
+import unicodecsv as csv
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from oscar.core.loading import get_model
+from unidecode import unidecode
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+
+SDNList = get_model('payment', 'SDNList')
+SDNListEntry = get_model('payment', 'SDNListEntry')
+
+CURRENT_LIST_KEY = get_cache_key(sdn_list='current')
+# Seconds the current list is cached for. Lists imported in other processes are searched after at most this long.
+CURRENT_LIST_CACHE_TIMEOUT = 300
+
+# Type of the entries imported, matching the type searched through the trade.gov API.
+ENTRY_TYPE = 'Individual'
+
+# Words shorter than this only match identical words.
+MIN_FUZZY_WORD_LENGTH = 4
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+SOURCE_PATTERN = re.compile(r'\(([^)]+)\)')
+COUNTRY_PATTERN = re.compile(r'\b[A-Z]{2}\b')
+
+
+def tokenize(text):
+    """ Returns the set of words of the text, transliterated to ASCII and lowercased. """
+    return set(WORD_PATTERN.findall(unidecode(six.text_type(text or '')).lower()))
+
+
+def get_source_abbreviation(source):
+    """ Returns the abbreviation of a source, as passed to the trade.gov API, e.g. SDN for the SDN list. """
+    abbreviations = SOURCE_PATTERN.findall(source)
+    abbreviation = abbreviations[-1] if abbreviations else source
+    return abbreviation.split()[0].upper() if abbreviation.strip() else ''
+
+
+def _get_trigrams(word):
+    padded = ' {} '.format(word)
+    return set(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+class SDNIndex(object):
+    """ In-memory index of the entries of a screening list. """
+
+    def __init__(self, entries, threshold):
+        self.threshold = threshold
+        self.entries = {}
+        # Entry IDs keyed by the words of their names.
+        self.postings = defaultdict(set)
+        # Words of the names keyed by their trigrams.
+        self.trigrams = defaultdict(set)
+
+        for entry in entries:
+            self.entries[entry['id']] = entry
+            for word in entry['names'].split():
+                if word not in self.postings and len(word) >= MIN_FUZZY_WORD_LENGTH:
+                    for trigram in _get_trigrams(word):
+                        self.trigrams[trigram].add(word)
+                self.postings[word].add(entry['id'])
+
+    def _match_word(self, word):
+        """ Returns the IDs of the entries with names including the word, or a word similar to it. """
+        entry_ids = set(self.postings.get(word, ()))
+        if len(word) < MIN_FUZZY_WORD_LENGTH or self.threshold >= 1:
+            return entry_ids
+
+        candidates = set()
+        for trigram in _get_trigrams(word):
+            candidates.update(self.trigrams.get(trigram, ()))
+        candidates.discard(word)
+
+        matcher = SequenceMatcher(None, '', word)
+        for candidate in candidates:
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() >= self.threshold and matcher.quick_ratio() >= self.threshold and \
+                    matcher.ratio() >= self.threshold:
+                entry_ids.update(self.postings[candidate])
+        return entry_ids
+
+    def search(self, name, city, country, sources):
+        """
+        Returns the entries of the given sources listing the individual.
+
+        Every word of the name must match a word of the names of the entry, every word of the city must be a word
+        of its addresses, and the country must be one of its countries.
+        """
+        name_words = tokenize(name)
+        city_words = tokenize(city)
+        country = (country or '').upper()
+        if not name_words:
+            return []
+
+        entry_ids = None
+        for word in sorted(name_words, key=len, reverse=True):
+            matches = self._match_word(word)
+            entry_ids = matches if entry_ids is None else entry_ids & matches
+            if not entry_ids:
+                return []
+
+        hits = []
+        for entry_id in sorted(entry_ids):
+            entry = self.entries[entry_id]
+            if entry['source'] in sources and country in entry['countries'].split() and \
+                    city_words.issubset(entry['addresses'].split()):
+                hits.append(entry)
+        return hits
+
+
+class _LocalIndex(object):
+    """ The index of the current list, held by this process. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = None
+        self.index = None
+
+    def get(self, current):
+        with self.lock:
+            if self.current != current:
+                entries = SDNListEntry.objects.filter(sdn_list_id=current[0]).values(
+                    'id', 'source', 'name', 'names', 'addresses', 'countries'
+                )
+                self.index = SDNIndex(entries, settings.SDN_FUZZY_MATCH_THRESHOLD)
+                self.current = current
+            return self.index
+
+
+_local_index = _LocalIndex()
+
+
+def get_current_list():
+    """ Returns the ID and last sync time of the most recently imported list, or None if no list is imported. """
+    current = cache.get(CURRENT_LIST_KEY)
+    if current is None:
+        sdn_list = SDNList.objects.order_by('-created').values_list('id', 'modified').first()
+        current = sdn_list or ()
+        cache.set(CURRENT_LIST_KEY, current, CURRENT_LIST_CACHE_TIMEOUT)
+    return tuple(current) or None
+
+
+def search_local_list(name, city, country, sources):
+    """
+    Searches the local mirror of the screening list for an individual.
+
+    Args:
+        name (str): Individual's full name.
+        city (str): Individual's city.
+        country (str): ISO 3166-1 alpha-2 country code where the individual is from.
+        sources (str): Comma-separated abbreviations of the sources searched, e.g. "SDN,ISN".
+
+    Returns:
+        dict: Response in the format of the trade.gov API, or None if no list, or only an outdated one, is imported.
+    """
+    current = get_current_list()
+    if current is None:
+        return None
+
+    list_id, synced = current
+    if synced < timezone.now() - datetime.timedelta(days=settings.SDN_LIST_MAX_AGE):
+        logger.warning('The local SDN list [%d] was last synced on [%s], and is outdated.', list_id, synced)
+        return None
+
+    sources = set(source.strip().upper() for source in (sources or '').split(','))
+    hits = _local_index.get(current).search(name, city, country, sources)
+    return {
+        'total': len(hits),
+        'sdn_list': list_id,
+        'results': [
+            {'name': hit['name'], 'source': hit['source'], 'countries': hit['countries'].split()} for hit in hits
+        ],
+    }
+
+
+def parse_list(data):
+    """
+    Returns the individuals listed in a consolidated screening list CSV file.
+
+    Raises:
+        ValueError: If the file lacks the columns of the consolidated screening list.
+    """
+    reader = csv.DictReader(six.BytesIO(data), encoding='utf-8-sig')
+    if not {'source', 'type', 'name'}.issubset(reader.fieldnames or ()):
+        raise ValueError('The file is not a consolidated screening list.')
+
+    for row in reader:
+        if (row.get('type') or '').strip() != ENTRY_TYPE:
+            continue
+
+        alt_names = row.get('alt_names') or ''
+        addresses = row.get('addresses') or ''
+        countries = set(COUNTRY_PATTERN.findall(' '.join(
+            [address.rsplit(',', 1)[-1] for address in addresses.split(';')] +
+            [row.get('citizenships') or '', row.get('nationalities') or '']
+        )))
+        yield SDNListEntry(
+            source=get_source_abbreviation(row['source'] or ''),
+            name=row['name'][:1024],
+            names=' '.join(sorted(tokenize(row['name']) | tokenize(alt_names))),
+            addresses=' '.join(sorted(tokenize(addresses))),
+            countries=' '.join(sorted(countries)),
+        )
+
+
+def import_list(data, source_url='', force=False):
+    """
+    Imports the individuals of a consolidated screening list CSV file, replacing the current list.
+
+    Returns:
+        SDNList: The list imported, or None if the file is the one the current list was imported from, in which
+            case the current list is marked as synced.
+    """
+    checksum = hashlib.sha256(data).hexdigest()
+    current = SDNList.objects.order_by('-created').first()
+    if current and current.checksum == checksum and not force:
+        # The list is up to date.
+        current.save()
+        cache.delete(CURRENT_LIST_KEY)
+        return None
+
+    entries = list(parse_list(data))
+    if not entries:
+        raise ValueError('The file lists no individuals.')
+
+    with transaction.atomic():
+        sdn_list = SDNList.objects.create(source_url=source_url, checksum=checksum, entries_count=len(entries))
+        for entry in entries:
+            entry.sdn_list = sdn_list
+        SDNListEntry.objects.bulk_create(entries, batch_size=1000)
+        SDNListEntry.objects.exclude(sdn_list=sdn_list).delete()
+        SDNList.objects.exclude(id=sdn_list.id).delete()
+
+    cache.delete(CURRENT_LIST_KEY)
+    return sdn_list
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+
+import ddt
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+from ecommerce.core.tests import toggle_switch
+from ecommerce.extensions.payment.constants import SDN_LOCAL_LIST_SWITCH
+from ecommerce.extensions.payment.sdn import import_list, search_local_list, tokenize
+from ecommerce.extensions.payment.utils import SDNClient
+from ecommerce.tests.testcases import TestCase
+
+SDNList = get_model('payment', 'SDNList')
+
+SDN_LIST_CSV = (
+    '\ufeffsource,type,name,alt_names,addresses,citizenships,nationalities\n'
+    '"Specially Designated Nationals (SDN) - Treasury Department",Individual,"Jöhn Smith","Johnny Smyth",'
+    '"1 Main St, Havana, CU",,\n'
+    '"Nonproliferation Sanctions (ISN) - State Department",Individual,"Maria Lopez",,"Caracas, VE",,VE\n'
+    '"Specially Designated Nationals (SDN) - Treasury Department",Entity,"Smith Trading",,"Havana, CU",,\n'
+).encode('utf-8')
+
+
+@ddt.ddt
+class LocalSDNListTests(TestCase):
+    def setUp(self):
+        super(LocalSDNListTests, self).setUp()
+        self.sdn_list = import_list(SDN_LIST_CSV)
+
+    def test_tokenize(self):
+        """ Words should be transliterated to ASCII, and lowercased. """
+        self.assertEqual(tokenize('Jöhn  SMITH-Jones'), {'john', 'smith', 'jones'})
+
+    def test_import(self):
+        """ Only the individuals of the list should be imported, and the same file should not be imported twice. """
+        self.assertEqual(self.sdn_list.entries_count, 2)
+        self.assertEqual(
+            set(self.sdn_list.entries.values_list('source', 'countries')), {('SDN', 'CU'), ('ISN', 'VE')}
+        )
+        self.assertIsNone(import_list(SDN_LIST_CSV))
+        self.assertEqual(import_list(SDN_LIST_CSV, force=True).entries_count, 2)
+        self.assertEqual(SDNList.objects.count(), 1)
+
+    def test_import_invalid_file(self):
+        """ Files other than screening lists should not be imported. """
+        with self.assertRaises(ValueError):
+            import_list(b'foo,bar\n1,2\n')
+
+    @ddt.data(
+        ('John Smith', 'Havana', 'CU', 'SDN', 1),
+        ('smith john', '', 'CU', 'SDN', 1),
+        ('Johnny Smyth', 'Havana', 'CU', 'SDN', 1),
+        ('John Smiht', 'Havana', 'CU', 'SDN', 0),
+        ('Jon Smith', 'Havana', 'CU', 'SDN', 0),
+        ('Johnny Smythe', 'Havana', 'CU', 'SDN', 1),
+        ('John Smith', 'Caracas', 'CU', 'SDN', 0),
+        ('John Smith', 'Havana', 'US', 'SDN', 0),
+        ('John Smith', 'Havana', 'CU', 'ISN', 0),
+        ('Maria Lopez', 'Caracas', 'VE', 'SDN,ISN', 1),
+        ('Smith Trading', 'Havana', 'CU', 'SDN', 0),
+    )
+    @ddt.unpack
+    def test_search(self, name, city, country, sources, hits):
+        """ Individuals should be matched by name, despite small spelling differences, city, country and source. """
+        self.assertEqual(search_local_list(name, city, country, sources)['total'], hits)
+
+    def test_search_outdated(self):
+        """ Outdated lists should not be searched. """
+        SDNList.objects.update(modified=timezone.now() - datetime.timedelta(days=30))
+        self.assertIsNone(search_local_list('John Smith', 'Havana', 'CU', 'SDN'))
+
+    def test_client(self):
+        """ The SDN client should search the local list instead of the SDN API, if the switch is active. """
+        client = SDNClient('http://sdn-test.fake/', 'fake-key', 'SDN')
+        toggle_switch(SDN_LOCAL_LIST_SWITCH, True)
+        self.assertEqual(client.search('John Smith', 'Havana', 'CU')['total'], 1)
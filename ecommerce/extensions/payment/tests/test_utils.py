@@ -3,6 +3,7 @@ import json
 import time
 from urllib import urlencode
 
+import ddt
 import httpretty
 import mock
 from django.conf import settings
@@ -11,8 +12,15 @@ from oscar.test import factories
 from requests.exceptions import HTTPError, Timeout
 
 from ecommerce.core.models import User
+from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.payment.models import SDNCheckFailure
-from ecommerce.extensions.payment.utils import SDNClient, clean_field_value, middle_truncate
+from ecommerce.extensions.payment.utils import (
+    SDNClient,
+    clean_field_value,
+    embargo_check,
+    get_ip_bucket,
+    middle_truncate
+)
 from ecommerce.tests.testcases import TestCase
 
 
@@ -154,6 +162,7 @@ class SDNCheckTests(TestCase):
             self.assertIn(product2, sdn_object.products.all())
 
 
+@ddt.ddt
 class EmbargoCheckTests(TestCase):
     """ Tests for the Embargo check function. """
 
@@ -186,3 +195,81 @@ class EmbargoCheckTests(TestCase):
         self.mock_embargo_response(json.dumps(embargo_response))
         response = self.site.siteconfiguration.embargo_api_client.course_access.get(**self.params)
         self.assertEqual(response, embargo_response)
+
+    def create_seats(self, count):
+        return [
+            CourseFactory(partner=self.partner).create_or_update_seat('verified', False, 10) for __ in range(count)
+        ]
+
+    def get_embargo_requests(self):
+        return [
+            request for request in httpretty.httpretty.latest_requests if 'course_access' in request.path
+        ]
+
+    @ddt.data(
+        ('203.0.113.7', '203.0.113.0/24'),
+        ('2001:db8:1234:5678::1', '2001:db8:1234::/48'),
+        ('unknown', 'unknown'),
+        (None, None),
+    )
+    @ddt.unpack
+    def test_get_ip_bucket(self, ip, bucket):
+        """ Verify IP addresses are bucketed by network. """
+        self.assertEqual(get_ip_bucket(ip), bucket)
+
+    @httpretty.activate
+    def test_embargo_check_cached(self):
+        """ Verify the courses of a basket are checked by a single call, and the results are cached. """
+        self.mock_access_token_response()
+        self.mock_embargo_response(json.dumps({'access': True}))
+        user = self.create_user(tracking_context={'lms_ip': '203.0.113.7'})
+        products = self.create_seats(2)
+
+        self.assertTrue(embargo_check(user, self.site, products))
+        embargo_requests = self.get_embargo_requests()
+        self.assertEqual(len(embargo_requests), 1)
+        self.assertEqual(
+            sorted(embargo_requests[0].querystring['course_ids']),
+            sorted(product.course_id for product in products)
+        )
+
+        # Users checked from the same network reuse the results.
+        user.tracking_context = {'lms_ip': '203.0.113.8'}
+        self.assertTrue(embargo_check(user, self.site, products))
+        self.assertEqual(len(self.get_embargo_requests()), 1)
+
+    @httpretty.activate
+    def test_embargo_check_denied(self):
+        """ Verify denials of a single course are cached, and denials of several courses are not. """
+        self.mock_access_token_response()
+        self.mock_embargo_response(json.dumps({'access': False}))
+        user = self.create_user()
+        products = self.create_seats(2)
+
+        self.assertFalse(embargo_check(user, self.site, products))
+        self.assertFalse(embargo_check(user, self.site, products[:1]))
+        self.assertEqual(len(self.get_embargo_requests()), 2)
+
+        self.assertFalse(embargo_check(user, self.site, products))
+        self.assertEqual(len(self.get_embargo_requests()), 2)
+
+    @httpretty.activate
+    def test_embargo_check_fail_open(self):
+        """ Verify purchases are allowed, and the failure recorded, if the API is un-reachable. """
+        self.mock_access_token_response()
+        self.mock_embargo_response(json.dumps({}), status_code=500)
+        user = self.create_user()
+        products = self.create_seats(1)
+
+        with mock.patch('newrelic.agent.record_custom_metric') as mock_record:
+            self.assertTrue(embargo_check(user, self.site, products))
+            self.assertTrue(embargo_check(user, self.site, products))
+        mock_record.assert_called_with('Custom/EmbargoCheck/FailedOpen', 1)
+        self.assertEqual(mock_record.call_count, 2)
+
+    def test_embargo_check_without_seats(self):
+        """ Verify the API is not called for baskets without seats. """
+        user = self.create_user()
+        product = factories.ProductFactory()
+        with self.assertNumQueries(1):
+            self.assertTrue(embargo_check(user, self.site, [product]))
@@ -23,6 +23,7 @@ from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.order.constants import PaymentEventTypeName
+from ecommerce.extensions.payment.constants import ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH
 from ecommerce.extensions.payment.exceptions import InvalidBasketError, InvalidSignatureError
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.tests.mixins import CybersourceMixin, CybersourceNotificationTestsMixin
@@ -34,6 +35,7 @@ from ecommerce.tests.testcases import TestCase
 JSON = 'application/json'
 
 Basket = get_model('basket', 'Basket')
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 PaymentEvent = get_model('order', 'PaymentEvent')
@@ -333,6 +335,48 @@ class CybersourceInterstitialViewTests(CybersourceNotificationTestsMixin, TestCa
         self.assertTrue(Order.objects.filter(basket=self.basket).exists())
         self.assertEqual(response.status_code, 302)
 
+    def test_accepted_notification_recorded(self):
+        """ Verify accepted notifications are recorded once, and not placed, when the switch is active. """
+        toggle_switch(ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH, True)
+        notification = self.generate_notification(self.basket, billing_address=self.billing_address)
+
+        for __ in range(2):
+            response = self.client.post(self.path, notification)
+            self.assertEqual(response.status_code, 302)
+
+        record = CybersourceNotification.objects.get()
+        self.assertEqual(record.idempotency_key, notification['transaction_id'])
+        self.assertEqual(record.order_number, self.basket.order_number)
+        self.assertEqual(record.status, CybersourceNotification.PENDING)
+        self.assertFalse(Order.objects.filter(basket=self.basket).exists())
+
+    def test_accepted_notification_receipt_pending(self):
+        """ Verify the learner is shown a pending receipt, until the order of the recorded notification is placed. """
+        toggle_switch(ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH, True)
+        self.user.set_password(self.password)
+        self.user.save()
+        self.client.login(username=self.user.username, password=self.password)
+        notification = self.generate_notification(self.basket, billing_address=self.billing_address)
+
+        response = self.client.post(self.path, notification, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'edx/checkout/receipt_pending.html')
+        self.assertIn('Refresh', response)
+        self.assertFalse(Order.objects.filter(basket=self.basket).exists())
+
+    @ddt.data({'decision': 'DECLINE'}, {'signature': 'invalid'})
+    def test_notification_not_recorded(self, overrides):
+        """ Verify declined and invalidly signed notifications are handled synchronously when the switch is active. """
+        toggle_switch(ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH, True)
+        notification = self.generate_notification(self.basket, billing_address=self.billing_address)
+        notification.update(overrides)
+
+        with mock.patch.object(self.view, 'validate_notification', side_effect=InvalidSignatureError):
+            response = self.client.post(self.path, notification)
+            self.assertRedirects(response, self.get_full_url(reverse('payment_error')))
+
+        self.assertFalse(CybersourceNotification.objects.exists())
+
 
 @ddt.ddt
 class ApplePayStartSessionViewTests(LoginMixin, TestCase):
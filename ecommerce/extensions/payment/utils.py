@@ -1,19 +1,33 @@
+import ipaddress
 import json
 import logging
 import re
 from urllib import urlencode
 
+import newrelic.agent
 import requests
+import six
+import waffle
 from django.conf import settings
+from django.db.models import Q
 from django.utils.translation import ugettext_lazy as _
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import get_cache_key
 from ecommerce.extensions.analytics.utils import parse_tracking_context
+from ecommerce.extensions.payment.constants import SDN_LOCAL_LIST_SWITCH
 from ecommerce.extensions.payment.models import SDNCheckFailure
+from ecommerce.extensions.payment.sdn import search_local_list
 
 logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
+Product = get_model('catalogue', 'Product')
+
+# Lengths of the network prefixes of the IP addresses embargo checks are cached for.
+EMBARGO_IPV4_PREFIX = 24
+EMBARGO_IPV6_PREFIX = 48
 
 
 def middle_truncate(string, chars):
@@ -68,39 +82,91 @@ def clean_field_value(value):
     return re.sub(r'[\^:"\']', '', value)
 
 
+def get_ip_bucket(ip):
+    """ Returns the network of the IP address, which shares its location, e.g. 203.0.113.0/24 for 203.0.113.7. """
+    if not ip:
+        return None
+
+    try:
+        address = ipaddress.ip_address(six.text_type(ip))
+    except ValueError:
+        return ip
+
+    prefix = EMBARGO_IPV4_PREFIX if address.version == 4 else EMBARGO_IPV6_PREFIX
+    return six.text_type(ipaddress.ip_network(six.text_type('{}/{}').format(address, prefix), strict=False))
+
+
+def _get_embargo_cache_key(site, user, ip_bucket, course_id):
+    return get_cache_key(
+        site_domain=site.domain,
+        resource='embargo_check',
+        username=user.username,
+        ip_bucket=ip_bucket,
+        course_id=course_id
+    )
+
+
 def embargo_check(user, site, products):
     """ Checks if the user has access to purchase products by calling the LMS embargo API.
 
+    Results are cached for each course, and the courses without cached results are checked by a single call.
+
     Args:
-        request (object): The current request
+        user (User): The user purchasing the products
+        site (Site): The current site
         products (list): A list of products to check access against
 
     Returns:
         Bool
     """
-    courses = []
-    _, _, ip = parse_tracking_context(user)
-
-    for product in products:
-        # We only are checking Seats
-        if product.get_product_class().name == SEAT_PRODUCT_CLASS_NAME:
-            courses.append(product.course.id)
-
-    if courses:
-        params = {
-            'user': user,
-            'ip_address': ip,
-            'course_ids': courses
-        }
-
-        try:
-            response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
-            return response.get('access', True)
-        except:  # pylint: disable=bare-except
-            # We are going to allow purchase if the API is un-reachable.
-            pass
+    # We only are checking Seats. Their product classes are set on their parents.
+    courses = sorted(set(
+        Product.objects.filter(id__in=[product.id for product in products]).filter(
+            Q(product_class__name=SEAT_PRODUCT_CLASS_NAME) | Q(parent__product_class__name=SEAT_PRODUCT_CLASS_NAME)
+        ).exclude(course__isnull=True).values_list('course_id', flat=True)
+    ))
+    if not courses:
+        return True
 
-    return True
+    _, _, ip = parse_tracking_context(user)
+    # The LMS also checks the country of the user's profile, so results are only reused for the same user.
+    ip_bucket = get_ip_bucket(ip)
+    cache_keys = dict((course_id, _get_embargo_cache_key(site, user, ip_bucket, course_id)) for course_id in courses)
+
+    uncached_courses = []
+    for course_id in courses:
+        cached_response = TieredCache.get_cached_response(cache_keys[course_id])
+        if not cached_response.is_found:
+            uncached_courses.append(course_id)
+        elif not cached_response.value:
+            return False
+
+    if not uncached_courses:
+        return True
+
+    params = {
+        'user': user,
+        'ip_address': ip,
+        'course_ids': uncached_courses
+    }
+
+    try:
+        response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
+    except Exception:  # pylint: disable=broad-except
+        # We are going to allow purchase if the API is un-reachable.
+        logger.exception('Failed to check embargo of courses %s for user [%s].', uncached_courses, user.username)
+        newrelic.agent.record_custom_metric('Custom/EmbargoCheck/FailedOpen', 1)
+        return True
+
+    access = response.get('access', True)
+    if access:
+        for course_id in uncached_courses:
+            TieredCache.set_all_tiers(cache_keys[course_id], True, settings.EMBARGO_CHECK_CACHE_TIMEOUT)
+    elif len(uncached_courses) == 1:
+        # A denial of several courses does not tell which of them are embargoed.
+        TieredCache.set_all_tiers(cache_keys[uncached_courses[0]], False, settings.EMBARGO_CHECK_CACHE_TIMEOUT)
+
+    return access
 
 
 class SDNClient(object):
@@ -118,6 +184,9 @@ class SDNClient(object):
             * SDN API returns a non-200 status code response
             * user is not found on the SDN list
 
+        If the SDN_LOCAL_LIST_SWITCH is active, the local mirror of the list is searched instead of the SDN API,
+        unless no list, or only an outdated one, is imported.
+
         Args:
             name (str): Individual's full name.
             city (str): Individual's city.
@@ -125,6 +194,12 @@ class SDNClient(object):
         Returns:
             dict: SDN API response.
         """
+        if waffle.switch_is_active(SDN_LOCAL_LIST_SWITCH):
+            response = search_local_list(name, city, country, self.sdn_list)
+            if response is not None:
+                return response
+            logger.warning('No current local SDN list is imported. Searching the SDN API for [%s].', name)
+
         params = urlencode({
             'sources': self.sdn_list,
             'api_key': self.api_key,
@@ -7,7 +7,7 @@ import six
 import waffle
 from django.contrib import messages
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -29,6 +29,7 @@ from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.payment.constants import ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH
 from ecommerce.extensions.payment.exceptions import DuplicateReferenceNumber, InvalidBasketError, InvalidSignatureError
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.utils import clean_field_value
@@ -40,6 +41,7 @@ Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
 BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
+CybersourceNotification = get_model('payment', 'CybersourceNotification')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
@@ -275,8 +277,11 @@ class CybersourceInterstitialView(CybersourceNotificationMixin, View):
 
     def post(self, request, *args, **kwargs):  # pylint: disable=unused-argument
         """Process a CyberSource merchant notification and place an order for paid products as appropriate."""
+        notification = request.POST.dict()
+        if self.should_record_notification(notification):
+            return self.record_notification(notification)
+
         try:
-            notification = request.POST.dict()
             basket = self.validate_notification(notification)
         except DuplicateReferenceNumber:
             # CyberSource has told us that they've declined an attempt to pay
@@ -321,6 +326,44 @@ class CybersourceInterstitialView(CybersourceNotificationMixin, View):
         except:  # pylint: disable=bare-except
             return redirect(reverse('payment_error'))
 
+    def should_record_notification(self, notification):
+        """ Returns True if the order of the notification should be placed asynchronously. """
+        return (
+            waffle.switch_is_active(ASYNC_CYBERSOURCE_NOTIFICATIONS_SWITCH) and
+            notification.get('decision', '').lower() == 'accept' and
+            self.payment_processor.is_signature_valid(notification)
+        )
+
+    def record_notification(self, notification):
+        """
+        Records an accepted notification, whose order is placed by the process_cybersource_notifications
+        management command, and redirects to the receipt page.
+
+        Notifications are keyed by their transaction ID. The key is unique, so duplicate notifications
+        of a transaction are only recorded once.
+        """
+        transaction_id = notification.get('transaction_id')
+        try:
+            with transaction.atomic():
+                CybersourceNotification.objects.create(
+                    idempotency_key=transaction_id or notification['signature'],
+                    order_number=notification.get('req_reference_number'),
+                    site=self.request.site,
+                    notification=notification
+                )
+            logger.info(
+                'Recorded CyberSource payment notification for transaction [%s], associated with order [%s].',
+                transaction_id,
+                notification.get('req_reference_number')
+            )
+        except IntegrityError:
+            logger.info(
+                'Received duplicate CyberSource payment notification for transaction [%s]. It was not recorded again.',
+                transaction_id
+            )
+
+        return self.redirect_to_receipt_page(notification)
+
     def redirect_to_receipt_page(self, notification):
         receipt_page_url = get_receipt_page_url(
             self.request.site.siteconfiguration,
@@ -1,8 +1,8 @@
 from oscar.core.loading import get_model
 
+from ecommerce.core.lookups import options
 from ecommerce.extensions.fulfillment.status import ORDER
 
-Option = get_model('catalogue', 'Option')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
 
@@ -50,7 +50,7 @@ def create_refunds_for_entitlement(order, entitlement_uuid):
     """
     refunds = []
 
-    entitlement_option = Option.objects.get(code='course_entitlement')
+    entitlement_option = options.get('course_entitlement')
 
     line = order.lines.get(refund_lines__id__isnull=True,
                            attributes__option=entitlement_option,
@@ -0,0 +1,296 @@
+"""
+Bulk refunds of the purchases of a course run, e.g. when the course run is cancelled.
+
+Refunds are created set-wise: the order lines eligible for refund are selected in a single query, and the refunds
+and refund lines of each batch of orders are created in bulk. Approving the refunds issues credits through the
+payment processors concurrently, spacing out the calls to each processor, and revokes the lines of each batch of
+refunds together, un-enrolling their purchasers concurrently.
+
+Runs are resumable: lines with refunds are not selected again, and refunds are approved from whichever status they
+were left in, e.g. refunds whose credits were issued are not credited again.
+"""
+from __future__ import unicode_literals
+
+import logging
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.db import connection, transaction
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.core.utils import RateLimiter
+from ecommerce.extensions.analytics.utils import audit_log
+from ecommerce.extensions.fulfillment.api import revoke_fulfillment_for_refunds
+from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
+
+logger = logging.getLogger(__name__)
+
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+Refund = get_model('refund', 'Refund')
+RefundLine = get_model('refund', 'RefundLine')
+post_refund = get_class('refund.signals', 'post_refund')
+
+# Number of credits issued per second through processors absent from settings.BULK_REFUND_CREDIT_RATE_LIMITS.
+DEFAULT_CREDIT_RATE_LIMIT = 5
+
+# Statuses of the refunds approved by the engine.
+APPROVABLE_STATUSES = (REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR, REFUND.PAYMENT_REFUNDED, REFUND.REVOCATION_ERROR)
+
+
+class BulkRefundProgress(object):
+    """ Counts of the lines and refunds processed by a run of the engine. """
+
+    FIELDS = (
+        'lines', 'refunds_created', 'credits_issued', 'credit_errors', 'refunds_completed', 'revocation_errors',
+    )
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def as_dict(self):
+        return OrderedDict((field, getattr(self, field)) for field in self.FIELDS)
+
+    def __str__(self):
+        return ', '.join('{}={}'.format(field, value) for field, value in self.as_dict().items())
+
+
+class BulkRefundEngine(object):
+    """
+    Refunds the purchases of a course run.
+
+    Arguments:
+        course_id (str): Identifier of the course run whose purchases are refunded.
+        batch_size (int): Number of orders, or refunds, processed at once.
+        concurrency (int): Maximum number of credits issued, and of lines revoked, at once.
+        notify_purchasers (bool): Whether purchasers are notified once their credits are issued.
+        progress_callback (callable): Called with the BulkRefundProgress after each batch.
+    """
+
+    def __init__(self, course_id, batch_size=100, concurrency=4, notify_purchasers=True, progress_callback=None):
+        if not course_id or not course_id.strip():
+            raise ValueError('"{}" is not a valid course ID.'.format(course_id))
+
+        self.course_id = course_id
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.notify_purchasers = notify_purchasers
+        self.progress_callback = progress_callback
+        self.progress = BulkRefundProgress()
+        self._processors = {}
+        self._rate_limiters = {}
+
+    def _report(self):
+        logger.info('Bulk refund of course run [%s]: %s', self.course_id, self.progress)
+        if self.progress_callback:
+            self.progress_callback(self.progress)
+
+    def get_refundable_lines(self):
+        """ Returns the lines of completed orders for the course run, without refunds other than denied ones. """
+        refunded_lines = RefundLine.objects.exclude(status=REFUND_LINE.DENIED).values('order_line_id')
+        return Line.objects.filter(
+            order__status=ORDER.COMPLETE,
+            product__attribute_values__attribute__code='course_key',
+            product__attribute_values__value_text=self.course_id,
+        ).exclude(id__in=refunded_lines)
+
+    def get_approvable_refunds(self):
+        """ Returns the refunds of lines for the course run, which are neither completed nor denied. """
+        return Refund.objects.filter(
+            lines__order_line__product__attribute_values__attribute__code='course_key',
+            lines__order_line__product__attribute_values__value_text=self.course_id,
+            status__in=APPROVABLE_STATUSES,
+        )
+
+    def create_refunds(self):
+        """ Creates a refund for the refundable lines of each order. """
+        lines = self.get_refundable_lines().order_by('order_id')
+        order_ids = list(lines.values_list('order_id', flat=True).distinct())
+
+        for start in range(0, len(order_ids), self.batch_size):
+            batch = order_ids[start:start + self.batch_size]
+            with transaction.atomic():
+                # The orders are locked, so the lines are not refunded concurrently by another run.
+                list(Order.objects.select_for_update().filter(id__in=batch).values_list('id', flat=True))
+                lines = self.get_refundable_lines().filter(order_id__in=batch).select_related('order').distinct()
+                self._create_refunds(lines)
+            self._report()
+
+        return self.progress
+
+    def _create_refunds(self, lines):
+        lines_by_order = OrderedDict()
+        for line in lines:
+            lines_by_order.setdefault(line.order_id, []).append(line)
+        if not lines_by_order:
+            return
+
+        existing_refunds = set(Refund.objects.filter(order_id__in=lines_by_order).values_list('id', flat=True))
+        status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
+        Refund.objects.bulk_create([
+            Refund(
+                order_id=order_id,
+                user_id=order_lines[0].order.user_id,
+                status=status,
+                total_credit_excl_tax=sum([line.line_price_excl_tax for line in order_lines])
+            ) for order_id, order_lines in lines_by_order.items()
+        ])
+
+        # Primary keys of objects created in bulk are not set by every database backend.
+        refunds = Refund.objects.filter(order_id__in=lines_by_order).exclude(id__in=existing_refunds)
+        refunds = dict((refund.order_id, refund) for refund in refunds)
+
+        status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
+        refund_lines = []
+        for order_id, refund in refunds.items():
+            order_lines = lines_by_order[order_id]
+            refund_lines.extend(
+                RefundLine(
+                    refund=refund,
+                    order_line=line,
+                    line_credit_excl_tax=line.line_price_excl_tax,
+                    quantity=line.quantity,
+                    status=status
+                ) for line in order_lines
+            )
+            audit_log(
+                'refund_created',
+                amount=refund.total_credit_excl_tax,
+                currency=refund.currency,
+                order_number=order_lines[0].order.number,
+                refund_id=refund.id,
+                user_id=refund.user_id
+            )
+        RefundLine.objects.bulk_create(refund_lines)
+
+        self.progress.lines += len(refund_lines)
+        self.progress.refunds_created += len(refunds)
+
+    def approve_refunds(self):
+        """ Issues the credits, and revokes the lines, of the approvable refunds. """
+        refund_ids = list(self.get_approvable_refunds().order_by('id').values_list('id', flat=True).distinct())
+
+        for start in range(0, len(refund_ids), self.batch_size):
+            refunds = list(
+                Refund.objects.filter(id__in=refund_ids[start:start + self.batch_size]).select_related(
+                    'order__basket', 'order__site', 'user'
+                ).prefetch_related('order__sources__source_type', 'lines__order_line__product')
+            )
+            self._issue_credits([refund for refund in refunds if refund.status in (
+                REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR
+            )])
+            self._revoke_lines([refund for refund in refunds if refund.status in (
+                REFUND.PAYMENT_REFUNDED, REFUND.REVOCATION_ERROR
+            )])
+            self._report()
+
+        return self.progress
+
+    def run(self, approve=True):
+        """ Creates the refunds of the course run's purchases, and approves them. """
+        self.create_refunds()
+        if approve:
+            self.approve_refunds()
+        return self.progress
+
+    def _get_processor(self, name, site):
+        key = (name, site.id if site else None)
+        if key not in self._processors:
+            self._processors[key] = get_processor_class_by_name(name)(site)
+        return self._processors[key]
+
+    def _get_rate_limiter(self, name):
+        if name not in self._rate_limiters:
+            rate = getattr(settings, 'BULK_REFUND_CREDIT_RATE_LIMITS', {}).get(name, DEFAULT_CREDIT_RATE_LIMIT)
+            self._rate_limiters[name] = RateLimiter(rate)
+        return self._rate_limiters[name]
+
+    def _credit_issued(self, refund, source=None, processor=None, reference=None):
+        if source is not None:
+            refund._record_credit(source, processor, reference)  # pylint: disable=protected-access
+        refund.set_status(REFUND.PAYMENT_REFUNDED)
+        self.progress.credits_issued += 1
+        if self.notify_purchasers and refund.total_credit_excl_tax != 0:
+            refund._notify_purchaser()  # pylint: disable=protected-access
+
+    def _credit_failed(self, refund):
+        refund.set_status(REFUND.PAYMENT_REFUND_ERROR)
+        self.progress.credit_errors += 1
+
+    def _issue_credits(self, refunds):
+        jobs = []
+        for refund in refunds:
+            # NOTE: Update this if we ever support multiple payment sources for a single order.
+            sources = refund.order.sources.all()
+            if refund.total_credit_excl_tax == 0 or not sources:
+                logger.info("No payments to credit for Refund [%d]", refund.id)
+                self._credit_issued(refund)
+                continue
+
+            source = sources[0]
+            try:
+                processor = self._get_processor(source.source_type.name, refund.order.site)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to issue credit for refund [%d].', refund.id)
+                self._credit_failed(refund)
+                continue
+            jobs.append((refund, source, processor))
+
+        def _issue(job):
+            refund, source, processor = job
+            self._get_rate_limiter(processor.NAME).wait()
+            try:
+                reference = processor.issue_credit(
+                    refund.order.number, refund.order.basket, source.reference, refund.total_credit_excl_tax,
+                    refund.currency
+                )
+                return job, True, reference
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to issue credit for refund [%d].', refund.id)
+                return job, False, None
+
+        def _issue_in_thread(job):
+            try:
+                return _issue(job)
+            finally:
+                # Processors record their responses using the connection of this thread.
+                connection.close()
+
+        # Each credit is recorded as soon as it is issued, so it is not issued again if the run is interrupted.
+        if self.concurrency > 1 and len(jobs) > 1:
+            pool = ThreadPool(min(self.concurrency, len(jobs)))
+            try:
+                for (refund, source, processor), issued, reference in pool.imap_unordered(_issue_in_thread, jobs):
+                    self._record_credit_result(refund, source, processor, issued, reference)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for job in jobs:
+                (refund, source, processor), issued, reference = _issue(job)
+                self._record_credit_result(refund, source, processor, issued, reference)
+
+    def _record_credit_result(self, refund, source, processor, issued, reference):
+        if issued:
+            self._credit_issued(refund, source, processor, reference)
+        else:
+            self._credit_failed(refund)
+
+    def _revoke_lines(self, refunds):
+        if not refunds:
+            return
+
+        results = revoke_fulfillment_for_refunds(refunds, self.concurrency)
+        for refund in refunds:
+            if results[refund.id]:
+                refund.set_status(REFUND.COMPLETE)
+                post_refund.send_robust(sender=Refund, refund=refund)
+                self.progress.refunds_completed += 1
+            else:
+                logger.error('Unable to revoke fulfillment of all lines of Refund [%d].', refund.id)
+                refund.set_status(REFUND.REVOCATION_ERROR)
+                self.progress.revocation_errors += 1
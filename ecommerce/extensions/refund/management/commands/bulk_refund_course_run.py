@@ -0,0 +1,79 @@
+"""
+This command refunds the purchases of a course run, e.g. when the course run is cancelled.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.refund.bulk import BulkRefundEngine
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Creates refunds for the purchases of a course run, and approves them.
+
+    Approving the refunds issues credits to the purchasers, and un-enrolls them from the course run. Every open
+    refund of the course run's purchases is approved, including refunds requested before the command is run.
+    The command can be run again to resume an interrupted run, or to retry the refunds which failed.
+
+    Example:
+
+        ./manage.py bulk_refund_course_run --course-id course-v1:edX+DemoX+Demo_Course --concurrency 8
+    """
+
+    help = 'Refund the purchases of a course run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course-id',
+                            action='store',
+                            dest='course_id',
+                            required=True,
+                            help='Identifier of the course run whose purchases are refunded.')
+        parser.add_argument('--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            type=int,
+                            default=100,
+                            help='Number of orders, or refunds, processed at once.')
+        parser.add_argument('--concurrency',
+                            action='store',
+                            dest='concurrency',
+                            type=int,
+                            default=4,
+                            help='Maximum number of credits issued, and of learners un-enrolled, at once.')
+        parser.add_argument('--no-approve',
+                            action='store_false',
+                            dest='approve',
+                            default=True,
+                            help='Only create the refunds, leaving them open for review.')
+        parser.add_argument('--no-notify',
+                            action='store_false',
+                            dest='notify',
+                            default=True,
+                            help='Do not notify purchasers once their credits are issued.')
+
+    def handle(self, *args, **options):
+        def report(progress):
+            self.stdout.write(str(progress))
+
+        try:
+            engine = BulkRefundEngine(
+                options['course_id'],
+                batch_size=options['batch_size'],
+                concurrency=options['concurrency'],
+                notify_purchasers=options['notify'],
+                progress_callback=report,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        progress = engine.run(approve=options['approve'])
+        logger.info('Finished refunding the purchases of course run [%s]: %s', options['course_id'], progress)
+        if progress.credit_errors or progress.revocation_errors:
+            self.stderr.write(
+                'Some refunds failed. Run the command again to retry them: {}'.format(progress)
+            )
@@ -0,0 +1,37 @@
+from StringIO import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.refund.status import REFUND
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+
+
+class BulkRefundCourseRunTests(RefundTestMixin, TestCase):
+    """Tests for bulk_refund_course_run management command."""
+
+    def test_invalid_course_id(self):
+        """Test that command fails if the course ID is invalid."""
+        with self.assertRaises(CommandError):
+            call_command('bulk_refund_course_run', '--course-id= ')
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
+    def test_bulk_refund(self):
+        """Test that command refunds the purchases of the course run, and reports its progress."""
+        order = self.create_order(free=True)
+        out = StringIO()
+        call_command('bulk_refund_course_run', '--course-id={}'.format(self.course.id), '--no-notify', stdout=out)
+
+        self.assertEqual(Refund.objects.get(order=order).status, REFUND.COMPLETE)
+        self.assertIn('refunds_completed=1', out.getvalue())
+
+    def test_no_approve(self):
+        """Test that command leaves the refunds open for review if asked to."""
+        order = self.create_order()
+        call_command('bulk_refund_course_run', '--course-id={}'.format(self.course.id), '--no-approve',
+                     stdout=StringIO())
+        self.assertEqual(Refund.objects.get(order=order).status, REFUND.OPEN)
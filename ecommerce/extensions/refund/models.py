@@ -12,6 +12,7 @@ from oscar.core.loading import get_class, get_model
 from oscar.core.utils import get_default_currency
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.lookups import payment_event_types
 from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.checkout.utils import format_currency, get_receipt_page_url
 from ecommerce.extensions.fulfillment.api import revoke_fulfillment_for_refund
@@ -23,7 +24,6 @@ from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 logger = logging.getLogger(__name__)
 
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 post_refund = get_class('refund.signals', 'post_refund')
 
 
@@ -103,7 +103,13 @@ class Refund(StatusMixin, TimeStampedModel):
             None: If no unrefunded order lines have been provided.
             Refund: With RefundLines corresponding to each given unrefunded order line.
         """
-        unrefunded_lines = [line for line in lines if not line.refund_lines.exclude(status=REFUND_LINE.DENIED).exists()]
+        lines = list(lines)
+        refunded_line_ids = set(
+            RefundLine.objects.filter(order_line__in=lines).exclude(status=REFUND_LINE.DENIED).values_list(
+                'order_line_id', flat=True
+            )
+        )
+        unrefunded_lines = [line for line in lines if line.id not in refunded_line_ids]
 
         if unrefunded_lines:
             status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
@@ -167,29 +173,34 @@ class Refund(StatusMixin, TimeStampedModel):
 
             refund_reference_number = processor.issue_credit(self.order.number, self.order.basket, source.reference,
                                                              amount, self.currency)
-            source.refund(amount, reference=refund_reference_number)
-            event_type, __ = PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.REFUNDED)
-            PaymentEvent.objects.create(
-                event_type=event_type,
-                order=self.order,
-                amount=amount,
-                reference=refund_reference_number,
-                processor_name=processor.NAME
-            )
-
-            audit_log(
-                'credit_issued',
-                amount=amount,
-                currency=self.currency,
-                processor_name=processor.NAME,
-                refund_id=self.id,
-                user_id=self.user.id
-            )
+            self._record_credit(source, processor, refund_reference_number)
         except AttributeError:
             # Order has no sources, resulting in an exception when trying to access `source_type`.
             # This occurs when attempting to refund free orders.
             logger.info("No payments to credit for Refund [%d]", self.id)
 
+    def _record_credit(self, source, processor, refund_reference_number):
+        """Record the credit issued to the purchaser via the payment processor, against the payment source."""
+        amount = self.total_credit_excl_tax
+        source.refund(amount, reference=refund_reference_number)
+        event_type, __ = payment_event_types.get_or_create(PaymentEventTypeName.REFUNDED)
+        PaymentEvent.objects.create(
+            event_type=event_type,
+            order=self.order,
+            amount=amount,
+            reference=refund_reference_number,
+            processor_name=processor.NAME
+        )
+
+        audit_log(
+            'credit_issued',
+            amount=amount,
+            currency=self.currency,
+            processor_name=processor.NAME,
+            refund_id=self.id,
+            user_id=self.user.id
+        )
+
     def _notify_purchaser(self):
         """ Notify the purchaser that the refund has been processed. """
         site_configuration = self.order.site.siteconfiguration
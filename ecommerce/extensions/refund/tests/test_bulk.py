@@ -0,0 +1,103 @@
+import ddt
+import mock
+from django.test import override_settings
+from oscar.core.loading import get_model
+from oscar.test.factories import UserFactory
+
+from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
+from ecommerce.extensions.refund.bulk import BulkRefundEngine
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+RefundLine = get_model('refund', 'RefundLine')
+Source = get_model('payment', 'Source')
+SourceType = get_model('payment', 'SourceType')
+
+FAKE_MODULES = ['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule']
+FAILING_MODULES = ['ecommerce.extensions.fulfillment.tests.modules.RevocationFailureModule']
+
+
+@ddt.ddt
+@override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor'])
+class BulkRefundEngineTests(RefundTestMixin, TestCase):
+    def setUp(self):
+        super(BulkRefundEngineTests, self).setUp()
+        self.orders = [self.create_paid_order() for __ in range(3)]
+
+    def create_paid_order(self, **kwargs):
+        order = self.create_order(user=UserFactory(), **kwargs)
+        source_type, __ = SourceType.objects.get_or_create(name=DummyProcessor.NAME)
+        Source.objects.create(source_type=source_type, order=order, currency=order.currency,
+                              amount_allocated=order.total_incl_tax, amount_debited=order.total_incl_tax)
+        return order
+
+    def create_engine(self, **kwargs):
+        return BulkRefundEngine(self.course.id, batch_size=2, notify_purchasers=False, **kwargs)
+
+    @ddt.data('', ' ', None)
+    def test_invalid_course_id(self, course_id):
+        """ ValueError should be raised if course_id is invalid. """
+        self.assertRaises(ValueError, BulkRefundEngine, course_id)
+
+    def test_create_refunds(self):
+        """ A refund should be created for each completed order of the course run, in batches of orders. """
+        self.create_order(user=UserFactory(), status=ORDER.OPEN)
+        callback = mock.Mock()
+        progress = self.create_engine(progress_callback=callback).create_refunds()
+
+        self.assertEqual(progress.refunds_created, 3)
+        self.assertEqual(progress.lines, 3)
+        self.assertEqual(callback.call_count, 2)
+        for order in self.orders:
+            self.assert_refund_matches_order(Refund.objects.get(order=order), order)
+
+    def test_create_refunds_resumed(self):
+        """ Lines already refunded should not be refunded again, unless their refunds were denied. """
+        self.create_engine().create_refunds()
+        Refund.objects.get(order=self.orders[0]).deny()
+
+        progress = self.create_engine().create_refunds()
+        self.assertEqual(progress.refunds_created, 1)
+        self.assertEqual(Refund.objects.filter(order=self.orders[0]).count(), 2)
+        self.assertEqual(Refund.objects.count(), 4)
+
+    @ddt.data(1, 2)
+    @override_settings(FULFILLMENT_MODULES=FAKE_MODULES)
+    def test_run(self, concurrency):
+        """ Credits should be issued, and lines revoked, for every refund. """
+        progress = self.create_engine(concurrency=concurrency).run()
+
+        self.assertEqual(progress.credits_issued, 3)
+        self.assertEqual(progress.refunds_completed, 3)
+        self.assertEqual(set(Refund.objects.values_list('status', flat=True)), {REFUND.COMPLETE})
+        self.assertEqual(set(RefundLine.objects.values_list('status', flat=True)), {REFUND_LINE.COMPLETE})
+        for order in self.orders:
+            self.assertEqual(order.payment_events.get().reference, DummyProcessor.REFUND_TRANSACTION_ID)
+
+    @override_settings(FULFILLMENT_MODULES=FAKE_MODULES)
+    def test_run_credit_error(self):
+        """ Refunds whose credits fail should be retried when the engine is run again. """
+        with mock.patch.object(DummyProcessor, 'issue_credit', side_effect=Exception):
+            progress = self.create_engine().run()
+        self.assertEqual(progress.credit_errors, 3)
+        self.assertEqual(set(Refund.objects.values_list('status', flat=True)), {REFUND.PAYMENT_REFUND_ERROR})
+
+        progress = self.create_engine().run()
+        self.assertEqual(progress.refunds_created, 0)
+        self.assertEqual(progress.refunds_completed, 3)
+
+    @override_settings(FULFILLMENT_MODULES=FAILING_MODULES)
+    def test_run_revocation_error(self):
+        """ Refunds whose lines fail to be revoked should not be credited again when the engine is run again. """
+        progress = self.create_engine().run()
+        self.assertEqual(progress.revocation_errors, 3)
+        self.assertEqual(set(Refund.objects.values_list('status', flat=True)), {REFUND.REVOCATION_ERROR})
+
+        with override_settings(FULFILLMENT_MODULES=FAKE_MODULES):
+            with mock.patch.object(DummyProcessor, 'issue_credit') as mock_issue_credit:
+                progress = self.create_engine().run()
+        self.assertFalse(mock_issue_credit.called)
+        self.assertEqual(progress.refunds_completed, 3)
@@ -0,0 +1,270 @@
+"""
+Bloom filter of the voucher codes, rejecting codes no voucher has without querying the database.
+
+Coupon landing and redemption pages are requested with codes guessed or mistyped far more often than with
+codes of vouchers. The filter is built from every voucher code by the rebuild_voucher_code_filter command, and
+shared through the cache, split into segments. Each process keeps a copy of it, loaded again whenever the filter
+is rebuilt. The codes of vouchers created since the filter was built are appended to a log in the cache, which
+processes apply to their copy. Codes are logged when their vouchers are saved, and again once the transaction
+saving them is committed, since a filter rebuilt in between neither reads them from the database nor applies
+the codes logged before it.
+
+The filter never rejects the code of a voucher: whenever it, or part of the log, is missing from the cache, every
+code may exist, until the filter is rebuilt.
+"""
+from __future__ import unicode_literals
+
+import hashlib
+import logging
+import math
+import struct
+import threading
+import uuid
+
+import newrelic.agent
+import six
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import get_cache_key
+
+logger = logging.getLogger(__name__)
+Voucher = get_model('voucher', 'Voucher')
+
+HEADER_KEY = get_cache_key(voucher_code_filter='header')
+LOG_KEY = get_cache_key(voucher_code_filter='log')
+ADDITIONS_KEY = get_cache_key(voucher_code_filter='additions')
+
+# Size, in bytes, of the segments the filter is split into. Memcached stores items of at most 1MB by default.
+SEGMENT_SIZE = 512 * 1024
+
+# The filter is sized for this many times the number of codes it is built from, leaving room for new vouchers.
+CAPACITY_HEADROOM = 1.5
+
+# Processes stop applying the log past this number of codes, until the filter is rebuilt.
+MAX_PENDING_ADDITIONS = 10000
+
+POPCOUNTS = [bin(byte).count('1') for byte in range(256)]
+
+
+def _normalize(code):
+    # MySQL compares codes case-insensitively, and ignores trailing spaces.
+    return six.text_type(code).rstrip().upper().encode('utf-8')
+
+
+class BloomFilter(object):
+    """ A Bloom filter of strings, whose bits are set by double hashing the SHA-1 digest of each string. """
+
+    def __init__(self, num_bits, num_hashes, bits=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate):
+        """ Returns an empty filter of the optimal size to hold the given number of strings, at the error rate. """
+        capacity = max(capacity, 1)
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, int(round(float(num_bits) / capacity * math.log(2))))
+        return cls(num_bits, num_hashes)
+
+    def _get_positions(self, value):
+        first, second = struct.unpack(str('<QQ'), hashlib.sha1(value).digest()[:16])
+        second |= 1
+        return [(first + index * second) % self.num_bits for index in range(self.num_hashes)]
+
+    def add(self, value):
+        for position in self._get_positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._get_positions(value))
+
+    def get_fill_ratio(self):
+        return sum(POPCOUNTS[byte] for byte in self.bits) / float(self.num_bits)
+
+    def get_error_rate(self):
+        """ Returns the probability of a string the filter does not hold being found, given the bits set. """
+        return self.get_fill_ratio() ** self.num_hashes
+
+
+def _get_segment_key(generation, index):
+    return get_cache_key(voucher_code_filter_segment='{}:{}'.format(generation, index))
+
+
+def _get_addition_key(log_id, index):
+    return get_cache_key(voucher_code_filter_addition='{}:{}'.format(log_id, index))
+
+
+def _load_filter(header):
+    keys = [_get_segment_key(header['generation'], index) for index in range(header['segments'])]
+    segments = cache.get_many(keys)
+    if len(segments) < len(keys):
+        logger.warning('Segments of the voucher code filter [%s] are missing from the cache.', header['generation'])
+        return None
+    return BloomFilter(header['num_bits'], header['num_hashes'], bytearray(b''.join(segments[key] for key in keys)))
+
+
+class _LocalFilter(object):
+    """ The copy of the filter held by this process, with the log applied to it. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.bloom = None
+        self.additions = 0
+
+    def update(self, header, additions):
+        """ Brings the copy up to date with the shared filter. Returns False if it cannot be. """
+        if self.generation != header['generation']:
+            bloom = _load_filter(header)
+            if bloom is None:
+                return False
+            self.generation, self.bloom, self.additions = header['generation'], bloom, header['additions']
+
+        if additions > self.additions:
+            if additions - self.additions > MAX_PENDING_ADDITIONS:
+                logger.warning('The voucher code filter is missing %d codes, and should be rebuilt.',
+                               additions - self.additions)
+                return False
+
+            keys = [_get_addition_key(header['log_id'], index) for index in range(self.additions + 1, additions + 1)]
+            codes = cache.get_many(keys)
+            if len(codes) < len(keys):
+                # Codes are added to the log after the count of additions is incremented.
+                return False
+            for key in keys:
+                self.bloom.add(codes[key])
+            self.additions = additions
+
+        return True
+
+
+_local_filter = _LocalFilter()
+
+
+def contains_code(code):
+    """
+    Checks whether a voucher may have the given code.
+
+    Returns:
+        bool: False if no voucher has the code, True if a voucher may have it, or None if the filter is unavailable.
+    """
+    shared = cache.get_many([HEADER_KEY, ADDITIONS_KEY])
+    header = shared.get(HEADER_KEY)
+    additions = shared.get(ADDITIONS_KEY)
+    if header is None or additions is None or additions < header['additions']:
+        return None
+
+    with _local_filter.lock:
+        if not _local_filter.update(header, additions):
+            return None
+        found = _normalize(code) in _local_filter.bloom
+
+    if not found:
+        newrelic.agent.record_custom_metric('Custom/VoucherCodeFilter/Rejections', 1)
+    return found
+
+
+def record_false_positive():
+    """ Records a code found by the filter, which no voucher has. """
+    newrelic.agent.record_custom_metric('Custom/VoucherCodeFilter/FalsePositives', 1)
+
+
+def _log_codes(codes):
+    log_id = cache.get(LOG_KEY)
+    if not codes or log_id is None:
+        # Filters are only built once the log is created, from every code.
+        return
+
+    try:
+        additions = cache.incr(ADDITIONS_KEY, len(codes))
+    except ValueError:
+        # The count of additions was evicted. The codes added since cannot be told apart from those added before.
+        logger.warning('The log of the voucher code filter is missing. The filter is disabled until it is rebuilt.')
+        cache.delete_many([HEADER_KEY, LOG_KEY])
+        return
+
+    first = additions - len(codes) + 1
+    cache.set_many(
+        dict((_get_addition_key(log_id, first + offset), code) for offset, code in enumerate(codes)), None
+    )
+
+
+def add_codes(codes):
+    """
+    Adds codes to the log of the filter, e.g. the codes of vouchers created in bulk, which are not saved one by one.
+
+    The codes are logged immediately, and again once the current transaction is committed.
+    """
+    codes = [_normalize(code) for code in codes]
+    _log_codes(codes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _log_codes(codes))
+
+
+def rebuild(error_rate=None):
+    """
+    Builds the filter from every voucher code, and shares it through the cache.
+
+    Returns:
+        dict: The header of the filter, describing it.
+    """
+    error_rate = error_rate or settings.VOUCHER_CODE_FILTER_ERROR_RATE
+
+    # Codes logged from now on are applied to the filter, whether or not they are read from the database below.
+    shared = cache.get_many([LOG_KEY, ADDITIONS_KEY])
+    log_id = shared.get(LOG_KEY)
+    additions = shared.get(ADDITIONS_KEY)
+    if log_id is None or additions is None:
+        log_id = uuid.uuid4().hex
+        additions = 0
+        cache.set(ADDITIONS_KEY, additions, None)
+        cache.set(LOG_KEY, log_id, None)
+
+    count = Voucher.objects.count()
+    bloom = BloomFilter.for_capacity(int(count * CAPACITY_HEADROOM), error_rate)
+    for code in Voucher.objects.values_list('code', flat=True).iterator():
+        bloom.add(_normalize(code))
+
+    generation = uuid.uuid4().hex
+    segments = [bytes(bloom.bits[start:start + SEGMENT_SIZE]) for start in range(0, len(bloom.bits), SEGMENT_SIZE)]
+    cache.set_many(
+        dict((_get_segment_key(generation, index), segment) for index, segment in enumerate(segments)), None
+    )
+
+    header = {
+        'generation': generation,
+        'log_id': log_id,
+        'additions': additions,
+        'codes': count,
+        'num_bits': bloom.num_bits,
+        'num_hashes': bloom.num_hashes,
+        'segments': len(segments),
+        'error_rate': bloom.get_error_rate(),
+    }
+    cache.set(HEADER_KEY, header, None)
+    return header
+
+
+def get_stats():
+    """ Returns the header of the shared filter, with the number of codes logged since it was built, if any. """
+    shared = cache.get_many([HEADER_KEY, ADDITIONS_KEY])
+    header = shared.get(HEADER_KEY)
+    if header is None:
+        return None
+
+    stats = dict(header)
+    stats['pending_additions'] = max(shared.get(ADDITIONS_KEY, 0) - header['additions'], 0)
+    return stats
+
+
+@receiver(post_save, sender=Voucher)
+def add_voucher_code(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    # Codes are added immediately, as well as once the transaction is committed, so the filter never rejects them.
+    if created or contains_code(instance.code) is False:
+        add_codes([instance.code])
@@ -0,0 +1,54 @@
+"""
+This command builds the voucher code filter from every voucher code, and shares it through the cache.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand
+
+from ecommerce.extensions.voucher import code_filter
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Builds the voucher code filter, which rejects codes no voucher has without querying the database.
+
+    The filter should be rebuilt regularly, e.g. daily, and after vouchers are created in bulk without being saved
+    one by one. Until it is first built, every code is looked up in the database.
+
+    Example:
+
+        ./manage.py rebuild_voucher_code_filter --error-rate 0.001
+    """
+
+    help = 'Build the voucher code filter from every voucher code.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--error-rate',
+                            action='store',
+                            dest='error_rate',
+                            type=float,
+                            help='Rate of unknown codes the filter fails to reject. '
+                                 'Defaults to settings.VOUCHER_CODE_FILTER_ERROR_RATE.')
+        parser.add_argument('--stats',
+                            action='store_true',
+                            dest='stats',
+                            default=False,
+                            help='Report the current filter, without rebuilding it.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            stats = code_filter.get_stats()
+            if stats is None:
+                self.stdout.write('The voucher code filter is not built.')
+                return
+        else:
+            stats = code_filter.rebuild(options['error_rate'])
+            stats['pending_additions'] = 0
+            logger.info('Built the voucher code filter [%s] from %d codes.', stats['generation'], stats['codes'])
+
+        for name in ('generation', 'codes', 'pending_additions', 'num_bits', 'num_hashes', 'segments', 'error_rate'):
+            self.stdout.write('{}: {}'.format(name, stats[name]))
@@ -0,0 +1,25 @@
+from StringIO import StringIO
+
+from django.core.management import call_command
+
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher import code_filter
+from ecommerce.tests.testcases import TestCase
+
+
+class RebuildVoucherCodeFilterTests(TestCase):
+    """Tests for rebuild_voucher_code_filter management command."""
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command('rebuild_voucher_code_filter', *args, stdout=out)
+        return out.getvalue()
+
+    def test_rebuild(self):
+        """Test that command builds the filter from the voucher codes, and reports it."""
+        prepare_voucher(code='FILTERED')
+        self.assertIn('not built', self.call_command('--stats'))
+
+        self.assertIn('codes: 1', self.call_command('--error-rate=0.001'))
+        self.assertTrue(code_filter.contains_code('FILTERED'))
+        self.assertIn('codes: 1', self.call_command('--stats'))
@@ -86,8 +86,20 @@ class Voucher(AbstractVoucher):
         except Voucher.DoesNotExist:
             return False
 
+    def _get_prefetched_offers(self):
+        """ Returns the offers of the voucher if they were prefetched, e.g. by a voucher snapshot, or None. """
+        offers = getattr(self, '_prefetched_objects_cache', {}).get('offers')
+        return list(offers) if offers is not None else None
+
     @property
     def original_offer(self):
+        offers = self._get_prefetched_offers()
+        if offers is not None:
+            for offer in offers:
+                if offer.condition.range_id is not None:
+                    return offer
+            return sorted(offers, key=lambda offer: offer.date_created)[0]
+
         try:
             return self.offers.filter(condition__range__isnull=False)[0]
         except (IndexError, ObjectDoesNotExist):
@@ -95,6 +107,13 @@ class Voucher(AbstractVoucher):
 
     @property
     def enterprise_offer(self):
+        offers = self._get_prefetched_offers()
+        if offers is not None:
+            enterprise_offers = [offer for offer in offers if offer.condition.enterprise_customer_uuid is not None]
+            if len(enterprise_offers) > 1:
+                logger.error('There is more than one enterprise offer associated with voucher %s!', self.id)
+            return enterprise_offers[0] if enterprise_offers else None
+
         try:
             return self.offers.get(condition__enterprise_customer_uuid__isnull=False)
         except ObjectDoesNotExist:
@@ -0,0 +1,235 @@
+"""
+Cached snapshots of vouchers, as needed to redeem them.
+
+Coupon landing, redemption and basket pages look up vouchers by code, along with their offers, the conditions,
+benefits and ranges of these offers, and the products of the ranges. A snapshot of these rows is cached for
+each code, with the versions, held in the shared cache, of the rows it was built from. Saving or deleting any
+of these rows replaces its version, so the snapshots built from it are rebuilt the next time they are
+requested. Codes no voucher has are cached too, and rebuilt once a voucher with the code is created. Codes the
+voucher code filter rejects are neither loaded nor cached.
+"""
+from __future__ import unicode_literals
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.core.utils import get_cache_key
+from ecommerce.extensions.voucher import code_filter
+
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Product = get_model('catalogue', 'Product')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+Voucher = get_model('voucher', 'Voucher')
+
+# Number of times a snapshot is built before giving up on caching it, if the rows it is built from keep changing.
+MAX_BUILD_ATTEMPTS = 3
+
+# Models whose rows snapshots are built from, keyed by the name identifying them in versions.
+VERSIONED_MODELS = (
+    ('voucher', Voucher),
+    ('offer', ConditionalOffer),
+    ('condition', Condition),
+    ('benefit', Benefit),
+    ('range', Range),
+    ('catalog', Catalog),
+)
+
+
+class VoucherSnapshot(object):
+    """
+    A voucher, with its offers and their conditions, benefits and ranges, and the IDs of the range products.
+    """
+
+    def __init__(self, voucher, range_product_ids, versions):
+        # None if no voucher has the code.
+        self.voucher = voucher
+        # IDs of the products of each range, keyed by range ID. Ranges whose products are not
+        # listed explicitly, e.g. ranges of product classes, are absent.
+        self.range_product_ids = range_product_ids
+        # Versions of the rows the snapshot is built from, keyed by (model name, ID) tuples.
+        self.versions = versions
+
+    def get_range_products(self, voucher_range):
+        """ Returns the products of the range, as returned by Range.all_products. """
+        product_ids = self.range_product_ids.get(voucher_range.id)
+        if product_ids is None:
+            return voucher_range.all_products()
+        if not product_ids:
+            return []
+
+        products = Product.objects.in_bulk(product_ids)
+        return [products[product_id] for product_id in product_ids if product_id in products]
+
+
+def _get_version_key(dependency):
+    return get_cache_key(voucher_snapshot_version='{}:{}'.format(*dependency))
+
+
+def _get_snapshot_key(code):
+    return get_cache_key(voucher_snapshot_code=code)
+
+
+def _get_versions(dependencies):
+    """ Returns the current versions of the given rows, keyed by (model name, ID) tuples. """
+    keys = dict((_get_version_key(dependency), dependency) for dependency in dependencies)
+    versions = cache.get_many(list(keys))
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # The versions expired or were evicted. Versions recorded from now on are newer than any snapshot.
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        versions.update(cache.get_many(missing))
+
+    return dict((keys[key], version) for key, version in versions.items())
+
+
+def bump_versions(dependencies):
+    """
+    Replaces the versions of the given rows, so the snapshots built from them are rebuilt.
+
+    The versions are replaced immediately, and again once the current transaction is committed, so snapshots
+    built while the transaction is in progress are rebuilt too.
+    """
+    keys = [_get_version_key(dependency) for dependency in dependencies]
+
+    def bump():
+        cache.set_many(dict((key, uuid.uuid4().hex) for key in keys), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_voucher_versions(vouchers):
+    """ Replaces the versions of the given vouchers, e.g. after they are updated without sending post_save. """
+    dependencies = []
+    for voucher_id, code in vouchers.values_list('id', 'code'):
+        dependencies.extend([('voucher', voucher_id), ('code', code)])
+    bump_versions(dependencies)
+
+
+def _get_range_product_ids(voucher_range):
+    if voucher_range.includes_all_products or voucher_range.classes.exists() or \
+            voucher_range.included_categories.exists():
+        # The products of these ranges change along with the product catalogue.
+        return None
+    return [product.id for product in voucher_range.all_products()]
+
+
+def _load(code):
+    """ Returns the voucher with the given code, if any, and the product IDs of its ranges. """
+    offers = ConditionalOffer.objects.select_related('condition__range', 'benefit__range')
+    voucher = Voucher.objects.filter(code=code).prefetch_related(Prefetch('offers', queryset=offers)).first()
+
+    dependencies = [('code', code)]
+    range_product_ids = {}
+    if voucher:
+        dependencies.append(('voucher', voucher.id))
+        for offer in voucher.offers.all():
+            dependencies.extend([
+                ('offer', offer.id), ('condition', offer.condition_id), ('benefit', offer.benefit_id)
+            ])
+            for voucher_range in (offer.condition.range, offer.benefit.range):
+                if voucher_range and voucher_range.id not in range_product_ids:
+                    dependencies.append(('range', voucher_range.id))
+                    if voucher_range.catalog_id:
+                        dependencies.append(('catalog', voucher_range.catalog_id))
+                    range_product_ids[voucher_range.id] = _get_range_product_ids(voucher_range)
+
+    range_product_ids = dict((key, value) for key, value in range_product_ids.items() if value is not None)
+    return voucher, range_product_ids, set(dependencies)
+
+
+def get_voucher_snapshot(code):
+    """
+    Returns the snapshot of the voucher with the given code.
+
+    Snapshots are cached for settings.VOUCHER_CACHE_TIMEOUT seconds, unless the rows they are built from change.
+
+    Returns:
+        VoucherSnapshot: The voucher of the snapshot is None if no voucher has the code.
+    """
+    key = _get_snapshot_key(code)
+    snapshot = cache.get(key)
+    if snapshot is not None and _get_versions(snapshot.versions) == snapshot.versions:
+        return snapshot
+
+    in_filter = code_filter.contains_code(code) if snapshot is None else None
+    if in_filter is False:
+        return VoucherSnapshot(None, {}, {})
+
+    dependencies = set(snapshot.versions) if snapshot is not None else {('code', code)}
+    for __ in range(MAX_BUILD_ATTEMPTS):
+        # The versions are read before the rows are loaded. If the rows change while they are loaded, their
+        # versions change too, and the snapshot is built again.
+        versions = _get_versions(dependencies)
+        voucher, range_product_ids, dependencies = _load(code)
+        snapshot = VoucherSnapshot(voucher, range_product_ids, versions)
+        if dependencies == set(versions) and _get_versions(dependencies) == versions:
+            cache.set(key, snapshot, settings.VOUCHER_CACHE_TIMEOUT)
+            break
+
+    if in_filter and snapshot.voucher is None:
+        code_filter.record_false_positive()
+    return snapshot
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_voucher_snapshots(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    # Receivers are not restricted to senders, since proxies of these models, e.g. conditions, are their own senders.
+    for name, model in VERSIONED_MODELS:
+        if isinstance(instance, model):
+            dependencies = [(name, instance.pk)]
+            if name == 'voucher':
+                dependencies.append(('code', instance.code))
+            bump_versions(dependencies)
+            return
+
+    if isinstance(instance, RangeProduct):
+        bump_versions([('range', instance.range_id)])
+
+
+def _invalidate_m2m(instance, reverse, pk_set, name):
+    if reverse:
+        # Relations cleared from the other side, e.g. the ranges of a product, are not known.
+        bump_versions([(name, pk) for pk in pk_set or []])
+    else:
+        bump_versions([(name, instance.pk)])
+
+
+@receiver(m2m_changed, sender=Voucher.offers.through)
+def invalidate_voucher_snapshots_on_offers_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # pylint: disable=unused-argument
+    if action.startswith('post_'):
+        _invalidate_m2m(instance, reverse, pk_set, 'voucher')
+        if reverse:
+            # Snapshots of the vouchers the offer is removed from depend on the offer.
+            bump_versions([('offer', instance.pk)])
+
+
+@receiver(m2m_changed, sender=Range.excluded_products.through)
+@receiver(m2m_changed, sender=Range.classes.through)
+@receiver(m2m_changed, sender=Range.included_categories.through)
+def invalidate_voucher_snapshots_on_range_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # pylint: disable=unused-argument
+    if action.startswith('post_'):
+        _invalidate_m2m(instance, reverse, pk_set, 'range')
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through)
+def invalidate_voucher_snapshots_on_catalog_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # pylint: disable=unused-argument
+    if action.startswith('post_'):
+        _invalidate_m2m(instance, reverse, pk_set, 'catalog')
@@ -0,0 +1,89 @@
+from __future__ import unicode_literals
+
+import mock
+from django.core.cache import cache
+
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher import code_filter
+from ecommerce.extensions.voucher.code_filter import BloomFilter
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot
+from ecommerce.tests.testcases import TestCase
+
+CODE = 'FILTERED'
+
+
+class BloomFilterTests(TestCase):
+    def test_membership(self):
+        """ Verify added strings are always found, and other strings rarely are. """
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        values = ['CODE{}'.format(index).encode('utf-8') for index in range(1000)]
+        for value in values:
+            bloom.add(value)
+
+        self.assertTrue(all(value in bloom for value in values))
+        false_positives = sum('OTHER{}'.format(index).encode('utf-8') in bloom for index in range(1000))
+        self.assertLess(false_positives, 50)
+        self.assertLess(bloom.get_error_rate(), 0.05)
+
+
+class VoucherCodeFilterTests(TestCase):
+    def setUp(self):
+        super(VoucherCodeFilterTests, self).setUp()
+        prepare_voucher(code=CODE)
+
+    def test_not_built(self):
+        """ Verify codes are neither accepted nor rejected until the filter is built. """
+        self.assertIsNone(code_filter.contains_code('UNKNOWN'))
+
+    def test_rebuild(self):
+        """ Verify the codes of vouchers are found, and those of no voucher are rejected. """
+        code_filter.rebuild()
+        self.assertTrue(code_filter.contains_code(CODE))
+        self.assertTrue(code_filter.contains_code(CODE.lower()))
+        self.assertFalse(code_filter.contains_code('UNKNOWN'))
+
+    def test_voucher_created(self):
+        """ Verify the codes of vouchers created after the filter is built are found. """
+        code_filter.rebuild()
+        self.assertFalse(code_filter.contains_code('CREATED'))
+        prepare_voucher(code='CREATED')
+        self.assertTrue(code_filter.contains_code('CREATED'))
+        self.assertEqual(code_filter.get_stats()['pending_additions'], 1)
+
+    def test_voucher_committed(self):
+        """ Verify the codes of vouchers created while the filter is rebuilt are found once they are committed. """
+        code_filter.rebuild()
+        with mock.patch.object(code_filter.transaction, 'on_commit') as mock_on_commit:
+            prepare_voucher(code='CREATED')
+
+        # The filter is rebuilt before the voucher is committed, so its code is not read from the database.
+        codes = mock.Mock(iterator=mock.Mock(return_value=iter([CODE])))
+        with mock.patch.object(code_filter.Voucher.objects, 'values_list', return_value=codes):
+            code_filter.rebuild()
+        self.assertFalse(code_filter.contains_code('CREATED'))
+
+        for call in mock_on_commit.call_args_list:
+            call[0][0]()
+        self.assertTrue(code_filter.contains_code('CREATED'))
+
+    def test_fail_open(self):
+        """ Verify no code is rejected if part of the filter, or of its log, is missing. """
+        code_filter.rebuild()
+        prepare_voucher(code='CREATED')
+        cache.delete(code_filter.ADDITIONS_KEY)
+        self.assertIsNone(code_filter.contains_code('UNKNOWN'))
+
+        code_filter.rebuild()
+        cache.delete_many([code_filter._get_segment_key(code_filter.get_stats()['generation'], 0)])
+        self.assertIsNone(code_filter.contains_code('UNKNOWN'))
+
+    def test_snapshot(self):
+        """ Verify codes rejected by the filter are not looked up, and false positives are recorded. """
+        code_filter.rebuild()
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_voucher_snapshot('UNKNOWN').voucher)
+
+        with mock.patch.object(code_filter, 'contains_code', return_value=True):
+            with mock.patch('newrelic.agent.record_custom_metric') as mock_record:
+                self.assertIsNone(get_voucher_snapshot('UNKNOWN').voucher)
+        mock_record.assert_called_once_with('Custom/VoucherCodeFilter/FalsePositives', 1)
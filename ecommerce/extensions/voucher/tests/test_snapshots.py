@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+from oscar.core.loading import get_model
+from oscar.test.factories import ProductFactory
+
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot
+from ecommerce.extensions.voucher.utils import get_cached_voucher
+from ecommerce.tests.testcases import TestCase
+
+Voucher = get_model('voucher', 'Voucher')
+
+CODE = 'SNAPSHOT'
+
+
+class VoucherSnapshotTests(TestCase):
+    def setUp(self):
+        super(VoucherSnapshotTests, self).setUp()
+        self.voucher, self.product = prepare_voucher(code=CODE)
+        self.offer = self.voucher.offers.first()
+
+    def test_snapshot_cached(self):
+        """ Verify the voucher, its offers, and the products of their ranges are retrieved from the cache. """
+        get_voucher_snapshot(CODE)
+
+        with self.assertNumQueries(0):
+            snapshot = get_voucher_snapshot(CODE)
+            voucher = snapshot.voucher
+            offer = voucher.original_offer
+            self.assertEqual(offer, self.offer)
+            self.assertEqual(offer.benefit.range, self.offer.benefit.range)
+            self.assertEqual(offer.condition.range, self.offer.condition.range)
+            self.assertIsNone(voucher.enterprise_offer)
+
+        self.assertEqual(snapshot.get_range_products(offer.benefit.range), [self.product])
+
+    def test_unknown_code_cached(self):
+        """ Verify unknown codes are cached, until a voucher with the code is created. """
+        with self.assertRaises(Voucher.DoesNotExist):
+            get_cached_voucher('UNKNOWN')
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(Voucher.DoesNotExist):
+                get_cached_voucher('UNKNOWN')
+
+        voucher, __ = prepare_voucher(code='UNKNOWN')
+        self.assertEqual(get_cached_voucher('UNKNOWN'), voucher)
+
+    def test_voucher_change(self):
+        """ Verify the snapshot is rebuilt when the voucher changes. """
+        get_cached_voucher(CODE)
+        self.voucher.name = 'Changed'
+        self.voucher.save()
+        self.assertEqual(get_cached_voucher(CODE).name, 'Changed')
+
+    def test_offer_change(self):
+        """ Verify the snapshot is rebuilt when its offer, or the benefit of the offer, changes. """
+        get_cached_voucher(CODE)
+        self.offer.email_domains = 'example.com'
+        self.offer.save()
+        self.assertEqual(get_cached_voucher(CODE).original_offer.email_domains, 'example.com')
+
+        benefit = self.offer.benefit
+        benefit.value = 50
+        benefit.save()
+        self.assertEqual(get_cached_voucher(CODE).original_offer.benefit.value, 50)
+
+    def test_range_products_change(self):
+        """ Verify the snapshot is rebuilt when products are added to the range of its offer. """
+        voucher_range = self.offer.benefit.range
+        get_voucher_snapshot(CODE)
+
+        product = ProductFactory(categories=[])
+        voucher_range.add_product(product)
+        snapshot = get_voucher_snapshot(CODE)
+        self.assertEqual(set(snapshot.get_range_products(voucher_range)), {self.product, product})
+
+    def test_offers_change(self):
+        """ Verify the snapshot is rebuilt when offers are removed from the voucher. """
+        get_cached_voucher(CODE)
+        self.voucher.offers.remove(self.offer)
+        with self.assertRaises(IndexError):
+            get_cached_voucher(CODE).original_offer  # pylint: disable=expression-not-assigned
@@ -13,7 +13,6 @@ import pytz
 from django.conf import settings
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
-from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from oscar.templatetags.currency_filters import currency
@@ -26,6 +25,7 @@ from ecommerce.enterprise.utils import get_enterprise_customer
 from ecommerce.extensions.api import exceptions
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_VOUCHER
 from ecommerce.extensions.offer.utils import get_discount_percentage, get_discount_value
+from ecommerce.extensions.voucher.snapshots import get_voucher_snapshot
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.conditions import ProgramCourseRunSeatsCondition
 from ecommerce.programs.constants import BENEFIT_MAP
@@ -125,7 +125,7 @@ def _get_info_for_coupon_report(coupon, voucher):
         course_id = None
     elif offer_range and offer_range.catalog:
         seat_stockrecord = offer_range.catalog.stock_records.first()
-        course_id = seat_stockrecord.product.attr.course_key
+        course_id = seat_stockrecord.product.get_snapshot_attribute('course_key')
         course_organization = CourseKey.from_string(course_id).org
     elif offer_range and offer_range.catalog_query:
         catalog_query = offer_range.catalog_query
@@ -874,8 +874,7 @@ def update_voucher_offer(offer, benefit_value, benefit_type=None, max_uses=None,
 
 def get_cached_voucher(code):
     """
-    Returns a voucher from cache if one is stored to cache, if not the voucher
-    is retrieved from database and stored to cache.
+    Returns a voucher, with its offers, from its cached snapshot. The snapshot is built if it is not cached.
 
     Arguments:
         code (str): The code of a coupon voucher.
@@ -886,15 +885,12 @@ def get_cached_voucher(code):
     Raises:
         Voucher.DoesNotExist: When no vouchers with provided code exist.
     """
-    voucher_code = 'voucher_{code}'.format(code=code)
-    cache_key = hashlib.md5(voucher_code).hexdigest()
-    voucher_cached_response = TieredCache.get_cached_response(cache_key)
-    if voucher_cached_response.is_found:
-        return voucher_cached_response.value
+    if not code:
+        raise Voucher.DoesNotExist
 
-    voucher = Voucher.objects.get(code=code)
-
-    TieredCache.set_all_tiers(cache_key, voucher, settings.VOUCHER_CACHE_TIMEOUT)
+    voucher = get_voucher_snapshot(code).voucher
+    if voucher is None:
+        raise Voucher.DoesNotExist
     return voucher
 
 
@@ -913,12 +909,16 @@ def get_voucher_and_products_from_code(code):
         Voucher.DoesNotExist: When no vouchers with provided code exist.
         ProductNotFoundError: When no products are associated with the voucher.
     """
-    voucher = get_cached_voucher(code)
+    snapshot = get_voucher_snapshot(code)
+    voucher = snapshot.voucher
+    if voucher is None:
+        raise Voucher.DoesNotExist
+
     voucher_range = voucher.best_offer.benefit.range
     has_catalog_configuration = voucher_range and (voucher_range.catalog_query or voucher_range.course_catalog)
     is_enterprise = ((voucher_range and voucher_range.enterprise_customer) or
                      voucher.best_offer.condition.enterprise_customer_uuid)
-    products = voucher_range.all_products() if voucher_range else []
+    products = snapshot.get_range_products(voucher_range) if voucher_range else []
 
     if products or has_catalog_configuration or is_enterprise:
         # List of products is empty in case of Multi-course coupon
@@ -9,6 +9,7 @@ from requests.exceptions import Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from ecommerce.extensions.offer.decorators import check_condition_applicability
+from ecommerce.extensions.offer.evaluation import get_evaluation_context
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
 from ecommerce.journals.client import fetch_journal_bundle
 
@@ -30,6 +31,18 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
     def name(self):
         return 'Basket contains every product in bundle {}'.format(self.journal_bundle_uuid)
 
+    def _get_journal_bundle_job(self, basket):
+        """ Returns the (key, func) tuple fetching the journal bundle of this condition. """
+        site = basket.site
+        return (
+            ('journal_bundle', str(self.journal_bundle_uuid)),
+            lambda: fetch_journal_bundle(site=site, journal_bundle_uuid=self.journal_bundle_uuid)
+        )
+
+    def get_prefetch_jobs(self, offer, basket):  # pylint: disable=unused-argument
+        """ Returns the jobs prefetching the data used by is_satisfied. See OfferEvaluationContext. """
+        return [self._get_journal_bundle_job(basket)]
+
     def get_applicable_course_skus(self, return_set=False):
         """
         Returns a dict of applicable SKUs for each course,
@@ -130,10 +143,7 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
         """
         try:
             # TODO: WL-1680: All calls from ecommerce to other services should be async
-            self.journal_bundle = fetch_journal_bundle(
-                site=basket.site,
-                journal_bundle_uuid=self.journal_bundle_uuid
-            )
+            self.journal_bundle = get_evaluation_context(basket).memoize(*self._get_journal_bundle_job(basket))
         except (HttpNotFoundError, SlumberBaseException, Timeout):
             return False
 
@@ -18,6 +18,10 @@ class ProgramsApiClient(object):
         self.client = client
         self.site_domain = site_domain
 
+    def get_program_cache_key(self, uuid):
+        """ Returns the key the details of a program are cached under. """
+        return '{site_domain}-program-{uuid}'.format(site_domain=self.site_domain, uuid=uuid)
+
     def get_program(self, uuid):
         """
         Retrieve the details for a single program.
@@ -29,7 +33,7 @@ class ProgramsApiClient(object):
             dict
         """
         program_uuid = str(uuid)
-        cache_key = '{site_domain}-program-{uuid}'.format(site_domain=self.site_domain, uuid=program_uuid)
+        cache_key = self.get_program_cache_key(program_uuid)
 
         program_cached_response = TieredCache.get_cached_response(cache_key)
 
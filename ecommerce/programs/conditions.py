@@ -10,8 +10,9 @@ from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
-from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
+from ecommerce.core.utils import get_cache_key, traverse_pagination
 from ecommerce.extensions.offer.decorators import check_condition_applicability
+from ecommerce.extensions.offer.evaluation import get_evaluation_context
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
 from ecommerce.programs.utils import get_program
 
@@ -64,10 +65,25 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             data_list = []
         return data_list
 
+    def _get_lms_resource_job(self, basket, resource_name, endpoint):
+        """ Returns the (key, func) tuple fetching an LMS resource of the basket owner. """
+        return (
+            ('lms_resource', resource_name, basket.owner.id),
+            lambda: self._get_lms_resource_for_user(basket, resource_name, endpoint)
+        )
+
     def _get_lms_resource(self, basket, resource_name, endpoint):
         if not basket.owner:
             return []
-        return self._get_lms_resource_for_user(basket, resource_name, endpoint)
+        return get_evaluation_context(basket).memoize(*self._get_lms_resource_job(basket, resource_name, endpoint))
+
+    def _get_entitlements(self, basket, site_configuration):
+        response = self._get_lms_resource(
+            basket, 'entitlements', site_configuration.entitlement_api_client.entitlements
+        )
+        if isinstance(response, dict):
+            return traverse_pagination(response, site_configuration.entitlement_api_client.entitlements)
+        return response
 
     def _get_user_ownership_data(self, basket, retrieve_entitlements=False):
         """
@@ -81,16 +97,27 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             enrollments = self._get_lms_resource(
                 basket, 'enrollments', site_configuration.enrollment_api_client.enrollment)
             if retrieve_entitlements:
-                response = self._get_lms_resource(
-                    basket, 'entitlements', site_configuration.entitlement_api_client.entitlements
+                # The remaining pages of the entitlements are fetched once per evaluation, like the first one.
+                entitlements = get_evaluation_context(basket).memoize(
+                    ('lms_entitlements', basket.owner_id),
+                    lambda: self._get_entitlements(basket, site_configuration)
                 )
-                if isinstance(response, dict):
-                    entitlements = deprecated_traverse_pagination(
-                        response, site_configuration.entitlement_api_client.entitlements)
-                else:
-                    entitlements = response
         return enrollments, entitlements
 
+    def _get_program_job(self, site_configuration):
+        """ Returns the (key, func) tuple fetching the program of this condition. """
+        return ('program', str(self.program_uuid)), lambda: get_program(self.program_uuid, site_configuration)
+
+    def get_prefetch_jobs(self, offer, basket):  # pylint: disable=unused-argument
+        """ Returns the jobs prefetching the data used by is_satisfied. See OfferEvaluationContext. """
+        site_configuration = basket.site.siteconfiguration
+        jobs = [self._get_program_job(site_configuration)]
+        if basket.owner and site_configuration.enable_partial_program:
+            jobs.append(self._get_lms_resource_job(
+                basket, 'enrollments', site_configuration.enrollment_api_client.enrollment
+            ))
+        return jobs
+
     def _has_entitlements(self, program):
         """
         Determines whether an entitlement product exists for any course in the program.
@@ -113,8 +140,9 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             bool
         """
         basket_skus = set([line.stockrecord.partner_sku for line in basket.all_lines()])
+        context = get_evaluation_context(basket)
         try:
-            program = get_program(self.program_uuid, basket.site.siteconfiguration)
+            program = context.memoize(*self._get_program_job(basket.site.siteconfiguration))
         except (HttpNotFoundError, SlumberBaseException, Timeout):
             return False
 
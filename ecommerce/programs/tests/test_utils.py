@@ -9,7 +9,7 @@ from testfixtures import LogCapture
 
 from ecommerce.programs.api import ProgramsApiClient
 from ecommerce.programs.tests.mixins import ProgramTestMixin
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.utils import get_program, get_programs
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.programs.utils'
@@ -61,3 +61,36 @@ class UtilTests(ProgramTestMixin, TestCase):
                 self.assertIsNone(response)
                 msg = 'No program data found for {}'.format(self.program_uuid)
                 l.check((LOGGER_NAME, 'DEBUG', msg))
+
+    @httpretty.activate
+    @ddt.data(1, 4)
+    def test_get_programs(self, concurrency):
+        """
+        The method should return data from the Discovery Service API for each program, and None for the programs
+        that fail to be retrieved. Data should be cached for subsequent calls.
+        """
+        other_program_uuid = uuid.uuid4()
+        missing_program_uuid = uuid.uuid4()
+        data = self.mock_program_detail_endpoint(self.program_uuid, self.discovery_api_url)
+        other_data = self.mock_program_detail_endpoint(other_program_uuid, self.discovery_api_url, title='Other')
+        httpretty.register_uri(
+            httpretty.GET,
+            '{}/programs/{}/'.format(self.discovery_api_url.strip('/'), missing_program_uuid),
+            status=404
+        )
+        expected = {
+            str(self.program_uuid): data,
+            str(other_program_uuid): other_data,
+            str(missing_program_uuid): None,
+        }
+        program_uuids = [self.program_uuid, other_program_uuid, missing_program_uuid, self.program_uuid]
+
+        with self.settings(DISCOVERY_API_CONCURRENCY=concurrency):
+            self.assertEqual(get_programs(program_uuids, self.site.siteconfiguration), expected)
+
+        # The program data should be cached
+        httpretty.disable()
+        self.assertEqual(get_programs(program_uuids[:2], self.site.siteconfiguration), {
+            str(self.program_uuid): data,
+            str(other_program_uuid): other_data,
+        })
@@ -1,5 +1,8 @@
 import logging
+from multiprocessing.pool import ThreadPool
 
+from django.conf import settings
+from edx_django_utils.cache import TieredCache
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
@@ -24,9 +27,23 @@ def get_program(program_uuid, siteconfiguration):
         dict
         None if not found or another error occurs
     """
+    client = _get_client(siteconfiguration, [program_uuid])
+    return _get_program(client, program_uuid) if client else None
+
+
+def _get_client(siteconfiguration, program_uuids):
+    try:
+        return ProgramsApiClient(siteconfiguration.discovery_api_client, siteconfiguration.site.domain)
+    except (ConnectionError, SlumberBaseException, Timeout):
+        for program_uuid in program_uuids:
+            msg = 'Failed to retrieve program details for {}'.format(program_uuid)
+            log.debug(msg)
+        return None
+
+
+def _get_program(client, program_uuid):
     response = None
     try:
-        client = ProgramsApiClient(siteconfiguration.discovery_api_client, siteconfiguration.site.domain)
         response = client.get_program(str(program_uuid))
     except HttpNotFoundError:
         msg = 'No program data found for {}'.format(program_uuid)
@@ -36,3 +53,48 @@ def get_program(program_uuid, siteconfiguration):
         log.debug(msg)
 
     return response
+
+
+def get_programs(program_uuids, siteconfiguration):
+    """
+    Returns details for each of the programs identified by the program_uuids.
+
+    Programs are retrieved as by get_program. Those not yet cached are retrieved concurrently, with at most
+    ``settings.DISCOVERY_API_CONCURRENCY`` requests made at once.
+
+    Args:
+        program_uuids (list): ids of the programs
+        siteconfiguration (SiteConfiguration): Configuration containing the requisite parameters
+            to connect to the Discovery Service.
+
+    Returns:
+        dict: program details keyed by program UUID string, None for programs not found or if another error occurs
+    """
+    program_uuids = set(str(program_uuid) for program_uuid in program_uuids)
+    client = _get_client(siteconfiguration, program_uuids)
+    if client is None:
+        return dict((program_uuid, None) for program_uuid in program_uuids)
+
+    programs = {}
+    uncached_program_uuids = []
+    for program_uuid in program_uuids:
+        program_cached_response = TieredCache.get_cached_response(client.get_program_cache_key(program_uuid))
+        if program_cached_response.is_found:
+            programs[program_uuid] = program_cached_response.value
+        else:
+            uncached_program_uuids.append(program_uuid)
+
+    def _get(program_uuid):
+        return program_uuid, _get_program(client, program_uuid)
+
+    if settings.DISCOVERY_API_CONCURRENCY > 1 and len(uncached_program_uuids) > 1:
+        pool = ThreadPool(min(settings.DISCOVERY_API_CONCURRENCY, len(uncached_program_uuids)))
+        try:
+            programs.update(pool.map(_get, uncached_program_uuids))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        programs.update(_get(program_uuid) for program_uuid in uncached_program_uuids)
+
+    return programs
@@ -8,7 +8,7 @@ from oscar.core.loading import get_model
 
 from ecommerce.core.views import StaffOnlyMixin
 from ecommerce.programs.forms import ProgramOfferForm
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.utils import get_program, get_programs
 
 Benefit = get_model('offer', 'Benefit')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
@@ -79,10 +79,12 @@ class ProgramOfferListView(ProgramOfferViewMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super(ProgramOfferListView, self).get_context_data(**kwargs)
 
-        # TODO: In the future, we should optimize our API calls, pulling the program data in as few calls as possible.
-        offers = []
-        for offer in context['object_list']:
-            offer.program = get_program(offer.condition.program_uuid, self.request.site.siteconfiguration)
-            offers.append(offer)
+        # The programs of every offer are retrieved at once, rather than offer by offer.
+        offers = list(context['object_list'])
+        programs = get_programs(
+            [offer.condition.program_uuid for offer in offers], self.request.site.siteconfiguration
+        )
+        for offer in offers:
+            offer.program = programs[str(offer.condition.program_uuid)]
 
         return context
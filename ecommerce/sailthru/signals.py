@@ -5,6 +5,7 @@ from django.dispatch import receiver
 from ecommerce_worker.sailthru.v1.tasks import update_course_enrollment
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookups import basket_attribute_types
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.analytics.utils import silence_exceptions
@@ -13,7 +14,6 @@ logger = logging.getLogger(__name__)
 post_checkout = get_class('checkout.signals', 'post_checkout')
 basket_addition = get_class('basket.signals', 'basket_addition')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 SAILTHRU_CAMPAIGN = 'sailthru_bid'
 
 
@@ -129,4 +129,4 @@ def get_basket_attribute_type():
     Returns:
         BasketAttributeType
     """
-    return BasketAttributeType.objects.get(name=SAILTHRU_CAMPAIGN)
+    return basket_attribute_types.get(SAILTHRU_CAMPAIGN)
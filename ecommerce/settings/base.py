@@ -207,6 +207,8 @@ TEMPLATES = [
 # MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    # NOTE: This middleware MUST appear first, so that the work done by the other middleware is recorded.
+    'ecommerce.core.middleware.RequestInstrumentationMiddleware',
     'edx_django_utils.cache.middleware.RequestCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -216,7 +218,7 @@ MIDDLEWARE_CLASSES = (
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.auth.middleware.SessionAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.contrib.sites.middleware.CurrentSiteMiddleware',
+    'ecommerce.core.middleware.CurrentSiteMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'edx_rest_framework_extensions.auth.jwt.middleware.EnsureJWTAuthSettingsMiddleware',
     'waffle.middleware.WaffleMiddleware',
@@ -247,6 +249,13 @@ COMMERCE_API_TIMEOUT = 7
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 PROGRAM_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
+# Maximum number of requests made to the Discovery service at once, e.g. for the courses of a basket.
+DISCOVERY_API_CONCURRENCY = 4
+
+# Maximum number of pages of a paginated API response requested at once, and per second, when traversing it.
+PAGINATION_CONCURRENCY = 4
+PAGINATION_RATE_LIMIT = 10
+
 # Cache catalog results from the enterprise and discovery service.
 CATALOG_RESULTS_CACHE_TIMEOUT = 86400
 
@@ -262,12 +271,32 @@ ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
 # LMS API settings used for fetching information from LMS
 LMS_API_CACHE_TIMEOUT = 30  # Value is in seconds.
+
+# Cache timeout for the embargo checks of each user, network and course.
+EMBARGO_CHECK_CACHE_TIMEOUT = 300  # Value is in seconds.
 # END URL CONFIGURATION
 
-VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
+# Cache timeout for voucher snapshots, which are also rebuilt whenever the rows they are built from change.
+VOUCHER_CACHE_TIMEOUT = 3600  # Value is in seconds.
+
+# Rate of codes no voucher has, which the voucher code filter, built by the rebuild_voucher_code_filter
+# command, fails to reject.
+VOUCHER_CODE_FILTER_ERROR_RATE = 0.01
 
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
+# Consolidated screening list file imported by the sync_sdn_list command, for searches made locally.
+SDN_LIST_URL = 'https://api.trade.gov/static/consolidated_screening_list/consolidated.csv'
+SDN_LIST_DOWNLOAD_TIMEOUT = 60  # Value is in seconds.
+# Number of days after its last sync the local list is no longer searched, in favor of the trade.gov API.
+SDN_LIST_MAX_AGE = 7
+# Similarity, between 0 and 1, above which words of names searched locally match words of listed names.
+SDN_FUZZY_MATCH_THRESHOLD = 0.9
+
+# Number of credits issued per second through each payment processor by bulk refunds, keyed by processor name.
+# Processors absent from this setting are limited to 5 credits per second.
+BULK_REFUND_CREDIT_RATE_LIMITS = {}
+
 # APP CONFIGURATION
 DJANGO_APPS = [
     'django.contrib.admin',
@@ -591,6 +620,10 @@ ENTERPRISE_API_CACHE_TIMEOUT = 300  # Value is in seconds
 ENABLE_ENTERPRISE_ON_RUNTIME_SWITCH = 'enable_enterprise_on_runtime'
 
 ENTERPRISE_CUSTOMER_COOKIE_NAME = 'enterprise_customer_uuid'
+
+# Seconds the directory of enterprise customers, synced by the sync_enterprise_customers command, is relied on for.
+# Past this age, enterprise customers are retrieved from the Enterprise API, until the directory is synced again.
+ENTERPRISE_CUSTOMER_DIRECTORY_MAX_AGE = 7200
 # END ENTERPRISE APP CONFIGURATION
 
 # DJANGO DEBUG TOOLBAR CONFIGURATION
@@ -606,3 +639,18 @@ if os.environ.get('ENABLE_DJANGO_TOOLBAR', False):
 
 # Determines if events are actually sent to Segment. This should only be set to False for testing purposes.
 SEND_SEGMENT_EVENTS = True
+
+# PERFORMANCE INSTRUMENTATION
+# Adds the number of SQL queries, cache lookups and outbound HTTP requests made by each request to its
+# response headers. This should not be enabled in production.
+PERFORMANCE_INSTRUMENTATION_HEADERS = False
+
+# Dotted paths of the classes the metrics of each request are exported to.
+PERFORMANCE_INSTRUMENTATION_EXPORTERS = (
+    'ecommerce.core.instrumentation.NewRelicExporter',
+)
+
+# Fraction of the applicator runs whose offer evaluations are profiled, and sent to New Relic
+# as OfferEvaluation custom events. See ecommerce.extensions.offer.profiling.
+OFFER_PROFILING_SAMPLE_RATE = 0
+# END PERFORMANCE INSTRUMENTATION
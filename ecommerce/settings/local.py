@@ -11,6 +11,11 @@ from ecommerce.settings.base import *
 DEBUG = True
 ALLOWED_HOSTS = ['*']
 INTERNAL_IPS = ['127.0.0.1']
+
+PERFORMANCE_INSTRUMENTATION_HEADERS = True
+PERFORMANCE_INSTRUMENTATION_EXPORTERS = (
+    'ecommerce.core.instrumentation.LoggingExporter',
+)
 # END DEBUG CONFIGURATION
 
 # EMAIL CONFIGURATION
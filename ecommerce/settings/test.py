@@ -32,6 +32,8 @@ if os.getenv('DISABLE_MIGRATIONS'):
         'scaffold_templates': None,
     }
 
+PERFORMANCE_INSTRUMENTATION_HEADERS = True
+
 # END TEST SETTINGS
 
 DATABASES = {
@@ -3,6 +3,7 @@
 import datetime
 import json
 import re
+from contextlib import contextmanager
 from decimal import Decimal
 
 import httpretty
@@ -20,6 +21,8 @@ from oscar.test.utils import RequestFactory
 from social_django.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.instrumentation import collect_metrics
+from ecommerce.core.sites import clear_sites
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
@@ -84,6 +87,34 @@ class ThrottlingMixin(object):
         self.addCleanup(TieredCache.dangerous_clear_all_tiers)
 
 
+class PerformanceBudgetMixin(object):
+    """Provides utility methods for asserting the number of queries and outbound HTTP requests made by a block."""
+
+    @contextmanager
+    def assert_budget(self, max_queries=None, max_http_requests=None):
+        """
+        Verify the block makes at most the given number of SQL queries and outbound HTTP requests.
+
+        Yields:
+            RequestMetrics: Metrics recorded while running the block.
+        """
+        with collect_metrics() as metrics:
+            yield metrics
+
+        if max_queries is not None:
+            self.assertLessEqual(
+                metrics.sql_queries, max_queries,
+                '{} queries were made, exceeding the budget of {}.'.format(metrics.sql_queries, max_queries)
+            )
+        if max_http_requests is not None:
+            self.assertLessEqual(
+                metrics.http_requests, max_http_requests,
+                '{} HTTP requests were made, exceeding the budget of {}: {}'.format(
+                    metrics.http_requests, max_http_requests, metrics.http_requests_by_host
+                )
+            )
+
+
 class JwtMixin(object):
     """ Mixin with JWT-related helper functions. """
     JWT_SECRET_KEY = settings.JWT_AUTH['JWT_SECRET_KEY']
@@ -264,6 +295,7 @@ class SiteMixin(object):
         Course.objects.all().delete()
         Partner.objects.all().delete()
         Site.objects.all().delete()
+        clear_sites()
         self.site_configuration = SiteConfigurationFactory(
             from_email='from@example.com',
             oauth_settings={
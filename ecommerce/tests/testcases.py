@@ -4,6 +4,7 @@ from django.test import TestCase as DjangoTestCase
 from django.test import TransactionTestCase as DjangoTransactionTestCase
 from edx_django_utils.cache import TieredCache
 
+from ecommerce.core.lookups import reset_lookup_registries
 from ecommerce.tests.mixins import SiteMixin, TestServerUrlMixin, UserMixin
 
 
@@ -20,6 +21,16 @@ class TieredCacheMixin(object):
         super(TieredCacheMixin, self).tearDown()
 
 
+class LookupRegistryMixin(object):
+    def setUp(self):
+        reset_lookup_registries()
+        super(LookupRegistryMixin, self).setUp()
+
+    def tearDown(self):
+        reset_lookup_registries()
+        super(LookupRegistryMixin, self).tearDown()
+
+
 class ViewTestMixin(TieredCacheMixin):
     path = None
 
@@ -53,7 +64,8 @@ class ViewTestMixin(TieredCacheMixin):
         self.assert_get_response_status(200)
 
 
-class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoTestCase):
+class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, LookupRegistryMixin,
+               DjangoTestCase):
     """
     Base test case for ecommerce tests.
 
@@ -61,7 +73,8 @@ class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, Djang
     """
 
 
-class LiveServerTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoLiveServerTestCase):
+class LiveServerTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, LookupRegistryMixin,
+                         DjangoLiveServerTestCase):
     """
     Base test case for ecommerce tests.
 
@@ -70,7 +83,8 @@ class LiveServerTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMi
     pass
 
 
-class TransactionTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoTransactionTestCase):
+class TransactionTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, LookupRegistryMixin,
+                          DjangoTransactionTestCase):
     """
     Base test case for ecommerce tests.
 
@@ -3,14 +3,19 @@
 """
 import logging
 import os
+from collections import OrderedDict
 
 import waffle
 from django.conf import ImproperlyConfigured, settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from path import Path
 from threadlocals.threadlocals import get_current_request
 
 logger = logging.getLogger(__name__)
 
+_theme_registry = None
+
 
 def get_current_site_theme():
     """
@@ -65,9 +70,9 @@ def get_theme_base_dir(theme_dir_name, suppress_error=False):
     Returns:
         (str): Base directory that contains the given theme
     """
-    for themes_dir in get_theme_base_dirs():
-        if theme_dir_name in (_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)):
-            return themes_dir
+    theme = get_theme_registry().get_theme(theme_dir_name)
+    if theme:
+        return theme.themes_base_dir
 
     if suppress_error:
         return None
@@ -174,13 +179,16 @@ def get_themes(themes_dir=None):
     if not is_comprehensive_theming_enabled():
         return []
 
-    themes_dirs = [Path(themes_dir)] if themes_dir else get_theme_base_dirs()
-    # pick only directories and discard files in themes directory
-    themes = []
-    for themes_dir in themes_dirs:
-        themes.extend([Theme(name, name, themes_dir) for name in get_theme_dirs(themes_dir)])
+    registry = get_theme_registry()
+    if not themes_dir:
+        return list(registry.themes)
 
-    return themes
+    themes_dir = Path(themes_dir)
+    if themes_dir in registry.themes_base_dirs:
+        return [theme for theme in registry.themes if theme.themes_base_dir == themes_dir]
+
+    # pick only directories and discard files in themes directory
+    return [Theme(name, name, themes_dir) for name in get_theme_dirs(themes_dir)]
 
 
 def get_theme_dirs(themes_dir=None):
@@ -205,6 +213,65 @@ def is_theme_dir(_dir):
     return bool(os.path.isdir(_dir) and theme_sub_directories.intersection(os.listdir(_dir)))
 
 
+class ThemeRegistry(object):
+    """
+    Immutable record of the themes found in the theme base directories.
+
+    Scanning the theme base directories touches the filesystem, so it is only done once, when the registry is
+    built, rather than each time a theme is looked up.
+    """
+
+    def __init__(self, themes_base_dirs):
+        themes = []
+        themes_by_dir_name = OrderedDict()
+        for themes_dir in themes_base_dirs:
+            for name in get_theme_dirs(themes_dir):
+                theme = Theme(name, name, themes_dir)
+                themes.append(theme)
+                # Themes found in the first directories take precedence, as the directories are searched in order.
+                themes_by_dir_name.setdefault(name, theme)
+
+        self.themes_base_dirs = tuple(themes_base_dirs)
+        self.themes = tuple(themes)
+        self._themes_by_dir_name = themes_by_dir_name
+
+    def get_theme(self, theme_dir_name):
+        """
+        Returns the theme with the given directory name, or None if there is no such theme.
+        """
+        return self._themes_by_dir_name.get(theme_dir_name)
+
+
+def get_theme_registry():
+    """
+    Returns the registry of the themes, building it the first time it is requested.
+
+    Returns:
+        (ThemeRegistry): registry of the themes in the directories listed by COMPREHENSIVE_THEME_DIRS.
+    """
+    global _theme_registry  # pylint: disable=global-statement
+    if _theme_registry is None:
+        _theme_registry = ThemeRegistry(get_theme_base_dirs())
+    return _theme_registry
+
+
+def reload_theme_registry():
+    """
+    Discards the registry of the themes, so that it is built again, e.g. after themes are added or removed.
+    """
+    global _theme_registry  # pylint: disable=global-statement
+    _theme_registry = None
+
+
+@receiver(setting_changed)
+def reload_theme_registry_on_setting_change(setting, **kwargs):  # pylint: disable=unused-argument
+    """
+    Reloads the registry of the themes when the directories containing the themes change.
+    """
+    if setting == 'COMPREHENSIVE_THEME_DIRS':
+        reload_theme_registry()
+
+
 class Theme(object):
     """
     class to encapsulate theme related information.
@@ -254,3 +321,7 @@ class Theme(object):
             self.path / 'templates',
             self.path / 'templates' / 'oscar',
         ]
+
+    @property
+    def static_dir(self):
+        return self.path / 'static'
@@ -1,6 +1,10 @@
 """
 Tests for Management commands of comprehensive theming.
 """
+import datetime
+import shutil
+import tempfile
+
 from django.conf import settings
 from django.core.management import CommandError, call_command
 from django.test import TestCase, override_settings
@@ -12,7 +16,9 @@ from ecommerce.theming.management.commands.update_assets import (
     SYSTEM_SASS_PATHS,
     Command,
     compile_sass,
-    get_sass_directories
+    compile_sass_in_parallel,
+    get_sass_directories,
+    group_sass_directories
 )
 
 
@@ -157,3 +163,48 @@ class TestUpdateAssets(TestCase):
             call_command("update_assets", "--skip-collect", "--skip-system", themes=[])
 
             self.assertFalse(mock_call_command.called)
+
+    def test_group_sass_directories(self):
+        """
+        Test that sass dirs sharing a css destination dir are grouped together, in order.
+        """
+        sass_dirs = get_sass_directories(themes=self.themes, system=True)
+        groups = group_sass_directories(sass_dirs)
+
+        self.assertEqual(len(groups), len(self.themes) + 1)
+        self.assertEqual(sum(len(group) for group in groups.values()), len(sass_dirs))
+        for css_destination_dir, group in groups.items():
+            self.assertTrue(all(sass_dir['css_destination_dir'] == css_destination_dir for sass_dir in group))
+
+    def test_compile_sass_in_parallel_skips_unchanged_sass(self):
+        """
+        Test that sass is only compiled in parallel mode if it changed since it was last compiled, or if forced.
+        """
+        css_destination_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, css_destination_dir)
+        sass_source_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, sass_source_dir)
+        (sass_source_dir / 'main.scss').write_text('body { color: red; }')
+        sass_dirs = [{
+            "sass_source_dir": sass_source_dir,
+            "css_destination_dir": css_destination_dir,
+            "lookup_paths": SYSTEM_SASS_PATHS,
+        }]
+
+        with patch(
+            "ecommerce.theming.management.commands.update_assets.compile_sass",
+            return_value=(sass_source_dir, css_destination_dir, datetime.timedelta(seconds=1)),
+        ) as mock_compile_sass:
+            compile_sass_in_parallel(sass_dirs, jobs=1)
+            compile_sass_in_parallel(sass_dirs, jobs=1)
+            self.assertEqual(mock_compile_sass.call_count, 1)
+
+            compile_sass_in_parallel(sass_dirs, jobs=1, force=True)
+            self.assertEqual(mock_compile_sass.call_count, 2)
+
+            (sass_source_dir / 'main.scss').write_text('body { color: blue; }')
+            compile_sass_in_parallel(sass_dirs, jobs=1)
+            self.assertEqual(mock_compile_sass.call_count, 3)
+
+            compile_sass_in_parallel(sass_dirs, jobs=1, output_style='compressed')
+            self.assertEqual(mock_compile_sass.call_count, 4)
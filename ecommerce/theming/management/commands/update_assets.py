@@ -5,7 +5,11 @@ Managements for asset compilation and collection.
 from __future__ import unicode_literals
 
 import datetime
+import hashlib
+import json
 import logging
+import multiprocessing
+from collections import OrderedDict
 
 import sass
 from django.conf import settings
@@ -25,6 +29,10 @@ SYSTEM_SASS_PATHS = [
     Path("ecommerce/static/sass"),
 ]
 
+# Name of the file, written to each css destination directory, recording the fingerprint of the sass it was compiled
+# from. Collectstatic ignores files whose name starts with a dot.
+SASS_MANIFEST_NAME = '.sass-manifest.json'
+
 
 class Command(BaseCommand):
     """
@@ -80,6 +88,30 @@ class Command(BaseCommand):
             help="Add source comments in compiled sass.",
         )
 
+        parser.add_argument(
+            '--parallel',
+            dest='parallel',
+            action='store_true',
+            default=False,
+            help="Compile sass in parallel, skipping css destination dirs whose sass is unchanged.",
+        )
+
+        parser.add_argument(
+            '--jobs',
+            dest='jobs',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of processes compiling sass in parallel (default=number of cores).",
+        )
+
+        parser.add_argument(
+            '--force',
+            dest='force',
+            action='store_true',
+            default=False,
+            help="Compile sass in parallel mode even if it is unchanged.",
+        )
+
         parser.add_argument(
             '--skip-collect',
             dest='collect',
@@ -148,15 +180,25 @@ class Command(BaseCommand):
             themes = []
             logger.info("Skipping theme sass compilation as theming is disabled.")
 
-        for sass_dir in get_sass_directories(themes, system):
-            result = compile_sass(
-                sass_source_dir=sass_dir['sass_source_dir'],
-                css_destination_dir=sass_dir['css_destination_dir'],
-                lookup_paths=sass_dir['lookup_paths'],
+        sass_dirs = get_sass_directories(themes, system)
+        if options.get('parallel'):
+            info = compile_sass_in_parallel(
+                sass_dirs,
+                jobs=options.get('jobs') or 1,
+                force=options.get('force', False),
                 output_style=output_style,
                 source_comments=source_comments,
             )
-            info.append(result)
+        else:
+            for sass_dir in sass_dirs:
+                result = compile_sass(
+                    sass_source_dir=sass_dir['sass_source_dir'],
+                    css_destination_dir=sass_dir['css_destination_dir'],
+                    lookup_paths=sass_dir['lookup_paths'],
+                    output_style=output_style,
+                    source_comments=source_comments,
+                )
+                info.append(result)
 
         logger.info("Sass compilation completed.")
 
@@ -263,6 +305,139 @@ def compile_sass(sass_source_dir, css_destination_dir, lookup_paths, **kwargs):
     return sass_source_dir, css_destination_dir, duration
 
 
+def group_sass_directories(sass_dirs):
+    """
+    Group sass directories by css destination directory.
+
+    Sass directories sharing a css destination directory must be compiled in order, as the css compiled from theme
+    overrides replaces the css compiled from system sass. Each group can be compiled independently of the others.
+
+    Args:
+        sass_dirs (list): sass directories, as returned by get_sass_directories
+
+    Returns:
+        OrderedDict mapping each css destination directory to the list of sass directories compiled into it.
+    """
+    groups = OrderedDict()
+    for sass_dir in sass_dirs:
+        groups.setdefault(sass_dir['css_destination_dir'], []).append(sass_dir)
+    return groups
+
+
+def get_sass_fingerprint(sass_dirs, **kwargs):
+    """
+    Get a hash of the sass files, and compilation options, used to compile the given sass directories.
+
+    The hash covers every sass file in the source directories and in the lookup paths used to resolve @imports,
+    so it changes whenever any file that may be imported changes.
+
+    Args:
+        sass_dirs (list): sass directories compiled into the same css destination directory
+        **kwargs: compilation options, e.g. output_style
+
+    Returns:
+        (str): hex digest of the sass files and options.
+    """
+    digest = hashlib.sha1()
+    for key in sorted(kwargs):
+        digest.update('{}={};'.format(key, kwargs[key]).encode('utf-8'))
+
+    for sass_dir in sass_dirs:
+        for directory in [sass_dir['sass_source_dir']] + list(sass_dir['lookup_paths']):
+            directory = Path(directory)
+            digest.update(directory.encode('utf-8'))
+            if not directory.isdir():
+                continue
+
+            for sass_file in sorted(directory.walkfiles('*.scss')):
+                digest.update(sass_file.encode('utf-8'))
+                digest.update(sass_file.bytes())
+
+    return digest.hexdigest()
+
+
+def read_sass_manifest(css_destination_dir):
+    """
+    Get the fingerprint recorded the last time sass was compiled into the given directory, or None.
+    """
+    manifest = Path(css_destination_dir) / SASS_MANIFEST_NAME
+    if not manifest.isfile():
+        return None
+
+    try:
+        return json.loads(manifest.text()).get('fingerprint')
+    except ValueError:
+        return None
+
+
+def write_sass_manifest(css_destination_dir, fingerprint):
+    """
+    Record the fingerprint of the sass compiled into the given directory.
+    """
+    (Path(css_destination_dir) / SASS_MANIFEST_NAME).write_text(json.dumps({'fingerprint': fingerprint}))
+
+
+def _compile_sass_group(args):
+    """
+    Compile, in order, sass directories sharing a css destination directory. Runs in a worker process.
+    """
+    sass_dirs, output_style, source_comments = args
+    return [
+        compile_sass(
+            sass_source_dir=sass_dir['sass_source_dir'],
+            css_destination_dir=sass_dir['css_destination_dir'],
+            lookup_paths=sass_dir['lookup_paths'],
+            output_style=output_style,
+            source_comments=source_comments,
+        )
+        for sass_dir in sass_dirs
+    ]
+
+
+def compile_sass_in_parallel(sass_dirs, jobs, force=False, output_style='nested', source_comments=False):
+    """
+    Compile sass directories in a pool of processes, skipping css destination directories whose sass is unchanged.
+
+    Args:
+        sass_dirs (list): sass directories, as returned by get_sass_directories
+        jobs (int): maximum number of processes compiling sass
+        force (bool): if True, compile sass even if it is unchanged
+        output_style (str): coding style for compiled css files
+        source_comments (bool): True if source comments need to be included in output
+
+    Returns:
+        A list of tuples containing sass source dir, css destination dir and duration of sass compilation process
+    """
+    pending = []
+    for css_destination_dir, group in group_sass_directories(sass_dirs).items():
+        fingerprint = get_sass_fingerprint(group, output_style=output_style, source_comments=source_comments)
+        if not force and read_sass_manifest(css_destination_dir) == fingerprint:
+            logger.info(">> %s is up to date, skipping.", css_destination_dir)
+            continue
+        pending.append((css_destination_dir, group, fingerprint))
+
+    tasks = [(group, output_style, source_comments) for __, group, __ in pending]
+    processes = min(jobs, len(tasks))
+    if processes > 1:
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            results = pool.map(_compile_sass_group, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_compile_sass_group(task) for task in tasks]
+
+    info = []
+    for (css_destination_dir, __, fingerprint), result in zip(pending, results):
+        write_sass_manifest(css_destination_dir, fingerprint)
+        duration = sum((duration for __, __, duration in result), datetime.timedelta())
+        logger.info(">> %s compiled in %ss", css_destination_dir, duration)
+        info.extend(result)
+
+    return info
+
+
 def collect_assets():
     """
     Collect static assets.
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.db import models
+from edx_django_utils.cache import TieredCache
+
+from ecommerce.core.utils import get_cache_key
 
 
 class SiteTheme(models.Model):
@@ -29,9 +32,27 @@ class SiteTheme(models.Model):
         if not site:
             return None
 
-        theme = site.themes.first()
+        # The theme of the site is looked up on every request, so it is cached until it changes.
+        cache_key = SiteTheme.get_cache_key(site.id)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            theme = cached_response.value
+        else:
+            theme = site.themes.first()
+            TieredCache.set_all_tiers(cache_key, theme, settings.THEME_CACHE_TIMEOUT)
 
         if (not theme) and settings.DEFAULT_SITE_THEME:
             theme = SiteTheme(site=site, theme_dir_name=settings.DEFAULT_SITE_THEME)
 
         return theme
+
+    @staticmethod
+    def get_cache_key(site_id):
+        return get_cache_key(site_theme_site_id=site_id)
+
+    @staticmethod
+    def invalidate_cache(site_id):
+        """
+        Removes the cached theme of the site with the given ID, e.g. when it is changed.
+        """
+        TieredCache.delete_all_tiers(SiteTheme.get_cache_key(site_id))
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.theming.models import SiteTheme
+
+
+@receiver(post_save, sender=SiteTheme)
+@receiver(post_delete, sender=SiteTheme)
+def invalidate_site_theme_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    When the theme of a site is changed, its cached theme must be invalidated.
+    """
+    SiteTheme.invalidate_cache(instance.site_id)
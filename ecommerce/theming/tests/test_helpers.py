@@ -1,6 +1,8 @@
 """
 Tests of comprehensive theming.
 """
+import os
+
 from django.conf import ImproperlyConfigured, settings
 from django.test import override_settings
 from mock import patch
@@ -13,7 +15,9 @@ from ecommerce.theming.helpers import (
     get_current_theme,
     get_theme_base_dir,
     get_theme_base_dirs,
-    get_themes
+    get_theme_registry,
+    get_themes,
+    reload_theme_registry
 )
 from ecommerce.theming.test_utils import with_comprehensive_theme
 
@@ -193,3 +197,26 @@ class TestHelpers(TestCase):
         Tests get_theme_base_dir returns None if theme is not found istead of raising an error.
         """
         self.assertIsNone(get_theme_base_dir("non-existent-theme", suppress_error=True))
+
+    def test_theme_registry(self):
+        """
+        Tests the themes directories are only scanned when the theme registry is built.
+        """
+        reload_theme_registry()
+        with patch('ecommerce.theming.helpers.os.listdir', wraps=os.listdir) as mock_listdir:
+            get_themes()
+            call_count = mock_listdir.call_count
+
+            self.assertEqual(get_theme_base_dir('test-theme-3'), settings.COMPREHENSIVE_THEME_DIRS[1])
+            get_all_theme_template_dirs()
+            get_themes()
+            self.assertEqual(mock_listdir.call_count, call_count)
+
+    def test_theme_registry_reloaded_on_setting_change(self):
+        """
+        Tests the theme registry is rebuilt when the themes directories change.
+        """
+        registry = get_theme_registry()
+        with override_settings(COMPREHENSIVE_THEME_DIRS=settings.COMPREHENSIVE_THEME_DIRS[:1]):
+            self.assertIsNot(get_theme_registry(), registry)
+            self.assertIsNone(get_theme_base_dir('test-theme-3', suppress_error=True))
@@ -0,0 +1,31 @@
+"""
+Tests of the theming models.
+"""
+from django.test import override_settings
+
+from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.models import SiteTheme
+
+
+class TestSiteTheme(TestCase):
+    """
+    Test the resolution of the themes of sites.
+    """
+
+    def test_get_theme_cached(self):
+        """
+        Tests the theme of a site is cached until it changes.
+        """
+        site_theme = SiteTheme.objects.create(site=self.site, theme_dir_name='test-theme')
+        self.assertEqual(SiteTheme.get_theme(self.site), site_theme)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteTheme.get_theme(self.site), site_theme)
+
+        site_theme.theme_dir_name = 'test-theme-2'
+        site_theme.save()
+        self.assertEqual(SiteTheme.get_theme(self.site).theme_dir_name, 'test-theme-2')
+
+        site_theme.delete()
+        with override_settings(DEFAULT_SITE_THEME=None):
+            self.assertIsNone(SiteTheme.get_theme(self.site))